@@ -15,6 +15,9 @@ from app.schemas.agent import ProgressEvent, ProgressEventType
 
 logger = logging.getLogger(__name__)
 
+# Previous messages sent to the model with a query (token limit)
+MAX_HISTORY_MESSAGES = 20
+
 
 class AgentOrchestrator:
     """Gemini Function Calling Agent Orchestrator."""
@@ -54,7 +57,9 @@ class AgentOrchestrator:
         # 履歴がある場合は利用
         if conversation_history:
             # トークン制限対策: 最新20件のみ保持
-            chat_history = self._truncate_history(conversation_history, max_messages=20)
+            chat_history = self._truncate_history(
+                conversation_history, max_messages=MAX_HISTORY_MESSAGES
+            )
             # 新しいユーザークエリを追加
             chat_history.append({
                 "role": "user",
@@ -231,7 +236,7 @@ class AgentOrchestrator:
         )
 
     def _truncate_history(
-        self, history: list[dict], max_messages: int = 20
+        self, history: list[dict], max_messages: int = MAX_HISTORY_MESSAGES
     ) -> list[dict]:
         """Truncate history to最新N件のメッセージのみ保持 (トークン制限対策).
 
@@ -7,12 +7,20 @@ from google.genai import types
 from app.agent.tools.customer_tools import (
     get_customer_details,
     get_customer_details_declaration,
+    get_customers_details,
+    get_customers_details_declaration,
     search_customers,
     search_customers_declaration,
 )
 from app.agent.tools.deal_tools import (
+    find_similar_deals,
+    find_similar_deals_declaration,
     get_deal_details,
     get_deal_details_declaration,
+    get_deal_summary,
+    get_deal_summary_declaration,
+    get_deals_details,
+    get_deals_details_declaration,
     search_deals,
     search_deals_declaration,
 )
@@ -28,8 +36,12 @@ __all__ = [
     "get_user_info",
     "search_customers",
     "get_customer_details",
+    "get_customers_details",
     "search_deals",
     "get_deal_details",
+    "get_deals_details",
+    "get_deal_summary",
+    "find_similar_deals",
     "search_latest_news",
 ]
 
@@ -51,8 +63,12 @@ def get_tools() -> list[types.Tool]:
                 get_user_info_declaration,
                 search_customers_declaration,
                 get_customer_details_declaration,
+                get_customers_details_declaration,
                 search_deals_declaration,
                 get_deal_details_declaration,
+                get_deals_details_declaration,
+                get_deal_summary_declaration,
+                find_similar_deals_declaration,
                 search_latest_news_declaration,
             ]
         )
@@ -83,10 +99,18 @@ async def execute_tool(tool_name: str, arguments: dict[str, Any]) -> Any:
         return await search_customers(**arguments)
     elif tool_name == "get_customer_details":
         return await get_customer_details(**arguments)
+    elif tool_name == "get_customers_details":
+        return await get_customers_details(**arguments)
     elif tool_name == "search_deals":
         return await search_deals(**arguments)
     elif tool_name == "get_deal_details":
         return await get_deal_details(**arguments)
+    elif tool_name == "get_deals_details":
+        return await get_deals_details(**arguments)
+    elif tool_name == "get_deal_summary":
+        return await get_deal_summary(**arguments)
+    elif tool_name == "find_similar_deals":
+        return await find_similar_deals(**arguments)
     elif tool_name == "search_latest_news":
         return await search_latest_news(**arguments)
     else:
@@ -4,10 +4,15 @@ import logging
 
 from google.genai import types
 
-from app.repositories.customer import CustomerRepository
+from app.core.resources import get_resources
+from app.models.schemas import Customer
+from app.repositories.filters import CustomerSpec
 
 logger = logging.getLogger(__name__)
 
+# Columns printed by search_customers (projected to cut RU and payload size)
+SEARCH_CUSTOMER_FIELDS = ["customer_id", "name", "industry", "contact_person"]
+
 
 # ========================================
 # Tool Functions
@@ -21,29 +26,32 @@ async def search_customers(
 
     Args:
         industries: List of industries to filter by
-        keyword: Keyword to search in customer name
+        keyword: Keyword to search in customer name (and contact / deal notes
+            when the search index is enabled)
 
     Returns:
         Formatted list of customers
     """
     try:
-        repo = CustomerRepository()
+        repo = get_resources().customer_repo
         customers = []
 
-        # 業界で検索
-        if industries:
-            for industry in industries:
-                industry_customers = await repo.get_customers_by_industry(industry)
-                customers.extend(industry_customers)
-
-        # キーワードで検索
+        # キーワードで検索（検索インデックス利用時は関連度順）
         if keyword:
-            keyword_customers = await repo.search_customers(keyword)
+            keyword_customers = await repo.search_customers(keyword, fields=SEARCH_CUSTOMER_FIELDS)
             customers.extend(keyword_customers)
 
+        # 業界で検索（複数業界を1クエリで取得）
+        if industries:
+            customers.extend(
+                await repo.find_customers(
+                    CustomerSpec(industries=industries), fields=SEARCH_CUSTOMER_FIELDS
+                )
+            )
+
         # 条件がない場合は全件取得
         if not industries and not keyword:
-            customers = await repo.get_all_customers()
+            customers = await repo.get_all_customers(fields=SEARCH_CUSTOMER_FIELDS)
 
         # 重複除去
         unique_customers = list({c.customer_id: c for c in customers}.values())
@@ -73,21 +81,52 @@ async def get_customer_details(customer_id: str) -> str:
         Formatted customer details
     """
     try:
-        repo = CustomerRepository()
+        repo = get_resources().customer_repo
         customer = await repo.get_customer_by_id(customer_id)
 
         if not customer:
             return f"顧客ID {customer_id} は見つかりませんでした。"
 
-        return f"""顧客詳細:
-- 顧客名: {customer.name}
+        return "顧客詳細:\n" + _format_customer_details(customer)
+    except Exception as e:
+        logger.error(f"Error in get_customer_details: {e}", exc_info=True)
+        return f"エラーが発生しました: {str(e)}"
+
+
+async def get_customers_details(customer_ids: list[str]) -> str:
+    """Get details of several customers in one batched read.
+
+    Args:
+        customer_ids: Customer IDs
+
+    Returns:
+        Formatted customer details
+    """
+    try:
+        repo = get_resources().customer_repo
+        customers = await repo.get_customers_by_ids(customer_ids)
+
+        sections = [f"{len(customers)}件の顧客詳細:"]
+        sections += [_format_customer_details(customer) for customer in customers]
+        found = {customer.customer_id for customer in customers}
+        missing = [
+            customer_id for customer_id in dict.fromkeys(customer_ids) if customer_id not in found
+        ]
+        if missing:
+            sections.append(f"見つからなかった顧客ID: {', '.join(missing)}")
+        return "\n\n".join(sections)
+    except Exception as e:
+        logger.error(f"Error in get_customers_details: {e}", exc_info=True)
+        return f"エラーが発生しました: {str(e)}"
+
+
+def _format_customer_details(customer: Customer) -> str:
+    """Format one customer for get_customer_details / get_customers_details."""
+    return f"""- 顧客名: {customer.name} (ID: {customer.customer_id})
 - 業界: {customer.industry or 'なし'}
 - 担当者: {customer.contact_person or 'なし'}
 - メール: {customer.email or 'なし'}
 - 電話番号: {customer.phone or 'なし'}"""
-    except Exception as e:
-        logger.error(f"Error in get_customer_details: {e}", exc_info=True)
-        return f"エラーが発生しました: {str(e)}"
 
 
 # ========================================
@@ -108,7 +147,10 @@ search_customers_declaration = types.FunctionDeclaration(
             ),
             "keyword": types.Schema(
                 type=types.Type.STRING,
-                description="顧客名に含まれるキーワード（部分一致）",
+                description=(
+                    "顧客名・担当者名・案件メモに含まれるキーワード（部分一致、関連度順）。"
+                    "全角半角・大文字小文字・ひらがなカタカナの違いは区別しません。"
+                ),
             ),
         },
     ),
@@ -127,3 +169,22 @@ get_customer_details_declaration = types.FunctionDeclaration(
         required=["customer_id"],
     ),
 )
+
+get_customers_details_declaration = types.FunctionDeclaration(
+    name="get_customers_details",
+    description=(
+        "複数の顧客IDの詳細情報をまとめて取得します。"
+        "2社以上の詳細が必要な場合は、get_customer_detailsを繰り返し呼ばずにこのツールを1回だけ使用してください。"
+    ),
+    parameters=types.Schema(
+        type=types.Type.OBJECT,
+        properties={
+            "customer_ids": types.Schema(
+                type=types.Type.ARRAY,
+                items=types.Schema(type=types.Type.STRING),
+                description="顧客IDのリスト",
+            )
+        },
+        required=["customer_ids"],
+    ),
+)
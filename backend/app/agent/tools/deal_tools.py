@@ -4,10 +4,32 @@ import logging
 
 from google.genai import types
 
-from app.repositories.deal import DealRepository
+from app.core.resources import get_resources
+from app.models.schemas import Deal, DealAggregate
+from app.repositories.filters import DealSpec
 
 logger = logging.getLogger(__name__)
 
+# Columns used by search_deals (projected to cut RU and payload size)
+SEARCH_DEAL_FIELDS = [
+    "deal_id",
+    "customer_id",
+    "customer_name",
+    "sales_user_id",
+    "deal_stage",
+    "deal_amount",
+    "service_type",
+    "last_contact_date",
+]
+
+# Result cap for search_deals (default / upper bound of ``limit``)
+DEFAULT_SEARCH_DEALS = 50
+MAX_SEARCH_DEALS = 200
+
+# Result cap for find_similar_deals (default / upper bound of ``top_k``)
+DEFAULT_SIMILAR_DEALS = 5
+MAX_SIMILAR_DEALS = 20
+
 
 # ========================================
 # Tool Functions
@@ -18,55 +40,67 @@ async def search_deals(
     sales_user_id: str | None = None,
     deal_stage: str | None = None,
     customer_id: str | None = None,
+    service_type: str | None = None,
+    min_amount: float | None = None,
+    max_amount: float | None = None,
+    contact_date_from: str | None = None,
+    contact_date_to: str | None = None,
+    limit: int | None = None,
 ) -> str:
-    """Search deals by sales user, stage, or customer.
+    """Search deals combining all given conditions in a single query.
+
+    Results are ordered by last contact date (newest first) and capped at
+    ``limit`` so that calls without conditions do not load every deal.
 
     Args:
         sales_user_id: Sales user ID to filter by
         deal_stage: Deal stage to filter by (見込み、提案、商談、受注、失注)
         customer_id: Customer ID to filter by
+        service_type: Service type to filter by
+        min_amount: Minimum deal amount (inclusive)
+        max_amount: Maximum deal amount (inclusive)
+        contact_date_from: Earliest last contact date (YYYY-MM-DD, inclusive)
+        contact_date_to: Latest last contact date (YYYY-MM-DD, inclusive)
+        limit: Maximum number of deals to return
 
     Returns:
         Formatted list of deals
     """
     try:
-        repo = DealRepository()
-        deals = []
-
-        # 営業担当者で検索
-        if sales_user_id:
-            deals = await repo.get_deals_by_user(sales_user_id)
-
-        # 顧客で検索
-        elif customer_id:
-            deals = await repo.get_deals_by_customer(customer_id)
-
-        # ステージで検索
-        elif deal_stage:
-            deals = await repo.get_deals_by_stage(deal_stage)
-
-        # 条件がない場合は全件取得
-        else:
-            deals = await repo.get_all_deals()
-
-        # フィルタリング（複数条件が指定された場合）
-        if sales_user_id and deals:
-            deals = [d for d in deals if d.sales_user_id == sales_user_id]
-        if deal_stage and deals:
-            deals = [d for d in deals if d.deal_stage == deal_stage]
-        if customer_id and deals:
-            deals = [d for d in deals if d.customer_id == customer_id]
+        repo = get_resources().deal_repo
+        top = min(int(limit), MAX_SEARCH_DEALS) if limit else DEFAULT_SEARCH_DEALS
+        spec = DealSpec(
+            sales_user_id=sales_user_id,
+            customer_id=customer_id,
+            deal_stage=deal_stage,
+            service_type=service_type,
+            min_amount=min_amount,
+            max_amount=max_amount,
+            contact_date_from=contact_date_from,
+            contact_date_to=contact_date_to,
+            order_by="last_contact_date",
+            descending=True,
+            # 1件多く取得して上限超過を判定する
+            top=top + 1,
+        )
+        deals = await repo.find_deals(spec, fields=SEARCH_DEAL_FIELDS)
 
         if not deals:
             return "該当する案件が見つかりませんでした。"
 
-        result = f"{len(deals)}件の案件が見つかりました:\n\n"
+        truncated = len(deals) > top
+        deals = deals[:top]
+        result = f"{len(deals)}件の案件が見つかりました"
+        if truncated:
+            result += f"（最終接触日の新しい順に上位{top}件を表示。条件を追加すると絞り込めます）"
+        result += ":\n\n"
         for deal in deals:
             result += f"- 案件ID: {deal.deal_id}\n"
             result += f"  顧客: {deal.customer_name or 'なし'}\n"
             result += f"  ステージ: {deal.deal_stage}\n"
             result += f"  金額: {deal.deal_amount:,.0f}円\n" if deal.deal_amount else "  金額: なし\n"
-            result += f"  サービス: {deal.service_type or 'なし'}\n\n"
+            result += f"  サービス: {deal.service_type or 'なし'}\n"
+            result += f"  最終接触日: {deal.last_contact_date or 'なし'}\n\n"
 
         return result
     except Exception as e:
@@ -84,27 +118,158 @@ async def get_deal_details(deal_id: str) -> str:
         Formatted deal details
     """
     try:
-        repo = DealRepository()
+        repo = get_resources().deal_repo
         deal = await repo.get_deal_by_id(deal_id)
 
         if not deal:
             return f"案件ID {deal_id} は見つかりませんでした。"
 
-        return f"""案件詳細:
-- 案件ID: {deal.deal_id}
-- 顧客: {deal.customer_name or 'なし'}
-- 営業担当: {deal.sales_user_name or 'なし'}
-- ステージ: {deal.deal_stage}
-- 金額: {deal.deal_amount:,.0f}円""" + (
-            f"\n- サービス種別: {deal.service_type or 'なし'}"
-            f"\n- 最終接触日: {deal.last_contact_date or 'なし'}"
-            f"\n- メモ: {deal.notes or 'なし'}"
-        )
+        return "案件詳細:\n" + _format_deal_details(deal)
     except Exception as e:
         logger.error(f"Error in get_deal_details: {e}", exc_info=True)
         return f"エラーが発生しました: {str(e)}"
 
 
+async def get_deals_details(deal_ids: list[str]) -> str:
+    """Get details of several deals in one batched read.
+
+    Args:
+        deal_ids: Deal IDs
+
+    Returns:
+        Formatted deal details
+    """
+    try:
+        repo = get_resources().deal_repo
+        deals = await repo.get_deals_by_ids(deal_ids)
+
+        sections = [f"{len(deals)}件の案件詳細:"]
+        sections += [_format_deal_details(deal) for deal in deals]
+        found = {deal.deal_id for deal in deals}
+        missing = [deal_id for deal_id in dict.fromkeys(deal_ids) if deal_id not in found]
+        if missing:
+            sections.append(f"見つからなかった案件ID: {', '.join(missing)}")
+        return "\n\n".join(sections)
+    except Exception as e:
+        logger.error(f"Error in get_deals_details: {e}", exc_info=True)
+        return f"エラーが発生しました: {str(e)}"
+
+
+async def find_similar_deals(
+    deal_id: str | None = None,
+    text: str | None = None,
+    service_type: str | None = None,
+    top_k: int | None = None,
+) -> str:
+    """Find past deals whose notes resemble a deal or a description.
+
+    Only the few most similar deals are returned, so the model never has
+    to read the whole deal list to find comparable cases.
+
+    Args:
+        deal_id: Deal to find similar deals for
+        text: Description to compare with (used when deal_id is not given)
+        service_type: Optional service type to weigh in (with text)
+        top_k: Maximum number of deals
+
+    Returns:
+        Formatted list of similar deals
+    """
+    try:
+        repo = get_resources().deal_repo
+        if not repo.similarity_ready:
+            return (
+                "類似案件検索は現在利用できません。search_dealsで条件を指定して検索してください。"
+            )
+        if not deal_id and not text:
+            return "deal_idまたはtextを指定してください。"
+        top = min(int(top_k), MAX_SIMILAR_DEALS) if top_k else DEFAULT_SIMILAR_DEALS
+        similar = await repo.find_similar_deals(deal_id, text, top, service_type)
+
+        if not similar:
+            return "類似する案件が見つかりませんでした。"
+
+        result = f"類似度の高い順に{len(similar)}件の案件が見つかりました:\n\n"
+        for match in similar:
+            deal = match.deal
+            result += f"- 案件ID: {deal.deal_id}（類似度: {match.score:.2f}）\n"
+            result += f"  顧客: {deal.customer_name or 'なし'}\n"
+            result += f"  ステージ: {deal.deal_stage}\n"
+            result += (
+                f"  金額: {deal.deal_amount:,.0f}円\n" if deal.deal_amount else "  金額: なし\n"
+            )
+            result += f"  サービス: {deal.service_type or 'なし'}\n"
+            result += f"  メモ: {deal.notes or 'なし'}\n\n"
+        return result
+    except Exception as e:
+        logger.error(f"Error in find_similar_deals: {e}", exc_info=True)
+        return f"エラーが発生しました: {str(e)}"
+
+
+async def get_deal_summary() -> str:
+    """Get pipeline totals by deal stage, service type and sales user.
+
+    The totals are computed server-side (see ``DealRepository.get_deal_summary``)
+    so the model does not have to add up deal lists itself.
+
+    Returns:
+        Formatted pipeline summary
+    """
+    try:
+        resources = get_resources()
+        summary = await resources.deal_repo.get_deal_summary()
+
+        if not summary.total.count:
+            return "案件が登録されていません。"
+
+        users = await resources.user_repo.get_many(list(summary.by_sales_user_id))
+        user_names = {
+            user_id: users[user_id].get("name", user_id) if user_id in users else user_id
+            for user_id in summary.by_sales_user_id
+        }
+        sections = [
+            f"案件パイプライン集計（全{_format_aggregate(summary.total)}）",
+            _format_groups("ステージ別", summary.by_deal_stage),
+            _format_groups("サービス種別", summary.by_service_type),
+            _format_groups("営業担当別", summary.by_sales_user_id, user_names),
+        ]
+        if summary.updated_at:
+            sections.append(f"集計日時: {summary.updated_at}")
+        return "\n\n".join(sections)
+    except Exception as e:
+        logger.error(f"Error in get_deal_summary: {e}", exc_info=True)
+        return f"エラーが発生しました: {str(e)}"
+
+
+def _format_aggregate(aggregate: DealAggregate) -> str:
+    """Format a count and an amount total."""
+    return f"{aggregate.count:,}件、合計{aggregate.total_amount:,.0f}円"
+
+
+def _format_groups(
+    title: str, groups: dict[str, DealAggregate], labels: dict[str, str] | None = None
+) -> str:
+    """Format the groups of one summary dimension, largest amount first."""
+    lines = [f"{title}:"]
+    for key, aggregate in sorted(groups.items(), key=lambda group: -group[1].total_amount):
+        label = labels.get(key, key) if labels else key
+        lines.append(f"- {label}: {_format_aggregate(aggregate)}")
+    return "\n".join(lines)
+
+
+def _format_deal_details(deal: Deal) -> str:
+    """Format one deal for get_deal_details / get_deals_details."""
+    amount = f"{deal.deal_amount:,.0f}円" if deal.deal_amount else "なし"
+    return f"""- 案件ID: {deal.deal_id}
+- 顧客: {deal.customer_name or "なし"}
+- 営業担当: {deal.sales_user_name or "なし"}
+- ステージ: {deal.deal_stage}
+- 金額: {amount}
+- サービス種別: {deal.service_type or "なし"}
+- 最終接触日: {deal.last_contact_date or "なし"}
+- メモ: {deal.notes or "なし"}"""
+
+
 # ========================================
 # Gemini Tool Declarations
 # ========================================
@@ -113,7 +278,8 @@ async def get_deal_details(deal_id: str) -> str:
 search_deals_declaration = types.FunctionDeclaration(
     name="search_deals",
     description=(
-        "営業担当者、案件ステージ、顧客IDで案件を検索します。"
+        "営業担当者、案件ステージ、顧客ID、サービス種別、金額範囲、最終接触日の範囲で案件を検索します。"
+        "指定した条件はすべてAND条件で組み合わされ、最終接触日の新しい順に返されます。"
         "このツールは案件ID、顧客名、ステージ、金額、サービスなど全ての情報を返すので、"
         "通常はget_deal_detailsを追加で呼ぶ必要はありません。"
     ),
@@ -129,8 +295,26 @@ search_deals_declaration = types.FunctionDeclaration(
                 description="案件ステージ（見込み、提案、商談、受注、失注）",
                 enum=["見込み", "提案", "商談", "受注", "失注"],
             ),
-            "customer_id": types.Schema(
-                type=types.Type.STRING, description="顧客ID"
+            "customer_id": types.Schema(type=types.Type.STRING, description="顧客ID"),
+            "service_type": types.Schema(
+                type=types.Type.STRING,
+                description="サービス種別（通信インフラ構築、技術人材派遣、危機管理対策）",
+            ),
+            "min_amount": types.Schema(
+                type=types.Type.NUMBER, description="案件金額の下限（円、以上）"
+            ),
+            "max_amount": types.Schema(
+                type=types.Type.NUMBER, description="案件金額の上限（円、以下）"
+            ),
+            "contact_date_from": types.Schema(
+                type=types.Type.STRING, description="最終接触日の開始日（YYYY-MM-DD、以降）"
+            ),
+            "contact_date_to": types.Schema(
+                type=types.Type.STRING, description="最終接触日の終了日（YYYY-MM-DD、以前）"
+            ),
+            "limit": types.Schema(
+                type=types.Type.INTEGER,
+                description=f"返す案件の最大件数（既定{DEFAULT_SEARCH_DEALS}件、最大{MAX_SEARCH_DEALS}件）",
             ),
         },
     ),
@@ -153,3 +337,62 @@ get_deal_details_declaration = types.FunctionDeclaration(
         required=["deal_id"],
     ),
 )
+
+get_deals_details_declaration = types.FunctionDeclaration(
+    name="get_deals_details",
+    description=(
+        "複数の案件IDの詳細情報（メモや最終接触日を含む）をまとめて取得します。"
+        "2件以上の詳細が必要な場合は、get_deal_detailsを繰り返し呼ばずにこのツールを1回だけ使用してください。"
+    ),
+    parameters=types.Schema(
+        type=types.Type.OBJECT,
+        properties={
+            "deal_ids": types.Schema(
+                type=types.Type.ARRAY,
+                items=types.Schema(type=types.Type.STRING),
+                description="案件IDのリスト",
+            )
+        },
+        required=["deal_ids"],
+    ),
+)
+
+find_similar_deals_declaration = types.FunctionDeclaration(
+    name="find_similar_deals",
+    description=(
+        "案件メモ（提案内容）とサービス種別が似ている過去の案件を類似度の高い順に返します。"
+        "「この案件に似た過去の案件は?」「同じような提案をした案件は?」のような質問では、"
+        "search_dealsで案件を大量に取得せずにこのツールを使用してください。"
+        "deal_idを指定するとその案件に似た案件を、textを指定するとその内容に似た案件を検索します。"
+    ),
+    parameters=types.Schema(
+        type=types.Type.OBJECT,
+        properties={
+            "deal_id": types.Schema(
+                type=types.Type.STRING, description="類似案件を探す基準の案件ID"
+            ),
+            "text": types.Schema(
+                type=types.Type.STRING,
+                description="案件の内容や提案の説明（deal_idを指定しない場合に使用）",
+            ),
+            "service_type": types.Schema(
+                type=types.Type.STRING,
+                description="サービス種別（通信インフラ構築、技術人材派遣、危機管理対策）。textと併用",
+            ),
+            "top_k": types.Schema(
+                type=types.Type.INTEGER,
+                description=f"返す案件の最大件数（既定{DEFAULT_SIMILAR_DEALS}件、最大{MAX_SIMILAR_DEALS}件）",
+            ),
+        },
+    ),
+)
+
+get_deal_summary_declaration = types.FunctionDeclaration(
+    name="get_deal_summary",
+    description=(
+        "案件パイプライン全体の件数と金額合計を、ステージ別・サービス種別・営業担当別に集計して返します。"
+        "「商談中の案件数は?」「受注金額の合計は?」「担当者ごとのパイプラインは?」のような"
+        "件数・金額の集計にはsearch_dealsで案件を列挙して数えずに、このツールを使用してください。"
+    ),
+    # 引数なし（空のOBJECTスキーマはGeminiに拒否されるためparametersを指定しない）
+)
@@ -4,7 +4,7 @@ import logging
 
 from google.genai import types
 
-from app.repositories.user import UserRepository
+from app.core.resources import get_resources
 
 logger = logging.getLogger(__name__)
 
@@ -24,7 +24,7 @@ async def get_user_info(user_id: str) -> str:
         Formatted user information string
     """
     try:
-        repo = UserRepository()
+        repo = get_resources().user_repo
         user = await repo.get_user_by_id(user_id)
 
         if not user:
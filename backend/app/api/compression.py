@@ -0,0 +1,146 @@
+"""Negotiated gzip / brotli compression of non-streaming responses.
+
+Conversation payloads with long Markdown reports and deal lists are large
+and compress well (Japanese text typically 4-8x). The middleware buffers a
+complete response body, picks the best encoding the client accepts
+(``br`` when the optional ``brotli`` package is installed, else ``gzip``)
+and leaves streaming responses (SSE, NDJSON) untouched so events are not
+held back by a compressor.
+"""
+
+import asyncio
+import gzip
+import logging
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+try:
+    import brotli
+except ImportError:  # optional: gzip only
+    brotli = None
+
+logger = logging.getLogger(__name__)
+
+# Bodies above this size are compressed in a worker thread to keep the event loop free
+THREAD_MIN_BYTES = 256 * 1024
+
+
+def supported_encodings() -> tuple[str, ...]:
+    """Content codings this process can produce, in order of preference."""
+    return ("br", "gzip") if brotli is not None else ("gzip",)
+
+
+def choose_encoding(accept_encoding: str) -> str | None:
+    """Pick the content coding for an ``Accept-Encoding`` header.
+
+    Args:
+        accept_encoding: Raw header value (e.g. "gzip, deflate, br;q=0.9")
+
+    Returns:
+        "br", "gzip" or None for identity
+    """
+    weights: dict[str, float] = {}
+    for part in accept_encoding.split(","):
+        coding, _, params = part.strip().partition(";")
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        weights[coding.strip().lower()] = quality
+    best, best_quality = None, 0.0
+    for coding in supported_encodings():
+        quality = weights.get(coding, weights.get("*", 0.0))
+        if quality > best_quality:
+            best, best_quality = coding, quality
+    return best
+
+
+class CompressionMiddleware:
+    """ASGI middleware compressing complete response bodies."""
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimum_size: int = 1024,
+        gzip_level: int = 6,
+        brotli_quality: int = 5,
+    ):
+        """Initialize middleware.
+
+        Args:
+            app: ASGI application
+            minimum_size: Smaller bodies are sent uncompressed
+            gzip_level: gzip compression level (1-9)
+            brotli_quality: brotli quality (0-11; 4-5 suits dynamic content)
+        """
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        encoding = choose_encoding(Headers(scope=scope).get("accept-encoding", ""))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start: Message | None = None
+        passthrough = False
+
+        async def send_compressed(message: Message) -> None:
+            nonlocal start, passthrough
+            if passthrough:
+                await send(message)
+                return
+            if message["type"] == "http.response.start":
+                start = message
+                headers = Headers(raw=message["headers"])
+                # Streaming responses have no Content-Length; never delay their headers
+                if (
+                    "content-length" not in headers
+                    or "content-encoding" in headers
+                    or message["status"] in (204, 206, 304)
+                ):
+                    passthrough = True
+                    await send(message)
+                return
+            if message["type"] != "http.response.body" or start is None:
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            if message.get("more_body", False):
+                # Body sent in chunks despite a Content-Length: leave it alone
+                passthrough = True
+                await send(start)
+                await send(message)
+                return
+            headers = MutableHeaders(raw=start["headers"])
+            headers.add_vary_header("Accept-Encoding")
+            if len(body) >= self.minimum_size:
+                compressed = await self._compress(body, encoding)
+                if len(compressed) < len(body):
+                    headers["Content-Encoding"] = encoding
+                    headers["Content-Length"] = str(len(compressed))
+                    body = compressed
+            await send(start)
+            await send({"type": "http.response.body", "body": body})
+
+        await self.app(scope, receive, send_compressed)
+
+    async def _compress(self, body: bytes, encoding: str) -> bytes:
+        if len(body) >= THREAD_MIN_BYTES:
+            return await asyncio.to_thread(self._compress_sync, body, encoding)
+        return self._compress_sync(body, encoding)
+
+    def _compress_sync(self, body: bytes, encoding: str) -> bytes:
+        if encoding == "br":
+            return brotli.compress(body, quality=self.brotli_quality)
+        return gzip.compress(body, compresslevel=self.gzip_level, mtime=0)
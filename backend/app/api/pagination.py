@@ -0,0 +1,65 @@
+"""Cursor helpers for paginated list endpoints.
+
+Cosmos DB continuation tokens are JSON strings, so they are wrapped in
+URL-safe base64 before being handed to clients as opaque cursors.
+"""
+
+import base64
+import binascii
+
+from fastapi import HTTPException, Response
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+# Conversation messages per window (one screen of chat history)
+MESSAGE_PAGE_SIZE = 50
+
+
+def encode_cursor(continuation_token: str | None) -> str | None:
+    """Encode a continuation token as an opaque cursor.
+
+    Args:
+        continuation_token: Cosmos DB continuation token
+
+    Returns:
+        URL-safe cursor string or None
+    """
+    if continuation_token is None:
+        return None
+    return base64.urlsafe_b64encode(continuation_token.encode("utf-8")).decode("ascii")
+
+
+def decode_cursor(cursor: str | None) -> str | None:
+    """Decode a cursor back into a continuation token.
+
+    Args:
+        cursor: Cursor received from the client
+
+    Returns:
+        Continuation token or None
+
+    Raises:
+        HTTPException: If the cursor is malformed
+    """
+    if not cursor:
+        return None
+    try:
+        token = base64.b64decode(cursor.encode("ascii"), altchars=b"-_", validate=True)
+        if not token:
+            raise ValueError("empty cursor")
+        return token.decode("utf-8")
+    except (binascii.Error, UnicodeError, ValueError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def set_next_cursor(response: Response, continuation_token: str | None) -> None:
+    """Expose the next cursor to the client via the response header.
+
+    Args:
+        response: Response whose headers are updated
+        continuation_token: Continuation token for the next page (None when exhausted)
+    """
+    next_cursor = encode_cursor(continuation_token)
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
@@ -0,0 +1,31 @@
+"""Helpers for the ``fields=`` projection parameter of list endpoints."""
+
+from fastapi import HTTPException
+from pydantic import BaseModel
+
+from app.core.exceptions import ValidationException
+from app.repositories.projection import validate_fields
+
+
+def parse_fields(fields: str | None, model: type[BaseModel]) -> list[str] | None:
+    """Parse a comma-separated ``fields`` query parameter.
+
+    Args:
+        fields: Raw query parameter (e.g. "deal_id,customer_name")
+        model: Model the fields must belong to
+
+    Returns:
+        List of field names, or None when no projection was requested
+
+    Raises:
+        HTTPException: If a field is unknown
+    """
+    if not fields:
+        return None
+    names = [name.strip() for name in fields.split(",") if name.strip()]
+    if not names:
+        return None
+    try:
+        return validate_fields(model, names)
+    except ValidationException as e:
+        raise HTTPException(status_code=e.status_code, detail=e.message)
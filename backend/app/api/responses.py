@@ -0,0 +1,223 @@
+"""Pre-serialized JSON responses for models read from the database.
+
+When a route returns models, FastAPI dumps them to dicts, validates the
+dicts against ``response_model`` and serializes the result - a second full
+validation of data the repository already trusts. Returning a ``Response``
+built here skips that step; ``response_model`` is still declared on the
+route so the OpenAPI schema is unchanged.
+
+``conditional_response`` adds HTTP validators: entities carry their Cosmos
+``_etag`` and lists a hash of the body, so polling clients that send
+``If-None-Match`` get an empty 304. Both are sent as weak ETags with
+``Vary: Accept``: the same tag covers the JSON and MessagePack bodies and
+their gzip / brotli encodings, which are equivalent but not byte-identical. It also
+serves MessagePack to clients sending ``Accept: application/msgpack``
+(service-to-service consumers) when the optional ``msgpack`` package is
+installed.
+
+``FastJSONResponse`` is the app's default response class for everything
+else (plain dicts such as the metrics endpoints), using ``orjson`` when
+installed.
+"""
+
+import hashlib
+from collections.abc import Sequence
+from typing import Any
+
+from fastapi import Request, Response
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+try:
+    import orjson
+except ImportError:  # optional: falls back to the standard json module
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:  # optional: JSON only
+    msgpack = None
+
+from app.api.pagination import set_next_cursor
+from app.repositories.hydration import list_adapter
+
+# Browsers revalidate (If-None-Match) on every use instead of guessing freshness
+CACHE_CONTROL = "no-cache"
+
+JSON_MEDIA_TYPE = "application/json"
+MSGPACK_MEDIA_TYPE = "application/msgpack"
+
+
+class FastJSONResponse(JSONResponse):
+    """JSON response rendered with ``orjson`` (same output as ``JSONResponse``)."""
+
+    def render(self, content: Any) -> bytes:
+        if orjson is None:
+            return super().render(content)
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
+
+
+def negotiate_media_type(request: Request) -> str:
+    """Pick JSON or MessagePack from the ``Accept`` header.
+
+    Args:
+        request: Incoming request
+
+    Returns:
+        ``MSGPACK_MEDIA_TYPE`` if asked for and available, else ``JSON_MEDIA_TYPE``
+    """
+    accept = request.headers.get("accept", "")
+    if msgpack is not None and (
+        "application/msgpack" in accept or "application/x-msgpack" in accept
+    ):
+        return MSGPACK_MEDIA_TYPE
+    return JSON_MEDIA_TYPE
+
+
+def dump_models(content: BaseModel | Sequence[BaseModel]) -> bytes:
+    """Serialize a model or a list of models (of one class) to JSON bytes.
+
+    Args:
+        content: Model or list of models
+
+    Returns:
+        JSON document
+    """
+    if isinstance(content, BaseModel):
+        return content.__pydantic_serializer__.to_json(content)
+    if not content:
+        return b"[]"
+    return list_adapter(type(content[0])).dump_json(list(content))
+
+
+def encode_models(content: BaseModel | Sequence[BaseModel], media_type: str) -> bytes:
+    """Serialize a model or a list of models as JSON or MessagePack.
+
+    Args:
+        content: Model or list of models
+        media_type: ``JSON_MEDIA_TYPE`` or ``MSGPACK_MEDIA_TYPE``
+
+    Returns:
+        Encoded body
+    """
+    if media_type != MSGPACK_MEDIA_TYPE:
+        return dump_models(content)
+    if isinstance(content, BaseModel):
+        data = content.model_dump(mode="json")
+    else:
+        data = (
+            list_adapter(type(content[0])).dump_python(list(content), mode="json")
+            if content
+            else []
+        )
+    return msgpack.packb(data)
+
+
+def model_response(
+    content: BaseModel | Sequence[BaseModel],
+    next_token: str | None = None,
+    status_code: int = 200,
+) -> Response:
+    """Build a JSON response from models without ``response_model`` re-validation.
+
+    Args:
+        content: Model or list of models
+        next_token: Continuation token for the next page, if paginated
+        status_code: HTTP status code
+
+    Returns:
+        JSON response
+    """
+    response = Response(
+        content=dump_models(content), status_code=status_code, media_type=JSON_MEDIA_TYPE
+    )
+    set_next_cursor(response, next_token)
+    return response
+
+
+def weak_etag(etag: str) -> str:
+    """Mark an ETag as weak (``W/"..."``)."""
+    return etag if etag.startswith("W/") else f"W/{etag}"
+
+
+def etag_value(header: str) -> str:
+    """Get the opaque tag of an ``If-Match`` header value (``W/`` prefix removed).
+
+    Our ETags are sent as weak, so clients echo them back with the prefix;
+    the tag itself is the Cosmos ``_etag`` used for the conditional write.
+    """
+    return header.strip().removeprefix("W/")
+
+
+def body_etag(body: bytes) -> str:
+    """Weak ETag derived from a serialized body."""
+    return f'W/"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+
+
+def etag_matches(header: str | None, etag: str) -> bool:
+    """Check an ``If-None-Match`` / ``If-Match`` header against an ETag.
+
+    Uses weak comparison (``W/`` prefixes are ignored), which is what
+    ``If-None-Match`` requires and is safe for our Cosmos ETags.
+
+    Args:
+        header: Raw header value (comma-separated tags or ``*``)
+        etag: Current ETag of the resource
+
+    Returns:
+        True if any tag in the header matches
+    """
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    current = etag.removeprefix("W/")
+    return any(tag.strip().removeprefix("W/") == current for tag in header.split(","))
+
+
+def not_modified(etag: str) -> Response:
+    """Build an empty 304 response for ``etag``."""
+    return Response(status_code=304, headers=validator_headers(etag))
+
+
+def validator_headers(etag: str) -> dict[str, str]:
+    """Headers sent with a (weak) ETag on 200 and 304 responses."""
+    return {"ETag": weak_etag(etag), "Cache-Control": CACHE_CONTROL, "Vary": "Accept"}
+
+
+def conditional_response(
+    request: Request,
+    content: BaseModel | Sequence[BaseModel],
+    etag: str | None = None,
+    next_token: str | None = None,
+) -> Response:
+    """Build a JSON (or MessagePack) response with an ``ETag``, or 304 if the client has it.
+
+    With a known ``etag`` (an entity's ``_etag``) a matching
+    ``If-None-Match`` is answered before anything is serialized. Otherwise
+    the ETag is hashed from the JSON body (also for MessagePack, so both
+    representations share it), which still saves the transfer. The ETag is
+    always sent as weak.
+
+    Args:
+        request: Incoming request (``If-None-Match`` header)
+        content: Model or list of models
+        etag: ETag of the content, or None to derive it from the body
+        next_token: Continuation token for the next page, if paginated
+
+    Returns:
+        JSON response or 304 Not Modified
+    """
+    if_none_match = request.headers.get("if-none-match")
+    if etag is not None and etag_matches(if_none_match, etag):
+        return not_modified(etag)
+    media_type = negotiate_media_type(request)
+    json_body = dump_models(content) if etag is None or media_type == JSON_MEDIA_TYPE else None
+    if etag is None:
+        etag = body_etag(json_body)
+        if etag_matches(if_none_match, etag):
+            return not_modified(etag)
+    body = json_body if media_type == JSON_MEDIA_TYPE else encode_models(content, media_type)
+    response = Response(content=body, media_type=media_type, headers=validator_headers(etag))
+    set_next_cursor(response, next_token)
+    return response
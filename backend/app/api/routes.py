@@ -3,37 +3,57 @@
 import logging
 import uuid
 from datetime import datetime
+from typing import Literal
 
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request
 from fastapi.responses import StreamingResponse
 
-from app.core.dependencies import get_customer_repository, get_deal_repository, get_user_repository
-from app.core.exceptions import NotFoundException
-from app.models.schemas import ChatRequest, ChatResponse, Customer, Deal, User
-from app.models.conversation import Message, Conversation
+from app.api.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, MESSAGE_PAGE_SIZE, decode_cursor
+from app.api.projection import parse_fields
+from app.api.responses import (
+    conditional_response,
+    etag_matches,
+    etag_value,
+    model_response,
+    not_modified,
+)
+from app.api.streaming import ndjson_response, sse_event, wants_ndjson
+from app.core.dependencies import (
+    get_conversation_repository,
+    get_conversation_writer,
+    get_customer_repository,
+    get_deal_repository,
+    get_user_repository,
+)
+from app.core.exceptions import NotFoundException, PreconditionFailedException
+from app.core.resources import AppResources, get_resources
+from app.models.schemas import (
+    ChatRequest,
+    ChatResponse,
+    Customer,
+    Deal,
+    DealSummary,
+    SimilarDeal,
+    User,
+)
+from app.models.conversation import Message, Conversation, ConversationSummary
 from app.repositories.customer import CustomerRepository
 from app.repositories.deal import DealRepository
+from app.repositories.filters import CustomerSpec, DealSpec, UserSpec
 from app.repositories.user import UserRepository
-from app.repositories.conversation import ConversationRepository
+from app.repositories.conversation import ConversationNotFoundError, ConversationRepository
+from app.repositories.conversation_writer import ConversationWriter
 from app.services.copilot_service import CopilotService, get_copilot_service
 from app.schemas.agent import AgentQueryRequest, ProgressEvent, ProgressEventType, ConversationResponse
-from app.agent.orchestrator import AgentOrchestrator
+from app.agent.orchestrator import MAX_HISTORY_MESSAGES, AgentOrchestrator
 # from app.agent.mock_orchestrator import MockAgentOrchestrator  # モック版（テスト用に残す）
 
 logger = logging.getLogger(__name__)
 
-
-# ============================================================
-# Dependency Injection
-# ============================================================
-
-
-def get_conversation_repository() -> ConversationRepository:
-    """Get conversation repository instance."""
-    return ConversationRepository()
-
 router = APIRouter(prefix="/api/v1", tags=["data"])
 
+DealSortField = Literal[DealSpec.sortable_fields]
+
 
 # ============================================================
 # User Endpoints
@@ -42,30 +62,47 @@ router = APIRouter(prefix="/api/v1", tags=["data"])
 
 @router.get("/users", response_model=list[User])
 async def get_users(
+    request: Request,
     department: str | None = Query(None, description="Filter by department"),
     role: str | None = Query(None, description="Filter by role"),
+    limit: int | None = Query(None, ge=1, le=MAX_PAGE_SIZE, description="Page size"),
+    cursor: str | None = Query(None, description="Cursor returned in X-Next-Cursor"),
+    fields: str | None = Query(None, description="Comma-separated fields to return"),
     repo: UserRepository = Depends(get_user_repository),
 ):
-    """Get all users or filter by department/role.
+    """Get all users or filter by department/role (filters are combined).
+
+    When ``limit`` or ``cursor`` is given, a single page is returned and the
+    cursor for the next page is sent in the ``X-Next-Cursor`` header.
 
     Args:
+        request: Incoming request (``If-None-Match``)
         department: Optional department filter
         role: Optional role filter
+        limit: Optional page size
+        cursor: Optional cursor of the page to fetch
+        fields: Optional comma-separated fields to return (partial objects)
         repo: UserRepository dependency
 
     Returns:
         List of users
     """
+    field_list = parse_fields(fields, User)
+    continuation_token = decode_cursor(cursor)
     try:
-        if department:
-            logger.info(f"Fetching users by department: {department}")
-            return await repo.get_users_by_department(department)
-        elif role:
-            logger.info(f"Fetching users by role: {role}")
-            return await repo.get_users_by_role(role)
-        else:
-            logger.info("Fetching all users")
-            return await repo.get_all_users()
+        if limit or continuation_token:
+            logger.info(f"Fetching users page (limit={limit or DEFAULT_PAGE_SIZE})")
+            users, next_token = await repo.get_users_page(
+                department=department,
+                role=role,
+                page_size=limit or DEFAULT_PAGE_SIZE,
+                continuation_token=continuation_token,
+                fields=field_list,
+            )
+            return conditional_response(request, users, next_token=next_token)
+        logger.info(f"Fetching users (department={department}, role={role})")
+        users = await repo.find_users(UserSpec(department=department, role=role), fields=field_list)
+        return conditional_response(request, users)
     except Exception as e:
         logger.error(f"Error fetching users: {e}", exc_info=True)
         raise HTTPException(status_code=500, detail=f"Error fetching users: {str(e)}")
@@ -73,12 +110,14 @@ async def get_users(
 
 @router.get("/users/{user_id}", response_model=User)
 async def get_user(
+    request: Request,
     user_id: str,
     repo: UserRepository = Depends(get_user_repository),
 ):
-    """Get user by ID.
+    """Get user by ID (``If-None-Match`` is answered with 304).
 
     Args:
+        request: Incoming request (``If-None-Match``)
         user_id: User ID
         repo: UserRepository dependency
 
@@ -87,10 +126,11 @@ async def get_user(
     """
     try:
         logger.info(f"Fetching user: {user_id}")
-        user = await repo.get_user_by_id(user_id)
-        if not user:
+        versioned = await repo.get_versioned(user_id)
+        if not versioned:
             raise NotFoundException(f"User {user_id} not found")
-        return user
+        user, etag = versioned
+        return conditional_response(request, user, etag)
     except NotFoundException:
         raise HTTPException(status_code=404, detail=f"User {user_id} not found")
     except Exception as e:
@@ -105,30 +145,65 @@ async def get_user(
 
 @router.get("/customers", response_model=list[Customer])
 async def get_customers(
+    request: Request,
     industry: str | None = Query(None, description="Filter by industry"),
-    search: str | None = Query(None, description="Search by name"),
+    search: str | None = Query(
+        None,
+        description="Search by name (ranked; also contact and deal notes with the search index)",
+    ),
+    limit: int | None = Query(None, ge=1, le=MAX_PAGE_SIZE, description="Page size"),
+    cursor: str | None = Query(None, description="Cursor returned in X-Next-Cursor"),
+    fields: str | None = Query(None, description="Comma-separated fields to return"),
     repo: CustomerRepository = Depends(get_customer_repository),
 ):
-    """Get all customers or filter by industry/search.
+    """Get all customers or filter by industry/search (filters are combined).
+
+    When ``limit`` or ``cursor`` is given, a single page is returned and the
+    cursor for the next page is sent in the ``X-Next-Cursor`` header. With
+    ``Accept: application/x-ndjson`` all matching customers are streamed as
+    NDJSON while Cosmos pages arrive.
 
     Args:
+        request: Incoming request (used for content negotiation)
         industry: Optional industry filter
         search: Optional search keyword
+        limit: Optional page size
+        cursor: Optional cursor of the page to fetch
+        fields: Optional comma-separated fields to return (partial objects)
         repo: CustomerRepository dependency
 
     Returns:
         List of customers
     """
+    field_list = parse_fields(fields, Customer)
+    if wants_ndjson(request):
+        logger.info("Streaming customers as NDJSON")
+        return ndjson_response(
+            repo.iter_customer_pages(
+                industry=industry,
+                keyword=search,
+                page_size=limit or DEFAULT_PAGE_SIZE,
+                fields=field_list,
+            )
+        )
+    continuation_token = decode_cursor(cursor)
     try:
-        if industry:
-            logger.info(f"Fetching customers by industry: {industry}")
-            return await repo.get_customers_by_industry(industry)
-        elif search:
-            logger.info(f"Searching customers: {search}")
-            return await repo.search_customers(search)
-        else:
-            logger.info("Fetching all customers")
-            return await repo.get_all_customers()
+        if limit or continuation_token:
+            logger.info(f"Fetching customers page (limit={limit or DEFAULT_PAGE_SIZE})")
+            customers, next_token = await repo.get_customers_page(
+                industry=industry,
+                keyword=search,
+                page_size=limit or DEFAULT_PAGE_SIZE,
+                continuation_token=continuation_token,
+                fields=field_list,
+            )
+            return conditional_response(request, customers, next_token=next_token)
+        logger.info(f"Fetching customers (industry={industry}, search={search})")
+        customers = await repo.find_customers(
+            CustomerSpec(industries=[industry] if industry else None, keyword=search),
+            fields=field_list,
+        )
+        return conditional_response(request, customers)
     except Exception as e:
         logger.error(f"Error fetching customers: {e}", exc_info=True)
         raise HTTPException(status_code=500, detail=f"Error fetching customers: {str(e)}")
@@ -136,12 +211,14 @@ async def get_customers(
 
 @router.get("/customers/{customer_id}", response_model=Customer)
 async def get_customer(
+    request: Request,
     customer_id: str,
     repo: CustomerRepository = Depends(get_customer_repository),
 ):
-    """Get customer by ID.
+    """Get customer by ID (``If-None-Match`` is answered with 304).
 
     Args:
+        request: Incoming request (``If-None-Match``)
         customer_id: Customer ID
         repo: CustomerRepository dependency
 
@@ -150,10 +227,11 @@ async def get_customer(
     """
     try:
         logger.info(f"Fetching customer: {customer_id}")
-        customer = await repo.get_customer_by_id(customer_id)
-        if not customer:
+        versioned = await repo.get_versioned(customer_id)
+        if not versioned:
             raise NotFoundException(f"Customer {customer_id} not found")
-        return customer
+        customer, etag = versioned
+        return conditional_response(request, customer, etag)
     except NotFoundException:
         raise HTTPException(status_code=404, detail=f"Customer {customer_id} not found")
     except Exception as e:
@@ -168,53 +246,165 @@ async def get_customer(
 
 @router.get("/deals", response_model=list[Deal])
 async def get_deals(
+    request: Request,
     sales_user_id: str | None = Query(None, description="Filter by sales user ID"),
     customer_id: str | None = Query(None, description="Filter by customer ID"),
     deal_stage: str | None = Query(None, description="Filter by deal stage"),
     service_type: str | None = Query(None, description="Filter by service type"),
+    min_amount: float | None = Query(None, ge=0, description="Minimum deal amount"),
+    max_amount: float | None = Query(None, ge=0, description="Maximum deal amount"),
+    contact_date_from: str | None = Query(None, description="Last contact date from (YYYY-MM-DD)"),
+    contact_date_to: str | None = Query(None, description="Last contact date to (YYYY-MM-DD)"),
+    order_by: DealSortField | None = Query(None, description="Field to sort by"),
+    order: Literal["asc", "desc"] = Query("asc", description="Sort direction"),
+    top: int | None = Query(None, ge=1, description="Maximum number of deals"),
+    limit: int | None = Query(None, ge=1, le=MAX_PAGE_SIZE, description="Page size"),
+    cursor: str | None = Query(None, description="Cursor returned in X-Next-Cursor"),
+    fields: str | None = Query(None, description="Comma-separated fields to return"),
     repo: DealRepository = Depends(get_deal_repository),
 ):
     """Get all deals or filter by various criteria.
 
+    All filters are combined into a single Cosmos DB query, with optional
+    server-side ordering and ``top`` cap. When ``limit`` or ``cursor`` is
+    given, a single page is returned and the cursor for the next page is sent
+    in the ``X-Next-Cursor`` header. With ``Accept: application/x-ndjson``
+    all matching deals are streamed as NDJSON while Cosmos pages arrive.
+
     Args:
+        request: Incoming request (used for content negotiation)
         sales_user_id: Optional sales user ID filter
         customer_id: Optional customer ID filter
         deal_stage: Optional deal stage filter (見込み、提案、商談、受注、失注)
         service_type: Optional service type filter (通信インフラ構築、技術人材派遣、危機管理対策)
+        min_amount: Optional minimum deal amount (inclusive)
+        max_amount: Optional maximum deal amount (inclusive)
+        contact_date_from: Optional earliest last contact date (inclusive)
+        contact_date_to: Optional latest last contact date (inclusive)
+        order_by: Optional field to sort by
+        order: Sort direction
+        top: Optional maximum number of deals
+        limit: Optional page size
+        cursor: Optional cursor of the page to fetch
+        fields: Optional comma-separated fields to return (partial objects)
         repo: DealRepository dependency
 
     Returns:
         List of deals
     """
+    field_list = parse_fields(fields, Deal)
+    spec = DealSpec(
+        sales_user_id=sales_user_id,
+        customer_id=customer_id,
+        deal_stage=deal_stage,
+        service_type=service_type,
+        min_amount=min_amount,
+        max_amount=max_amount,
+        contact_date_from=contact_date_from,
+        contact_date_to=contact_date_to,
+        order_by=order_by,
+        descending=order == "desc",
+        top=top,
+    )
+    if wants_ndjson(request):
+        logger.info("Streaming deals as NDJSON")
+        return ndjson_response(
+            repo.iter_deal_pages(spec, page_size=limit or DEFAULT_PAGE_SIZE, fields=field_list)
+        )
+    continuation_token = decode_cursor(cursor)
     try:
-        if sales_user_id:
-            logger.info(f"Fetching deals by sales user: {sales_user_id}")
-            return await repo.get_deals_by_user(sales_user_id)
-        elif customer_id:
-            logger.info(f"Fetching deals by customer: {customer_id}")
-            return await repo.get_deals_by_customer(customer_id)
-        elif deal_stage:
-            logger.info(f"Fetching deals by stage: {deal_stage}")
-            return await repo.get_deals_by_stage(deal_stage)
-        elif service_type:
-            logger.info(f"Fetching deals by service type: {service_type}")
-            return await repo.get_deals_by_service_type(service_type)
-        else:
-            logger.info("Fetching all deals")
-            return await repo.get_all_deals()
+        if limit or continuation_token:
+            logger.info(f"Fetching deals page (limit={limit or DEFAULT_PAGE_SIZE})")
+            deals, next_token = await repo.get_deals_page(
+                spec,
+                page_size=limit or DEFAULT_PAGE_SIZE,
+                continuation_token=continuation_token,
+                fields=field_list,
+            )
+            return conditional_response(request, deals, next_token=next_token)
+        logger.info(f"Fetching deals: {spec.model_dump(exclude_defaults=True)}")
+        deals = await repo.find_deals(spec, fields=field_list)
+        return conditional_response(request, deals)
     except Exception as e:
         logger.error(f"Error fetching deals: {e}", exc_info=True)
         raise HTTPException(status_code=500, detail=f"Error fetching deals: {str(e)}")
 
 
+@router.get("/deals/summary", response_model=DealSummary)
+async def get_deal_summary(
+    request: Request,
+    repo: DealRepository = Depends(get_deal_repository),
+):
+    """Get deal counts and amount totals by stage, service type and sales user.
+
+    Served from the incrementally maintained summary document (one point
+    read) when ``DEAL_SUMMARY_ENABLED`` is set (the default).
+    ``If-None-Match`` is answered with 304.
+
+    Args:
+        request: Incoming request (``If-None-Match``)
+        repo: DealRepository dependency
+
+    Returns:
+        Pipeline summary
+    """
+    try:
+        logger.info("Fetching deal summary")
+        summary = await repo.get_deal_summary()
+        return conditional_response(request, summary)
+    except Exception as e:
+        logger.error(f"Error fetching deal summary: {e}", exc_info=True)
+        raise HTTPException(status_code=500, detail=f"Error fetching deal summary: {str(e)}")
+
+
+@router.get("/deals/similar", response_model=list[SimilarDeal])
+async def get_similar_deals(
+    request: Request,
+    deal_id: str | None = Query(None, description="Deal to find similar deals for"),
+    q: str | None = Query(None, description="Free text to compare with deal notes"),
+    service_type: str | None = Query(None, description="Service type to weigh in (with q)"),
+    top_k: int = Query(5, ge=1, le=50, description="Maximum number of deals"),
+    repo: DealRepository = Depends(get_deal_repository),
+):
+    """Get the deals whose notes are most similar to a deal or a text.
+
+    Served from the in-process vector index (``VECTOR_INDEX_ENABLED``),
+    ranked by TF-IDF cosine similarity of character n-grams.
+
+    Args:
+        request: Incoming request (``If-None-Match``)
+        deal_id: Deal to find similar deals for (excluded from the results)
+        q: Free text, used when ``deal_id`` is not given
+        service_type: Optional service type to weigh in for ``q``
+        top_k: Maximum number of deals
+        repo: DealRepository dependency
+
+    Returns:
+        Similar deals with their similarity score, most similar first
+    """
+    if not deal_id and not q:
+        raise HTTPException(status_code=400, detail="deal_id or q is required")
+    if not repo.similarity_ready:
+        raise HTTPException(status_code=503, detail="Similar deal search is not available")
+    try:
+        logger.info(f"Finding similar deals (deal_id={deal_id}, top_k={top_k})")
+        similar = await repo.find_similar_deals(deal_id, q, top_k, service_type)
+        return conditional_response(request, similar)
+    except Exception as e:
+        logger.error(f"Error finding similar deals: {e}", exc_info=True)
+        raise HTTPException(status_code=500, detail=f"Error finding similar deals: {str(e)}")
+
+
 @router.get("/deals/{deal_id}", response_model=Deal)
 async def get_deal(
+    request: Request,
     deal_id: str,
     repo: DealRepository = Depends(get_deal_repository),
 ):
-    """Get deal by ID.
+    """Get deal by ID (``If-None-Match`` is answered with 304).
 
     Args:
+        request: Incoming request (``If-None-Match``)
         deal_id: Deal ID
         repo: DealRepository dependency
 
@@ -223,10 +413,11 @@ async def get_deal(
     """
     try:
         logger.info(f"Fetching deal: {deal_id}")
-        deal = await repo.get_deal_by_id(deal_id)
-        if not deal:
+        versioned = await repo.get_versioned(deal_id)
+        if not versioned:
             raise NotFoundException(f"Deal {deal_id} not found")
-        return deal
+        deal, etag = versioned
+        return conditional_response(request, deal, etag)
     except NotFoundException:
         raise HTTPException(status_code=404, detail=f"Deal {deal_id} not found")
     except Exception as e:
@@ -234,6 +425,125 @@ async def get_deal(
         raise HTTPException(status_code=500, detail=f"Error fetching deal: {str(e)}")
 
 
+# ============================================================
+# Metrics Endpoints
+# ============================================================
+
+
+@router.get("/metrics/cache")
+async def get_cache_metrics(resources: AppResources = Depends(get_resources)):
+    """Get entity cache hit/miss/eviction counters per container.
+
+    Args:
+        resources: Application resources dependency
+
+    Returns:
+        Dict of container name to cache stats
+    """
+    return resources.cache_stats()
+
+
+@router.get("/metrics/replica")
+async def get_replica_metrics(resources: AppResources = Depends(get_resources)):
+    """Get change-feed replica status per container.
+
+    Args:
+        resources: Application resources dependency
+
+    Returns:
+        Dict of container name to replica stats (empty when replicas are disabled)
+    """
+    return resources.replica_stats()
+
+
+@router.get("/metrics/search-index")
+async def get_search_index_metrics(resources: AppResources = Depends(get_resources)):
+    """Get customer search index status.
+
+    Args:
+        resources: Application resources dependency
+
+    Returns:
+        Index counters (null when the search index is disabled)
+    """
+    return resources.search_index_stats()
+
+
+@router.get("/metrics/vector-index")
+async def get_vector_index_metrics(resources: AppResources = Depends(get_resources)):
+    """Get deal vector index status.
+
+    Args:
+        resources: Application resources dependency
+
+    Returns:
+        Index counters (null when the vector index is disabled)
+    """
+    return resources.vector_index_stats()
+
+
+@router.get("/metrics/deal-views")
+async def get_deal_view_metrics(resources: AppResources = Depends(get_resources)):
+    """Get materialized deal view status.
+
+    Args:
+        resources: Application resources dependency
+
+    Returns:
+        Enabled views and change feed sync job counters
+    """
+    return resources.deal_view_stats()
+
+
+@router.get("/metrics/conversation-writes")
+async def get_conversation_write_metrics(resources: AppResources = Depends(get_resources)):
+    """Get write-behind queue counters of chat turns.
+
+    Args:
+        resources: Application resources dependency
+
+    Returns:
+        Pending, written, retried and dropped turn counters
+    """
+    return resources.conversation_write_stats()
+
+
+@router.get("/metrics/repository")
+async def get_repository_metrics(resources: AppResources = Depends(get_resources)):
+    """Get RU charge, latency and item count histograms per repository operation.
+
+    Args:
+        resources: Application resources dependency
+
+    Returns:
+        Dict with per-operation stats (highest total RU first) and recent slow queries
+    """
+    return resources.repository_stats()
+
+
+@router.get("/metrics/throttling")
+async def get_throttling_metrics(resources: AppResources = Depends(get_resources)):
+    """Get in-flight limiter and 429 (throttling) retry counters per container.
+
+    Args:
+        resources: Application resources dependency
+
+    Returns:
+        Dict of container name to throttling stats
+    """
+    return resources.throttle_stats()
+
+
+@router.delete("/metrics/repository", status_code=204)
+async def reset_repository_metrics(resources: AppResources = Depends(get_resources)):
+    """Reset repository operation statistics and the slow query log.
+
+    Args:
+        resources: Application resources dependency
+    """
+    resources.reset_repository_stats()
+
+
 # ============================================================
 # Copilot (AI Chat) Endpoints
 # ============================================================
@@ -311,7 +621,7 @@ async def create_conversation(
         )
         conversation = await repo.create_conversation(user_id, first_message)
         logger.info(f"Created conversation {conversation.id}")
-        return ConversationResponse(**conversation.dict())
+        return model_response(conversation)
     except Exception as e:
         logger.error(f"Error creating conversation: {e}", exc_info=True)
         raise HTTPException(status_code=500, detail=f"Error creating conversation: {str(e)}")
@@ -319,12 +629,17 @@ async def create_conversation(
 
 @router.get("/conversations/{conversation_id}", response_model=ConversationResponse)
 async def get_conversation(
+    request: Request,
     conversation_id: str,
     repo: ConversationRepository = Depends(get_conversation_repository),
 ):
-    """Get conversation by ID.
+    """Get conversation by ID with all of its messages (``If-None-Match`` is answered with 304).
+
+    Use ``GET /conversations/{conversation_id}/messages`` to load long
+    conversations one window at a time.
 
     Args:
+        request: Incoming request (``If-None-Match``)
         conversation_id: Conversation ID
         repo: ConversationRepository dependency
 
@@ -332,10 +647,17 @@ async def get_conversation(
         Conversation object
     """
     try:
-        conversation = await repo.get_conversation(conversation_id)
-        if not conversation:
+        header = await repo.get_header(conversation_id)
+        if not header:
             raise HTTPException(status_code=404, detail=f"Conversation {conversation_id} not found")
-        return ConversationResponse(**conversation.dict())
+        conversation, etag = header
+        # ヘッダーのETagで304を判定し、メッセージは本文を返すときだけ読む
+        if etag is not None and etag_matches(request.headers.get("if-none-match"), etag):
+            return not_modified(etag)
+        if not await repo.load_messages(conversation):
+            # 書き込み途中（メッセージ未反映）の本文にはヘッダーのETagを付けない
+            etag = None
+        return conditional_response(request, conversation, etag)
     except HTTPException:
         raise
     except Exception as e:
@@ -343,25 +665,76 @@ async def get_conversation(
         raise HTTPException(status_code=500, detail=f"Error getting conversation: {str(e)}")
 
 
-@router.get("/users/{user_id}/conversations", response_model=list[ConversationResponse])
+@router.get("/conversations/{conversation_id}/messages", response_model=list[Message])
+async def get_conversation_messages(
+    request: Request,
+    conversation_id: str,
+    limit: int = Query(
+        MESSAGE_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE, description="Messages per window"
+    ),
+    cursor: str | None = Query(None, description="Cursor returned in X-Next-Cursor"),
+    direction: Literal["older", "newer"] = Query(
+        "older", description="older: newest window first, then back in time; newer: forward"
+    ),
+    repo: ConversationRepository = Depends(get_conversation_repository),
+):
+    """Get one window of conversation messages (chronological order within the window).
+
+    Without a cursor, ``older`` returns the latest messages and ``newer``
+    the first ones. The cursor of the adjacent window in the same direction
+    is sent in the ``X-Next-Cursor`` header (absent at the end).
+
+    Args:
+        request: Incoming request (``If-None-Match``)
+        conversation_id: Conversation ID
+        limit: Messages per window
+        cursor: Optional cursor of the window to fetch
+        direction: Direction to walk in
+        repo: ConversationRepository dependency
+
+    Returns:
+        List of messages
+    """
+    token = decode_cursor(cursor)
+    if token is not None and not token.isdigit():
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    try:
+        messages, next_seq = await repo.get_message_page(
+            conversation_id,
+            limit=limit,
+            cursor=int(token) if token is not None else None,
+            newer=direction == "newer",
+        )
+        next_token = str(next_seq) if next_seq is not None else None
+        return conditional_response(request, messages, next_token=next_token)
+    except ConversationNotFoundError:
+        raise HTTPException(status_code=404, detail=f"Conversation {conversation_id} not found")
+    except Exception as e:
+        logger.error(f"Error getting messages of {conversation_id}: {e}", exc_info=True)
+        raise HTTPException(status_code=500, detail=f"Error getting messages: {str(e)}")
+
+
+@router.get("/users/{user_id}/conversations", response_model=list[ConversationSummary])
 async def list_user_conversations(
+    request: Request,
     user_id: str,
-    limit: int = Query(50, description="Max number of conversations to return"),
+    limit: int = Query(50, ge=1, le=200, description="Max number of conversations to return"),
     repo: ConversationRepository = Depends(get_conversation_repository),
 ):
-    """List conversations for a user.
+    """List conversations for a user (summaries for the history list, without messages).
 
     Args:
+        request: Incoming request (``If-None-Match``)
         user_id: User ID
         limit: Max number of conversations
         repo: ConversationRepository dependency
 
     Returns:
-        List of conversations
+        Conversation summaries, most recently updated first
     """
     try:
         conversations = await repo.list_user_conversations(user_id, limit)
-        return [ConversationResponse(**c.dict()) for c in conversations]
+        return conditional_response(request, conversations)
     except Exception as e:
         logger.error(f"Error listing conversations for user {user_id}: {e}", exc_info=True)
         raise HTTPException(status_code=500, detail=f"Error listing conversations: {str(e)}")
@@ -370,23 +743,28 @@ async def list_user_conversations(
 @router.delete("/conversations/{conversation_id}")
 async def delete_conversation(
     conversation_id: str,
+    if_match: str | None = Header(None, description="ETag the conversation must still have"),
     repo: ConversationRepository = Depends(get_conversation_repository),
 ):
     """Delete a conversation (soft delete).
 
     Args:
         conversation_id: Conversation ID to delete
+        if_match: Optional ETag from a previous GET (412 if the conversation changed)
         repo: ConversationRepository dependency
 
     Returns:
         Success message
     """
     try:
-        await repo.delete_conversation(conversation_id)
+        etag = etag_value(if_match) if if_match else None
+        await repo.delete_conversation(conversation_id, etag=etag)
         return {"message": "Conversation deleted successfully"}
-    except ValueError as e:
+    except ConversationNotFoundError as e:
         logger.error(f"Conversation not found: {conversation_id}")
         raise HTTPException(status_code=404, detail=str(e))
+    except PreconditionFailedException as e:
+        raise HTTPException(status_code=e.status_code, detail=e.message)
     except Exception as e:
         logger.error(f"Error deleting conversation {conversation_id}: {e}", exc_info=True)
         raise HTTPException(status_code=500, detail=f"Error deleting conversation: {str(e)}")
@@ -400,16 +778,20 @@ async def delete_conversation(
 @router.post("/agent/query-stream")
 async def agent_query_stream(
     request: AgentQueryRequest,
-    conv_repo: ConversationRepository = Depends(get_conversation_repository),
+    repo: ConversationRepository = Depends(get_conversation_repository),
+    conv_writer: ConversationWriter = Depends(get_conversation_writer),
 ):
     """
     エージェントクエリ（SSEストリーミング）
 
-    Gemini Function Calling Agentを使用して進捗状況をリアルタイムで返す
+    Gemini Function Calling Agentを使用して進捗状況をリアルタイムで返す。
+    新規会話はストリーム開始前に作成し、以降のターンの保存は
+    ストリーム終了後にConversationWriterへ渡して応答を待たせない
 
     Args:
         request: Agent query request with user_id, query, and optional conversation_id
-        conv_repo: ConversationRepository dependency
+        repo: ConversationRepository dependency
+        conv_writer: ConversationWriter dependency
 
     Returns:
         Server-Sent Events stream
@@ -419,43 +801,37 @@ async def agent_query_stream(
     # 会話履歴の処理
     conversation_id = request.conversation_id
     conversation_history = None
+    user_message = Message(
+        message_id=str(uuid.uuid4()),
+        role="user",
+        content=request.query,
+        timestamp=datetime.utcnow().isoformat(),
+    )
 
     if conversation_id:
-        # 既存の会話を取得
-        conversation = await conv_repo.get_conversation(conversation_id)
-        if not conversation:
+        # 既存の会話の直近メッセージだけを取得（モデルに渡す件数分、未書き込みの分を含む）
+        try:
+            recent = await conv_writer.recent_messages(conversation_id, MAX_HISTORY_MESSAGES)
+        except ConversationNotFoundError:
             raise HTTPException(status_code=404, detail=f"Conversation {conversation_id} not found")
 
         # Gemini形式に変換
-        conversation_history = convert_to_gemini_format(conversation.messages)
-        logger.info(f"Loaded {len(conversation.messages)} messages from conversation {conversation_id}")
+        conversation_history = convert_to_gemini_format(recent)
+        logger.info(f"Loaded {len(recent)} recent messages from conversation {conversation_id}")
     else:
-        # 新規会話を作成
-        first_message = Message(
-            message_id=str(uuid.uuid4()),
-            role="user",
-            content=request.query,
-            timestamp=datetime.utcnow().isoformat(),
-        )
-        conversation = await conv_repo.create_conversation(request.user_id, first_message)
+        # 新規会話（ヘッダーと一覧用サマリーをストリーム開始前に作成し、
+        # 他のワーカーや直接の読み取りからもすぐに見えるようにする）
+        try:
+            conversation = await repo.start_conversation(request.user_id, user_message)
+        except Exception as e:
+            logger.error(f"Error starting conversation: {e}", exc_info=True)
+            raise HTTPException(status_code=500, detail=f"Error starting conversation: {str(e)}")
         conversation_id = conversation.id
-        logger.info(f"Created new conversation {conversation_id}")
 
     async def generate():
         final_response_text = None
         first_event = True
         try:
-            # ユーザーメッセージを保存（既存会話の場合のみ）
-            if request.conversation_id:
-                user_message = Message(
-                    message_id=str(uuid.uuid4()),
-                    role="user",
-                    content=request.query,
-                    timestamp=datetime.utcnow().isoformat(),
-                )
-                await conv_repo.add_message(conversation_id, user_message)
-                logger.debug(f"Saved user message to conversation {conversation_id}")
-
             # エージェント実行
             async for event in orchestrator.execute_query_stream(
                 request.user_id, request.query, conversation_history
@@ -470,18 +846,7 @@ async def agent_query_stream(
                     final_response_text = event.content
 
                 # ProgressEventをJSON化してSSEフォーマットで送信
-                yield f"data: {event.model_dump_json()}\n\n"
-
-            # アシスタントメッセージを保存
-            if final_response_text:
-                assistant_message = Message(
-                    message_id=str(uuid.uuid4()),
-                    role="assistant",
-                    content=final_response_text,
-                    timestamp=datetime.utcnow().isoformat(),
-                )
-                await conv_repo.add_message(conversation_id, assistant_message)
-                logger.info(f"Saved assistant message to conversation {conversation_id}")
+                yield sse_event(event)
 
         except Exception as e:
             # エラー時もSSEで送信
@@ -489,7 +854,25 @@ async def agent_query_stream(
             error_event = ProgressEvent(
                 type=ProgressEventType.ERROR, message=str(e)
             )
-            yield f"data: {error_event.model_dump_json()}\n\n"
+            yield sse_event(error_event)
+
+        finally:
+            # ターン（ユーザーメッセージ＋最終回答）をまとめて書き込みキューへ
+            # 最終回答がない場合もユーザーメッセージは保存する
+            turn = [user_message]
+            if final_response_text:
+                turn.append(
+                    Message(
+                        message_id=str(uuid.uuid4()),
+                        role="assistant",
+                        content=final_response_text,
+                        timestamp=datetime.utcnow().isoformat(),
+                    )
+                )
+            try:
+                conv_writer.submit(conversation_id, turn)
+            except RuntimeError as e:
+                logger.error(f"Could not queue turn of conversation {conversation_id}: {e}")
 
     return StreamingResponse(
         generate(),
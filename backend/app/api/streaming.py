@@ -0,0 +1,55 @@
+"""NDJSON and Server-Sent Events streaming helpers."""
+
+import logging
+from collections.abc import AsyncIterator
+
+from fastapi import Request
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel
+
+logger = logging.getLogger(__name__)
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+
+def wants_ndjson(request: Request) -> bool:
+    """Check whether the client asked for an NDJSON stream.
+
+    Args:
+        request: Incoming request
+
+    Returns:
+        True if the Accept header contains application/x-ndjson
+    """
+    return NDJSON_MEDIA_TYPE in request.headers.get("accept", "")
+
+
+async def _ndjson_lines(pages: AsyncIterator[list[BaseModel]]) -> AsyncIterator[bytes]:
+    """Serialize model pages into NDJSON chunks (one chunk per page)."""
+    try:
+        async for page in pages:
+            yield "".join(model.model_dump_json() + "\n" for model in page).encode("utf-8")
+    except Exception as e:
+        # Headers are already sent, so the stream can only be cut short
+        logger.error(f"Error while streaming NDJSON: {e}", exc_info=True)
+
+
+def ndjson_response(pages: AsyncIterator[list[BaseModel]]) -> StreamingResponse:
+    """Build a streaming NDJSON response from pages of models.
+
+    Args:
+        pages: Async iterator yielding lists of models as pages arrive
+
+    Returns:
+        StreamingResponse with one JSON object per line
+    """
+    return StreamingResponse(
+        _ndjson_lines(pages),
+        media_type=NDJSON_MEDIA_TYPE,
+        headers={"X-Accel-Buffering": "no"},
+    )
+
+
+def sse_event(event: BaseModel) -> bytes:
+    """Encode a model as one SSE ``data:`` event (serialized straight to bytes)."""
+    return b"data: " + event.__pydantic_serializer__.to_json(event) + b"\n\n"
@@ -10,10 +10,93 @@ load_dotenv()
 class Settings:
     """Application settings."""
 
+    # Storage backend: "cosmos" (Azure Cosmos DB), "sqlite" (embedded, single node)
+    # or "memory" (in-process, for benchmarks)
+    STORAGE_BACKEND: str = os.getenv("STORAGE_BACKEND", "cosmos").lower()
+    SQLITE_PATH: str = os.getenv("SQLITE_PATH", "data/sangikyo.db")
+    SQLITE_POOL_SIZE: int = int(os.getenv("SQLITE_POOL_SIZE", "4"))
+    # In-memory backend: simulated latency per request and initial data
+    MEMORY_STORE_LATENCY_MS: float = float(os.getenv("MEMORY_STORE_LATENCY_MS", "0"))
+    MEMORY_STORE_LATENCY_JITTER_MS: float = float(os.getenv("MEMORY_STORE_LATENCY_JITTER_MS", "0"))
+    MEMORY_STORE_SEED_DATA: str = os.getenv("MEMORY_STORE_SEED_DATA", "demo")  # demo|synthetic|none
+    MEMORY_STORE_SYNTHETIC_DEALS: int = int(os.getenv("MEMORY_STORE_SYNTHETIC_DEALS", "10000"))
+    MEMORY_STORE_RANDOM_SEED: int = int(os.getenv("MEMORY_STORE_RANDOM_SEED", "42"))
+
     # Cosmos DB
     COSMOS_ENDPOINT: str = os.getenv("COSMOS_ENDPOINT", "")
     COSMOS_KEY: str = os.getenv("COSMOS_KEY", "")
     COSMOS_DATABASE_NAME: str = os.getenv("COSMOS_DATABASE_NAME", "SangikyoDB")
+    # Connection pool (one pool per worker process)
+    COSMOS_MAX_CONNECTIONS: int = int(os.getenv("COSMOS_MAX_CONNECTIONS", "100"))
+    COSMOS_MAX_CONNECTIONS_PER_HOST: int = int(
+        os.getenv("COSMOS_MAX_CONNECTIONS_PER_HOST", "0")
+    )  # 0 = unlimited
+    COSMOS_CONNECTION_TIMEOUT: int = int(os.getenv("COSMOS_CONNECTION_TIMEOUT", "60"))
+    # Throttling (429) handling per container (see app.core.resilience)
+    COSMOS_MAX_IN_FLIGHT_PER_CONTAINER: int = int(
+        os.getenv("COSMOS_MAX_IN_FLIGHT_PER_CONTAINER", "32")
+    )  # 0 = unlimited
+    COSMOS_THROTTLE_MAX_RETRIES: int = int(os.getenv("COSMOS_THROTTLE_MAX_RETRIES", "8"))
+    COSMOS_RETRY_BASE_DELAY_MS: float = float(os.getenv("COSMOS_RETRY_BASE_DELAY_MS", "100"))
+    COSMOS_RETRY_MAX_DELAY_MS: float = float(os.getenv("COSMOS_RETRY_MAX_DELAY_MS", "10000"))
+
+    # Entity cache (per worker, point reads only; TTL 0 disables a cache)
+    ENTITY_CACHE_MAX_ITEMS: int = int(os.getenv("ENTITY_CACHE_MAX_ITEMS", "10000"))
+    USER_CACHE_TTL_SECONDS: float = float(os.getenv("USER_CACHE_TTL_SECONDS", "600"))
+    CUSTOMER_CACHE_TTL_SECONDS: float = float(os.getenv("CUSTOMER_CACHE_TTL_SECONDS", "600"))
+    DEAL_CACHE_TTL_SECONDS: float = float(os.getenv("DEAL_CACHE_TTL_SECONDS", "60"))
+    NEGATIVE_CACHE_TTL_SECONDS: float = float(os.getenv("NEGATIVE_CACHE_TTL_SECONDS", "30"))
+
+    # Change-feed replica of Users/Customers/Deals (per worker, opt-in)
+    REPLICA_ENABLED: bool = os.getenv("REPLICA_ENABLED", "false").lower() == "true"
+    REPLICA_POLL_INTERVAL_SECONDS: float = float(os.getenv("REPLICA_POLL_INTERVAL_SECONDS", "5"))
+    # Full reload that drops items deleted by other workers (the change feed has no deletes);
+    # 0 = never
+    REPLICA_RESYNC_INTERVAL_SECONDS: float = float(
+        os.getenv("REPLICA_RESYNC_INTERVAL_SECONDS", "600")
+    )
+    # Bigram index for customer keyword search (built from the Customers/Deals replicas)
+    SEARCH_INDEX_ENABLED: bool = os.getenv("SEARCH_INDEX_ENABLED", "false").lower() == "true"
+    # Deal notes vector index for similar deal search (built from the Deals replica)
+    VECTOR_INDEX_ENABLED: bool = os.getenv("VECTOR_INDEX_ENABLED", "false").lower() == "true"
+    VECTOR_INDEX_DIM: int = int(os.getenv("VECTOR_INDEX_DIM", "1024"))  # 4 bytes x dim per deal
+
+    # Materialized deal views (DealsBySalesUser / DealsByCustomer containers must exist)
+    DEAL_VIEWS_ENABLED: bool = os.getenv("DEAL_VIEWS_ENABLED", "false").lower() == "true"
+    # Tail the Deals change feed to pick up writes made outside the app (one worker is enough)
+    DEAL_VIEW_SYNC_ENABLED: bool = os.getenv("DEAL_VIEW_SYNC_ENABLED", "false").lower() == "true"
+    DEAL_VIEW_SYNC_INTERVAL_SECONDS: float = float(
+        os.getenv("DEAL_VIEW_SYNC_INTERVAL_SECONDS", "5")
+    )
+    # Pipeline summary document (DealSummaries container, built on startup if missing);
+    # when disabled, totals are computed with server-side aggregate queries
+    DEAL_SUMMARY_ENABLED: bool = os.getenv("DEAL_SUMMARY_ENABLED", "true").lower() == "true"
+
+    # Write-behind persistence of chat turns (per worker; drained on shutdown)
+    CONVERSATION_WRITE_MAX_ATTEMPTS: int = int(os.getenv("CONVERSATION_WRITE_MAX_ATTEMPTS", "5"))
+    CONVERSATION_WRITE_RETRY_BASE_DELAY_MS: float = float(
+        os.getenv("CONVERSATION_WRITE_RETRY_BASE_DELAY_MS", "200")
+    )
+    CONVERSATION_WRITE_RETRY_MAX_DELAY_MS: float = float(
+        os.getenv("CONVERSATION_WRITE_RETRY_MAX_DELAY_MS", "5000")
+    )
+    CONVERSATION_WRITE_DRAIN_TIMEOUT_SECONDS: float = float(
+        os.getenv("CONVERSATION_WRITE_DRAIN_TIMEOUT_SECONDS", "10")
+    )
+
+    # Repository instrumentation (per worker; 0 disables a slow query threshold)
+    QUERY_METRICS_ENABLED: bool = os.getenv("QUERY_METRICS_ENABLED", "true").lower() == "true"
+    SLOW_QUERY_MS: float = float(os.getenv("SLOW_QUERY_MS", "500"))
+    SLOW_QUERY_REQUEST_CHARGE: float = float(os.getenv("SLOW_QUERY_REQUEST_CHARGE", "50"))
+    SLOW_QUERY_LOG_SIZE: int = int(os.getenv("SLOW_QUERY_LOG_SIZE", "100"))
+
+    # Response compression (non-streaming responses; brotli is used when installed)
+    RESPONSE_COMPRESSION_ENABLED: bool = (
+        os.getenv("RESPONSE_COMPRESSION_ENABLED", "true").lower() == "true"
+    )
+    RESPONSE_COMPRESSION_MIN_BYTES: int = int(os.getenv("RESPONSE_COMPRESSION_MIN_BYTES", "1024"))
+    GZIP_LEVEL: int = int(os.getenv("GZIP_LEVEL", "6"))
+    BROTLI_QUALITY: int = int(os.getenv("BROTLI_QUALITY", "5"))
 
     # Gemini API
     GEMINI_API_KEY: str = os.getenv("GEMINI_API_KEY", "")
@@ -1,22 +1,67 @@
 """Cosmos DB client management."""
 
-from azure.cosmos import CosmosClient
+import logging
+
+import aiohttp
+from azure.core.pipeline.transport import AioHttpTransport
+from azure.cosmos.aio import ContainerProxy, CosmosClient
+from azure.cosmos.documents import ConnectionPolicy, RetryOptions
 
 from app.core.config import settings
+from app.core.storage import StorageBackend
+
+logger = logging.getLogger(__name__)
 
 
-class CosmosDBClient:
-    """Cosmos DB client wrapper."""
+class CosmosDBClient(StorageBackend):
+    """Async Cosmos DB client wrapper (the production storage backend).
+
+    One instance is opened per worker process by the application lifespan
+    (see ``app.core.resources``) and shared by every repository.
+    """
 
     def __init__(self):
-        """Initialize Cosmos DB client."""
-        self.client = CosmosClient(settings.COSMOS_ENDPOINT, settings.COSMOS_KEY)
+        """Initialize Cosmos DB client.
+
+        Must be called from a running event loop because it creates the
+        aiohttp session that backs the connection pool. No network I/O is
+        performed until the first request.
+        """
+        super().__init__()
+        connector = aiohttp.TCPConnector(
+            limit=settings.COSMOS_MAX_CONNECTIONS,
+            limit_per_host=settings.COSMOS_MAX_CONNECTIONS_PER_HOST,
+        )
+        transport = AioHttpTransport(session=aiohttp.ClientSession(connector=connector))
+        # Throttled requests are retried by the per-container ThrottleGuard
+        # (jittered backoff, in-flight limit, counters), not inside the SDK
+        connection_policy = ConnectionPolicy()
+        connection_policy.RetryOptions = RetryOptions(max_retry_attempt_count=0)
+        self.client = CosmosClient(
+            settings.COSMOS_ENDPOINT,
+            settings.COSMOS_KEY,
+            transport=transport,
+            connection_policy=connection_policy,
+            connection_timeout=settings.COSMOS_CONNECTION_TIMEOUT,
+        )
         self.database = self.client.get_database_client(settings.COSMOS_DATABASE_NAME)
+        self._containers: dict[str, ContainerProxy] = {}
+        logger.info(f"Cosmos DB client opened (max connections: {settings.COSMOS_MAX_CONNECTIONS})")
 
-    def get_container(self, container_name: str):
-        """Get container client."""
-        return self.database.get_container_client(container_name)
+    def get_container(self, container_name: str) -> ContainerProxy:
+        """Get container client.
 
+        Container proxies are cached so that every repository for the same
+        container shares one proxy.
+        """
+        container = self._containers.get(container_name)
+        if container is None:
+            container = self.database.get_container_client(container_name)
+            self._containers[container_name] = container
+        return container
 
-# Global client instance
-cosmos_client = CosmosDBClient()
+    async def close(self) -> None:
+        """Close the underlying HTTP session."""
+        await self.client.close()
+        self._containers.clear()
+        logger.info("Cosmos DB client closed")
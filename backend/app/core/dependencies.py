@@ -1,32 +1,53 @@
 """FastAPI dependencies for dependency injection."""
 
+from app.core.resources import get_resources
+from app.repositories.conversation import ConversationRepository
+from app.repositories.conversation_writer import ConversationWriter
 from app.repositories.customer import CustomerRepository
 from app.repositories.deal import DealRepository
 from app.repositories.user import UserRepository
 
 
 def get_user_repository() -> UserRepository:
-    """Provide UserRepository instance.
+    """Provide the shared UserRepository instance.
 
     Returns:
         UserRepository instance
     """
-    return UserRepository()
+    return get_resources().user_repo
 
 
 def get_customer_repository() -> CustomerRepository:
-    """Provide CustomerRepository instance.
+    """Provide the shared CustomerRepository instance.
 
     Returns:
         CustomerRepository instance
     """
-    return CustomerRepository()
+    return get_resources().customer_repo
 
 
 def get_deal_repository() -> DealRepository:
-    """Provide DealRepository instance.
+    """Provide the shared DealRepository instance.
 
     Returns:
         DealRepository instance
     """
-    return DealRepository()
+    return get_resources().deal_repo
+
+
+def get_conversation_repository() -> ConversationRepository:
+    """Provide the shared ConversationRepository instance.
+
+    Returns:
+        ConversationRepository instance
+    """
+    return get_resources().conversation_repo
+
+
+def get_conversation_writer() -> ConversationWriter:
+    """Provide the shared write-behind ConversationWriter instance.
+
+    Returns:
+        ConversationWriter instance
+    """
+    return get_resources().conversation_writer
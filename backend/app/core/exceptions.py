@@ -50,3 +50,15 @@ class DatabaseException(AppException):
             message: Error message
         """
         super().__init__(message, status_code=500)
+
+
+class PreconditionFailedException(AppException):
+    """Exception raised when an item changed since it was read (ETag mismatch)."""
+
+    def __init__(self, message: str = "Precondition failed"):
+        """Initialize PreconditionFailedException.
+
+        Args:
+            message: Error message
+        """
+        super().__init__(message, status_code=412)
@@ -0,0 +1,313 @@
+"""In-process stand-in for Cosmos DB.
+
+``MemoryStorage`` implements the storage backend interface with containers
+that mimic the parts of the ``azure.cosmos.aio`` ``ContainerProxy`` API used
+by the repositories (point operations, read-many, paged queries and the
+change feed). Queries support the SQL subset the repositories generate
+(see ``app.core.sql_subset``).
+
+Every request waits a configurable simulated latency, so route and agent
+tool benchmarks can be run reproducibly without an Azure account.
+"""
+
+import asyncio
+import copy
+import logging
+import random
+import time
+import uuid
+from collections.abc import AsyncIterator, Callable, Iterable
+from typing import Any
+
+from azure.cosmos.exceptions import CosmosResourceExistsError, CosmosResourceNotFoundError
+
+from app.core.sql_subset import parse_query
+from app.core.storage import (
+    PARTITION_KEYS,
+    StorageBackend,
+    check_precondition,
+    report_response,
+)
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PAGE_SIZE = 100
+
+
+class MemoryStorage(StorageBackend):
+    """Storage backend keeping every container in process memory."""
+
+    def __init__(self, latency_ms: float = 0, latency_jitter_ms: float = 0, seed: int = 42):
+        """Initialize empty storage.
+
+        Args:
+            latency_ms: Simulated latency of every request (and query page)
+            latency_jitter_ms: Random extra latency added to ``latency_ms``
+            seed: Random seed of the latency jitter
+        """
+        super().__init__()
+        self.latency_ms = latency_ms
+        self.latency_jitter_ms = latency_jitter_ms
+        self._random = random.Random(seed)
+        self._containers: dict[str, MemoryContainer] = {}
+        logger.info(
+            f"In-memory storage opened (latency: {latency_ms}ms + up to {latency_jitter_ms}ms)"
+        )
+
+    def get_container(self, container_name: str) -> "MemoryContainer":
+        """Get container (created on first use)."""
+        container = self._containers.get(container_name)
+        if container is None:
+            container = MemoryContainer(
+                container_name, PARTITION_KEYS.get(container_name, "id"), self._simulate_latency
+            )
+            self._containers[container_name] = container
+        return container
+
+    def load(self, container_name: str, items: Iterable[dict]) -> int:
+        """Insert or replace items directly (no simulated latency).
+
+        Args:
+            container_name: Container name
+            items: Items to store
+
+        Returns:
+            Number of stored items
+        """
+        container = self.get_container(container_name)
+        count = 0
+        for item in items:
+            container.put(item)
+            count += 1
+        return count
+
+    async def _simulate_latency(self) -> None:
+        """Wait for the simulated network round trip."""
+        delay_ms = self.latency_ms
+        if self.latency_jitter_ms:
+            delay_ms += self._random.uniform(0, self.latency_jitter_ms)
+        # Yield to the event loop even without latency, like a real request
+        await asyncio.sleep(delay_ms / 1000)
+
+
+class MemoryContainer:
+    """``ContainerProxy`` compatible container backed by a dict."""
+
+    def __init__(self, container_id: str, partition_key_field: str, latency: Callable[[], Any]):
+        """Initialize container.
+
+        Args:
+            container_id: Container name
+            partition_key_field: Item field holding the partition key
+            latency: Coroutine function awaited once per request
+        """
+        self.id = container_id
+        self.partition_key_field = partition_key_field
+        self._latency = latency
+        self._items: dict[tuple[Any, str], dict] = {}
+        # Change feed position of the latest write of each item
+        self._versions: dict[tuple[Any, str], int] = {}
+        self._lsn = 0
+
+    # ------------------------------------------------------------------
+    # Point operations
+    # ------------------------------------------------------------------
+
+    async def read_item(self, item: str, partition_key: Any, **kwargs: Any) -> dict:
+        """Read one item."""
+        await self._latency()
+        stored = self._get((partition_key, item))
+        report_response(kwargs, stored)
+        return copy.deepcopy(stored)
+
+    async def read_items(self, items: list[tuple[str, Any]], **kwargs: Any) -> list[dict]:
+        """Read several items by (id, partition key); missing items are omitted."""
+        await self._latency()
+        found = [
+            copy.deepcopy(self._items[(pk, item_id)])
+            for item_id, pk in items
+            if (pk, item_id) in self._items
+        ]
+        report_response(kwargs, found)
+        return found
+
+    async def create_item(self, body: dict, **kwargs: Any) -> dict:
+        """Create an item (409 if it already exists)."""
+        await self._latency()
+        if self._key(body) in self._items:
+            raise CosmosResourceExistsError(
+                status_code=409,
+                message=f"Entity with the specified id already exists: {body['id']}",
+            )
+        return self._write(body, kwargs)
+
+    async def upsert_item(self, body: dict, **kwargs: Any) -> dict:
+        """Create or replace an item."""
+        await self._latency()
+        existing = self._items.get(self._key(body))
+        if existing is not None:
+            check_precondition(existing.get("_etag"), kwargs)
+        return self._write(body, kwargs)
+
+    async def replace_item(self, item: str | dict, body: dict, **kwargs: Any) -> dict:
+        """Replace an existing item (404 if missing)."""
+        await self._latency()
+        check_precondition(self._get(self._key(body)).get("_etag"), kwargs)
+        return self._write(body, kwargs)
+
+    async def delete_item(self, item: str | dict, partition_key: Any, **kwargs: Any) -> None:
+        """Delete an item (404 if missing)."""
+        await self._latency()
+        item_id = item["id"] if isinstance(item, dict) else item
+        key = (partition_key, item_id)
+        check_precondition(self._get(key).get("_etag"), kwargs)
+        del self._items[key]
+        self._versions.pop(key, None)
+        report_response(kwargs, None)
+
+    def put(self, body: dict) -> dict:
+        """Store an item synchronously (bulk loading)."""
+        return self._write(body, {})
+
+    # ------------------------------------------------------------------
+    # Queries and change feed
+    # ------------------------------------------------------------------
+
+    def query_items(
+        self,
+        query: str,
+        parameters: list[dict] | None = None,
+        partition_key: Any = None,
+        max_item_count: int | None = None,
+        **kwargs: Any,
+    ) -> "MemoryQueryIterable":
+        """Run a query (evaluated lazily, like the SDK's item paged)."""
+        parsed = parse_query(query)
+        values = {p["name"]: p["value"] for p in parameters or []}
+
+        def execute() -> list[dict]:
+            items = (
+                item
+                for (pk, _), item in self._items.items()
+                if partition_key is None or pk == partition_key
+            )
+            return parsed.execute(items, values)
+
+        return MemoryQueryIterable(
+            execute, max_item_count or DEFAULT_PAGE_SIZE, self._latency, kwargs.get("response_hook")
+        )
+
+    async def query_items_change_feed(
+        self,
+        start_time: str | None = None,
+        continuation: str | None = None,
+        response_hook: Callable | None = None,
+        **kwargs: Any,
+    ) -> AsyncIterator[dict]:
+        """Read the latest version of every item changed after a position.
+
+        The continuation (``etag`` response header) is the last change feed
+        position; ``start_time`` accepts ``"Beginning"`` and ``"Now"``.
+        """
+        await self._latency()
+        if continuation is not None:
+            start = int(continuation)
+        elif start_time == "Now":
+            start = self._lsn
+        else:
+            start = 0
+        changed = sorted((lsn, key) for key, lsn in self._versions.items() if lsn > start)
+        end = self._lsn
+        for _, key in changed:
+            item = self._items.get(key)
+            if item is not None:
+                yield copy.deepcopy(item)
+        if response_hook:
+            response_hook({"etag": str(end)}, None)
+
+    # ------------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------------
+
+    def _key(self, body: dict) -> tuple[Any, str]:
+        return body.get(self.partition_key_field), body["id"]
+
+    def _get(self, key: tuple[Any, str]) -> dict:
+        stored = self._items.get(key)
+        if stored is None:
+            raise CosmosResourceNotFoundError(
+                status_code=404, message=f"Entity with the specified id does not exist: {key[1]}"
+            )
+        return stored
+
+    def _write(self, body: dict, kwargs: dict) -> dict:
+        item = copy.deepcopy(body)
+        item["_etag"] = f'"{uuid.uuid4()}"'
+        item["_ts"] = int(time.time())
+        key = self._key(item)
+        self._lsn += 1
+        self._items[key] = item
+        self._versions[key] = self._lsn
+        report_response(kwargs, item)
+        return copy.deepcopy(item)
+
+
+class MemoryQueryIterable:
+    """Result of ``query_items``: iterate items or pages (``by_page``)."""
+
+    def __init__(
+        self,
+        execute: Callable[[], list[dict]],
+        page_size: int,
+        latency: Callable[[], Any],
+        response_hook: Callable | None,
+    ):
+        self._execute = execute
+        self._page_size = page_size
+        self._latency = latency
+        self._response_hook = response_hook
+
+    def __aiter__(self) -> AsyncIterator[dict]:
+        return self._iter_items()
+
+    async def _iter_items(self) -> AsyncIterator[dict]:
+        async for page in self.by_page():
+            async for item in page:
+                yield item
+
+    def by_page(self, continuation_token: str | None = None) -> "MemoryPageIterator":
+        """Iterate pages starting at a continuation token (an offset)."""
+        return MemoryPageIterator(self, int(continuation_token or 0))
+
+
+class MemoryPageIterator:
+    """Async iterator of pages exposing ``continuation_token`` like the SDK."""
+
+    def __init__(self, query: MemoryQueryIterable, offset: int):
+        self._query = query
+        self._offset = offset
+        self._results: list[dict] | None = None
+        self.continuation_token: str | None = None
+
+    def __aiter__(self) -> "MemoryPageIterator":
+        return self
+
+    async def __anext__(self) -> AsyncIterator[dict]:
+        if self._results is None:
+            self._results = self._query._execute()
+        elif self.continuation_token is None:
+            raise StopAsyncIteration
+        if self._offset >= len(self._results) and self._offset > 0:
+            raise StopAsyncIteration
+        await self._query._latency()
+        page = self._results[self._offset : self._offset + self._query._page_size]
+        self._offset += len(page)
+        self.continuation_token = str(self._offset) if self._offset < len(self._results) else None
+        if self._query._response_hook:
+            self._query._response_hook({"x-ms-item-count": str(len(page))}, page)
+        return _aiter([copy.deepcopy(item) for item in page])
+
+
+async def _aiter(items: list[dict]) -> AsyncIterator[dict]:
+    for item in items:
+        yield item
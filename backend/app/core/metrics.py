@@ -0,0 +1,376 @@
+"""Per-operation instrumentation of Cosmos DB access.
+
+Every Cosmos call made by a repository is timed and charged to the
+repository operation that issued it (e.g. ``DealRepository.get_deals_by_user``).
+The request charge and server-side query metrics are read from the
+response headers through the SDK's ``response_hook``.
+"""
+
+import bisect
+import contextvars
+import functools
+import inspect
+import logging
+import time
+from collections import deque
+from collections.abc import AsyncIterator, Callable
+from datetime import UTC, datetime
+
+logger = logging.getLogger(__name__)
+
+REQUEST_CHARGE_HEADER = "x-ms-request-charge"
+QUERY_METRICS_HEADER = "x-ms-documentdb-query-metrics"
+
+# Upper bounds of histogram buckets (the last bucket is unbounded)
+LATENCY_BUCKETS_MS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+REQUEST_CHARGE_BUCKETS = (1, 2, 5, 10, 25, 50, 100, 250, 500, 1000)
+
+# Query metrics summed per operation (the rest are kept only in slow query entries)
+AGGREGATED_QUERY_METRICS = (
+    "retrievedDocumentCount",
+    "outputDocumentCount",
+    "totalExecutionTimeInMs",
+)
+
+_current_operation: contextvars.ContextVar[str | None] = contextvars.ContextVar(
+    "repository_operation", default=None
+)
+
+
+class Histogram:
+    """Fixed-bucket histogram."""
+
+    def __init__(self, buckets: tuple[float, ...]):
+        """Initialize histogram.
+
+        Args:
+            buckets: Sorted upper bounds of the buckets
+        """
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def observe(self, value: float) -> None:
+        """Add one observation."""
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.total += value
+        self.max = max(self.max, value)
+
+    def percentile(self, q: float) -> float:
+        """Estimate a percentile as the upper bound of the bucket containing it.
+
+        Args:
+            q: Percentile between 0 and 1
+
+        Returns:
+            Bucket upper bound, capped at the observed maximum
+        """
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank:
+                bound = self.buckets[index] if index < len(self.buckets) else self.max
+                return round(min(float(bound), self.max), 2)
+        return self.max
+
+    def stats(self) -> dict:
+        """Get summary and bucket counts."""
+        labels = [f"<={bound}" for bound in self.buckets] + [f">{self.buckets[-1]}"]
+        return {
+            "count": self.count,
+            "avg": round(self.total / self.count, 2) if self.count else 0.0,
+            "p50": self.percentile(0.5),
+            "p95": self.percentile(0.95),
+            "p99": self.percentile(0.99),
+            "max": round(self.max, 2),
+            "buckets": dict(zip(labels, self.counts, strict=True)),
+        }
+
+
+class OperationStats:
+    """Aggregated measurements of one repository operation on one container."""
+
+    def __init__(self, operation: str, container: str):
+        """Initialize empty statistics.
+
+        Args:
+            operation: Repository operation name
+            container: Container name
+        """
+        self.operation = operation
+        self.container = container
+        self.calls = 0
+        self.errors = 0
+        self.items = 0
+        self.request_charge = 0.0
+        self.query_metrics: dict[str, float] = dict.fromkeys(AGGREGATED_QUERY_METRICS, 0.0)
+        self.latency_ms = Histogram(LATENCY_BUCKETS_MS)
+        self.request_units = Histogram(REQUEST_CHARGE_BUCKETS)
+
+    def stats(self) -> dict:
+        """Get aggregated statistics."""
+        return {
+            "operation": self.operation,
+            "container": self.container,
+            "calls": self.calls,
+            "errors": self.errors,
+            "items": self.items,
+            "request_charge": round(self.request_charge, 2),
+            "query_metrics": {key: round(value, 2) for key, value in self.query_metrics.items()},
+            "latency_ms": self.latency_ms.stats(),
+            "request_units": self.request_units.stats(),
+        }
+
+
+class OperationTracker:
+    """Measurements of one Cosmos DB call, filled while the call runs."""
+
+    def __init__(
+        self,
+        metrics: "RepositoryMetrics",
+        operation: str,
+        container: str,
+        query: str | None = None,
+        parameters: list | None = None,
+    ):
+        """Initialize tracker.
+
+        Args:
+            metrics: Registry the measurement is recorded to
+            operation: Repository operation name
+            container: Container name
+            query: Query text (None for point operations)
+            parameters: Query parameters
+        """
+        self.metrics = metrics
+        self.operation = operation
+        self.container = container
+        self.query = query
+        self.parameters = parameters
+        self.items = 0
+        self.request_charge = 0.0
+        self.query_metrics: dict[str, float] = {}
+        self._started = 0.0
+
+    def on_response(self, headers, _result) -> None:
+        """``response_hook`` for SDK calls (called once per response/page)."""
+        self.request_charge += float(headers.get(REQUEST_CHARGE_HEADER) or 0)
+        raw_metrics = headers.get(QUERY_METRICS_HEADER)
+        if raw_metrics:
+            for key, value in _parse_query_metrics(raw_metrics).items():
+                self.query_metrics[key] = self.query_metrics.get(key, 0.0) + value
+
+    def __enter__(self) -> "OperationTracker":
+        self._started = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, _traceback) -> None:
+        duration_ms = (time.perf_counter() - self._started) * 1000
+        # GeneratorExit means a streaming consumer stopped early, not a failure
+        failed = exc_type is not None and issubclass(exc_type, Exception)
+        self.metrics.record(self, duration_ms, failed)
+
+
+class RepositoryMetrics:
+    """Registry of per-operation statistics and the slow query log."""
+
+    def __init__(
+        self,
+        slow_query_ms: float = 500,
+        slow_query_request_charge: float = 50,
+        slow_query_log_size: int = 100,
+        query_metrics_enabled: bool = True,
+    ):
+        """Initialize registry.
+
+        Args:
+            slow_query_ms: Calls at or above this wall time are logged as slow (0 disables)
+            slow_query_request_charge: Calls at or above this RU charge are logged as slow (0 disables)
+            slow_query_log_size: Number of recent slow calls kept in memory
+            query_metrics_enabled: Request server-side query metrics for queries
+        """
+        self.slow_query_ms = slow_query_ms
+        self.slow_query_request_charge = slow_query_request_charge
+        self.query_metrics_enabled = query_metrics_enabled
+        self.slow_queries: deque[dict] = deque(maxlen=slow_query_log_size)
+        self._operations: dict[tuple[str, str], OperationStats] = {}
+
+    def track(
+        self,
+        default_operation: str,
+        container: str,
+        query: str | None = None,
+        parameters: list | None = None,
+    ) -> OperationTracker:
+        """Start measuring one Cosmos DB call.
+
+        The call is attributed to the repository operation currently running
+        (see ``label_operations``), or to ``default_operation`` otherwise.
+
+        Args:
+            default_operation: Fallback operation name
+            container: Container name
+            query: Query text (None for point operations)
+            parameters: Query parameters
+
+        Returns:
+            Tracker to use as a context manager
+        """
+        operation = _current_operation.get() or default_operation
+        return OperationTracker(self, operation, container, query, parameters)
+
+    def record(self, tracker: OperationTracker, duration_ms: float, failed: bool = False) -> None:
+        """Record a finished call.
+
+        Args:
+            tracker: Tracker of the call
+            duration_ms: Wall time in milliseconds
+            failed: Whether the call raised
+        """
+        key = (tracker.operation, tracker.container)
+        stats = self._operations.get(key)
+        if stats is None:
+            stats = self._operations[key] = OperationStats(*key)
+        stats.calls += 1
+        stats.errors += int(failed)
+        stats.items += tracker.items
+        stats.request_charge += tracker.request_charge
+        for name in AGGREGATED_QUERY_METRICS:
+            stats.query_metrics[name] += tracker.query_metrics.get(name, 0.0)
+        stats.latency_ms.observe(duration_ms)
+        stats.request_units.observe(tracker.request_charge)
+
+        if self._is_slow(duration_ms, tracker.request_charge):
+            entry = {
+                "timestamp": datetime.now(UTC).isoformat(),
+                "operation": tracker.operation,
+                "container": tracker.container,
+                "duration_ms": round(duration_ms, 2),
+                "request_charge": round(tracker.request_charge, 2),
+                "items": tracker.items,
+                "query": tracker.query,
+                "parameters": tracker.parameters,
+                "query_metrics": tracker.query_metrics,
+                "failed": failed,
+            }
+            self.slow_queries.append(entry)
+            logger.warning(
+                f"Slow Cosmos DB call {tracker.operation} on {tracker.container}: "
+                f"{duration_ms:.0f}ms, {tracker.request_charge:.2f} RU, {tracker.items} items, "
+                f"query={tracker.query!r}, parameters={tracker.parameters!r}"
+            )
+
+    def stats(self) -> list[dict]:
+        """Get statistics of every operation, most expensive (total RU) first."""
+        return [
+            stats.stats()
+            for stats in sorted(
+                self._operations.values(), key=lambda s: s.request_charge, reverse=True
+            )
+        ]
+
+    def reset(self) -> None:
+        """Clear all statistics and the slow query log."""
+        self._operations.clear()
+        self.slow_queries.clear()
+
+    def _is_slow(self, duration_ms: float, request_charge: float) -> bool:
+        return (self.slow_query_ms > 0 and duration_ms >= self.slow_query_ms) or (
+            self.slow_query_request_charge > 0 and request_charge >= self.slow_query_request_charge
+        )
+
+
+def label_operations(cls: type, prefix: str) -> None:
+    """Attribute Cosmos calls made inside public methods of ``cls`` to those methods.
+
+    Wraps each public coroutine / async generator defined directly on
+    ``cls`` so that it sets the current operation name while it runs. Plain
+    methods are wrapped too: when one returns an async iterator (e.g.
+    ``iter_find_pages`` handing back another method's page stream), the
+    iterator is labelled while it is consumed. The outermost labelled method
+    wins when repository methods call each other.
+
+    Args:
+        cls: Repository class
+        prefix: Prefix of operation names (usually the class name)
+    """
+    for name, func in list(vars(cls).items()):
+        if name.startswith("_"):
+            continue
+        if inspect.iscoroutinefunction(func):
+            setattr(cls, name, _label_coroutine(func, f"{prefix}.{name}"))
+        elif inspect.isasyncgenfunction(func):
+            setattr(cls, name, _label_async_generator(func, f"{prefix}.{name}"))
+        elif inspect.isfunction(func):
+            setattr(cls, name, _label_iterator_factory(func, f"{prefix}.{name}"))
+
+
+def _label_coroutine(func: Callable, operation: str) -> Callable:
+    @functools.wraps(func)
+    async def wrapper(*args, **kwargs):
+        if _current_operation.get() is not None:
+            return await func(*args, **kwargs)
+        token = _current_operation.set(operation)
+        try:
+            return await func(*args, **kwargs)
+        finally:
+            _current_operation.reset(token)
+
+    return wrapper
+
+
+def _label_async_generator(func: Callable, operation: str) -> Callable:
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        return _label_iteration(func(*args, **kwargs), operation)
+
+    return wrapper
+
+
+def _label_iterator_factory(func: Callable, operation: str) -> Callable:
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        result = func(*args, **kwargs)
+        if isinstance(result, AsyncIterator):
+            return _label_iteration(result, operation)
+        return result
+
+    return wrapper
+
+
+async def _label_iteration(iterator: AsyncIterator, operation: str) -> AsyncIterator:
+    """Yield from ``iterator``, labelling each step with ``operation``."""
+    try:
+        while True:
+            # Label each step separately so the name never leaks to the consumer
+            token = _current_operation.set(operation) if _current_operation.get() is None else None
+            try:
+                item = await iterator.__anext__()
+            except StopAsyncIteration:
+                return
+            finally:
+                if token is not None:
+                    _current_operation.reset(token)
+            yield item
+    finally:
+        aclose = getattr(iterator, "aclose", None)
+        if aclose is not None:
+            await aclose()
+
+
+def _parse_query_metrics(raw: str) -> dict[str, float]:
+    """Parse ``key=value;key=value`` query metrics from the response header."""
+    metrics = {}
+    for part in raw.split(";"):
+        key, _, value = part.partition("=")
+        try:
+            metrics[key.strip()] = float(value)
+        except ValueError:
+            continue
+    return metrics
@@ -0,0 +1,189 @@
+"""Throttling-aware retries and in-flight limits for Cosmos DB access.
+
+Each container gets a ``ThrottleGuard`` that caps the number of concurrent
+requests and retries requests rejected with 429 (request rate too large).
+The retry delay honours the server-provided ``x-ms-retry-after-ms`` and
+adds jittered exponential backoff so that throttled callers do not retry
+in lockstep. The SDK's own throttle retries are disabled in
+``CosmosDBClient`` so that every 429 is counted here.
+"""
+
+import asyncio
+import logging
+import random
+from collections.abc import AsyncIterator, Awaitable, Callable
+from contextlib import asynccontextmanager
+from typing import TypeVar
+
+from azure.cosmos.exceptions import CosmosHttpResponseError
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+THROTTLED_STATUS = 429
+RETRY_AFTER_HEADER = "x-ms-retry-after-ms"
+
+
+class ThrottleGuard:
+    """In-flight limiter and 429 retry policy for one container."""
+
+    def __init__(
+        self,
+        name: str,
+        max_in_flight: int = 32,
+        max_retries: int = 8,
+        base_delay_ms: float = 100,
+        max_delay_ms: float = 10_000,
+    ):
+        """Initialize guard.
+
+        Args:
+            name: Container name used in logs and stats
+            max_in_flight: Maximum concurrent requests (0 = unlimited)
+            max_retries: Retries of a throttled request before giving up
+            base_delay_ms: Backoff of the first retry
+            max_delay_ms: Upper bound of the exponential backoff
+        """
+        self.name = name
+        self.max_in_flight = max_in_flight
+        self.max_retries = max_retries
+        self.base_delay_ms = base_delay_ms
+        self.max_delay_ms = max_delay_ms
+        self._semaphore = asyncio.Semaphore(max_in_flight) if max_in_flight > 0 else None
+        self.requests = 0
+        self.throttled = 0
+        self.retries = 0
+        self.exhausted = 0
+        self.retry_wait_ms = 0.0
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self.queued = 0
+        self.peak_queued = 0
+
+    async def run(self, operation: Callable[[], Awaitable[T]]) -> T:
+        """Run a Cosmos DB request within the limit, retrying when throttled.
+
+        Args:
+            operation: Callable that starts the request (called again on retry)
+
+        Returns:
+            Result of the request
+
+        Raises:
+            CosmosHttpResponseError: When the request fails with another status
+                or is still throttled after ``max_retries`` retries
+        """
+        attempt = 0
+        while True:
+            try:
+                async with self.slot():
+                    return await operation()
+            except CosmosHttpResponseError as e:
+                if not await self.backoff(e, attempt):
+                    raise
+                attempt += 1
+
+    @asynccontextmanager
+    async def slot(self) -> AsyncIterator[None]:
+        """Hold one in-flight request slot (waits while the limit is reached)."""
+        self.requests += 1
+        if self._semaphore is None:
+            self._enter()
+            try:
+                yield
+            finally:
+                self.in_flight -= 1
+            return
+
+        self.queued += 1
+        self.peak_queued = max(self.peak_queued, self.queued)
+        try:
+            await self._semaphore.acquire()
+        finally:
+            self.queued -= 1
+        self._enter()
+        try:
+            yield
+        finally:
+            self.in_flight -= 1
+            self._semaphore.release()
+
+    async def backoff(self, error: Exception, attempt: int) -> bool:
+        """Wait before retrying a throttled request.
+
+        Args:
+            error: Exception raised by the request
+            attempt: Number of retries already made for this request
+
+        Returns:
+            True after waiting if the request should be retried, False if the
+            error is not a throttle or retries are exhausted
+        """
+        if not is_throttled(error):
+            return False
+        self.throttled += 1
+        if attempt >= self.max_retries:
+            self.exhausted += 1
+            logger.error(f"{self.name}: still throttled after {attempt} retries, giving up")
+            return False
+
+        delay_ms = self.retry_delay_ms(error, attempt)
+        self.retries += 1
+        self.retry_wait_ms += delay_ms
+        logger.warning(
+            f"{self.name}: throttled (429), retry {attempt + 1}/{self.max_retries} "
+            f"in {delay_ms:.0f}ms"
+        )
+        await asyncio.sleep(delay_ms / 1000)
+        return True
+
+    def retry_delay_ms(self, error: Exception, attempt: int) -> float:
+        """Compute the delay before the next retry.
+
+        The server-provided retry-after is a lower bound (stretched by up to
+        25% so that callers spread out); full-jitter exponential backoff
+        covers responses without it and repeated throttling.
+
+        Args:
+            error: Throttling exception
+            attempt: Number of retries already made
+
+        Returns:
+            Delay in milliseconds
+        """
+        backoff = random.uniform(0, min(self.max_delay_ms, self.base_delay_ms * 2**attempt))
+        return max(retry_after_ms(error) * random.uniform(1.0, 1.25), backoff)
+
+    def stats(self) -> dict:
+        """Get limiter and retry counters."""
+        return {
+            "max_in_flight": self.max_in_flight,
+            "in_flight": self.in_flight,
+            "peak_in_flight": self.peak_in_flight,
+            "queued": self.queued,
+            "peak_queued": self.peak_queued,
+            "requests": self.requests,
+            "throttled": self.throttled,
+            "retries": self.retries,
+            "exhausted": self.exhausted,
+            "retry_wait_ms": round(self.retry_wait_ms, 1),
+        }
+
+    def _enter(self) -> None:
+        self.in_flight += 1
+        self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+
+
+def is_throttled(error: Exception) -> bool:
+    """Whether an exception is a 429 (request rate too large) response."""
+    return isinstance(error, CosmosHttpResponseError) and error.status_code == THROTTLED_STATUS
+
+
+def retry_after_ms(error: Exception) -> float:
+    """Get the server-provided retry delay of a throttled response (0 if absent)."""
+    headers = getattr(error, "headers", None) or {}
+    try:
+        return float(headers.get(RETRY_AFTER_HEADER) or 0)
+    except (TypeError, ValueError):
+        return 0.0
@@ -0,0 +1,320 @@
+"""Application-scoped resources (storage backend and repositories).
+
+Resources are opened once per worker process by the FastAPI lifespan in
+``main.py`` and shared by routes, services and agent tools. Standalone
+scripts call ``init_resources()`` / ``close_resources()`` themselves.
+"""
+
+import logging
+
+from app.core.config import settings
+from app.core.database import CosmosDBClient
+from app.core.memory_store import MemoryStorage
+from app.core.sqlite_store import SQLiteStorage
+from app.core.storage import StorageBackend
+from app.repositories.cache import EntityCache
+from app.repositories.conversation import ConversationRepository
+from app.repositories.conversation_writer import ConversationWriter
+from app.repositories.customer import CustomerRepository
+from app.repositories.deal import DealRepository
+from app.repositories.deal_summary import DealSummaryRepository, rebuild_deal_summary
+from app.repositories.deal_vectors import DealVectorIndex
+from app.repositories.deal_views import DEAL_VIEWS, DealViewRepository, DealViewSyncJob
+from app.repositories.replica import ContainerReplica
+from app.repositories.search_index import CustomerSearchIndex
+from app.repositories.user import UserRepository
+
+logger = logging.getLogger(__name__)
+
+
+class AppResources:
+    """Container for resources shared across the worker."""
+
+    def __init__(self, storage: StorageBackend):
+        """Initialize repositories on top of a shared storage backend.
+
+        Args:
+            storage: Opened storage backend
+        """
+        self.storage = storage
+        self.caches = {
+            "Users": _build_cache("Users", settings.USER_CACHE_TTL_SECONDS),
+            "Customers": _build_cache("Customers", settings.CUSTOMER_CACHE_TTL_SECONDS),
+            "Deals": _build_cache("Deals", settings.DEAL_CACHE_TTL_SECONDS),
+        }
+        self.user_repo = UserRepository(storage, self.caches["Users"])
+        self.customer_repo = CustomerRepository(storage, self.caches["Customers"])
+        self.deal_repo = DealRepository(storage, self.caches["Deals"])
+        self.conversation_repo = ConversationRepository(storage)
+        self.conversation_writer = ConversationWriter(
+            self.conversation_repo,
+            max_attempts=settings.CONVERSATION_WRITE_MAX_ATTEMPTS,
+            retry_base_delay_ms=settings.CONVERSATION_WRITE_RETRY_BASE_DELAY_MS,
+            retry_max_delay_ms=settings.CONVERSATION_WRITE_RETRY_MAX_DELAY_MS,
+        )
+        self.replicas: dict[str, ContainerReplica] = {}
+        if settings.REPLICA_ENABLED:
+            self._attach_replicas()
+        self.search_index: CustomerSearchIndex | None = None
+        if settings.SEARCH_INDEX_ENABLED:
+            self._attach_search_index()
+        self.vector_index: DealVectorIndex | None = None
+        if settings.VECTOR_INDEX_ENABLED:
+            self._attach_vector_index()
+        self.deal_views: list[DealViewRepository] = []
+        self.deal_view_sync: DealViewSyncJob | None = None
+        if settings.DEAL_VIEWS_ENABLED:
+            self._attach_deal_views()
+        self.deal_summary: DealSummaryRepository | None = None
+        if settings.DEAL_SUMMARY_ENABLED:
+            self.deal_summary = DealSummaryRepository(storage)
+            self.deal_repo.attach_summary(self.deal_summary)
+
+    def _attach_replicas(self) -> None:
+        """Create change-feed replicas and attach them to the repositories."""
+        for repo, index_fields in (
+            (self.user_repo, ("department", "role")),
+            (self.customer_repo, ("industry",)),
+            (self.deal_repo, ("sales_user_id", "customer_id", "deal_stage", "service_type")),
+        ):
+            replica = ContainerReplica(
+                repo.container,
+                name=repo.container_name,
+                index_fields=index_fields,
+                poll_interval_seconds=settings.REPLICA_POLL_INTERVAL_SECONDS,
+                resync_interval_seconds=settings.REPLICA_RESYNC_INTERVAL_SECONDS,
+                guard=repo.guard,
+            )
+            repo.attach_replica(replica)
+            self.replicas[repo.container_name] = replica
+
+    def _attach_search_index(self) -> None:
+        """Create the customer search index on top of the replicas."""
+        if not self.replicas:
+            logger.warning("SEARCH_INDEX_ENABLED requires REPLICA_ENABLED; search index disabled")
+            return
+        self.search_index = CustomerSearchIndex(self.replicas["Customers"], self.replicas["Deals"])
+        self.customer_repo.attach_search_index(self.search_index)
+
+    def _attach_vector_index(self) -> None:
+        """Create the deal notes vector index on top of the Deals replica."""
+        if not self.replicas:
+            logger.warning("VECTOR_INDEX_ENABLED requires REPLICA_ENABLED; vector index disabled")
+            return
+        self.vector_index = DealVectorIndex(dim=settings.VECTOR_INDEX_DIM)
+        self.vector_index.attach(self.replicas["Deals"])
+        self.deal_repo.attach_vector_index(self.vector_index)
+
+    def _attach_deal_views(self) -> None:
+        """Create materialized deal views and attach them to the deal repository."""
+        self.deal_views = [
+            DealViewRepository(name, key_field, self.storage)
+            for name, key_field in DEAL_VIEWS.items()
+        ]
+        self.deal_repo.attach_views(self.deal_views)
+        if settings.DEAL_VIEW_SYNC_ENABLED:
+            self.deal_view_sync = DealViewSyncJob(
+                self.deal_repo.container,
+                self.deal_views,
+                poll_interval_seconds=settings.DEAL_VIEW_SYNC_INTERVAL_SECONDS,
+            )
+
+    async def start(self) -> None:
+        """Start background tasks and build the deal summary if it does not exist yet."""
+        for replica in self.replicas.values():
+            await replica.start()
+        if self.deal_view_sync:
+            await self.deal_view_sync.start()
+        if self.deal_summary:
+            await self._ensure_deal_summary()
+
+    async def _ensure_deal_summary(self) -> None:
+        """Build the deal summary if it does not exist yet (aggregate queries serve meanwhile)."""
+        try:
+            if await self.deal_summary.get_summary() is None:
+                logger.info("Deal summary not found; building it from Deals")
+                await rebuild_deal_summary(self.deal_repo, self.deal_summary)
+        except Exception as e:
+            logger.error(
+                f"Could not build the deal summary (is the {self.deal_summary.container_name} "
+                f"container created?): {e}"
+            )
+
+    def cache_stats(self) -> dict[str, dict]:
+        """Get entity cache counters per container.
+
+        Returns:
+            Dict of container name to cache stats
+        """
+        return {name: cache.stats() for name, cache in self.caches.items()}
+
+    def replica_stats(self) -> dict[str, dict]:
+        """Get replica status per container.
+
+        Returns:
+            Dict of container name to replica stats
+        """
+        return {name: replica.stats() for name, replica in self.replicas.items()}
+
+    def search_index_stats(self) -> dict | None:
+        """Get customer search index status.
+
+        Returns:
+            Dict of index counters, or None when the index is disabled
+        """
+        return self.search_index.stats() if self.search_index else None
+
+    def vector_index_stats(self) -> dict | None:
+        """Get deal vector index status.
+
+        Returns:
+            Dict of index counters, or None when the index is disabled
+        """
+        return self.vector_index.stats() if self.vector_index else None
+
+    def deal_view_stats(self) -> dict:
+        """Get materialized deal view status.
+
+        Returns:
+            Dict with the enabled views and change feed sync job counters
+        """
+        return {
+            "views": {view.container_name: view.key_field for view in self.deal_views},
+            "sync_job": self.deal_view_sync.stats() if self.deal_view_sync else None,
+        }
+
+    def conversation_write_stats(self) -> dict:
+        """Get write-behind queue counters of chat turns.
+
+        Returns:
+            Dict of queue counters
+        """
+        return self.conversation_writer.stats()
+
+    def repository_stats(self) -> dict:
+        """Get per-operation Cosmos DB statistics and recent slow calls.
+
+        Returns:
+            Dict with ``operations`` (most expensive first) and ``slow_queries``
+        """
+        metrics = self.storage.metrics
+        return {"operations": metrics.stats(), "slow_queries": list(metrics.slow_queries)}
+
+    def throttle_stats(self) -> dict[str, dict]:
+        """Get in-flight limiter and 429 retry counters per container.
+
+        Returns:
+            Dict of container name to throttling stats
+        """
+        return self.storage.throttle_stats()
+
+    def reset_repository_stats(self) -> None:
+        """Clear per-operation statistics and the slow query log."""
+        self.storage.metrics.reset()
+
+    async def close(self) -> None:
+        """Release all resources (queued conversation writes are drained first)."""
+        await self.conversation_writer.close(settings.CONVERSATION_WRITE_DRAIN_TIMEOUT_SECONDS)
+        for replica in self.replicas.values():
+            await replica.stop()
+        if self.deal_view_sync:
+            await self.deal_view_sync.stop()
+        await self.storage.close()
+
+
+def _build_cache(container_name: str, ttl_seconds: float) -> EntityCache:
+    """Build the entity cache for a container from settings."""
+    return EntityCache(
+        name=container_name,
+        max_items=settings.ENTITY_CACHE_MAX_ITEMS,
+        ttl_seconds=ttl_seconds,
+        negative_ttl_seconds=settings.NEGATIVE_CACHE_TTL_SECONDS,
+    )
+
+
+def open_storage() -> StorageBackend:
+    """Open the storage backend selected by ``settings.STORAGE_BACKEND``.
+
+    Returns:
+        Opened storage backend
+
+    Raises:
+        ValueError: If the backend name is unknown
+    """
+    if settings.STORAGE_BACKEND == "cosmos":
+        return CosmosDBClient()
+    if settings.STORAGE_BACKEND == "sqlite":
+        return SQLiteStorage(settings.SQLITE_PATH, pool_size=settings.SQLITE_POOL_SIZE)
+    if settings.STORAGE_BACKEND == "memory":
+        storage = MemoryStorage(
+            latency_ms=settings.MEMORY_STORE_LATENCY_MS,
+            latency_jitter_ms=settings.MEMORY_STORE_LATENCY_JITTER_MS,
+            seed=settings.MEMORY_STORE_RANDOM_SEED,
+        )
+        _seed_memory_storage(storage, settings.MEMORY_STORE_SEED_DATA)
+        return storage
+    raise ValueError(f"Unknown STORAGE_BACKEND: {settings.STORAGE_BACKEND}")
+
+
+def _seed_memory_storage(storage: MemoryStorage, seed_data: str) -> None:
+    """Load demo or synthetic data into a fresh in-memory backend."""
+    # Imported here: initializers are scripts built on top of the core modules
+    from app.initializers.generate_data import SyntheticDataGenerator
+    from app.initializers.seed_data import DEMO_CUSTOMERS, DEMO_DEALS, DEMO_USERS
+
+    if seed_data == "demo":
+        sources = {"Users": DEMO_USERS, "Customers": DEMO_CUSTOMERS, "Deals": DEMO_DEALS}
+    elif seed_data == "synthetic":
+        generator = SyntheticDataGenerator(
+            num_deals=settings.MEMORY_STORE_SYNTHETIC_DEALS, seed=settings.MEMORY_STORE_RANDOM_SEED
+        )
+        sources = {
+            "Users": generator.users(),
+            "Customers": generator.customers(),
+            "Deals": generator.iter_deals(),
+        }
+    else:
+        return
+    for name, items in sources.items():
+        count = storage.load(name, items)
+        logger.info(f"Loaded {count} {seed_data} items into in-memory {name}")
+
+
+_resources: AppResources | None = None
+
+
+async def init_resources() -> AppResources:
+    """Open application resources (idempotent).
+
+    Returns:
+        AppResources instance
+    """
+    global _resources
+    if _resources is None:
+        _resources = AppResources(open_storage())
+        await _resources.start()
+        logger.info("Application resources initialized")
+    return _resources
+
+
+async def close_resources() -> None:
+    """Close application resources if they were opened."""
+    global _resources
+    if _resources is not None:
+        await _resources.close()
+        _resources = None
+        logger.info("Application resources closed")
+
+
+def get_resources() -> AppResources:
+    """Get the opened application resources.
+
+    Returns:
+        AppResources instance
+
+    Raises:
+        RuntimeError: If resources have not been initialized
+    """
+    if _resources is None:
+        raise RuntimeError("Application resources are not initialized")
+    return _resources
@@ -0,0 +1,465 @@
+"""Parser for the Cosmos DB SQL subset generated by the repositories.
+
+Used by the storage backends that are not Cosmos DB: ``MemoryStorage``
+evaluates the parsed query in Python, ``SQLiteStorage`` compiles it to
+SQLite SQL. Supported syntax:
+
+- ``SELECT [TOP n] * | c.a, c.b FROM c``
+- ``SELECT VALUE COUNT(1) | SUM(c.a) FROM c`` and ``SELECT DISTINCT VALUE c.a FROM c``
+- ``WHERE`` with ``AND`` / ``OR`` / ``NOT``, parentheses, comparisons
+  (``= != <> < <= > >=``), ``CONTAINS``, ``STARTSWITH``,
+  ``ARRAY_CONTAINS``, ``IS_DEFINED``, ``IS_NUMBER``, ``LOWER`` and ``UPPER``
+- ``ORDER BY`` on one or more fields, ``OFFSET n LIMIT m``
+- ``@name`` parameters and string / number / boolean / null literals
+
+Expressions are parsed into tuples:
+
+- ``("path", "a.b")``, ``("param", "@name")``, ``("literal", value)``
+- ``("neg", expr)``, ``("not", expr)``, ``("and", [exprs])``, ``("or", [exprs])``
+- ``("cmp", operator, left, right)``, ``("call", FUNCTION, [args])``
+- ``("aggregate", COUNT | SUM, arg)`` (``SELECT VALUE`` only)
+"""
+
+import re
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass, field
+from typing import Any
+
+from azure.cosmos.exceptions import CosmosHttpResponseError
+
+Expr = tuple
+
+FUNCTIONS = (
+    "CONTAINS",
+    "STARTSWITH",
+    "ARRAY_CONTAINS",
+    "IS_DEFINED",
+    "IS_NUMBER",
+    "LOWER",
+    "UPPER",
+)
+
+AGGREGATES = ("COUNT", "SUM")
+
+_TOKEN = re.compile(
+    r"""\s*(?:
+        (?P<number>\d+(?:\.\d+)?)
+      | (?P<string>'(?:[^'\\]|\\.)*'|"(?:[^"\\]|\\.)*")
+      | (?P<param>@\w+)
+      | (?P<op><=|>=|!=|<>|=|<|>|\(|\)|,|\*|-)
+      | (?P<name>[A-Za-z_][\w.]*)
+    )""",
+    re.VERBOSE,
+)
+
+_CONSTANTS = {"TRUE": True, "FALSE": False, "NULL": None}
+
+# Marker for a missing field (Cosmos ``undefined``)
+UNDEFINED = object()
+
+
+@dataclass
+class ParsedQuery:
+    """Parsed ``SELECT`` query."""
+
+    fields: list[str] | None = None
+    # SELECT VALUE expression (a field path or an aggregate); results are bare values
+    value: Expr | None = None
+    distinct: bool = False
+    top: int | None = None
+    where: Expr | None = None
+    order_by: list[tuple[str, bool]] = field(default_factory=list)
+    offset: int = 0
+    limit: int | None = None
+
+    def execute(self, items: Iterable[dict], params: dict) -> list[dict]:
+        """Evaluate the query over items in memory (filter, sort, slice, project).
+
+        Args:
+            items: Candidate items
+            params: Parameter values by name (``@name``)
+
+        Returns:
+            Result items (bare values for ``SELECT VALUE``)
+        """
+        where = compile_predicate(self.where) if self.where else None
+        results = [item for item in items if where is None or where(item, params) is True]
+        if self.value is not None and self.value[0] == "aggregate":
+            return _aggregate(self.value, results, params)
+        for path, descending in reversed(self.order_by):
+            results.sort(key=lambda item: _sort_key(resolve(item, path)), reverse=descending)
+        if self.value is not None:
+            results = self.select_values(results, params)
+        end = None if self.limit is None else self.offset + self.limit
+        results = results[self.offset : end]
+        if self.top is not None:
+            results = results[: self.top]
+        if self.value is not None:
+            return results
+        return [self.project(item) for item in results]
+
+    def select_values(self, items: list[dict], params: dict) -> list:
+        """Evaluate the ``SELECT VALUE`` expression (undefined values are omitted)."""
+        expr = compile_predicate(self.value)
+        values = [value for item in items if (value := expr(item, params)) is not UNDEFINED]
+        if not self.distinct:
+            return values
+        seen = set()
+        distinct = []
+        for value in values:
+            key = _sort_key(value) if not isinstance(value, list | dict) else repr(value)
+            if key not in seen:
+                seen.add(key)
+                distinct.append(value)
+        return distinct
+
+    def project(self, item: dict) -> dict:
+        """Apply the SELECT list to an item (undefined fields are omitted)."""
+        if self.fields is None:
+            return item
+        return {
+            path.rsplit(".", 1)[-1]: value
+            for path in self.fields
+            if (value := resolve(item, path)) is not UNDEFINED
+        }
+
+
+def parse_query(query: str) -> ParsedQuery:
+    """Parse a query of the supported SQL subset.
+
+    Args:
+        query: Cosmos DB SQL query
+
+    Returns:
+        Parsed query
+
+    Raises:
+        CosmosHttpResponseError: 400 if the query is outside the subset
+    """
+    try:
+        return _Parser(_tokenize(query)).parse()
+    except (ValueError, IndexError) as e:
+        raise CosmosHttpResponseError(
+            status_code=400, message=f"Unsupported query: {e}: {query}"
+        ) from e
+
+
+def resolve(item: dict, path: str) -> Any:
+    """Get a (dotted) field of an item, or ``UNDEFINED`` if it is missing."""
+    value: Any = item
+    for part in path.split("."):
+        if not isinstance(value, dict) or part not in value:
+            return UNDEFINED
+        value = value[part]
+    return value
+
+
+def _tokenize(query: str) -> list[tuple[str, str]]:
+    tokens = []
+    position = 0
+    query = query.strip()
+    while position < len(query):
+        match = _TOKEN.match(query, position)
+        if not match:
+            raise ValueError(f"unexpected character at {position}")
+        kind = match.lastgroup
+        tokens.append((kind, match.group(kind)))
+        position = match.end()
+    return tokens
+
+
+class _Parser:
+    """Recursive descent parser of the SQL subset."""
+
+    def __init__(self, tokens: list[tuple[str, str]]):
+        self.tokens = tokens
+        self.position = 0
+
+    # Token helpers
+
+    def peek(self) -> tuple[str, str] | None:
+        return self.tokens[self.position] if self.position < len(self.tokens) else None
+
+    def next(self) -> tuple[str, str]:
+        token = self.tokens[self.position]
+        self.position += 1
+        return token
+
+    def keyword(self, *words: str) -> bool:
+        """Consume the next token if it is one of the keywords."""
+        token = self.peek()
+        if token and token[0] == "name" and token[1].upper() in words:
+            self.position += 1
+            return True
+        return False
+
+    def expect_keyword(self, word: str) -> None:
+        if not self.keyword(word):
+            raise ValueError(f"expected {word}")
+
+    def op(self, *ops: str) -> str | None:
+        token = self.peek()
+        if token and token[0] == "op" and token[1] in ops:
+            self.position += 1
+            return token[1]
+        return None
+
+    def expect_op(self, value: str) -> None:
+        if not self.op(value):
+            raise ValueError(f"expected '{value}'")
+
+    def integer(self) -> int:
+        kind, value = self.next()
+        if kind != "number":
+            raise ValueError("expected a number")
+        return int(value)
+
+    def path(self) -> str:
+        kind, value = self.next()
+        if kind != "name" or not value.startswith("c."):
+            raise ValueError(f"expected a field reference, got {value}")
+        return value[2:]
+
+    # Grammar
+
+    def parse(self) -> ParsedQuery:
+        parsed = ParsedQuery()
+        self.expect_keyword("SELECT")
+        parsed.distinct = self.keyword("DISTINCT")
+        if self.keyword("TOP"):
+            parsed.top = self.integer()
+        if self.keyword("VALUE"):
+            parsed.value = self.value_expr()
+        elif parsed.distinct:
+            raise ValueError("DISTINCT is supported with VALUE only")
+        elif not self.op("*"):
+            parsed.fields = [self.path()]
+            while self.op(","):
+                parsed.fields.append(self.path())
+        self.expect_keyword("FROM")
+        if self.next() != ("name", "c"):
+            raise ValueError("expected FROM c")
+        if self.keyword("WHERE"):
+            parsed.where = self.or_expr()
+        if self.keyword("ORDER"):
+            self.expect_keyword("BY")
+            while True:
+                path = self.path()
+                descending = self.keyword("DESC")
+                if not descending:
+                    self.keyword("ASC")
+                parsed.order_by.append((path, descending))
+                if not self.op(","):
+                    break
+        if self.keyword("OFFSET"):
+            parsed.offset = self.integer()
+            self.expect_keyword("LIMIT")
+            parsed.limit = self.integer()
+        if self.peek() is not None:
+            raise ValueError(f"unexpected {self.peek()[1]}")
+        aggregate = parsed.value is not None and parsed.value[0] == "aggregate"
+        if aggregate and (parsed.distinct or parsed.order_by):
+            raise ValueError("aggregates do not support DISTINCT or ORDER BY")
+        return parsed
+
+    def value_expr(self) -> Expr:
+        kind, value = self.peek() or ("", "")
+        if kind == "name" and value.upper() in AGGREGATES:
+            self.next()
+            self.expect_op("(")
+            arg = self.operand()
+            self.expect_op(")")
+            if value.upper() == "SUM" and arg[0] != "path":
+                raise ValueError("SUM requires a field reference")
+            return ("aggregate", value.upper(), arg)
+        return ("path", self.path())
+
+    def or_expr(self) -> Expr:
+        terms = [self.and_expr()]
+        while self.keyword("OR"):
+            terms.append(self.and_expr())
+        return terms[0] if len(terms) == 1 else ("or", terms)
+
+    def and_expr(self) -> Expr:
+        terms = [self.not_expr()]
+        while self.keyword("AND"):
+            terms.append(self.not_expr())
+        return terms[0] if len(terms) == 1 else ("and", terms)
+
+    def not_expr(self) -> Expr:
+        if self.keyword("NOT"):
+            return ("not", self.not_expr())
+        return self.comparison()
+
+    def comparison(self) -> Expr:
+        left = self.operand()
+        operator = self.op("=", "!=", "<>", "<", "<=", ">", ">=")
+        if operator is None:
+            return left
+        return ("cmp", "!=" if operator == "<>" else operator, left, self.operand())
+
+    def operand(self) -> Expr:
+        if self.op("("):
+            inner = self.or_expr()
+            self.expect_op(")")
+            return inner
+        kind, value = self.next()
+        if kind == "param":
+            return ("param", value)
+        if kind == "string":
+            return ("literal", value[1:-1].replace("\\'", "'").replace('\\"', '"'))
+        if kind == "number":
+            return ("literal", float(value) if "." in value else int(value))
+        if kind == "op" and value == "-":
+            return ("neg", self.operand())
+        if kind != "name":
+            raise ValueError(f"unexpected {value}")
+        upper = value.upper()
+        if upper in _CONSTANTS:
+            return ("literal", _CONSTANTS[upper])
+        if value.startswith("c."):
+            return ("path", value[2:])
+        if upper in FUNCTIONS:
+            self.expect_op("(")
+            args = [self.or_expr()]
+            while self.op(","):
+                args.append(self.or_expr())
+            self.expect_op(")")
+            return ("call", upper, args)
+        raise ValueError(f"unsupported identifier {value}")
+
+
+# ============================================================
+# In-memory evaluation (Cosmos semantics)
+# ============================================================
+
+Predicate = Callable[[dict, dict], Any]
+
+
+def compile_predicate(expr: Expr) -> Predicate:
+    """Compile an expression into a function of (item, params)."""
+    kind = expr[0]
+    if kind == "path":
+        path = expr[1]
+        return lambda item, params: resolve(item, path)
+    if kind == "param":
+        name = expr[1]
+        return lambda item, params: params.get(name, UNDEFINED)
+    if kind == "literal":
+        value = expr[1]
+        return lambda item, params: value
+    if kind == "neg":
+        inner = compile_predicate(expr[1])
+        return lambda item, params: -inner(item, params)
+    if kind == "not":
+        inner = compile_predicate(expr[1])
+        return lambda item, params: inner(item, params) is not True
+    if kind in ("and", "or"):
+        terms = [compile_predicate(term) for term in expr[1]]
+        combine = all if kind == "and" else any
+        return lambda item, params: combine(term(item, params) is True for term in terms)
+    if kind == "cmp":
+        compare = _COMPARISONS[expr[1]]
+        left, right = compile_predicate(expr[2]), compile_predicate(expr[3])
+        return lambda item, params: compare(left(item, params), right(item, params))
+    if kind == "call":
+        function = _FUNCTIONS[expr[1]]
+        args = [compile_predicate(arg) for arg in expr[2]]
+        return lambda item, params: function(*(arg(item, params) for arg in args))
+    raise ValueError(f"unknown expression {kind}")
+
+
+def _aggregate(expr: Expr, items: list[dict], params: dict) -> list:
+    """Evaluate ``COUNT`` / ``SUM`` over the matching items (Cosmos semantics)."""
+    _, name, arg = expr
+    argument = compile_predicate(arg)
+    values = [value for item in items if (value := argument(item, params)) is not UNDEFINED]
+    if name == "COUNT":
+        return [len(values)]
+    if any(isinstance(value, bool) or not isinstance(value, int | float) for value in values):
+        # A non-number makes the sum undefined: no result row
+        return []
+    return [sum(values)]
+
+
+def _type_group(value: Any) -> type:
+    if isinstance(value, bool):
+        return bool
+    if isinstance(value, int | float):
+        return float
+    return type(value)
+
+
+def _compare(check: Callable[[Any, Any], bool]) -> Callable[[Any, Any], Any]:
+    """Comparison with Cosmos semantics: values of different types are undefined."""
+
+    def compare(left: Any, right: Any) -> Any:
+        if left is UNDEFINED or right is UNDEFINED:
+            return UNDEFINED
+        if _type_group(left) is not _type_group(right):
+            return UNDEFINED
+        if left is None:
+            return check(0, 0)
+        return check(left, right)
+
+    return compare
+
+
+_COMPARISONS = {
+    "=": _compare(lambda a, b: a == b),
+    "!=": _compare(lambda a, b: a != b),
+    "<": _compare(lambda a, b: a < b),
+    "<=": _compare(lambda a, b: a <= b),
+    ">": _compare(lambda a, b: a > b),
+    ">=": _compare(lambda a, b: a >= b),
+}
+
+
+def _contains(text: Any, fragment: Any, ignore_case: Any = False) -> Any:
+    if not isinstance(text, str) or not isinstance(fragment, str):
+        return UNDEFINED
+    if ignore_case is True:
+        return fragment.casefold() in text.casefold()
+    return fragment in text
+
+
+def _startswith(text: Any, prefix: Any, ignore_case: Any = False) -> Any:
+    if not isinstance(text, str) or not isinstance(prefix, str):
+        return UNDEFINED
+    if ignore_case is True:
+        return text.casefold().startswith(prefix.casefold())
+    return text.startswith(prefix)
+
+
+def _array_contains(values: Any, value: Any, partial: Any = False) -> Any:
+    if not isinstance(values, list) or value is UNDEFINED:
+        return UNDEFINED
+    if partial is True and isinstance(value, dict):
+        return any(
+            isinstance(entry, dict) and all(entry.get(k) == v for k, v in value.items())
+            for entry in values
+        )
+    return value in values
+
+
+_FUNCTIONS: dict[str, Callable[..., Any]] = {
+    "CONTAINS": _contains,
+    "STARTSWITH": _startswith,
+    "ARRAY_CONTAINS": _array_contains,
+    "IS_DEFINED": lambda value: value is not UNDEFINED,
+    "IS_NUMBER": lambda value: isinstance(value, int | float) and not isinstance(value, bool),
+    "LOWER": lambda value: value.lower() if isinstance(value, str) else UNDEFINED,
+    "UPPER": lambda value: value.upper() if isinstance(value, str) else UNDEFINED,
+}
+
+# Cosmos ORDER BY: undefined < null < false < true < numbers < strings
+_TYPE_ORDER = {type(None): 1, bool: 2, int: 3, float: 3, str: 4}
+
+
+def _sort_key(value: Any) -> tuple:
+    if value is UNDEFINED:
+        return (0, 0)
+    rank = _TYPE_ORDER.get(type(value), 5)
+    if rank in (1, 5):
+        return (rank, 0)
+    return (rank, value)
@@ -0,0 +1,585 @@
+"""Embedded SQLite storage backend for single-node deployments.
+
+Each container is a table holding the item as a JSON document next to its
+partition key, id, ETag and change feed position::
+
+    pk TEXT, id TEXT, doc TEXT CHECK (json_valid(doc)), etag TEXT, lsn INTEGER
+
+Frequently filtered fields get B-tree indexes on ``json_extract(doc, ...)``
+(see ``INDEXED_FIELDS``); the queries of the repositories are compiled from
+the Cosmos SQL subset (``app.core.sql_subset``) to SQLite SQL using the same
+expressions, so those indexes are used. The database runs in WAL mode so
+readers do not block the writer, and calls run on a small pool of
+connections in worker threads to keep the event loop free.
+"""
+
+import asyncio
+import contextlib
+import json
+import logging
+import sqlite3
+import time
+import uuid
+from collections.abc import AsyncIterator, Callable
+from pathlib import Path
+from typing import Any
+
+from azure.cosmos.exceptions import CosmosResourceExistsError, CosmosResourceNotFoundError
+
+from app.core.sql_subset import Expr, ParsedQuery, parse_query
+from app.core.storage import (
+    PARTITION_KEYS,
+    StorageBackend,
+    check_precondition,
+    report_response,
+)
+
+logger = logging.getLogger(__name__)
+
+# B-tree indexes per container (a tuple is a composite index)
+INDEXED_FIELDS: dict[str, tuple[str | tuple[str, ...], ...]] = {
+    "Deals": ("sales_user_id", "customer_id", "deal_stage", "service_type"),
+    # (user_id, updated_at) serves "conversations of a user, newest first" without a sort
+    "ConversationSummaries": (("user_id", "updated_at"),),
+    # Messages of a conversation in append order
+    "ConversationMessages": (("conversation_id", "seq"),),
+}
+
+DEFAULT_PAGE_SIZE = 100
+
+# Keep read-many statements well under SQLite's bound parameter limit
+READ_MANY_CHUNK = 400
+
+
+class SQLitePool:
+    """Fixed-size pool of SQLite connections used from worker threads."""
+
+    def __init__(self, path: str, size: int = 4, busy_timeout_ms: int = 5000):
+        """Open connections.
+
+        Args:
+            path: Database file path
+            size: Number of connections
+            busy_timeout_ms: Wait for the write lock before failing
+        """
+        self._connections = [self._connect(path, busy_timeout_ms) for _ in range(max(1, size))]
+        self._idle: asyncio.Queue[sqlite3.Connection] = asyncio.Queue()
+        for connection in self._connections:
+            self._idle.put_nowait(connection)
+
+    @staticmethod
+    def _connect(path: str, busy_timeout_ms: int) -> sqlite3.Connection:
+        # Autocommit mode: write transactions are opened explicitly (BEGIN IMMEDIATE)
+        connection = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=NORMAL")
+        connection.execute(f"PRAGMA busy_timeout={int(busy_timeout_ms)}")
+        return connection
+
+    async def run(self, function: Callable[..., Any], *args: Any) -> Any:
+        """Run ``function(connection, *args)`` on a pooled connection in a thread."""
+        connection = await self._idle.get()
+        try:
+            return await asyncio.to_thread(function, connection, *args)
+        finally:
+            self._idle.put_nowait(connection)
+
+    def close(self) -> None:
+        """Close every connection."""
+        for connection in self._connections:
+            connection.close()
+        self._connections.clear()
+
+
+class SQLiteStorage(StorageBackend):
+    """Storage backend keeping every container in one SQLite database."""
+
+    def __init__(self, path: str, pool_size: int = 4):
+        """Open the database (created if missing).
+
+        Args:
+            path: Database file path
+            pool_size: Number of pooled connections
+        """
+        super().__init__()
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self.path = path
+        self.pool = SQLitePool(path, pool_size)
+        self._containers: dict[str, SQLiteContainer] = {}
+        logger.info(f"SQLite storage opened: {path} (pool size: {pool_size})")
+
+    def get_container(self, container_name: str) -> "SQLiteContainer":
+        """Get container (its table and indexes are created on first use)."""
+        container = self._containers.get(container_name)
+        if container is None:
+            self._create_table(container_name)
+            container = SQLiteContainer(
+                container_name, PARTITION_KEYS.get(container_name, "id"), self.pool
+            )
+            self._containers[container_name] = container
+        return container
+
+    def _create_table(self, name: str) -> None:
+        table = _quote(name)
+        statements = [
+            f"""CREATE TABLE IF NOT EXISTS {table} (
+                pk TEXT NOT NULL,
+                id TEXT NOT NULL,
+                doc TEXT NOT NULL CHECK (json_valid(doc)),
+                etag TEXT NOT NULL,
+                lsn INTEGER NOT NULL,
+                PRIMARY KEY (pk, id)
+            )""",
+            f"CREATE INDEX IF NOT EXISTS {_quote(f'ix_{name}_lsn')} ON {table} (lsn)",
+            "CREATE TABLE IF NOT EXISTS _sequences (name TEXT PRIMARY KEY, value INTEGER NOT NULL)",
+        ]
+        for index in INDEXED_FIELDS.get(name, ()):
+            fields = (index,) if isinstance(index, str) else index
+            statements.append(
+                f"CREATE INDEX IF NOT EXISTS {_quote(f'ix_{name}_' + '_'.join(fields))} "
+                f"ON {table} ({', '.join(_json_path(field) for field in fields)})"
+            )
+        # Schema setup is a one-time local operation, so a short-lived connection is fine
+        with contextlib.closing(sqlite3.connect(self.path, isolation_level=None)) as connection:
+            connection.execute("PRAGMA journal_mode=WAL")
+            for statement in statements:
+                connection.execute(statement)
+
+    async def close(self) -> None:
+        """Close pooled connections."""
+        self.pool.close()
+        self._containers.clear()
+        logger.info("SQLite storage closed")
+
+
+class SQLiteContainer:
+    """``ContainerProxy`` compatible container backed by one table."""
+
+    def __init__(self, container_id: str, partition_key_field: str, pool: SQLitePool):
+        """Initialize container.
+
+        Args:
+            container_id: Container (table) name
+            partition_key_field: Item field holding the partition key
+            pool: Connection pool
+        """
+        self.id = container_id
+        self.partition_key_field = partition_key_field
+        self.pool = pool
+        self._table = _quote(container_id)
+
+    # ------------------------------------------------------------------
+    # Point operations
+    # ------------------------------------------------------------------
+
+    async def read_item(self, item: str, partition_key: Any, **kwargs: Any) -> dict:
+        """Read one item."""
+        row = await self.pool.run(
+            _fetch_one,
+            f"SELECT doc FROM {self._table} WHERE pk = ? AND id = ?",
+            (partition_key, item),
+        )
+        if row is None:
+            raise _not_found(item)
+        found = json.loads(row[0])
+        report_response(kwargs, found)
+        return found
+
+    async def read_items(self, items: list[tuple[str, Any]], **kwargs: Any) -> list[dict]:
+        """Read several items by (id, partition key); missing items are omitted."""
+
+        def read(connection: sqlite3.Connection) -> list[dict]:
+            found = []
+            for start in range(0, len(items), READ_MANY_CHUNK):
+                chunk = items[start : start + READ_MANY_CHUNK]
+                keys = ", ".join("(?, ?)" for _ in chunk)
+                args = [value for item_id, pk in chunk for value in (pk, item_id)]
+                rows = connection.execute(
+                    f"SELECT doc FROM {self._table} WHERE (pk, id) IN (VALUES {keys})", args
+                )
+                found.extend(json.loads(row[0]) for row in rows)
+            return found
+
+        found = await self.pool.run(read)
+        report_response(kwargs, found)
+        return found
+
+    async def create_item(self, body: dict, **kwargs: Any) -> dict:
+        """Create an item (409 if it already exists)."""
+        return await self._write(body, "create", kwargs)
+
+    async def upsert_item(self, body: dict, **kwargs: Any) -> dict:
+        """Create or replace an item."""
+        return await self._write(body, "upsert", kwargs)
+
+    async def replace_item(self, item: str | dict, body: dict, **kwargs: Any) -> dict:
+        """Replace an existing item (404 if missing)."""
+        return await self._write(body, "replace", kwargs)
+
+    async def delete_item(self, item: str | dict, partition_key: Any, **kwargs: Any) -> None:
+        """Delete an item (404 if missing)."""
+        item_id = item["id"] if isinstance(item, dict) else item
+
+        def delete(connection: sqlite3.Connection) -> None:
+            with _write_transaction(connection):
+                row = connection.execute(
+                    f"SELECT etag FROM {self._table} WHERE pk = ? AND id = ?",
+                    (partition_key, item_id),
+                ).fetchone()
+                if row is None:
+                    raise _not_found(item_id)
+                check_precondition(row[0], kwargs)
+                connection.execute(
+                    f"DELETE FROM {self._table} WHERE pk = ? AND id = ?", (partition_key, item_id)
+                )
+
+        await self.pool.run(delete)
+        report_response(kwargs, None)
+
+    async def _write(self, body: dict, mode: str, kwargs: dict) -> dict:
+        item = dict(body)
+        item["_etag"] = f'"{uuid.uuid4()}"'
+        item["_ts"] = int(time.time())
+        pk = item.get(self.partition_key_field)
+
+        def write(connection: sqlite3.Connection) -> None:
+            with _write_transaction(connection):
+                row = connection.execute(
+                    f"SELECT etag FROM {self._table} WHERE pk = ? AND id = ?", (pk, item["id"])
+                ).fetchone()
+                if row is not None and mode == "create":
+                    raise CosmosResourceExistsError(
+                        status_code=409,
+                        message=f"Entity with the specified id already exists: {item['id']}",
+                    )
+                if row is None and mode == "replace":
+                    raise _not_found(item["id"])
+                if row is not None:
+                    check_precondition(row[0], kwargs)
+                lsn = connection.execute(
+                    "INSERT INTO _sequences (name, value) VALUES (?, 1) "
+                    "ON CONFLICT (name) DO UPDATE SET value = value + 1 RETURNING value",
+                    (self.id,),
+                ).fetchone()[0]
+                connection.execute(
+                    f"INSERT OR REPLACE INTO {self._table} (pk, id, doc, etag, lsn) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    (pk, item["id"], json.dumps(item, ensure_ascii=False), item["_etag"], lsn),
+                )
+
+        await self.pool.run(write)
+        report_response(kwargs, item)
+        return item
+
+    # ------------------------------------------------------------------
+    # Queries and change feed
+    # ------------------------------------------------------------------
+
+    def query_items(
+        self,
+        query: str,
+        parameters: list[dict] | None = None,
+        partition_key: Any = None,
+        max_item_count: int | None = None,
+        **kwargs: Any,
+    ) -> "SQLiteQueryIterable":
+        """Run a query (compiled to SQL, executed one page at a time)."""
+        parsed = parse_query(query)
+        values = {p["name"]: p["value"] for p in parameters or []}
+        return SQLiteQueryIterable(
+            self,
+            parsed,
+            compile_query(self._table, parsed, values, partition_key),
+            max_item_count or DEFAULT_PAGE_SIZE,
+            kwargs.get("response_hook"),
+        )
+
+    async def query_items_change_feed(
+        self,
+        start_time: str | None = None,
+        continuation: str | None = None,
+        response_hook: Callable | None = None,
+        **kwargs: Any,
+    ) -> AsyncIterator[dict]:
+        """Read the latest version of every item changed after a position.
+
+        The continuation (``etag`` response header) is the last change feed
+        position; ``start_time`` accepts ``"Beginning"`` and ``"Now"``.
+        """
+
+        def read(connection: sqlite3.Connection) -> tuple[list[str], int]:
+            current = connection.execute(
+                "SELECT value FROM _sequences WHERE name = ?", (self.id,)
+            ).fetchone()
+            end = current[0] if current else 0
+            if continuation is not None:
+                start = int(continuation)
+            elif start_time == "Now":
+                start = end
+            else:
+                start = 0
+            rows = connection.execute(
+                f"SELECT doc FROM {self._table} WHERE lsn > ? AND lsn <= ? ORDER BY lsn",
+                (start, end),
+            ).fetchall()
+            return [row[0] for row in rows], end
+
+        docs, end = await self.pool.run(read)
+        for doc in docs:
+            yield json.loads(doc)
+        if response_hook:
+            response_hook({"etag": str(end)}, None)
+
+
+class SQLiteQueryIterable:
+    """Result of ``query_items``: iterate items or pages (``by_page``)."""
+
+    def __init__(
+        self,
+        container: SQLiteContainer,
+        parsed: ParsedQuery,
+        compiled: tuple[str, list, int, int | None],
+        page_size: int,
+        response_hook: Callable | None,
+    ):
+        self._container = container
+        self._parsed = parsed
+        self._sql, self._args, self._start, self._count = compiled
+        self._page_size = page_size
+        self._response_hook = response_hook
+
+    def __aiter__(self) -> AsyncIterator[dict]:
+        return self._iter_items()
+
+    async def _iter_items(self) -> AsyncIterator[dict]:
+        async for page in self.by_page():
+            async for item in page:
+                yield item
+
+    def by_page(self, continuation_token: str | None = None) -> "SQLitePageIterator":
+        """Iterate pages starting at a continuation token (an offset)."""
+        return SQLitePageIterator(self, int(continuation_token or 0))
+
+    async def fetch(self, offset: int) -> list[dict]:
+        """Fetch the page starting ``offset`` rows into the result."""
+        size = self._page_size
+        if self._count is not None:
+            size = min(size, self._count - offset)
+            if size <= 0:
+                return []
+        rows = await self._container.pool.run(
+            _fetch_all, f"{self._sql} LIMIT ? OFFSET ?", [*self._args, size, self._start + offset]
+        )
+        page = [self._parsed.project(json.loads(row[0])) for row in rows]
+        if self._response_hook:
+            self._response_hook({"x-ms-item-count": str(len(page))}, page)
+        return page
+
+
+class SQLitePageIterator:
+    """Async iterator of pages exposing ``continuation_token`` like the SDK."""
+
+    def __init__(self, query: SQLiteQueryIterable, offset: int):
+        self._query = query
+        self._offset = offset
+        self._started = False
+        self.continuation_token: str | None = None
+
+    def __aiter__(self) -> "SQLitePageIterator":
+        return self
+
+    async def __anext__(self) -> AsyncIterator[dict]:
+        if self._started and self.continuation_token is None:
+            raise StopAsyncIteration
+        page = await self._query.fetch(self._offset)
+        if not page and (self._started or self._offset > 0):
+            raise StopAsyncIteration
+        self._started = True
+        self._offset += len(page)
+        full = len(page) == self._query._page_size
+        self.continuation_token = str(self._offset) if full else None
+        return _aiter(page)
+
+
+async def _aiter(items: list[dict]) -> AsyncIterator[dict]:
+    for item in items:
+        yield item
+
+
+# ============================================================
+# SQL compilation
+# ============================================================
+
+
+def compile_query(
+    table: str, parsed: ParsedQuery, params: dict, partition_key: Any = None
+) -> tuple[str, list, int, int | None]:
+    """Compile a parsed query to SQLite SQL (without the page LIMIT/OFFSET).
+
+    Args:
+        table: Quoted table name
+        parsed: Parsed Cosmos SQL query
+        params: Parameter values by name
+        partition_key: Restrict to one partition (None = all)
+
+    Returns:
+        Tuple of (sql, args, first row offset, maximum row count or None)
+    """
+    compiler = _SQLCompiler(params)
+    conditions = []
+    if partition_key is not None:
+        conditions.append("pk = ?")
+        compiler.args.append(partition_key)
+    if parsed.where is not None:
+        conditions.append(compiler.expr(parsed.where))
+    sql = f"SELECT {_select_list(parsed, conditions)} FROM {table}"
+    if conditions:
+        sql += " WHERE " + " AND ".join(conditions)
+    if parsed.order_by:
+        sql += " ORDER BY " + ", ".join(
+            f"{_json_path(path)} {'DESC' if descending else 'ASC'}"
+            for path, descending in parsed.order_by
+        )
+    counts = [n for n in (parsed.limit, parsed.top) if n is not None]
+    return sql, compiler.args, parsed.offset, min(counts) if counts else None
+
+
+def _select_list(parsed: ParsedQuery, conditions: list[str]) -> str:
+    """SELECT list returning one JSON text column (the document, or the VALUE)."""
+    if parsed.value is None:
+        return "doc"
+    if parsed.value[0] == "aggregate":
+        _, name, arg = parsed.value
+        if name == "COUNT":
+            return "json_quote(COUNT(1))"
+        return f"json_quote(COALESCE(SUM({_json_path(arg[1])}), 0))"
+    # Undefined values are omitted from SELECT VALUE results
+    path = parsed.value[1]
+    conditions.append(f"json_type(doc, '$.{path}') IS NOT NULL")
+    value = (
+        f"CASE WHEN json_type(doc, '$.{path}') IN ('object', 'array') THEN {_json_path(path)} "
+        f"ELSE json_quote({_json_path(path)}) END"
+    )
+    return f"DISTINCT {value}" if parsed.distinct else value
+
+
+class _SQLCompiler:
+    """Translate expressions of the SQL subset to SQLite with bound arguments."""
+
+    def __init__(self, params: dict):
+        self.params = params
+        self.args: list = []
+
+    def bind(self, value: Any) -> str:
+        if value is None:
+            return "NULL"
+        if isinstance(value, bool):
+            value = int(value)
+        elif isinstance(value, list | dict):
+            value = json.dumps(value, ensure_ascii=False)
+        self.args.append(value)
+        return "?"
+
+    def expr(self, node: Expr) -> str:
+        kind = node[0]
+        if kind == "path":
+            return _json_path(node[1])
+        if kind == "param":
+            if node[1] not in self.params:
+                raise ValueError(f"missing parameter {node[1]}")
+            return self.bind(self.params[node[1]])
+        if kind == "literal":
+            return self.bind(node[1])
+        if kind == "neg":
+            return f"-({self.expr(node[1])})"
+        if kind == "not":
+            return f"NOT ({self.expr(node[1])})"
+        if kind in ("and", "or"):
+            return "(" + f" {kind.upper()} ".join(self.expr(term) for term in node[1]) + ")"
+        if kind == "cmp":
+            operator, left, right = node[1], node[2], node[3]
+            if _is_null(right) or _is_null(left):
+                other = left if _is_null(right) else right
+                return f"{self.expr(other)} IS {'NOT ' if operator == '!=' else ''}NULL"
+            return f"({self.expr(left)} {operator} {self.expr(right)})"
+        if kind == "call":
+            return self.call(node[1], node[2])
+        raise ValueError(f"unknown expression {kind}")
+
+    def call(self, name: str, args: list[Expr]) -> str:
+        ignore_case = len(args) > 2 and args[2] == ("literal", True)
+        if name == "CONTAINS":
+            text, fragment = self.expr(args[0]), self.expr(args[1])
+            if ignore_case:
+                return f"instr(lower({text}), lower({fragment})) > 0"
+            return f"instr({text}, {fragment}) > 0"
+        if name == "STARTSWITH":
+            # Placeholders are positional: compile in the order they appear
+            text, length, prefix = (self.expr(arg) for arg in (args[0], args[1], args[1]))
+            if ignore_case:
+                return f"substr(lower({text}), 1, length({length})) = lower({prefix})"
+            return f"substr({text}, 1, length({length})) = {prefix}"
+        if name == "ARRAY_CONTAINS":
+            values, value = args[0], args[1]
+            if values[0] == "path":
+                return (
+                    f"EXISTS (SELECT 1 FROM json_each(doc, '$.{values[1]}') "
+                    f"WHERE value = {self.expr(value)})"
+                )
+            needle = self.expr(value)
+            return f"{needle} IN (SELECT value FROM json_each({self.expr(values)}))"
+        if name == "IS_DEFINED":
+            if args[0][0] != "path":
+                raise ValueError("IS_DEFINED requires a field reference")
+            return f"json_type(doc, '$.{args[0][1]}') IS NOT NULL"
+        if name == "IS_NUMBER":
+            if args[0][0] != "path":
+                raise ValueError("IS_NUMBER requires a field reference")
+            return f"json_type(doc, '$.{args[0][1]}') IN ('integer', 'real')"
+        if name in ("LOWER", "UPPER"):
+            return f"{name.lower()}({self.expr(args[0])})"
+        raise ValueError(f"unsupported function {name}")
+
+
+def _is_null(node: Expr) -> bool:
+    return node == ("literal", None)
+
+
+def _json_path(path: str) -> str:
+    """Expression of a document field (identical in indexes and queries)."""
+    return f"json_extract(doc, '$.{path}')"
+
+
+def _quote(name: str) -> str:
+    return '"' + name.replace('"', '""') + '"'
+
+
+# ============================================================
+# Helpers
+# ============================================================
+
+
+@contextlib.contextmanager
+def _write_transaction(connection: sqlite3.Connection):
+    """Serialize writers: take the write lock before reading the current ETag."""
+    connection.execute("BEGIN IMMEDIATE")
+    try:
+        yield
+    except BaseException:
+        connection.execute("ROLLBACK")
+        raise
+    connection.execute("COMMIT")
+
+
+def _fetch_one(connection: sqlite3.Connection, sql: str, args: tuple) -> tuple | None:
+    return connection.execute(sql, args).fetchone()
+
+
+def _fetch_all(connection: sqlite3.Connection, sql: str, args: list) -> list[tuple]:
+    return connection.execute(sql, args).fetchall()
+
+
+def _not_found(item_id: str) -> CosmosResourceNotFoundError:
+    return CosmosResourceNotFoundError(
+        status_code=404, message=f"Entity with the specified id does not exist: {item_id}"
+    )
@@ -0,0 +1,119 @@
+"""Storage backend interface used by the repositories.
+
+Repositories talk to containers through the ``azure.cosmos.aio``
+``ContainerProxy`` API. A backend hands out those container objects plus
+the per-container throttling guards and the shared repository metrics:
+
+- ``CosmosDBClient`` (``app.core.database``): Azure Cosmos DB
+- ``MemoryStorage`` (``app.core.memory_store``): in-process stand-in for
+  benchmarks and load tests without network access
+- ``SQLiteStorage`` (``app.core.sqlite_store``): embedded database for
+  single-node (on-prem / demo) deployments
+
+The backend is selected by ``settings.STORAGE_BACKEND`` (see
+``app.core.resources.open_storage``).
+"""
+
+from abc import ABC, abstractmethod
+from typing import Any
+
+from azure.core import MatchConditions
+from azure.cosmos.exceptions import CosmosAccessConditionFailedError
+
+from app.core.config import settings
+from app.core.metrics import RepositoryMetrics
+from app.core.resilience import ThrottleGuard
+
+# Partition key field per container (containers not listed use ``id``)
+PARTITION_KEYS = {
+    "DealsBySalesUser": "sales_user_id",
+    "DealsByCustomer": "customer_id",
+    "ConversationMessages": "conversation_id",
+    "ConversationSummaries": "user_id",
+}
+
+
+class StorageBackend(ABC):
+    """Base class of storage backends."""
+
+    def __init__(self):
+        """Initialize metrics and throttling guards shared by every repository."""
+        self._guards: dict[str, ThrottleGuard] = {}
+        # Per-operation RU / latency statistics of every repository using this backend
+        self.metrics = RepositoryMetrics(
+            slow_query_ms=settings.SLOW_QUERY_MS,
+            slow_query_request_charge=settings.SLOW_QUERY_REQUEST_CHARGE,
+            slow_query_log_size=settings.SLOW_QUERY_LOG_SIZE,
+            query_metrics_enabled=settings.QUERY_METRICS_ENABLED,
+        )
+
+    @abstractmethod
+    def get_container(self, container_name: str) -> Any:
+        """Get the container client (``ContainerProxy`` compatible).
+
+        Args:
+            container_name: Container name
+
+        Returns:
+            Container client shared by every repository for the container
+        """
+
+    def get_guard(self, container_name: str) -> ThrottleGuard:
+        """Get the throttling guard of a container.
+
+        Guards are shared like container proxies, so the in-flight limit
+        applies to every repository and loader using the container.
+        """
+        guard = self._guards.get(container_name)
+        if guard is None:
+            guard = ThrottleGuard(
+                container_name,
+                max_in_flight=settings.COSMOS_MAX_IN_FLIGHT_PER_CONTAINER,
+                max_retries=settings.COSMOS_THROTTLE_MAX_RETRIES,
+                base_delay_ms=settings.COSMOS_RETRY_BASE_DELAY_MS,
+                max_delay_ms=settings.COSMOS_RETRY_MAX_DELAY_MS,
+            )
+            self._guards[container_name] = guard
+        return guard
+
+    def throttle_stats(self) -> dict[str, dict]:
+        """Get limiter and 429 retry counters per container."""
+        return {name: guard.stats() for name, guard in self._guards.items()}
+
+    async def close(self) -> None:  # noqa: B027 - optional hook, nothing to release by default
+        """Release connections held by the backend."""
+
+
+def check_precondition(current_etag: str | None, kwargs: dict) -> None:
+    """Enforce the ``etag`` / ``match_condition`` keyword arguments of a write.
+
+    Helper for backends that emulate Cosmos DB optimistic concurrency.
+
+    Args:
+        current_etag: ETag of the stored item
+        kwargs: Keyword arguments of the container call
+
+    Raises:
+        CosmosAccessConditionFailedError: 412 if the precondition is not met
+    """
+    etag = kwargs.get("etag")
+    condition = kwargs.get("match_condition")
+    if etag is None or condition is None:
+        return
+    matches = current_etag == etag
+    if (condition == MatchConditions.IfNotModified and not matches) or (
+        condition == MatchConditions.IfModified and matches
+    ):
+        raise CosmosAccessConditionFailedError(
+            status_code=412,
+            message="Operation cannot be performed because one of the "
+            "specified precondition is not met",
+        )
+
+
+def report_response(kwargs: dict, result: Any) -> None:
+    """Call the ``response_hook`` of a container call with emulated headers."""
+    hook = kwargs.get("response_hook")
+    if hook:
+        etag = result.get("_etag") if isinstance(result, dict) else None
+        hook({"etag": etag} if etag else {}, result)
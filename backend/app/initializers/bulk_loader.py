@@ -0,0 +1,108 @@
+"""Concurrent bulk loader for Cosmos DB containers."""
+
+import asyncio
+import logging
+import time
+from collections.abc import Iterable
+from functools import partial
+
+from azure.cosmos.aio import ContainerProxy
+
+from app.core.resilience import ThrottleGuard
+
+logger = logging.getLogger(__name__)
+
+REQUEST_CHARGE_HEADER = "x-ms-request-charge"
+
+
+class LoadStats:
+    """Throughput and RU consumption of one bulk load."""
+
+    def __init__(self, container: str):
+        """Initialize empty statistics.
+
+        Args:
+            container: Name of the loaded container
+        """
+        self.container = container
+        self.items = 0
+        self.errors = 0
+        self.request_units = 0.0
+        self.seconds = 0.0
+        self.error_samples: list[str] = []
+
+    @property
+    def items_per_second(self) -> float:
+        """Written items per second."""
+        return self.items / self.seconds if self.seconds else 0.0
+
+    @property
+    def ru_per_second(self) -> float:
+        """Consumed request units per second."""
+        return self.request_units / self.seconds if self.seconds else 0.0
+
+    def summary(self) -> str:
+        """One-line human readable report."""
+        return (
+            f"{self.container}: {self.items:,} items in {self.seconds:.1f}s "
+            f"({self.items_per_second:,.0f} items/s), "
+            f"{self.request_units:,.0f} RU ({self.ru_per_second:,.0f} RU/s, "
+            f"{self.request_units / self.items if self.items else 0:.2f} RU/item), "
+            f"{self.errors} errors"
+        )
+
+
+async def bulk_upsert(
+    container: ContainerProxy,
+    items: Iterable[dict],
+    concurrency: int = 64,
+    progress_every: int = 10000,
+    guard: ThrottleGuard | None = None,
+) -> LoadStats:
+    """Upsert items with a fixed number of concurrent writers.
+
+    Items are pulled lazily from ``items``, so generators of any size can
+    be loaded without materializing them. The request charge of every
+    write is read from the response headers.
+
+    Args:
+        container: Target container
+        items: Items to upsert (each must contain ``id``)
+        concurrency: Number of concurrent in-flight writes
+        progress_every: Log progress every N items (0 disables)
+        guard: Throttling guard of the container; throttled writes are
+            retried with backoff instead of being counted as errors
+
+    Returns:
+        Load statistics
+    """
+    stats = LoadStats(container=container.id)
+    iterator = iter(items)
+
+    def record_charge(headers, _body) -> None:
+        stats.request_units += float(headers.get(REQUEST_CHARGE_HEADER, 0) or 0)
+
+    async def writer() -> None:
+        for item in iterator:
+            try:
+                write = partial(container.upsert_item, body=item, response_hook=record_charge)
+                await (guard.run(write) if guard else write())
+                stats.items += 1
+                if progress_every and stats.items % progress_every == 0:
+                    elapsed = time.perf_counter() - started
+                    logger.info(
+                        f"{container.id}: {stats.items:,} items "
+                        f"({stats.items / elapsed:,.0f} items/s, {stats.request_units:,.0f} RU)"
+                    )
+            except Exception as e:
+                stats.errors += 1
+                if len(stats.error_samples) < 5:
+                    stats.error_samples.append(f"{item.get('id')}: {e}")
+
+    started = time.perf_counter()
+    await asyncio.gather(*(writer() for _ in range(max(1, concurrency))))
+    stats.seconds = time.perf_counter() - started
+
+    for sample in stats.error_samples:
+        logger.error(f"Error upserting into {container.id}: {sample}")
+    return stats
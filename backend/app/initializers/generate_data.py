@@ -0,0 +1,344 @@
+"""Generate and bulk load production-scale synthetic data to Cosmos DB.
+
+Produces Japanese-language users, customers and deals with a skewed
+(Zipf-like) distribution: a few sales users and customers own most deals,
+and early stages are more common than won/lost deals. The demo records
+from ``seed_data`` are always included, so the demo users keep working.
+
+Data is loaded into the backend selected by ``STORAGE_BACKEND`` (Cosmos DB
+by default, which requires COSMOS_* settings in ``.env``).
+
+Usage (from ``backend/``)::
+
+    python -m app.initializers.generate_data --deals 100000
+    STORAGE_BACKEND=sqlite python -m app.initializers.generate_data --deals 10000
+    python -m app.initializers.generate_data --deals 1000000 --customers 20000 --concurrency 128
+    python -m app.initializers.generate_data --deals 100000 --dry-run
+"""
+
+import argparse
+import asyncio
+import itertools
+import math
+import random
+import time
+from collections import Counter
+from collections.abc import Iterator
+from datetime import date, timedelta
+
+from app.core.resources import open_storage
+from app.initializers.bulk_loader import LoadStats, bulk_upsert
+from app.initializers.seed_data import DEMO_CUSTOMERS, DEMO_DEALS, DEMO_USERS
+
+SURNAMES = [
+    "佐藤", "鈴木", "高橋", "田中", "伊藤", "渡辺", "山本", "中村", "小林", "加藤",
+    "吉田", "山田", "佐々木", "山口", "松本", "井上", "木村", "林", "斎藤", "清水",
+    "山崎", "森", "池田", "橋本", "阿部", "石川", "山下", "中島", "石井", "小川",
+]  # fmt: skip
+GIVEN_NAMES = [
+    "太郎", "一郎", "健太", "翔太", "大輔", "直樹", "誠", "拓也", "亮", "剛",
+    "花子", "美咲", "陽子", "由美", "愛", "真由美", "恵", "彩", "千尋", "さくら",
+]  # fmt: skip
+ROMAJI_SURNAMES = [
+    "sato", "suzuki", "takahashi", "tanaka", "ito", "watanabe", "yamamoto", "nakamura",
+    "kobayashi", "kato", "yoshida", "yamada", "sasaki", "yamaguchi", "matsumoto", "inoue",
+    "kimura", "hayashi", "saito", "shimizu", "yamazaki", "mori", "ikeda", "hashimoto",
+    "abe", "ishikawa", "yamashita", "nakajima", "ishii", "ogawa",
+]  # fmt: skip
+REGIONS = [
+    "東京", "大阪", "名古屋", "札幌", "福岡", "仙台", "広島", "横浜", "神戸", "京都",
+    "北陸", "九州", "関西", "東北", "中部", "四国", "湘南", "千葉", "埼玉", "静岡",
+]  # fmt: skip
+COMPANY_STEMS = [
+    "テクノ", "ネット", "システム", "電機", "通信", "データ", "ソリューション", "建設",
+    "エナジー", "ロジスティクス", "メディカル", "ファイナンス", "リテール", "インフラ",
+]  # fmt: skip
+COMPANY_SUFFIXES = ["株式会社", "ホールディングス株式会社", "工業株式会社", "サービス株式会社"]
+
+INDUSTRIES = {
+    "通信": 20, "IT・通信": 18, "製造": 15, "建設": 10, "金融": 8,
+    "官公庁": 7, "医療": 6, "物流": 6, "エネルギー": 5, "小売": 5,
+}  # fmt: skip
+DEPARTMENTS = {
+    "営業部": 40,
+    "法人営業部": 25,
+    "第一営業部": 15,
+    "第二営業部": 12,
+    "西日本営業部": 8,
+}
+ROLES = {"営業担当": 80, "マネージャー": 15, "部長": 5}
+DEAL_STAGES = {"見込み": 35, "提案": 25, "商談": 18, "受注": 12, "失注": 10}
+SERVICE_TYPES = {
+    # service type: (weight, median amount in yen)
+    "通信インフラ構築": (50, 40_000_000),
+    "技術人材派遣": (30, 15_000_000),
+    "危機管理対策": (20, 8_000_000),
+}
+NOTE_TEMPLATES = {
+    "通信インフラ構築": [
+        "5G基地局構築プロジェクト。{region}エリア{n}拠点の提案中。",
+        "光ファイバー網の増強案件。{month}月着工予定で調整中。",
+        "{region}データセンター間のネットワーク冗長化。見積提出済み。",
+        "社内LAN刷新の相談。{n}フロア分のWi-Fi環境構築を提案。",
+    ],
+    "技術人材派遣": [
+        "ネットワークエンジニア{n}名の派遣。6ヶ月契約。",
+        "クラウド移行支援のため技術者{n}名を{month}月から常駐予定。",
+        "保守運用要員の増員相談。{region}拠点で{n}名体制を希望。",
+    ],
+    "危機管理対策": [
+        "データセンターのBCP対策コンサルティング。初回ヒアリング済み。",
+        "{region}拠点の災害時通信確保計画。{month}月に訓練実施予定。",
+        "セキュリティ診断と初動対応体制の整備。{n}拠点が対象。",
+    ],
+}
+
+# Deals are generated and loaded in chunks to keep memory flat at 1M deals
+CHUNK_SIZE = 10_000
+
+
+def _zipf_cum_weights(count: int, skew: float) -> list[float]:
+    """Cumulative Zipf weights (rank 1 is the most frequent)."""
+    return list(itertools.accumulate(1.0 / (rank**skew) for rank in range(1, count + 1)))
+
+
+def _weighted(rng: random.Random, weights: dict) -> str:
+    return rng.choices(list(weights), weights=list(weights.values()))[0]
+
+
+class SyntheticDataGenerator:
+    """Deterministic generator of users, customers and deals."""
+
+    def __init__(
+        self,
+        num_users: int = 50,
+        num_customers: int = 2000,
+        num_deals: int = 10_000,
+        skew: float = 1.1,
+        seed: int = 42,
+        as_of: date | None = None,
+    ):
+        """Initialize generator.
+
+        Counts include the demo records, which are always generated first.
+
+        Args:
+            num_users: Number of sales users
+            num_customers: Number of customers
+            num_deals: Number of deals
+            skew: Zipf exponent for deals per sales user / customer (0 = uniform)
+            seed: Random seed (same seed produces the same dataset)
+            as_of: Reference date for last contact dates (defaults to today)
+        """
+        self.num_users = max(num_users, len(DEMO_USERS))
+        self.num_customers = max(num_customers, len(DEMO_CUSTOMERS))
+        self.num_deals = max(num_deals, len(DEMO_DEALS))
+        self.skew = skew
+        self.seed = seed
+        self.as_of = as_of or date.today()
+        self._users: list[dict] | None = None
+        self._customers: list[dict] | None = None
+
+    def users(self) -> list[dict]:
+        """Generate sales users (demo users first)."""
+        if self._users is None:
+            rng = random.Random(f"{self.seed}-users")
+            users = [dict(user) for user in DEMO_USERS]
+            for number in range(len(users) + 1, self.num_users + 1):
+                surname_index = rng.randrange(len(SURNAMES))
+                users.append(
+                    {
+                        "id": str(number),
+                        "user_id": str(number),
+                        "name": SURNAMES[surname_index] + rng.choice(GIVEN_NAMES),
+                        "email": f"{ROMAJI_SURNAMES[surname_index]}{number}@example.com",
+                        "department": _weighted(rng, DEPARTMENTS),
+                        "role": _weighted(rng, ROLES),
+                    }
+                )
+            self._users = users
+        return self._users
+
+    def customers(self) -> list[dict]:
+        """Generate customers (demo customers first)."""
+        if self._customers is None:
+            rng = random.Random(f"{self.seed}-customers")
+            customers = [dict(customer) for customer in DEMO_CUSTOMERS]
+            used_names = {customer["name"] for customer in customers}
+            for number in range(len(customers) + 1, self.num_customers + 1):
+                surname_index = rng.randrange(len(SURNAMES))
+                name = (
+                    rng.choice(REGIONS + SURNAMES)
+                    + rng.choice(COMPANY_STEMS)
+                    + rng.choice(COMPANY_SUFFIXES)
+                )
+                if name in used_names:
+                    # Numbered branch keeps names unique once combinations run out
+                    name = name.replace("株式会社", f"第{number}株式会社")
+                used_names.add(name)
+                customers.append(
+                    {
+                        "id": str(number),
+                        "customer_id": str(number),
+                        "name": name,
+                        "industry": _weighted(rng, INDUSTRIES),
+                        "contact_person": SURNAMES[surname_index] + rng.choice(GIVEN_NAMES),
+                        "email": f"{ROMAJI_SURNAMES[surname_index]}@c{number}.example.com",
+                        "phone": f"0{rng.randint(3, 9)}-{rng.randint(1000, 9999)}-{rng.randint(1000, 9999)}",
+                    }
+                )
+            self._customers = customers
+        return self._customers
+
+    def iter_deals(self) -> Iterator[dict]:
+        """Generate deals lazily (demo deals first)."""
+        rng = random.Random(f"{self.seed}-deals")
+        users = self.users()
+        customers = self.customers()
+        user_weights = _zipf_cum_weights(len(users), self.skew)
+        customer_weights = _zipf_cum_weights(len(customers), self.skew)
+        service_types = list(SERVICE_TYPES)
+        service_weights = [weight for weight, _ in SERVICE_TYPES.values()]
+
+        yield from (dict(deal) for deal in DEMO_DEALS)
+        number = len(DEMO_DEALS)
+        while number < self.num_deals:
+            count = min(CHUNK_SIZE, self.num_deals - number)
+            owners = rng.choices(users, cum_weights=user_weights, k=count)
+            accounts = rng.choices(customers, cum_weights=customer_weights, k=count)
+            stages = rng.choices(list(DEAL_STAGES), weights=list(DEAL_STAGES.values()), k=count)
+            services = rng.choices(service_types, weights=service_weights, k=count)
+            for owner, account, stage, service in zip(
+                owners, accounts, stages, services, strict=True
+            ):
+                number += 1
+                median = SERVICE_TYPES[service][1]
+                # Recent contacts are more common (mean 60 days, capped at 2 years)
+                days_ago = min(int(rng.expovariate(1 / 60)), 730)
+                yield {
+                    "id": str(number),
+                    "deal_id": str(number),
+                    "customer_id": account["customer_id"],
+                    "customer_name": account["name"],
+                    "sales_user_id": owner["user_id"],
+                    "sales_user_name": owner["name"],
+                    "deal_stage": stage,
+                    "deal_amount": round(rng.lognormvariate(math.log(median), 0.8), -5),
+                    "service_type": service,
+                    "last_contact_date": (self.as_of - timedelta(days=days_ago)).isoformat(),
+                    "notes": rng.choice(NOTE_TEMPLATES[service]).format(
+                        region=rng.choice(REGIONS),
+                        n=rng.randint(2, 30),
+                        month=rng.randint(1, 12),
+                    ),
+                }
+
+
+def describe(generator: SyntheticDataGenerator) -> str:
+    """Summarize the deal distribution of a dataset (generates all deals)."""
+    owners: Counter[str] = Counter()
+    stages: Counter[str] = Counter()
+    total = 0
+    for deal in generator.iter_deals():
+        owners[deal["sales_user_id"]] += 1
+        stages[deal["deal_stage"]] += 1
+        total += 1
+    top = owners.most_common(5)
+    lines = [f"deals: {total:,}"]
+    lines.append(
+        "top sales users: "
+        + ", ".join(f"{user_id}={count:,} ({count / total:.1%})" for user_id, count in top)
+    )
+    lines.append(
+        "stages: " + ", ".join(f"{stage}={count:,}" for stage, count in stages.most_common())
+    )
+    return "\n".join(lines)
+
+
+async def load_all(
+    generator: SyntheticDataGenerator, concurrency: int = 64, containers: list[str] | None = None
+) -> list[LoadStats]:
+    """Bulk load a generated dataset.
+
+    Args:
+        generator: Dataset to load
+        concurrency: Concurrent writes per container
+        containers: Containers to load (default: Users, Customers, Deals)
+
+    Returns:
+        Statistics per container
+    """
+    sources = {
+        "Users": generator.users,
+        "Customers": generator.customers,
+        "Deals": generator.iter_deals,
+    }
+    storage = open_storage()
+    results = []
+    try:
+        for name in containers or list(sources):
+            print(f"⏳ Loading {name}...")
+            guard = storage.get_guard(name)
+            stats = await bulk_upsert(
+                storage.get_container(name),
+                sources[name](),
+                concurrency=concurrency,
+                guard=guard,
+            )
+            print(f"{'✓' if not stats.errors else '✗'} {stats.summary()}")
+            if guard.throttled:
+                print(f"   throttled {guard.throttled:,} times, {guard.retries:,} retries")
+            results.append(stats)
+    finally:
+        await storage.close()
+    return results
+
+
+def main() -> None:
+    """Command line entry point."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--users", type=int, default=50, help="number of sales users")
+    parser.add_argument("--customers", type=int, default=2000, help="number of customers")
+    parser.add_argument("--deals", type=int, default=10_000, help="number of deals (10k-1M)")
+    parser.add_argument("--skew", type=float, default=1.1, help="Zipf exponent (0 = uniform)")
+    parser.add_argument("--seed", type=int, default=42, help="random seed")
+    parser.add_argument("--as-of", type=date.fromisoformat, help="reference date (YYYY-MM-DD)")
+    parser.add_argument("--concurrency", type=int, default=64, help="concurrent writes")
+    parser.add_argument(
+        "--containers",
+        default="Users,Customers,Deals",
+        help="comma-separated containers to load",
+    )
+    parser.add_argument(
+        "--dry-run", action="store_true", help="generate only and print the distribution"
+    )
+    args = parser.parse_args()
+
+    generator = SyntheticDataGenerator(
+        num_users=args.users,
+        num_customers=args.customers,
+        num_deals=args.deals,
+        skew=args.skew,
+        seed=args.seed,
+        as_of=args.as_of,
+    )
+    if args.dry_run:
+        started = time.perf_counter()
+        print(describe(generator))
+        print(f"generated in {time.perf_counter() - started:.1f}s")
+        return
+
+    results = asyncio.run(
+        load_all(generator, args.concurrency, [c.strip() for c in args.containers.split(",")])
+    )
+    items = sum(stats.items for stats in results)
+    request_units = sum(stats.request_units for stats in results)
+    seconds = sum(stats.seconds for stats in results)
+    print(
+        f"✅ Loaded {items:,} items in {seconds:.1f}s "
+        f"({items / seconds if seconds else 0:,.0f} items/s, {request_units:,.0f} RU)"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,40 @@
+"""Move messages embedded in conversation documents to ConversationMessages.
+
+Conversations created before messages were split out keep them in a
+``messages`` array of the ``Conversations`` document. This moves them to
+one document per message and leaves the header with ``message_count``.
+The app reads both layouts, so it can run while the app is serving; it is
+safe to re-run.
+
+Usage (from ``backend/``)::
+
+    python -m app.initializers.migrate_conversation_messages
+"""
+
+import asyncio
+
+from app.core.resources import open_storage
+from app.repositories.conversation import ConversationRepository
+
+
+async def migrate():
+    """Move inline messages of every conversation."""
+    print("🔄 Moving inline conversation messages...")
+    storage = open_storage()
+    conversations = moved = 0
+    try:
+        repo = ConversationRepository(storage)
+        # IDs are collected first: paging through a result set that the
+        # migration itself shrinks would skip conversations
+        items = await repo.query("SELECT c.id FROM c WHERE IS_DEFINED(c.messages)")
+        for item in items:
+            count = await repo.move_inline_messages(item["id"])
+            conversations += 1 if count else 0
+            moved += count
+    finally:
+        await storage.close()
+    print(f"✅ Moved {moved:,} messages of {conversations:,} conversations")
+
+
+if __name__ == "__main__":
+    asyncio.run(migrate())
@@ -0,0 +1,38 @@
+"""Rebuild the conversation history list (ConversationSummaries).
+
+Recomputes the summary of every conversation from its header and latest
+message, and removes the summaries of deleted conversations. Run it once
+after creating the container, and after writes made outside the
+application. Safe to re-run.
+
+Usage (from ``backend/``)::
+
+    python -m app.initializers.rebuild_conversation_summaries
+"""
+
+import asyncio
+
+from app.core.resources import open_storage
+from app.repositories.conversation import ConversationRepository
+
+
+async def rebuild():
+    """Rebuild every conversation summary."""
+    print("🔄 Rebuilding conversation summaries...")
+    storage = open_storage()
+    written = removed = 0
+    try:
+        repo = ConversationRepository(storage)
+        async for page in repo.iter_pages("SELECT c.id FROM c", page_size=500):
+            for item in page:
+                if await repo.rebuild_summary(item["id"]):
+                    written += 1
+                else:
+                    removed += 1
+    finally:
+        await storage.close()
+    print(f"✅ {written:,} summaries written, {removed:,} deleted conversations skipped")
+
+
+if __name__ == "__main__":
+    asyncio.run(rebuild())
@@ -0,0 +1,37 @@
+"""Rebuild the pipeline summary document from the Deals container.
+
+Recomputes deal counts and amount totals by stage, service type and sales
+user into ``DealSummaries``. Run it after bulk loads or writes made outside
+the application; with ``DEAL_SUMMARY_ENABLED`` (the default) the app also
+builds the summary on startup when it does not exist yet.
+
+Usage (from ``backend/``)::
+
+    python -m app.initializers.rebuild_deal_summary
+"""
+
+import asyncio
+
+from app.core.resources import open_storage
+from app.repositories.deal import DealRepository
+from app.repositories.deal_summary import DealSummaryRepository, rebuild_deal_summary
+
+
+async def rebuild():
+    """Rebuild the deal summary."""
+    print("🔄 Rebuilding deal summary...")
+    storage = open_storage()
+    try:
+        summary = await rebuild_deal_summary(
+            DealRepository(storage), DealSummaryRepository(storage)
+        )
+    finally:
+        await storage.close()
+    print(
+        f"✅ {summary.total.count:,} deals, total {summary.total.total_amount:,.0f} "
+        f"({len(summary.by_deal_stage)} stages, {len(summary.by_sales_user_id)} sales users)"
+    )
+
+
+if __name__ == "__main__":
+    asyncio.run(rebuild())
@@ -0,0 +1,35 @@
+"""Backfill materialized deal views from the Deals container.
+
+Copies every deal into ``DealsBySalesUser`` and ``DealsByCustomer`` and
+removes copies of deleted deals or copies stored under an old key. Run it
+once after creating the view containers (``create_deal_view_containers.py``)
+and after bulk loads made with the views disabled.
+
+Usage (from ``backend/``)::
+
+    python -m app.initializers.rebuild_deal_views
+"""
+
+import asyncio
+
+from app.core.resources import open_storage
+from app.repositories.deal import DealRepository
+from app.repositories.deal_views import DEAL_VIEWS, DealViewRepository, rebuild_deal_views
+
+
+async def rebuild_all():
+    """Rebuild all deal views."""
+    print("🔄 Rebuilding deal views...")
+    storage = open_storage()
+    try:
+        views = [
+            DealViewRepository(name, key_field, storage) for name, key_field in DEAL_VIEWS.items()
+        ]
+        result = await rebuild_deal_views(DealRepository(storage), views)
+    finally:
+        await storage.close()
+    print(f"✅ {result['synced']:,} deals synced, {result['removed']:,} stale copies removed")
+
+
+if __name__ == "__main__":
+    asyncio.run(rebuild_all())
@@ -1,6 +1,6 @@
 """Conversation models for chat history."""
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
 
 class Message(BaseModel):
@@ -14,12 +14,29 @@ class Message(BaseModel):
 
 
 class Conversation(BaseModel):
-    """Conversation session."""
+    """Conversation session.
+
+    The ``Conversations`` document is a small header; messages are stored
+    one per document in ``ConversationMessages`` and only filled in here
+    when they are loaded.
+    """
 
     id: str  # conversation_id (UUID) - partition key
     user_id: str
     title: str  # "KDDI案件について" etc (auto-generated)
-    messages: list[Message]
+    messages: list[Message] = Field(default_factory=list)
+    message_count: int = 0  # Number of messages appended so far
     created_at: str
     updated_at: str
     is_active: bool = True  # For archiving feature
+
+
+class ConversationSummary(BaseModel):
+    """Conversation entry of the history list (stored in ``ConversationSummaries``)."""
+
+    id: str  # conversation_id
+    user_id: str  # partition key
+    title: str
+    message_count: int = 0
+    last_message: str | None = None  # Beginning of the latest message
+    updated_at: str
@@ -39,6 +39,30 @@ class Deal(BaseModel):
     notes: str | None = None  # メモ・提案内容
 
 
+class SimilarDeal(BaseModel):
+    """Deal returned by similar deal search."""
+
+    deal: Deal
+    score: float  # コサイン類似度（0〜1）
+
+
+class DealAggregate(BaseModel):
+    """Deal count and amount total of one group."""
+
+    count: int = 0
+    total_amount: int = 0  # 案件金額の合計（円単位に丸めた整数。金額未設定の案件は0として計上）
+
+
+class DealSummary(BaseModel):
+    """Pipeline totals grouped by stage, service type and sales user."""
+
+    total: DealAggregate = Field(default_factory=DealAggregate)
+    by_deal_stage: dict[str, DealAggregate] = Field(default_factory=dict)
+    by_service_type: dict[str, DealAggregate] = Field(default_factory=dict)
+    by_sales_user_id: dict[str, DealAggregate] = Field(default_factory=dict)
+    updated_at: str | None = None  # 集計の最終更新日時（ISO形式）
+
+
 class ChatRequest(BaseModel):
     """Chat request model."""
 
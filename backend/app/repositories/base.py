@@ -1,11 +1,23 @@
 """Base repository for common CRUD operations."""
 
 import logging
+from collections.abc import AsyncIterator
 from typing import Generic, TypeVar
 
-from azure.cosmos import ContainerProxy
+from azure.core import MatchConditions
+from azure.cosmos.aio import ContainerProxy
+from azure.cosmos.exceptions import CosmosAccessConditionFailedError, CosmosResourceNotFoundError
+from pydantic import BaseModel
 
-from app.core.database import cosmos_client
+from app.core.exceptions import PreconditionFailedException
+from app.core.metrics import OperationTracker, label_operations
+from app.core.storage import StorageBackend
+from app.repositories.cache import EntityCache
+from app.repositories.filters import QuerySpec
+from app.repositories.hydration import hydrate, hydrate_many
+from app.repositories.projection import partial_model, project_item, project_query
+from app.repositories.query_builder import QueryBuilder
+from app.repositories.replica import ContainerReplica
 
 logger = logging.getLogger(__name__)
 
@@ -15,25 +27,63 @@ T = TypeVar("T")
 class BaseRepository(Generic[T]):
     """Base repository with common CRUD operations."""
 
-    def __init__(self, container_name: str):
+    # Entity model built from items (set by subclasses)
+    model: type[BaseModel] | None = None
+
+    def __init_subclass__(cls, **kwargs):
+        """Attribute Cosmos calls to the public methods of each repository."""
+        super().__init_subclass__(**kwargs)
+        label_operations(cls, cls.__name__)
+
+    def __init__(
+        self, container_name: str, client: StorageBackend, cache: EntityCache | None = None
+    ):
         """Initialize repository with container name.
 
         Args:
             container_name: Name of the Cosmos DB container
+            client: Shared storage backend
+            cache: Optional read-through cache for point reads
         """
         self.container_name = container_name
-        self.container: ContainerProxy = cosmos_client.get_container(container_name)
+        self.container: ContainerProxy = client.get_container(container_name)
+        self.cache = cache
+        self.metrics = client.metrics
+        self.guard = client.get_guard(container_name)
+        self.replica: ContainerReplica | None = None
         logger.debug(f"Repository initialized for container: {container_name}")
 
-    async def get_all(self) -> list[dict]:
+    def attach_replica(self, replica: ContainerReplica) -> None:
+        """Serve reads from an in-memory replica once it is ready.
+
+        Args:
+            replica: Change-feed synchronized replica of this container
+        """
+        self.replica = replica
+
+    @property
+    def replica_ready(self) -> bool:
+        """Whether reads can be served from the replica."""
+        return self.replica is not None and self.replica.ready
+
+    async def get_all(self, fields: list[str] | None = None) -> list[dict]:
         """Get all items from the container.
 
+        Args:
+            fields: Optional fields to project (``SELECT c.a, c.b``)
+
         Returns:
             List of all items
         """
+        if self.replica_ready:
+            return self._project(self.replica.all(), fields)
+        query = project_query("SELECT * FROM c", fields)
         try:
-            query = "SELECT * FROM c"
-            items = list(self.container.query_items(query=query, enable_cross_partition_query=True))
+            with self._track("get_all", query) as tracker:
+                items = await self.guard.run(
+                    lambda: self._collect(query, None, self._query_options(tracker))
+                )
+                tracker.items = len(items)
             logger.info(f"Retrieved {len(items)} items from {self.container_name}")
             return items
         except Exception as e:
@@ -49,39 +99,462 @@ class BaseRepository(Generic[T]):
 
         Returns:
             Item dict or None if not found
+
+        Raises:
+            CosmosHttpResponseError: On any other failure (throttling after
+                retries, timeouts, ...), so callers never mistake an outage
+                for a missing item
         """
+        if self.replica_ready:
+            return self.replica.get(item_id)
+        generation = None
+        if self.cache:
+            found, cached = self.cache.get(item_id)
+            if found:
+                return cached
+            generation = self.cache.generation()
+
         try:
-            item = self.container.read_item(item=item_id, partition_key=partition_key)
+            with self._track("get_by_id") as tracker:
+                item = await self.guard.run(
+                    lambda: self.container.read_item(
+                        item=item_id,
+                        partition_key=partition_key,
+                        response_hook=tracker.on_response,
+                    )
+                )
+                tracker.items = 1
             logger.debug(f"Retrieved item {item_id} from {self.container_name}")
-            return item
+        except CosmosResourceNotFoundError:
+            logger.warning(f"Item {item_id} not found in {self.container_name}")
+            if self.cache:
+                self.cache.set_missing(item_id, generation)
+            return None
         except Exception as e:
-            logger.warning(f"Item {item_id} not found in {self.container_name}: {e}")
+            logger.error(f"Error getting item {item_id} from {self.container_name}: {e}")
+            raise
+
+        if self.cache:
+            self.cache.set(item_id, item, generation)
+        return item
+
+    async def get_versioned(self, item_id: str) -> tuple[BaseModel, str | None] | None:
+        """Get an entity model together with its ETag (Cosmos ``_etag``).
+
+        The ETag identifies the version that was read; pass it back to
+        ``replace`` / ``delete`` to make the write conditional on it. Assumes
+        the container is partitioned by its ``id``.
+
+        Args:
+            item_id: Item ID
+
+        Returns:
+            Tuple of (model, etag), or None if not found
+        """
+        item = await self.get_by_id(item_id, item_id)
+        if not item:
             return None
+        return hydrate(self.model, item), item.get("_etag")
+
+    async def get_many(self, item_ids: list[str], use_replica: bool = True) -> dict[str, dict]:
+        """Get several items by ID in one batched read.
+
+        IDs served by the replica or the cache are not read again; the rest
+        are fetched with a single read-many request. Assumes the container
+        is partitioned by its ``id``.
+
+        Args:
+            item_ids: Item IDs (duplicates are ignored)
+            use_replica: Serve IDs from the replica when it is ready; pass
+                False to read IDs the replica does not have (yet)
+
+        Returns:
+            Mapping of item ID to item (missing IDs are omitted)
+        """
+        found: dict[str, dict] = {}
+        pending: list[str] = []
+        for item_id in dict.fromkeys(item_ids):
+            if use_replica and self.replica_ready:
+                item = self.replica.get(item_id)
+                if item:
+                    found[item_id] = item
+                continue
+            if self.cache:
+                hit, cached = self.cache.get(item_id)
+                if hit:
+                    if cached:
+                        found[item_id] = cached
+                    continue
+            pending.append(item_id)
+        if not pending:
+            return found
+
+        generation = self.cache.generation() if self.cache else None
+        try:
+            with self._track("get_many") as tracker:
+                items = await self.guard.run(
+                    lambda: self.container.read_items(
+                        items=[(item_id, item_id) for item_id in pending],
+                        response_hook=tracker.on_response,
+                    )
+                )
+                tracker.items = len(items)
+        except Exception as e:
+            logger.error(f"Error reading {len(pending)} items from {self.container_name}: {e}")
+            raise
+        for item in items:
+            found[item["id"]] = item
+            if self.cache:
+                self.cache.set(item["id"], item, generation)
+        missing = [item_id for item_id in pending if item_id not in found]
+        if missing:
+            logger.warning(f"Items not found in {self.container_name}: {', '.join(missing)}")
+            if self.cache:
+                for item_id in missing:
+                    self.cache.set_missing(item_id, generation)
+        logger.debug(f"Read {len(pending)} items from {self.container_name} in one batch")
+        return found
 
-    async def query(self, query: str, parameters: list | None = None) -> list[dict]:
+    async def find_by_field(
+        self, field: str, value: object, fields: list[str] | None = None
+    ) -> list[dict]:
+        """Get items whose ``field`` equals ``value``.
+
+        Served from the replica's secondary-key index when available,
+        otherwise executed as a parameterized query.
+
+        Args:
+            field: Field name
+            value: Value to match
+            fields: Optional fields to project
+
+        Returns:
+            List of matching items
+        """
+        if self.replica_ready:
+            return self._project(self.replica.find(field, value), fields)
+        query, parameters = self._build_filter_query({field: value})
+        return await self.query(query=query, parameters=parameters, fields=fields)
+
+    async def find(self, spec: QuerySpec, fields: list[str] | None = None) -> list[dict]:
+        """Get items matching a specification in a single query.
+
+        Evaluated against the replica when available, otherwise executed as
+        one parameterized query with server-side ORDER BY and TOP.
+
+        Args:
+            spec: Filters, ordering and result cap
+            fields: Optional fields to project
+
+        Returns:
+            List of matching items
+        """
+        if self.replica_ready:
+            return self._project(spec.select(self.replica.all()), fields)
+        query, parameters = spec.build_query(fields)
+        return await self.query(query=query, parameters=parameters)
+
+    async def find_page(
+        self,
+        spec: QuerySpec,
+        page_size: int = 100,
+        continuation_token: str | None = None,
+        fields: list[str] | None = None,
+    ) -> tuple[list[dict], str | None]:
+        """Get one page of items matching a specification.
+
+        Args:
+            spec: Filters, ordering and result cap
+            page_size: Maximum number of items in the page
+            continuation_token: Token returned by the previous page
+            fields: Optional fields to project
+
+        Returns:
+            Tuple of (items, next continuation token or None when exhausted)
+        """
+        query, parameters = spec.build_query(fields)
+        return await self.query_page(query, parameters, page_size, continuation_token)
+
+    def iter_find_pages(
+        self, spec: QuerySpec, page_size: int = 100, fields: list[str] | None = None
+    ) -> AsyncIterator[list[dict]]:
+        """Stream items matching a specification one Cosmos page at a time.
+
+        Args:
+            spec: Filters, ordering and result cap
+            page_size: Maximum number of items per page
+            fields: Optional fields to project
+
+        Returns:
+            Async iterator of item lists, one per page
+        """
+        query, parameters = spec.build_query(fields)
+        return self.iter_pages(query, parameters, page_size)
+
+    async def query(
+        self,
+        query: str,
+        parameters: list | None = None,
+        fields: list[str] | None = None,
+        partition_key: str | None = None,
+    ) -> list[dict]:
         """Execute a custom query.
 
         Args:
             query: SQL query string
             parameters: Query parameters
+            fields: Optional fields to project; rewrites a leading
+                ``SELECT * FROM c`` into ``SELECT c.a, c.b FROM c``
+            partition_key: Scope the query to one partition (None = cross-partition)
 
         Returns:
             List of matching items
         """
+        query = project_query(query, fields)
         try:
-            items = list(
-                self.container.query_items(
-                    query=query,
-                    parameters=parameters or [],
-                    enable_cross_partition_query=True,
-                )
-            )
+            with self._track("query", query, parameters) as tracker:
+                options = self._query_options(tracker, partition_key)
+                items = await self.guard.run(lambda: self._collect(query, parameters, options))
+                tracker.items = len(items)
             logger.debug(f"Query returned {len(items)} items from {self.container_name}")
             return items
         except Exception as e:
             logger.error(f"Error executing query on {self.container_name}: {e}")
             raise
 
+    async def get_page(
+        self,
+        page_size: int,
+        continuation_token: str | None = None,
+        fields: list[str] | None = None,
+    ) -> tuple[list[dict], str | None]:
+        """Get one page of items from the container.
+
+        Args:
+            page_size: Maximum number of items in the page
+            continuation_token: Token returned by the previous page (None for the first page)
+            fields: Optional fields to project
+
+        Returns:
+            Tuple of (items, next continuation token or None when exhausted)
+        """
+        return await self.query_page("SELECT * FROM c", None, page_size, continuation_token, fields)
+
+    async def query_page(
+        self,
+        query: str,
+        parameters: list | None = None,
+        page_size: int = 100,
+        continuation_token: str | None = None,
+        fields: list[str] | None = None,
+        partition_key: str | None = None,
+    ) -> tuple[list[dict], str | None]:
+        """Execute a custom query and return a single page of results.
+
+        Only one page is held in memory, so peak memory depends on
+        ``page_size`` rather than on the container size. Cross-partition
+        queries may return fewer than ``page_size`` items per page.
+
+        Args:
+            query: SQL query string
+            parameters: Query parameters
+            page_size: Maximum number of items in the page
+            continuation_token: Token returned by the previous page (None for the first page)
+            fields: Optional fields to project
+            partition_key: Scope the query to one partition (None = cross-partition)
+
+        Returns:
+            Tuple of (items, next continuation token or None when exhausted)
+        """
+        query = project_query(query, fields)
+        try:
+            with self._track("query_page", query, parameters) as tracker:
+                options = self._query_options(tracker, partition_key)
+
+                async def fetch() -> tuple[list[dict], str | None]:
+                    pager = self.container.query_items(
+                        query=query,
+                        parameters=parameters or [],
+                        max_item_count=page_size,
+                        **options,
+                    ).by_page(continuation_token)
+                    try:
+                        page = await pager.__anext__()
+                    except StopAsyncIteration:
+                        return [], None
+                    return [item async for item in page], pager.continuation_token
+
+                items, next_token = await self.guard.run(fetch)
+                tracker.items = len(items)
+            logger.debug(f"Query page returned {len(items)} items from {self.container_name}")
+            return items, next_token
+        except Exception as e:
+            logger.error(f"Error executing paged query on {self.container_name}: {e}")
+            raise
+
+    async def iter_pages(
+        self,
+        query: str,
+        parameters: list | None = None,
+        page_size: int = 100,
+        fields: list[str] | None = None,
+        partition_key: str | None = None,
+    ) -> AsyncIterator[list[dict]]:
+        """Execute a query and yield results one Cosmos page at a time.
+
+        A page fetch that is throttled is retried from the continuation
+        token of the last delivered page, so no item is yielded twice.
+        The in-flight slot is held only while a page is fetched.
+
+        Args:
+            query: SQL query string
+            parameters: Query parameters
+            page_size: Maximum number of items per page
+            fields: Optional fields to project
+            partition_key: Scope the query to one partition (None = cross-partition)
+
+        Yields:
+            Lists of items, one per page
+        """
+        query = project_query(query, fields)
+        total = 0
+        try:
+            # One measurement for the whole stream (RU and time of every page)
+            with self._track("iter_pages", query, parameters) as tracker:
+                options = self._query_options(tracker, partition_key)
+
+                def open_pages(continuation_token: str | None):
+                    return self.container.query_items(
+                        query=query,
+                        parameters=parameters or [],
+                        max_item_count=page_size,
+                        **options,
+                    ).by_page(continuation_token)
+
+                pages = open_pages(None)
+                continuation_token = None
+                attempt = 0
+                while True:
+                    try:
+                        async with self.guard.slot():
+                            page = await pages.__anext__()
+                            items = [item async for item in page]
+                    except StopAsyncIteration:
+                        break
+                    except Exception as e:
+                        if not await self.guard.backoff(e, attempt):
+                            raise
+                        attempt += 1
+                        pages = open_pages(continuation_token)
+                        continue
+                    attempt = 0
+                    continuation_token = pages.continuation_token
+                    if items:
+                        total += len(items)
+                        tracker.items = total
+                        yield items
+        except Exception as e:
+            logger.error(f"Error streaming query on {self.container_name}: {e}")
+            raise
+        logger.info(f"Streamed {total} items from {self.container_name}")
+
+    def _track(
+        self, primitive: str, query: str | None = None, parameters: list | None = None
+    ) -> OperationTracker:
+        """Measure one Cosmos DB call (RU, query metrics, wall time, items).
+
+        Args:
+            primitive: Name used when no repository operation is running
+            query: Query text (None for point operations)
+            parameters: Query parameters (recorded in the slow query log)
+
+        Returns:
+            Tracker to use as a context manager
+        """
+        return self.metrics.track(
+            f"{type(self).__name__}.{primitive}", self.container_name, query, parameters
+        )
+
+    async def _collect(self, query: str, parameters: list | None, options: dict) -> list[dict]:
+        """Run a query to completion (one attempt of ``guard.run``)."""
+        return [
+            item
+            async for item in self.container.query_items(
+                query=query, parameters=parameters or [], **options
+            )
+        ]
+
+    def _query_options(self, tracker: OperationTracker, partition_key: str | None = None) -> dict:
+        """Keyword arguments for ``query_items`` (charge reporting and partition scope)."""
+        options: dict = {"response_hook": tracker.on_response}
+        if self.metrics.query_metrics_enabled:
+            options["populate_query_metrics"] = True
+        if partition_key is not None:
+            options["partition_key"] = partition_key
+        return options
+
+    @staticmethod
+    def _match_options(etag: str | None) -> dict:
+        """Keyword arguments making a write conditional on ``etag`` (none when unset)."""
+        if etag is None:
+            return {}
+        return {"etag": etag, "match_condition": MatchConditions.IfNotModified}
+
+    def _to_models(self, items: list[dict], fields: list[str] | None = None) -> list[BaseModel]:
+        """Build entity models, or lightweight partial models for projections.
+
+        Items come from our own database and go straight to the compiled
+        validator in one call (see ``app.repositories.hydration``).
+
+        Args:
+            items: Items returned by Cosmos DB
+            fields: Projected fields (None for full models)
+
+        Returns:
+            List of models
+        """
+        model = partial_model(self.model, fields) if fields else self.model
+        return hydrate_many(model, items)
+
+    @staticmethod
+    def _project(items: list[dict], fields: list[str] | None) -> list[dict]:
+        """Apply a projection to items served from memory."""
+        if not fields:
+            return items
+        return [project_item(item, fields) for item in items]
+
+    def _after_write(self, item_id: str | None, written: dict | None) -> None:
+        """Keep the cache and replica consistent with a local write.
+
+        Args:
+            item_id: ID of the written item
+            written: Item returned by Cosmos DB, or None for deletes
+        """
+        if not item_id:
+            return
+        if self.cache:
+            self.cache.invalidate(item_id)
+        if self.replica:
+            if written is None:
+                self.replica.remove(item_id)
+            else:
+                self.replica.apply(written)
+
+    @staticmethod
+    def _build_filter_query(filters: dict[str, object]) -> tuple[str, list[dict]]:
+        """Build a parameterized query that ANDs equality filters.
+
+        Args:
+            filters: Mapping of field name to value (None values are ignored)
+
+        Returns:
+            Tuple of (query, parameters)
+        """
+        builder = QueryBuilder()
+        for field, value in filters.items():
+            builder.where_eq(field, value)
+        return builder.build()
+
     async def create(self, item: dict) -> dict:
         """Create a new item.
 
@@ -92,7 +565,12 @@ class BaseRepository(Generic[T]):
             Created item
         """
         try:
-            created_item = self.container.create_item(body=item)
+            with self._track("create") as tracker:
+                created_item = await self.guard.run(
+                    lambda: self.container.create_item(body=item, response_hook=tracker.on_response)
+                )
+                tracker.items = 1
+            self._after_write(item.get("id"), created_item)
             logger.info(f"Created item in {self.container_name}: {item.get('id')}")
             return created_item
         except Exception as e:
@@ -109,23 +587,79 @@ class BaseRepository(Generic[T]):
             Upserted item
         """
         try:
-            upserted_item = self.container.upsert_item(body=item)
+            with self._track("upsert") as tracker:
+                upserted_item = await self.guard.run(
+                    lambda: self.container.upsert_item(body=item, response_hook=tracker.on_response)
+                )
+                tracker.items = 1
+            self._after_write(item.get("id"), upserted_item)
             logger.info(f"Upserted item in {self.container_name}: {item.get('id')}")
             return upserted_item
         except Exception as e:
             logger.error(f"Error upserting item in {self.container_name}: {e}")
             raise
 
-    async def delete(self, item_id: str, partition_key: str) -> None:
+    async def replace(self, item: dict, etag: str | None = None) -> dict:
+        """Replace an existing item, optionally only if it is unchanged.
+
+        Args:
+            item: New version of the item (must contain ``id``)
+            etag: ETag of the version the change is based on (optimistic concurrency)
+
+        Returns:
+            Replaced item
+
+        Raises:
+            PreconditionFailedException: If the item changed since ``etag`` was read
+        """
+        try:
+            with self._track("replace") as tracker:
+                replaced_item = await self.guard.run(
+                    lambda: self.container.replace_item(
+                        item=item["id"],
+                        body=item,
+                        response_hook=tracker.on_response,
+                        **self._match_options(etag),
+                    )
+                )
+                tracker.items = 1
+            self._after_write(item["id"], replaced_item)
+            logger.info(f"Replaced item in {self.container_name}: {item['id']}")
+            return replaced_item
+        except CosmosAccessConditionFailedError:
+            logger.info(f"Item {item['id']} in {self.container_name} changed since {etag}")
+            raise PreconditionFailedException(f"Item {item['id']} was modified concurrently")
+        except Exception as e:
+            logger.error(f"Error replacing item in {self.container_name}: {e}")
+            raise
+
+    async def delete(self, item_id: str, partition_key: str, etag: str | None = None) -> None:
         """Delete an item.
 
         Args:
             item_id: Item ID
             partition_key: Partition key value
+            etag: Optional ETag the item must still have (optimistic concurrency)
+
+        Raises:
+            PreconditionFailedException: If the item changed since ``etag`` was read
         """
         try:
-            self.container.delete_item(item=item_id, partition_key=partition_key)
+            with self._track("delete") as tracker:
+                await self.guard.run(
+                    lambda: self.container.delete_item(
+                        item=item_id,
+                        partition_key=partition_key,
+                        response_hook=tracker.on_response,
+                        **self._match_options(etag),
+                    )
+                )
+                tracker.items = 1
+            self._after_write(item_id, None)
             logger.info(f"Deleted item {item_id} from {self.container_name}")
+        except CosmosAccessConditionFailedError:
+            logger.info(f"Item {item_id} in {self.container_name} changed since {etag}")
+            raise PreconditionFailedException(f"Item {item_id} was modified concurrently")
         except Exception as e:
             logger.error(f"Error deleting item {item_id} from {self.container_name}: {e}")
             raise
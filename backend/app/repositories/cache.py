@@ -0,0 +1,174 @@
+"""In-process read-through cache for repository point reads."""
+
+import logging
+import time
+from collections import OrderedDict
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+# Marker stored for IDs that are known not to exist (negative caching)
+_MISSING = object()
+
+
+class EntityCache:
+    """Bounded TTL + LRU cache of raw Cosmos DB items keyed by item ID.
+
+    The cache is per worker process; entries written by other workers are
+    only picked up once the local entry expires, so TTLs bound staleness.
+    Cached dicts are shared between callers and must not be mutated.
+
+    A read that misses takes a ``generation()`` token before going to the
+    database and passes it to ``set`` / ``set_missing``. ``invalidate``
+    records the generation at which each key was last written, so a read
+    that was in flight during a write does not cache the old item. The
+    last ``max_items`` invalidations are remembered.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        max_items: int,
+        ttl_seconds: float,
+        negative_ttl_seconds: float = 0,
+    ):
+        """Initialize cache.
+
+        Args:
+            name: Cache name used in logs and stats (usually the container name)
+            max_items: Maximum number of entries before LRU eviction
+            ttl_seconds: Lifetime of cached items
+            negative_ttl_seconds: Lifetime of cached misses (0 disables negative caching)
+        """
+        self.name = name
+        self.max_items = max_items
+        self.ttl_seconds = ttl_seconds
+        self.negative_ttl_seconds = negative_ttl_seconds
+        self._entries: OrderedDict[str, tuple[float, Any]] = OrderedDict()
+        # Generation of the latest write per key (oldest first)
+        self._generation = 0
+        self._invalidated: OrderedDict[str, int] = OrderedDict()
+        self.hits = 0
+        self.negative_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+        self.stale_sets = 0
+
+    def get(self, key: str) -> tuple[bool, dict | None]:
+        """Look up an item.
+
+        Args:
+            key: Item ID
+
+        Returns:
+            Tuple of (found, item). ``(True, None)`` means the item is cached as missing.
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return False, None
+
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            self.expirations += 1
+            self.misses += 1
+            return False, None
+
+        self._entries.move_to_end(key)
+        if value is _MISSING:
+            self.negative_hits += 1
+            return True, None
+        self.hits += 1
+        return True, value
+
+    def generation(self) -> int:
+        """Get the token to pass to ``set`` / ``set_missing`` after a read.
+
+        Returns:
+            Current write generation
+        """
+        return self._generation
+
+    def set(self, key: str, item: dict, generation: int | None = None) -> None:
+        """Cache an item.
+
+        Args:
+            key: Item ID
+            item: Item dict as returned by Cosmos DB
+            generation: ``generation()`` taken before the read; the item is
+                not cached if the key was written since
+        """
+        if self._written_since(key, generation):
+            return
+        self._store(key, item, self.ttl_seconds)
+
+    def set_missing(self, key: str, generation: int | None = None) -> None:
+        """Remember that an item does not exist.
+
+        Args:
+            key: Item ID
+            generation: ``generation()`` taken before the read
+        """
+        if self.negative_ttl_seconds > 0 and not self._written_since(key, generation):
+            self._store(key, _MISSING, self.negative_ttl_seconds)
+
+    def invalidate(self, key: str) -> None:
+        """Drop an item (called on every write).
+
+        Args:
+            key: Item ID
+        """
+        self._generation += 1
+        self._invalidated[key] = self._generation
+        self._invalidated.move_to_end(key)
+        while len(self._invalidated) > max(self.max_items, 1):
+            self._invalidated.popitem(last=False)
+        if self._entries.pop(key, None) is not None:
+            self.invalidations += 1
+
+    def _written_since(self, key: str, generation: int | None) -> bool:
+        """Whether ``key`` was invalidated after ``generation`` was taken."""
+        if generation is None or self._invalidated.get(key, 0) <= generation:
+            return False
+        self.stale_sets += 1
+        return True
+
+    def clear(self) -> None:
+        """Drop all entries."""
+        self._entries.clear()
+
+    def stats(self) -> dict:
+        """Get cache counters.
+
+        Returns:
+            Dict of counters and sizing information
+        """
+        lookups = self.hits + self.negative_hits + self.misses
+        return {
+            "size": len(self._entries),
+            "max_items": self.max_items,
+            "ttl_seconds": self.ttl_seconds,
+            "negative_ttl_seconds": self.negative_ttl_seconds,
+            "hits": self.hits,
+            "negative_hits": self.negative_hits,
+            "misses": self.misses,
+            "hit_ratio": round((self.hits + self.negative_hits) / lookups, 4) if lookups else 0.0,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "invalidations": self.invalidations,
+            "stale_sets": self.stale_sets,
+        }
+
+    def _store(self, key: str, value: Any, ttl_seconds: float) -> None:
+        """Insert an entry and evict least recently used entries if needed."""
+        if ttl_seconds <= 0 or self.max_items <= 0:
+            return
+        self._entries[key] = (time.monotonic() + ttl_seconds, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_items:
+            evicted_key, _ = self._entries.popitem(last=False)
+            self.evictions += 1
+            logger.debug(f"Evicted {evicted_key} from {self.name} cache")
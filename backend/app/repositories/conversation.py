@@ -1,48 +1,345 @@
-"""Repository for conversation history."""
+"""Repository for conversation history.
 
+A conversation is stored as a small header document in ``Conversations``
+(title, ``message_count``, timestamps) plus one document per message in
+``ConversationMessages`` (partition key ``/conversation_id``), numbered by
+``seq`` in append order. Appending a message writes one message document
+and then rewrites the header, so its cost does not depend on the length of
+the conversation and long reports never push one document toward the
+2 MB item limit.
+
+Message documents are written before the header counts them, and reads
+stop at the header's ``message_count``: a document past the count belongs
+to an append that has not committed (yet) and is not served. A header
+therefore never counts a message that is not stored.
+
+Conversations written before the split keep their messages inline in the
+header; they are read as the first messages of the conversation until
+``app.initializers.migrate_conversation_messages`` moves them out.
+
+The history list is served from ``ConversationSummaries`` (partition key
+``/user_id``): one small entry per active conversation with its title,
+message count and the beginning of the latest message, kept up to date on
+every write. Listing a user's conversations is a single-partition query
+ordered by ``updated_at`` that never touches messages.
+"""
+
+import asyncio
+import contextlib
 import logging
 import uuid
+from collections.abc import Callable
 from datetime import datetime
 
-from app.models.conversation import Conversation, Message
+from azure.cosmos.exceptions import CosmosResourceNotFoundError
+
+from app.core.exceptions import PreconditionFailedException
+from app.core.storage import StorageBackend
+from app.models.conversation import Conversation, ConversationSummary, Message
 from app.repositories.base import BaseRepository
+from app.repositories.hydration import hydrate, hydrate_many
+from app.repositories.query_builder import QueryBuilder
 
 logger = logging.getLogger(__name__)
 
+MESSAGES_CONTAINER = "ConversationMessages"
+SUMMARIES_CONTAINER = "ConversationSummaries"
+
+# Characters of the latest message kept in a conversation summary
+SNIPPET_LENGTH = 100
+
+# Read-modify-write attempts before giving up on a conversation that keeps changing
+MAX_WRITE_ATTEMPTS = 5
+
+
+class ConversationNotFoundError(ValueError):
+    """Raised when a conversation header does not exist."""
+
+
+class ConversationMessageRepository(BaseRepository[Message]):
+    """Messages of every conversation, one document each."""
+
+    model = Message
+
+    def __init__(self, client: StorageBackend):
+        super().__init__(container_name=MESSAGES_CONTAINER, client=client)
+
+    async def save(self, conversation_id: str, seq: int, message: Message) -> None:
+        """Write a message (idempotent: the document ID is the message ID).
+
+        Args:
+            conversation_id: Conversation ID (partition key)
+            seq: Position of the message in the conversation
+            message: Message to store
+        """
+        await self.upsert(message_item(conversation_id, seq, message))
+
+    async def list_messages(self, conversation_id: str, end: int | None = None) -> list[Message]:
+        """Get the messages of a conversation in append order.
+
+        Args:
+            conversation_id: Conversation ID
+            end: ``message_count`` of the header; documents from this
+                position on are not committed and are skipped
+
+        Returns:
+            List of messages
+        """
+        query, parameters = (
+            QueryBuilder()
+            .where_eq("conversation_id", conversation_id)
+            .where_range("seq", maximum=None if end is None else end - 1)
+            .order_by("seq")
+            .build()
+        )
+        items = await self.query(query, parameters, partition_key=conversation_id)
+        return hydrate_many(Message, items)
+
+    async def get_window(
+        self,
+        conversation_id: str,
+        limit: int,
+        cursor: int | None = None,
+        newer: bool = False,
+        min_seq: int | None = None,
+        end: int | None = None,
+    ) -> tuple[list[Message], int | None]:
+        """Get up to ``limit`` consecutive messages next to a position.
+
+        One single-partition ``TOP`` query on ``seq``, so the cost depends
+        on ``limit`` only, not on the length of the conversation.
+
+        Args:
+            conversation_id: Conversation ID
+            limit: Maximum number of messages
+            cursor: ``seq`` to continue from (exclusive); None starts at the
+                newest message (or at the oldest with ``newer``)
+            newer: Walk toward newer messages instead of older ones
+            min_seq: Ignore messages before this ``seq`` (legacy headers
+                keep the first messages inline)
+            end: ``message_count`` of the header; documents from this
+                position on are not committed and are skipped
+
+        Returns:
+            Tuple of (messages in chronological order, cursor of the next
+            window or None when there are no more messages that way)
+        """
+        builder = QueryBuilder().where_eq("conversation_id", conversation_id)
+        maximum = None if end is None else end - 1
+        if newer:
+            minimum = None if cursor is None else cursor + 1
+            if min_seq is not None:
+                minimum = max(minimum or 0, min_seq)
+            builder.where_range("seq", minimum=minimum, maximum=maximum)
+        else:
+            if cursor is not None:
+                maximum = cursor - 1 if maximum is None else min(maximum, cursor - 1)
+            builder.where_range("seq", minimum=min_seq, maximum=maximum)
+        query, parameters = builder.order_by("seq", descending=not newer).top(limit + 1).build()
+        items = await self.query(query, parameters, partition_key=conversation_id)
+        more = len(items) > limit
+        items = items[:limit]
+        if not newer:
+            items.reverse()
+        next_cursor = None
+        if more and items:
+            next_cursor = items[-1]["seq"] if newer else items[0]["seq"]
+        return hydrate_many(Message, items), next_cursor
+
+
+class ConversationSummaryRepository(BaseRepository[ConversationSummary]):
+    """History list entries of every conversation, partitioned by user."""
+
+    model = ConversationSummary
+
+    def __init__(self, client: StorageBackend):
+        super().__init__(container_name=SUMMARIES_CONTAINER, client=client)
+
+    async def save(self, summary: ConversationSummary) -> None:
+        """Write the summary of a conversation.
+
+        Args:
+            summary: Conversation summary
+        """
+        await self.upsert(summary.model_dump())
+
+    async def remove(self, conversation_id: str, user_id: str) -> None:
+        """Delete the summary of a conversation (missing summaries are ignored).
+
+        Args:
+            conversation_id: Conversation ID
+            user_id: Owner of the conversation (partition key)
+        """
+        with contextlib.suppress(CosmosResourceNotFoundError):
+            await self.delete(item_id=conversation_id, partition_key=user_id)
+
+    async def list_for_user(self, user_id: str, limit: int = 50) -> list[ConversationSummary]:
+        """Get the most recently updated conversations of a user.
+
+        Args:
+            user_id: User ID
+            limit: Maximum number of conversations to return
+
+        Returns:
+            Conversation summaries, newest first
+        """
+        query, parameters = (
+            QueryBuilder()
+            .where_eq("user_id", user_id)
+            .order_by("updated_at", descending=True)
+            .top(limit)
+            .build()
+        )
+        items = await self.query(query, parameters, partition_key=user_id)
+        return hydrate_many(ConversationSummary, items)
+
+
+def message_item(conversation_id: str, seq: int, message: Message) -> dict:
+    """Build the ``ConversationMessages`` document of a message."""
+    return {
+        **message.model_dump(),
+        "id": message.message_id,
+        "conversation_id": conversation_id,
+        "seq": seq,
+    }
+
+
+def build_summary(conv: Conversation, last: Message | None) -> ConversationSummary:
+    """Build the history list entry of a conversation.
+
+    Args:
+        conv: Conversation header
+        last: Latest message (None if there is none)
+
+    Returns:
+        Conversation summary
+    """
+    snippet = None
+    if last is not None:
+        text = " ".join(last.content.split())
+        snippet = text[:SNIPPET_LENGTH] + "..." if len(text) > SNIPPET_LENGTH else text
+    return ConversationSummary(
+        id=conv.id,
+        user_id=conv.user_id,
+        title=conv.title,
+        message_count=conv.message_count,
+        last_message=snippet,
+        updated_at=conv.updated_at,
+    )
+
+
+def message_count(item: dict) -> int:
+    """Get the message count of a header (legacy headers count their inline messages)."""
+    if "message_count" in item:
+        return item["message_count"]
+    return len(item.get("messages") or [])
+
 
 class ConversationRepository(BaseRepository):
     """Repository for managing conversation history."""
 
-    def __init__(self):
-        super().__init__(container_name="Conversations")
+    model = Conversation
+
+    def __init__(self, client: StorageBackend):
+        super().__init__(container_name="Conversations", client=client)
+        self.messages = ConversationMessageRepository(client)
+        self.summaries = ConversationSummaryRepository(client)
 
     async def create_conversation(
-        self, user_id: str, first_message: Message
+        self,
+        user_id: str,
+        first_message: Message,
+        conversation_id: str | None = None,
+        replies: list[Message] | None = None,
     ) -> Conversation:
         """Create a new conversation.
 
         Args:
             user_id: User ID
             first_message: First message in the conversation
+            conversation_id: Optional ID to use (generated when omitted)
+            replies: Messages following the first one, written in the same
+                step (e.g. the assistant's answer of the first turn)
 
         Returns:
             Created conversation
+
+        Raises:
+            CosmosResourceExistsError: If a conversation with ``conversation_id`` exists
         """
-        conv_id = str(uuid.uuid4())
-        conversation = Conversation(
-            id=conv_id,
-            user_id=user_id,
-            title=self._generate_title(first_message.content),
-            messages=[first_message],
-            created_at=datetime.utcnow().isoformat(),
-            updated_at=datetime.utcnow().isoformat(),
-        )
-        await self.create(conversation.dict())
+        messages = [first_message, *(replies or [])]
+        conversation = self.new_conversation(user_id, messages, conversation_id)
+        conv_id = conversation.id
+        # Messages first: a failed header write leaves unreachable messages,
+        # never a header counting messages that do not exist (as for appends)
+        await self._save_messages(conv_id, 0, messages)
+        await self.create(conversation.model_dump(exclude={"messages"}))
+        await self._sync_summary(conversation, messages[-1])
+        conversation.messages = messages
         logger.info(f"Created conversation {conv_id} for user {user_id}")
         return conversation
 
+    async def start_conversation(
+        self, user_id: str, first_message: Message, conversation_id: str | None = None
+    ) -> Conversation:
+        """Create an empty conversation ahead of its first turn.
+
+        The header (``message_count`` 0, titled after ``first_message``) and
+        its summary are written in parallel, so the conversation can be read
+        and listed by every worker while the first turn is generated; the
+        turn is then appended like any other.
+
+        Args:
+            user_id: User ID
+            first_message: Message the title is generated from (not stored)
+            conversation_id: Optional ID to use (generated when omitted)
+
+        Returns:
+            Created conversation header
+
+        Raises:
+            CosmosResourceExistsError: If a conversation with ``conversation_id`` exists
+        """
+        conversation = self.new_conversation(user_id, [first_message], conversation_id)
+        conversation.message_count = 0
+        header, _ = await asyncio.gather(
+            self.create(conversation.model_dump(exclude={"messages"})),
+            self._sync_summary(conversation, None),
+            return_exceptions=True,
+        )
+        if isinstance(header, BaseException):
+            # Do not list a conversation that does not exist
+            with contextlib.suppress(Exception):
+                await self.summaries.remove(conversation.id, user_id)
+            raise header
+        logger.info(f"Started conversation {conversation.id} for user {user_id}")
+        return conversation
+
+    def new_conversation(
+        self, user_id: str, messages: list[Message], conversation_id: str | None = None
+    ) -> Conversation:
+        """Build the header of a conversation that is about to be created.
+
+        Args:
+            user_id: User ID
+            messages: Messages of the conversation (the first one gives the title)
+            conversation_id: Optional ID to use (generated when omitted)
+
+        Returns:
+            Conversation header (not stored)
+        """
+        now = datetime.utcnow().isoformat()
+        return Conversation(
+            id=conversation_id or str(uuid.uuid4()),
+            user_id=user_id,
+            title=self._generate_title(messages[0].content),
+            message_count=len(messages),
+            created_at=now,
+            updated_at=now,
+        )
+
     async def get_conversation(self, conversation_id: str) -> Conversation | None:
-        """Get conversation by ID.
+        """Get conversation by ID, with its messages.
 
         Args:
             conversation_id: Conversation ID
@@ -51,78 +348,403 @@ class ConversationRepository(BaseRepository):
             Conversation or None if not found
         """
         try:
-            # Cosmos DB: id is partition key, so pass it as both id and partition_key
-            item = await self.get_by_id(conversation_id, conversation_id)
-            if item:
-                return Conversation(**item)
-            return None
+            versioned = await self.get_versioned(conversation_id)
+            return versioned[0] if versioned else None
         except Exception as e:
             logger.error(f"Error getting conversation {conversation_id}: {e}")
             return None
 
-    async def add_message(
-        self, conversation_id: str, message: Message
-    ) -> Conversation:
-        """Add message to conversation.
+    async def get_versioned(self, item_id: str) -> tuple[Conversation, str | None] | None:
+        """Get a conversation with its messages, and its ETag.
+
+        Args:
+            item_id: Conversation ID
+
+        Returns:
+            Tuple of (conversation, etag), or None if not found. The ETag is
+            None if a counted message document is missing (see ``load_messages``).
+        """
+        header = await self.get_header(item_id)
+        if not header:
+            return None
+        conversation, etag = header
+        complete = await self.load_messages(conversation)
+        return conversation, etag if complete else None
+
+    async def get_header(self, conversation_id: str) -> tuple[Conversation, str | None] | None:
+        """Get a conversation header (without stored messages) and its ETag.
+
+        Every append rewrites the header, so its ETag changes whenever the
+        messages do, and ``If-None-Match`` can be answered from the header
+        alone. Legacy inline messages are part of the header.
+
+        Args:
+            conversation_id: Conversation ID
+
+        Returns:
+            Tuple of (conversation header, etag), or None if not found
+        """
+        item = await self.get_by_id(conversation_id, conversation_id)
+        if not item:
+            return None
+        conversation = hydrate(Conversation, item)
+        conversation.message_count = message_count(item)
+        return conversation, item.get("_etag")
+
+    async def load_messages(self, conversation: Conversation) -> bool:
+        """Add the stored messages to a header returned by ``get_header``.
+
+        Only messages the header counts are loaded. Appends store their
+        documents before counting them, so the body is normally complete;
+        if a counted document is missing anyway (e.g. deleted by hand), the
+        body must not be sent with the header's ETag, or clients would keep
+        revalidating the incomplete copy.
+
+        Args:
+            conversation: Conversation header (messages are appended in place)
+
+        Returns:
+            Whether every message counted by the header was loaded
+        """
+        stored = await self.messages.list_messages(conversation.id, conversation.message_count)
+        conversation.messages = [*conversation.messages, *stored]
+        return len(conversation.messages) >= conversation.message_count
+
+    async def get_message_page(
+        self,
+        conversation_id: str,
+        limit: int = 20,
+        cursor: int | None = None,
+        newer: bool = False,
+    ) -> tuple[list[Message], int | None]:
+        """Get one window of messages of a conversation (newest first by default).
+
+        Legacy headers keep their first messages inline (positions ``0`` to
+        ``len(messages) - 1``); those are served from the header, and only
+        messages appended later are queried. Reads never migrate anything
+        (see ``app.initializers.migrate_conversation_messages``).
+
+        Args:
+            conversation_id: Conversation ID
+            limit: Maximum number of messages
+            cursor: Cursor returned with the previous window
+            newer: Walk toward newer messages instead of older ones
+
+        Returns:
+            Tuple of (messages in chronological order, next cursor or None)
+
+        Raises:
+            ConversationNotFoundError: If conversation not found
+        """
+        item = await self.get_by_id(conversation_id, conversation_id)
+        if not item:
+            raise ConversationNotFoundError(f"Conversation {conversation_id} not found")
+        inline = hydrate_many(Message, item.get("messages") or [])
+        if not inline:
+            return await self.messages.get_window(
+                conversation_id, limit, cursor, newer, end=message_count(item)
+            )
+        if newer:
+            return await self._newer_with_inline(item, inline, limit, cursor)
+        return await self._older_with_inline(item, inline, limit, cursor)
+
+    async def _older_with_inline(
+        self, item: dict, inline: list[Message], limit: int, cursor: int | None
+    ) -> tuple[list[Message], int | None]:
+        """Window toward older messages of a legacy header (inline messages first)."""
+        end = len(inline)
+        stored: list[Message] = []
+        if cursor is None or cursor > end:
+            stored, next_cursor = await self.messages.get_window(
+                item["id"], limit, cursor, min_seq=end, end=message_count(item)
+            )
+            if next_cursor is not None:
+                return stored, next_cursor
+        else:
+            end = cursor
+        start = max(0, end - (limit - len(stored)))
+        return [*inline[start:end], *stored], start if start > 0 else None
+
+    async def _newer_with_inline(
+        self, item: dict, inline: list[Message], limit: int, cursor: int | None
+    ) -> tuple[list[Message], int | None]:
+        """Window toward newer messages of a legacy header (inline messages first)."""
+        start = 0 if cursor is None else cursor + 1
+        if start >= len(inline):
+            return await self.messages.get_window(
+                item["id"], limit, cursor, newer=True, min_seq=len(inline), end=message_count(item)
+            )
+        window = inline[start : start + limit]
+        room = limit - len(window)
+        if room == 0:
+            last = start + limit - 1
+            return window, last if last + 1 < message_count(item) else None
+        stored, next_cursor = await self.messages.get_window(
+            item["id"], room, newer=True, min_seq=len(inline), end=message_count(item)
+        )
+        return [*window, *stored], next_cursor
+
+    async def add_message(self, conversation_id: str, message: Message) -> Conversation:
+        """Append a message to a conversation.
 
         Args:
             conversation_id: Conversation ID
             message: Message to add
 
         Returns:
-            Updated conversation
+            Updated conversation header (messages are not loaded)
 
         Raises:
-            ValueError: If conversation not found
+            ConversationNotFoundError: If conversation not found
+            PreconditionFailedException: If concurrent writers kept winning
         """
-        conv = await self.get_conversation(conversation_id)
-        if not conv:
-            raise ValueError(f"Conversation {conversation_id} not found")
+        return await self.append_messages(conversation_id, [message])
+
+    async def append_messages(self, conversation_id: str, messages: list[Message]) -> Conversation:
+        """Append several messages (e.g. a whole turn) to a conversation.
+
+        The message documents are written at the positions after the
+        header's ``message_count``, then the count is bumped with optimistic
+        concurrency. If another append won the header in between, the
+        documents are written again at the new positions (upserted by
+        message ID, so they move rather than duplicate). A failure before
+        the header write leaves only uncommitted documents, which reads
+        skip (see ``discard_messages``).
+
+        Args:
+            conversation_id: Conversation ID
+            messages: Messages in order
+
+        Returns:
+            Updated conversation header (messages are not loaded)
+
+        Raises:
+            ConversationNotFoundError: If conversation not found
+            PreconditionFailedException: If concurrent writers kept winning
+        """
+        for attempt in range(1, MAX_WRITE_ATTEMPTS + 1):
+            item = await self.get_by_id(conversation_id, conversation_id)
+            if not item:
+                raise ConversationNotFoundError(f"Conversation {conversation_id} not found")
+            seq = message_count(item)
+            await self._save_messages(conversation_id, seq, messages)
+            item["message_count"] = seq + len(messages)
+            item["updated_at"] = datetime.utcnow().isoformat()
+            try:
+                written = await self.replace(item, etag=item.get("_etag"))
+            except PreconditionFailedException:
+                logger.info(
+                    f"Conversation {conversation_id} changed concurrently "
+                    f"(attempt {attempt}/{MAX_WRITE_ATTEMPTS})"
+                )
+                continue
+            conv = hydrate(Conversation, written)
+            conv.message_count = message_count(written)
+            await self._sync_summary(conv, messages[-1])
+            logger.info(f"Added {len(messages)} messages from {seq} to conversation {conv.id}")
+            return conv
+        raise PreconditionFailedException(f"Conversation {conversation_id} kept changing")
+
+    async def is_appended(self, conversation_id: str, messages: list[Message]) -> bool:
+        """Check whether an append of ``messages`` has been committed.
+
+        Used before retrying an append whose outcome is unknown (e.g. the
+        header write timed out), so a retry never counts the messages twice.
+
+        Args:
+            conversation_id: Conversation ID
+            messages: Messages of the append, in order
+
+        Returns:
+            Whether the last message is stored at a position the header counts
+        """
+        last = await self.messages.get_by_id(messages[-1].message_id, conversation_id)
+        if not last:
+            return False
+        item = await self.get_by_id(conversation_id, conversation_id)
+        return bool(item) and last["seq"] < message_count(item)
+
+    async def discard_messages(self, conversation_id: str, messages: list[Message]) -> int:
+        """Delete the documents of an append that was given up (best effort).
 
-        conv.messages.append(message)
-        conv.updated_at = datetime.utcnow().isoformat()
+        Reads already skip documents past ``message_count``, but the next
+        append reuses those positions and would commit them alongside its
+        own messages. Documents the header counts are kept.
 
-        # Use upsert to update
-        await self.upsert(conv.dict())
-        logger.info(f"Added message to conversation {conversation_id}")
-        return conv
+        Args:
+            conversation_id: Conversation ID
+            messages: Messages of the failed append
+
+        Returns:
+            Number of deleted documents
+        """
+        item = await self.get_by_id(conversation_id, conversation_id)
+        end = message_count(item) if item else 0
+        deleted = 0
+        for message in messages:
+            stored = await self.messages.get_by_id(message.message_id, conversation_id)
+            if stored and stored["seq"] >= end:
+                with contextlib.suppress(CosmosResourceNotFoundError):
+                    await self.messages.delete(message.message_id, partition_key=conversation_id)
+                    deleted += 1
+        return deleted
 
     async def list_user_conversations(
         self, user_id: str, limit: int = 50
-    ) -> list[Conversation]:
-        """List conversations for a user.
+    ) -> list[ConversationSummary]:
+        """List conversations for a user (summaries, without messages).
 
         Args:
             user_id: User ID
             limit: Maximum number of conversations to return
 
         Returns:
-            List of conversations
-        """
-        query = f"""
-            SELECT * FROM c
-            WHERE c.user_id = '{user_id}' AND c.is_active = true
-            ORDER BY c.updated_at DESC
-            OFFSET 0 LIMIT {limit}
+            Conversation summaries, most recently updated first
         """
-        items = await self.query(query)
-        return [Conversation(**item) for item in items]
+        return await self.summaries.list_for_user(user_id, limit)
 
-    async def delete_conversation(self, conversation_id: str) -> None:
+    async def delete_conversation(self, conversation_id: str, etag: str | None = None) -> None:
         """Delete a conversation (soft delete).
 
         Args:
             conversation_id: Conversation ID to delete
+            etag: Optional ETag the conversation must still have (``If-Match``)
+
+        Raises:
+            ConversationNotFoundError: If conversation not found
+            PreconditionFailedException: If the conversation changed since ``etag``
         """
-        conv = await self.get_conversation(conversation_id)
-        if not conv:
-            raise ValueError(f"Conversation {conversation_id} not found")
 
-        conv_dict = conv.dict()
-        conv_dict["is_active"] = False
-        await self.upsert(conv_dict)
+        def deactivate(item: dict) -> None:
+            item["is_active"] = False
+
+        conv = await self._modify(conversation_id, deactivate, etag=etag)
+        try:
+            await self.summaries.remove(conversation_id, conv.user_id)
+        except Exception as e:
+            logger.error(f"Error removing summary of conversation {conversation_id}: {e}")
         logger.info(f"Deleted conversation {conversation_id}")
 
+    async def move_inline_messages(self, conversation_id: str) -> int:
+        """Move the messages embedded in a legacy header to ``ConversationMessages``.
+
+        Safe to re-run: message documents are upserted by message ID and the
+        header is only rewritten while it still has inline messages.
+
+        Args:
+            conversation_id: Conversation ID
+
+        Returns:
+            Number of messages moved
+        """
+        item = await self.get_by_id(conversation_id, conversation_id)
+        inline = hydrate_many(Message, (item or {}).get("messages") or [])
+        if not inline:
+            return 0
+        await self._save_messages(conversation_id, 0, inline)
+
+        def strip(header: dict) -> None:
+            header["message_count"] = message_count(header)
+            header.pop("messages", None)
+
+        await self._modify(conversation_id, strip)
+        logger.info(f"Moved {len(inline)} inline messages of conversation {conversation_id}")
+        return len(inline)
+
+    async def rebuild_summary(self, conversation_id: str) -> ConversationSummary | None:
+        """Recompute the summary of a conversation from its header and latest message.
+
+        Args:
+            conversation_id: Conversation ID
+
+        Returns:
+            Written summary, or None if the conversation is missing or deleted
+            (its summary is removed)
+        """
+        item = await self.get_by_id(conversation_id, conversation_id)
+        if not item:
+            return None
+        conv = hydrate(Conversation, item)
+        if not conv.is_active:
+            await self.summaries.remove(conversation_id, conv.user_id)
+            return None
+        conv.message_count = message_count(item)
+        latest, _ = await self.messages.get_window(conversation_id, 1, end=conv.message_count)
+        if not latest:
+            latest = conv.messages[-1:]
+        summary = build_summary(conv, latest[-1] if latest else None)
+        await self.summaries.save(summary)
+        return summary
+
+    async def _save_messages(self, conversation_id: str, seq: int, messages: list[Message]) -> None:
+        """Write message documents from position ``seq`` concurrently."""
+        await asyncio.gather(
+            *(
+                self.messages.save(conversation_id, seq + offset, message)
+                for offset, message in enumerate(messages)
+            )
+        )
+
+    async def _sync_summary(self, conv: Conversation, last: Message | None) -> None:
+        """Write the summary of a conversation after a write.
+
+        Failures are logged rather than raised (the message itself is
+        stored); run ``rebuild_conversation_summaries`` to repair the list.
+        """
+        try:
+            await self.summaries.save(build_summary(conv, last))
+        except Exception as e:
+            logger.error(f"Error writing summary of conversation {conv.id}: {e}")
+
+    async def _modify(
+        self,
+        conversation_id: str,
+        change: Callable[[dict], None],
+        etag: str | None = None,
+    ) -> Conversation:
+        """Read-modify-write a conversation header with optimistic concurrency.
+
+        The write only succeeds if nobody wrote in between; otherwise the
+        change is re-applied to the newer version. With ``etag`` (an
+        ``If-Match`` from the client) the write is never retried. The raw
+        document is changed, so fields the model does not know are kept.
+
+        Args:
+            conversation_id: Conversation ID
+            change: Function mutating the header document in place
+            etag: Optional ETag the conversation must still have
+
+        Returns:
+            Written conversation header
+
+        Raises:
+            ConversationNotFoundError: If conversation not found
+            PreconditionFailedException: If ``etag`` does not match, or
+                concurrent writers kept winning
+        """
+        for attempt in range(1, MAX_WRITE_ATTEMPTS + 1):
+            item = await self.get_by_id(conversation_id, conversation_id)
+            if not item:
+                raise ConversationNotFoundError(f"Conversation {conversation_id} not found")
+            current_etag = item.get("_etag")
+            if etag is not None and etag != current_etag:
+                raise PreconditionFailedException(
+                    f"Conversation {conversation_id} was modified concurrently"
+                )
+
+            change(item)
+            try:
+                written = await self.replace(item, etag=current_etag)
+                return hydrate(Conversation, written)
+            except PreconditionFailedException:
+                if etag is not None:
+                    raise
+                logger.info(
+                    f"Conversation {conversation_id} changed concurrently "
+                    f"(attempt {attempt}/{MAX_WRITE_ATTEMPTS})"
+                )
+        raise PreconditionFailedException(f"Conversation {conversation_id} kept changing")
+
     def _generate_title(self, first_query: str) -> str:
         """Generate conversation title from first query.
 
@@ -0,0 +1,251 @@
+"""Write-behind persistence of conversation turns.
+
+The chat stream hands a finished turn (user question and assistant answer)
+to ``ConversationWriter.submit`` and closes the response without waiting for
+Cosmos DB. New conversations are created (``start_conversation``) before
+the stream starts, so only appends are queued. The writer keeps one flush
+task per conversation, so turns of a
+conversation are written in the order they were submitted while different
+conversations are written concurrently. Turns queued while a write of the
+same conversation is in flight are coalesced into the next write: the
+message documents in parallel, one ``message_count`` update on the header
+and one summary update.
+
+Failed writes are retried with exponential backoff. A retry first checks
+whether the previous attempt committed after all (its outcome is unknown
+when e.g. the header write timed out), so messages are never counted
+twice. Message documents are stored before the header counts them; when a
+write is given up, its uncommitted documents are deleted so the next
+append does not commit them. Only a conversation that no longer exists
+is given up without retrying. Until a write lands, ``recent_messages``
+overlays the queued messages, so the next turn sees them. ``close`` stops
+accepting turns and waits for the queue to drain.
+
+The queue lives in the worker process: turns still queued when a worker is
+killed (rather than shut down) are lost, and other workers (and direct
+repository reads) do not see them until they are written.
+"""
+
+import asyncio
+import logging
+import random
+from dataclasses import dataclass
+
+from app.models.conversation import Message
+from app.repositories.conversation import ConversationNotFoundError, ConversationRepository
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class PendingWrite:
+    """Messages of one conversation waiting to be written (one or more turns)."""
+
+    conversation_id: str
+    messages: list[Message]
+    turns: int = 1
+    attempts: int = 0
+
+
+class ConversationWriter:
+    """Per-conversation ordered write-behind queue for chat turns."""
+
+    def __init__(
+        self,
+        repo: ConversationRepository,
+        max_attempts: int = 5,
+        retry_base_delay_ms: float = 200.0,
+        retry_max_delay_ms: float = 5000.0,
+    ):
+        """Initialize writer.
+
+        Args:
+            repo: Conversation repository
+            max_attempts: Attempts per write before its messages are dropped
+            retry_base_delay_ms: Backoff before the first retry (doubled per retry)
+            retry_max_delay_ms: Backoff cap
+        """
+        self.repo = repo
+        self.max_attempts = max_attempts
+        self.retry_base_delay_ms = retry_base_delay_ms
+        self.retry_max_delay_ms = retry_max_delay_ms
+        self._pending: dict[str, PendingWrite] = {}  # queued, not taken by a flush yet
+        self._in_flight: dict[str, PendingWrite] = {}  # being written
+        self._tasks: dict[str, asyncio.Task] = {}
+        self._closed = False
+        self.turns_submitted = 0
+        self.turns_coalesced = 0
+        self.writes = 0
+        self.messages_written = 0
+        self.retries = 0
+        self.failed_writes = 0
+        self.messages_dropped = 0
+
+    def submit(self, conversation_id: str, messages: list[Message]) -> None:
+        """Queue the messages of a turn; returns without waiting for the write.
+
+        Args:
+            conversation_id: Conversation ID (the conversation must exist)
+            messages: Messages of the turn in order
+
+        Raises:
+            RuntimeError: If the writer is closed
+        """
+        if self._closed:
+            raise RuntimeError("Conversation writer is closed")
+        if not messages:
+            return
+        self.turns_submitted += 1
+        pending = self._pending.get(conversation_id)
+        if pending:
+            pending.messages.extend(messages)
+            pending.turns += 1
+            self.turns_coalesced += 1
+        else:
+            self._pending[conversation_id] = PendingWrite(conversation_id, list(messages))
+        if conversation_id not in self._tasks:
+            self._tasks[conversation_id] = asyncio.create_task(
+                self._flush(conversation_id), name=f"conversation-write-{conversation_id}"
+            )
+
+    async def _flush(self, conversation_id: str) -> None:
+        """Write queued turns of a conversation one batch at a time, in order."""
+        try:
+            while (write := self._pending.pop(conversation_id, None)) is not None:
+                self._in_flight[conversation_id] = write
+                try:
+                    await self._write_with_retries(write)
+                finally:
+                    del self._in_flight[conversation_id]
+        finally:
+            del self._tasks[conversation_id]
+
+    async def _write_with_retries(self, write: PendingWrite) -> None:
+        """Write a batch, retrying every failure but a missing conversation with backoff."""
+        error: Exception | None = None
+        for attempt in range(1, self.max_attempts + 1):
+            try:
+                await self._write(write)
+                self.writes += 1
+                self.messages_written += len(write.messages)
+                return
+            except ConversationNotFoundError as e:
+                # Retrying will not make the conversation exist
+                error = e
+                break
+            except Exception as e:
+                error = e
+                if attempt == self.max_attempts:
+                    break
+                self.retries += 1
+                cap = min(self.retry_max_delay_ms, self.retry_base_delay_ms * 2 ** (attempt - 1))
+                delay_ms = random.uniform(cap / 2, cap)
+                logger.warning(
+                    f"Writing conversation {write.conversation_id} failed "
+                    f"(attempt {attempt}/{self.max_attempts}), retrying in {delay_ms:.0f}ms: {e}"
+                )
+                await asyncio.sleep(delay_ms / 1000)
+        self.failed_writes += 1
+        self.messages_dropped += len(write.messages)
+        message_ids = [message.message_id for message in write.messages]
+        logger.error(
+            f"Dropped {len(write.messages)} messages of conversation {write.conversation_id} "
+            f"{message_ids}: {error}"
+        )
+        try:
+            await self.repo.discard_messages(write.conversation_id, write.messages)
+        except Exception as e:
+            logger.error(
+                f"Error discarding uncommitted messages of conversation "
+                f"{write.conversation_id}: {e}"
+            )
+
+    async def _write(self, write: PendingWrite) -> None:
+        """Append one batch (skipped if an earlier attempt committed it after all)."""
+        write.attempts += 1
+        if write.attempts > 1 and await self.repo.is_appended(
+            write.conversation_id, write.messages
+        ):
+            return
+        await self.repo.append_messages(write.conversation_id, write.messages)
+
+    # ------------------------------------------------------------------
+    # Reads overlaying queued turns
+    # ------------------------------------------------------------------
+
+    def pending_messages(self, conversation_id: str) -> list[Message]:
+        """Get messages of a conversation that may not be written yet.
+
+        Args:
+            conversation_id: Conversation ID
+
+        Returns:
+            Messages being written followed by queued ones, in order
+        """
+        return [
+            message
+            for write in (self._in_flight.get(conversation_id), self._pending.get(conversation_id))
+            if write
+            for message in write.messages
+        ]
+
+    async def recent_messages(self, conversation_id: str, limit: int) -> list[Message]:
+        """Get the latest messages of a conversation, including queued ones.
+
+        Args:
+            conversation_id: Conversation ID
+            limit: Maximum number of messages
+
+        Returns:
+            Up to ``limit`` latest messages, oldest first
+
+        Raises:
+            ConversationNotFoundError: If the conversation does not exist
+        """
+        pending = self.pending_messages(conversation_id)
+        stored, _ = await self.repo.get_message_page(conversation_id, limit=limit)
+        # A write may land between the two reads; keep one copy of each message
+        pending_ids = {message.message_id for message in pending}
+        messages = [message for message in stored if message.message_id not in pending_ids]
+        return (messages + pending)[-limit:]
+
+    # ------------------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------------------
+
+    async def close(self, timeout_seconds: float = 10.0) -> None:
+        """Stop accepting turns and wait for queued writes to finish.
+
+        Args:
+            timeout_seconds: Longest wait; writes still running are cancelled
+        """
+        self._closed = True
+        tasks = list(self._tasks.values())
+        if not tasks:
+            return
+        logger.info(f"Draining conversation writes of {len(tasks)} conversations")
+        _, not_done = await asyncio.wait(tasks, timeout=timeout_seconds)
+        if not_done:
+            logger.error(
+                f"Conversation writes not drained within {timeout_seconds}s; "
+                f"dropping {self.stats()['pending_messages']} messages"
+            )
+            for task in not_done:
+                task.cancel()
+            await asyncio.gather(*not_done, return_exceptions=True)
+
+    def stats(self) -> dict:
+        """Get queue counters."""
+        writes = (*self._in_flight.values(), *self._pending.values())
+        return {
+            "closed": self._closed,
+            "pending_conversations": len(self._tasks),
+            "pending_messages": sum(len(write.messages) for write in writes),
+            "turns_submitted": self.turns_submitted,
+            "turns_coalesced": self.turns_coalesced,
+            "writes": self.writes,
+            "messages_written": self.messages_written,
+            "retries": self.retries,
+            "failed_writes": self.failed_writes,
+            "messages_dropped": self.messages_dropped,
+        }
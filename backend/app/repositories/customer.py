@@ -1,28 +1,61 @@
 """Customer repository for customer data access."""
 
 import logging
+from collections.abc import AsyncIterator
 
+from app.core.storage import StorageBackend
 from app.models.schemas import Customer
 from app.repositories.base import BaseRepository
+from app.repositories.cache import EntityCache
+from app.repositories.filters import CustomerSpec
+from app.repositories.hydration import hydrate
+from app.repositories.search_index import CustomerSearchIndex
 
 logger = logging.getLogger(__name__)
 
+# Continuation tokens of keyword searches paged from the index
+SEARCH_TOKEN_PREFIX = "search:"
+
 
 class CustomerRepository(BaseRepository[Customer]):
     """Repository for Customer data access."""
 
-    def __init__(self):
-        """Initialize CustomerRepository."""
-        super().__init__("Customers")
+    model = Customer
+
+    def __init__(self, client: StorageBackend, cache: EntityCache | None = None):
+        """Initialize CustomerRepository.
+
+        Args:
+            client: Shared storage backend
+            cache: Optional read-through cache for customer lookups
+        """
+        super().__init__("Customers", client, cache)
+        self.search_index: CustomerSearchIndex | None = None
+
+    def attach_search_index(self, index: CustomerSearchIndex) -> None:
+        """Serve keyword searches from an in-process n-gram index once it is ready.
+
+        Args:
+            index: Customer search index (kept in sync by the replicas)
+        """
+        self.search_index = index
+
+    @property
+    def search_ready(self) -> bool:
+        """Whether keyword searches can be served from the index."""
+        return self.search_index is not None and self.search_index.ready
 
-    async def get_all_customers(self) -> list[Customer]:
+    async def get_all_customers(self, fields: list[str] | None = None) -> list[Customer]:
         """Get all customers.
 
+        Args:
+            fields: Optional fields to project (returns partial models)
+
         Returns:
             List of Customer objects
         """
-        items = await self.get_all()
-        return [Customer(**item) for item in items]
+        items = await self.get_all(fields)
+        return self._to_models(items, fields)
 
     async def get_customer_by_id(self, customer_id: str) -> Customer | None:
         """Get customer by ID.
@@ -34,35 +67,118 @@ class CustomerRepository(BaseRepository[Customer]):
             Customer object or None if not found
         """
         item = await self.get_by_id(item_id=customer_id, partition_key=customer_id)
-        return Customer(**item) if item else None
+        return hydrate(Customer, item) if item else None
 
-    async def get_customers_by_industry(self, industry: str) -> list[Customer]:
+    async def get_customers_by_ids(self, customer_ids: list[str]) -> list[Customer]:
+        """Get several customers by ID in one batched read.
+
+        Args:
+            customer_ids: Customer IDs
+
+        Returns:
+            Customer objects in request order (IDs that do not exist are skipped)
+        """
+        items = await self.get_many(customer_ids)
+        return [
+            hydrate(Customer, items[item_id])
+            for item_id in dict.fromkeys(customer_ids)
+            if item_id in items
+        ]
+
+    async def get_customers_by_industry(
+        self, industry: str, fields: list[str] | None = None
+    ) -> list[Customer]:
         """Get customers by industry.
 
         Args:
             industry: Industry name
+            fields: Optional fields to project (returns partial models)
 
         Returns:
             List of Customer objects
         """
-        query = "SELECT * FROM c WHERE c.industry = @industry"
-        parameters = [{"name": "@industry", "value": industry}]
-        items = await self.query(query=query, parameters=parameters)
-        return [Customer(**item) for item in items]
+        items = await self.find_by_field("industry", industry, fields)
+        return self._to_models(items, fields)
 
-    async def search_customers(self, keyword: str) -> list[Customer]:
+    async def search_customers(
+        self, keyword: str, fields: list[str] | None = None
+    ) -> list[Customer]:
         """Search customers by name.
 
+        With the search index, contact persons and deal notes are searched
+        too, spelling variants (width, case, kana) match and the best
+        matches come first.
+
         Args:
             keyword: Search keyword
+            fields: Optional fields to project (returns partial models)
 
         Returns:
             List of Customer objects matching the keyword
         """
-        query = "SELECT * FROM c WHERE CONTAINS(c.name, @keyword)"
-        parameters = [{"name": "@keyword", "value": keyword}]
-        items = await self.query(query=query, parameters=parameters)
-        return [Customer(**item) for item in items]
+        return await self.find_customers(CustomerSpec(keyword=keyword), fields)
+
+    async def find_customers(
+        self, spec: CustomerSpec, fields: list[str] | None = None
+    ) -> list[Customer]:
+        """Get customers matching all filters of a specification in a single query.
+
+        Args:
+            spec: Customer filters, ordering and result cap
+            fields: Optional fields to project (returns partial models)
+
+        Returns:
+            List of Customer objects
+        """
+        items = await self.find(spec, fields)
+        return self._to_models(items, fields)
+
+    async def get_customers_page(
+        self,
+        industry: str | None = None,
+        keyword: str | None = None,
+        page_size: int = 100,
+        continuation_token: str | None = None,
+        fields: list[str] | None = None,
+    ) -> tuple[list[Customer], str | None]:
+        """Get one page of customers, optionally filtered by industry and name keyword.
+
+        Args:
+            industry: Optional industry filter
+            keyword: Optional keyword matched against the customer name
+            page_size: Maximum number of customers in the page
+            continuation_token: Token returned by the previous page
+            fields: Optional fields to project (returns partial models)
+
+        Returns:
+            Tuple of (customers, next continuation token or None when exhausted)
+        """
+        items, next_token = await self.find_page(
+            self._customer_spec(industry, keyword), page_size, continuation_token, fields
+        )
+        return self._to_models(items, fields), next_token
+
+    async def iter_customer_pages(
+        self,
+        industry: str | None = None,
+        keyword: str | None = None,
+        page_size: int = 100,
+        fields: list[str] | None = None,
+    ) -> AsyncIterator[list[Customer]]:
+        """Stream customers page by page, optionally filtered by industry and name keyword.
+
+        Args:
+            industry: Optional industry filter
+            keyword: Optional keyword matched against the customer name
+            page_size: Maximum number of customers per page
+            fields: Optional fields to project (returns partial models)
+
+        Yields:
+            Lists of Customer objects, one per Cosmos page
+        """
+        spec = self._customer_spec(industry, keyword)
+        async for items in self.iter_find_pages(spec, page_size, fields):
+            yield self._to_models(items, fields)
 
     async def create_customer(self, customer: Customer) -> Customer:
         """Create a new customer.
@@ -76,21 +192,29 @@ class CustomerRepository(BaseRepository[Customer]):
         customer_dict = customer.model_dump()
         customer_dict["id"] = customer.customer_id  # Cosmos DB requires 'id' field
         created = await self.create(customer_dict)
-        return Customer(**created)
+        return hydrate(Customer, created)
 
-    async def update_customer(self, customer: Customer) -> Customer:
+    async def update_customer(self, customer: Customer, etag: str | None = None) -> Customer:
         """Update a customer.
 
         Args:
             customer: Customer object to update
+            etag: Optional ETag of the version the update is based on; when
+                given, the update fails if the customer changed in the meantime
 
         Returns:
             Updated Customer object
+
+        Raises:
+            PreconditionFailedException: If ``etag`` no longer matches
         """
         customer_dict = customer.model_dump()
         customer_dict["id"] = customer.customer_id
-        updated = await self.upsert(customer_dict)
-        return Customer(**updated)
+        if etag is None:
+            updated = await self.upsert(customer_dict)
+        else:
+            updated = await self.replace(customer_dict, etag=etag)
+        return hydrate(Customer, updated)
 
     async def delete_customer(self, customer_id: str) -> None:
         """Delete a customer.
@@ -99,3 +223,105 @@ class CustomerRepository(BaseRepository[Customer]):
             customer_id: Customer ID to delete
         """
         await self.delete(item_id=customer_id, partition_key=customer_id)
+
+    async def find(self, spec: CustomerSpec, fields: list[str] | None = None) -> list[dict]:
+        """Get customers matching a specification, from the search index for keywords.
+
+        Args:
+            spec: Customer filters, ordering and result cap
+            fields: Optional fields to project
+
+        Returns:
+            List of matching customer items (best keyword match first unless ordered)
+        """
+        if spec.keyword and self.search_ready:
+            return self._project(await self._search(spec), fields)
+        return await super().find(spec, fields)
+
+    async def find_page(
+        self,
+        spec: CustomerSpec,
+        page_size: int = 100,
+        continuation_token: str | None = None,
+        fields: list[str] | None = None,
+    ) -> tuple[list[dict], str | None]:
+        """Get one page of customers matching a specification.
+
+        Keyword searches served by the index are paged by offset; the
+        continuation token is then ``search:<offset>``.
+
+        Args:
+            spec: Customer filters, ordering and result cap
+            page_size: Maximum number of customers in the page
+            continuation_token: Token returned by the previous page
+            fields: Optional fields to project
+
+        Returns:
+            Tuple of (customer items, next continuation token or None when exhausted)
+        """
+        offset = self._search_offset(continuation_token)
+        if spec.keyword and self.search_ready and offset is not None:
+            items = await self._search(spec)
+            end = offset + page_size
+            next_token = f"{SEARCH_TOKEN_PREFIX}{end}" if end < len(items) else None
+            return self._project(items[offset:end], fields), next_token
+        return await super().find_page(spec, page_size, continuation_token, fields)
+
+    def iter_find_pages(
+        self, spec: CustomerSpec, page_size: int = 100, fields: list[str] | None = None
+    ) -> AsyncIterator[list[dict]]:
+        """Stream customers matching a specification, from the search index for keywords.
+
+        Args:
+            spec: Customer filters, ordering and result cap
+            page_size: Maximum number of customers per page
+            fields: Optional fields to project
+
+        Returns:
+            Async iterator of customer item lists, one per page
+        """
+        if spec.keyword and self.search_ready:
+            return self._iter_search_pages(spec, page_size, fields)
+        return super().iter_find_pages(spec, page_size, fields)
+
+    async def _iter_search_pages(
+        self, spec: CustomerSpec, page_size: int, fields: list[str] | None
+    ) -> AsyncIterator[list[dict]]:
+        """Yield keyword search results in pages."""
+        items = await self._search(spec)
+        for start in range(0, len(items), page_size):
+            yield self._project(items[start : start + page_size], fields)
+
+    async def _search(self, spec: CustomerSpec) -> list[dict]:
+        """Evaluate a keyword specification with the search index and the replica."""
+        customer_ids = self.search_index.search(spec.keyword)
+        found = {customer_id: self.replica.get(customer_id) for customer_id in customer_ids}
+        missing = [customer_id for customer_id, item in found.items() if item is None]
+        if missing:
+            # Indexed (e.g. from deal notes) before the Customers replica caught up
+            found.update(await self.get_many(missing, use_replica=False))
+        items = []
+        for customer_id in customer_ids:
+            item = found.get(customer_id)
+            if item is None or (spec.industries and item.get("industry") not in spec.industries):
+                continue
+            items.append(item)
+        if spec.order_by:
+            # Explicit ordering wins over relevance (same rules as replica reads)
+            return spec.model_copy(update={"keyword": None, "industries": None}).select(items)
+        return items[: spec.top] if spec.top is not None else items
+
+    @staticmethod
+    def _search_offset(continuation_token: str | None) -> int | None:
+        """Get the offset of a search page token (0 for the first page, None if not ours)."""
+        if continuation_token is None:
+            return 0
+        if not continuation_token.startswith(SEARCH_TOKEN_PREFIX):
+            return None
+        offset = continuation_token.removeprefix(SEARCH_TOKEN_PREFIX)
+        return int(offset) if offset.isdigit() else None
+
+    @staticmethod
+    def _customer_spec(industry: str | None, keyword: str | None) -> CustomerSpec:
+        """Build the customer specification for an industry and name keyword."""
+        return CustomerSpec(industries=[industry] if industry else None, keyword=keyword)
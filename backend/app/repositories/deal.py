@@ -1,9 +1,26 @@
 """Deal repository for deal data access."""
 
 import logging
+from collections.abc import AsyncIterator
+from typing import TYPE_CHECKING
 
-from app.models.schemas import Deal
+from azure.cosmos.exceptions import CosmosResourceNotFoundError
+
+from app.core.storage import StorageBackend
+from app.models.schemas import Deal, DealSummary, SimilarDeal
 from app.repositories.base import BaseRepository
+from app.repositories.cache import EntityCache
+from app.repositories.deal_summary import (
+    DealSummaryRepository,
+    aggregate_deal_summary,
+    summarize,
+)
+from app.repositories.deal_vectors import DealVectorIndex
+from app.repositories.filters import DealSpec
+from app.repositories.hydration import hydrate
+
+if TYPE_CHECKING:
+    from app.repositories.deal_views import DealViewRepository
 
 logger = logging.getLogger(__name__)
 
@@ -11,18 +28,118 @@ logger = logging.getLogger(__name__)
 class DealRepository(BaseRepository[Deal]):
     """Repository for Deal data access."""
 
-    def __init__(self):
-        """Initialize DealRepository."""
-        super().__init__("Deals")
+    model = Deal
+
+    def __init__(self, client: StorageBackend, cache: EntityCache | None = None):
+        """Initialize DealRepository.
+
+        Args:
+            client: Shared storage backend
+            cache: Optional read-through cache for deal lookups
+        """
+        super().__init__("Deals", client, cache)
+        # Materialized views by partition key field (see deal_views)
+        self.views: dict[str, DealViewRepository] = {}
+        # Incrementally maintained pipeline totals (see deal_summary)
+        self.summary: DealSummaryRepository | None = None
+        # Notes similarity index (kept in sync by the replica, see deal_vectors)
+        self.vector_index: DealVectorIndex | None = None
+
+    def attach_views(self, views: list["DealViewRepository"]) -> None:
+        """Serve sales user / customer lookups from materialized views and keep them in sync.
+
+        Args:
+            views: View repositories (one per key field)
+        """
+        self.views = {view.key_field: view for view in views}
+
+    def attach_summary(self, summary: DealSummaryRepository) -> None:
+        """Serve pipeline totals from the summary document and keep it in sync.
+
+        Args:
+            summary: Summary repository
+        """
+        self.summary = summary
+
+    def attach_vector_index(self, index: DealVectorIndex) -> None:
+        """Serve similar deal searches from a vector index.
+
+        Args:
+            index: Deal vector index (kept in sync by the replica)
+        """
+        self.vector_index = index
+
+    @property
+    def similarity_ready(self) -> bool:
+        """Whether similar deal searches can be served."""
+        return self.vector_index is not None and self.vector_index.ready
+
+    async def find_similar_deals(
+        self,
+        deal_id: str | None = None,
+        text: str | None = None,
+        top_k: int = 5,
+        service_type: str | None = None,
+    ) -> list[SimilarDeal]:
+        """Find the deals whose notes are most similar to a deal or a text.
+
+        Args:
+            deal_id: Deal to find similar deals for (excluded from the results)
+            text: Free text to compare with (used when ``deal_id`` is not given)
+            top_k: Maximum number of deals
+            service_type: Optional service type to weigh in (text queries only)
+
+        Returns:
+            Similar deals, most similar first
+
+        Raises:
+            RuntimeError: If the vector index is disabled or still loading
+            ValueError: If neither ``deal_id`` nor ``text`` is given
+        """
+        if not self.similarity_ready:
+            raise RuntimeError("Deal vector index is not available")
+        if deal_id:
+            [matches] = self.vector_index.similar_to([deal_id], top_k)
+        elif text:
+            [matches] = self.vector_index.search([text], top_k, service_type)
+        else:
+            raise ValueError("deal_id or text is required")
+        similar = []
+        for match_id, score in matches:
+            item = self.replica.get(match_id)
+            if item is not None:
+                similar.append(SimilarDeal(deal=hydrate(Deal, item), score=round(score, 4)))
+        return similar
+
+    async def get_deal_summary(self) -> DealSummary:
+        """Get deal counts and amount totals by stage, service type and sales user.
 
-    async def get_all_deals(self) -> list[Deal]:
+        One point read when the summary document is attached and built;
+        otherwise computed from the replica, or with server-side aggregate
+        queries (no deal document is transferred).
+
+        Returns:
+            DealSummary object
+        """
+        if self.summary is not None:
+            summary = await self.summary.get_summary()
+            if summary is not None:
+                return summary
+        if self.replica_ready:
+            return summarize(self.replica.all())
+        return await aggregate_deal_summary(self)
+
+    async def get_all_deals(self, fields: list[str] | None = None) -> list[Deal]:
         """Get all deals.
 
+        Args:
+            fields: Optional fields to project (returns partial models)
+
         Returns:
             List of Deal objects
         """
-        items = await self.get_all()
-        return [Deal(**item) for item in items]
+        items = await self.get_all(fields)
+        return self._to_models(items, fields)
 
     async def get_deal_by_id(self, deal_id: str) -> Deal | None:
         """Get deal by ID.
@@ -34,63 +151,142 @@ class DealRepository(BaseRepository[Deal]):
             Deal object or None if not found
         """
         item = await self.get_by_id(item_id=deal_id, partition_key=deal_id)
-        return Deal(**item) if item else None
+        return hydrate(Deal, item) if item else None
+
+    async def get_deals_by_ids(self, deal_ids: list[str]) -> list[Deal]:
+        """Get several deals by ID in one batched read.
+
+        Args:
+            deal_ids: Deal IDs
+
+        Returns:
+            Deal objects in request order (IDs that do not exist are skipped)
+        """
+        items = await self.get_many(deal_ids)
+        return [
+            hydrate(Deal, items[item_id]) for item_id in dict.fromkeys(deal_ids) if item_id in items
+        ]
 
-    async def get_deals_by_user(self, sales_user_id: str) -> list[Deal]:
+    async def get_deals_by_user(
+        self, sales_user_id: str, fields: list[str] | None = None
+    ) -> list[Deal]:
         """Get deals by sales user.
 
         Args:
             sales_user_id: Sales user ID
+            fields: Optional fields to project (returns partial models)
 
         Returns:
             List of Deal objects
         """
-        query = "SELECT * FROM c WHERE c.sales_user_id = @sales_user_id"
-        parameters = [{"name": "@sales_user_id", "value": sales_user_id}]
-        items = await self.query(query=query, parameters=parameters)
-        return [Deal(**item) for item in items]
+        if self.replica_ready:
+            items = await self.find_by_field("sales_user_id", sales_user_id, fields)
+        else:
+            items = await self.find(DealSpec(sales_user_id=sales_user_id), fields)
+        return self._to_models(items, fields)
 
-    async def get_deals_by_customer(self, customer_id: str) -> list[Deal]:
+    async def get_deals_by_customer(
+        self, customer_id: str, fields: list[str] | None = None
+    ) -> list[Deal]:
         """Get deals by customer.
 
         Args:
             customer_id: Customer ID
+            fields: Optional fields to project (returns partial models)
 
         Returns:
             List of Deal objects
         """
-        query = "SELECT * FROM c WHERE c.customer_id = @customer_id"
-        parameters = [{"name": "@customer_id", "value": customer_id}]
-        items = await self.query(query=query, parameters=parameters)
-        return [Deal(**item) for item in items]
+        if self.replica_ready:
+            items = await self.find_by_field("customer_id", customer_id, fields)
+        else:
+            items = await self.find(DealSpec(customer_id=customer_id), fields)
+        return self._to_models(items, fields)
 
-    async def get_deals_by_stage(self, deal_stage: str) -> list[Deal]:
+    async def get_deals_by_stage(
+        self, deal_stage: str, fields: list[str] | None = None
+    ) -> list[Deal]:
         """Get deals by stage.
 
         Args:
             deal_stage: Deal stage (見込み、提案、商談、受注、失注)
+            fields: Optional fields to project (returns partial models)
 
         Returns:
             List of Deal objects
         """
-        query = "SELECT * FROM c WHERE c.deal_stage = @deal_stage"
-        parameters = [{"name": "@deal_stage", "value": deal_stage}]
-        items = await self.query(query=query, parameters=parameters)
-        return [Deal(**item) for item in items]
+        items = await self.find_by_field("deal_stage", deal_stage, fields)
+        return self._to_models(items, fields)
 
-    async def get_deals_by_service_type(self, service_type: str) -> list[Deal]:
+    async def get_deals_by_service_type(
+        self, service_type: str, fields: list[str] | None = None
+    ) -> list[Deal]:
         """Get deals by service type.
 
         Args:
             service_type: Service type
+            fields: Optional fields to project (returns partial models)
+
+        Returns:
+            List of Deal objects
+        """
+        items = await self.find_by_field("service_type", service_type, fields)
+        return self._to_models(items, fields)
+
+    async def find_deals(self, spec: DealSpec, fields: list[str] | None = None) -> list[Deal]:
+        """Get deals matching all filters of a specification in a single query.
+
+        Args:
+            spec: Deal filters, ordering and result cap
+            fields: Optional fields to project (returns partial models)
 
         Returns:
             List of Deal objects
         """
-        query = "SELECT * FROM c WHERE c.service_type = @service_type"
-        parameters = [{"name": "@service_type", "value": service_type}]
-        items = await self.query(query=query, parameters=parameters)
-        return [Deal(**item) for item in items]
+        items = await self.find(spec, fields)
+        return self._to_models(items, fields)
+
+    async def get_deals_page(
+        self,
+        spec: DealSpec | None = None,
+        page_size: int = 100,
+        continuation_token: str | None = None,
+        fields: list[str] | None = None,
+    ) -> tuple[list[Deal], str | None]:
+        """Get one page of deals matching a specification.
+
+        Args:
+            spec: Optional deal filters, ordering and result cap
+            page_size: Maximum number of deals in the page
+            continuation_token: Token returned by the previous page
+            fields: Optional fields to project (returns partial models)
+
+        Returns:
+            Tuple of (deals, next continuation token or None when exhausted)
+        """
+        items, next_token = await self.find_page(
+            spec or DealSpec(), page_size, continuation_token, fields
+        )
+        return self._to_models(items, fields), next_token
+
+    async def iter_deal_pages(
+        self,
+        spec: DealSpec | None = None,
+        page_size: int = 100,
+        fields: list[str] | None = None,
+    ) -> AsyncIterator[list[Deal]]:
+        """Stream deals matching a specification page by page.
+
+        Args:
+            spec: Optional deal filters, ordering and result cap
+            page_size: Maximum number of deals per page
+            fields: Optional fields to project (returns partial models)
+
+        Yields:
+            Lists of Deal objects, one per Cosmos page
+        """
+        async for items in self.iter_find_pages(spec or DealSpec(), page_size, fields):
+            yield self._to_models(items, fields)
 
     async def create_deal(self, deal: Deal) -> Deal:
         """Create a new deal.
@@ -104,21 +300,34 @@ class DealRepository(BaseRepository[Deal]):
         deal_dict = deal.model_dump()
         deal_dict["id"] = deal.deal_id  # Cosmos DB requires 'id' field
         created = await self.create(deal_dict)
-        return Deal(**created)
+        await self._sync_views(created)
+        await self._sync_summary(created)
+        return hydrate(Deal, created)
 
-    async def update_deal(self, deal: Deal) -> Deal:
+    async def update_deal(self, deal: Deal, etag: str | None = None) -> Deal:
         """Update a deal.
 
         Args:
             deal: Deal object to update
+            etag: Optional ETag of the version the update is based on; when
+                given, the update fails if the deal changed in the meantime
 
         Returns:
             Updated Deal object
+
+        Raises:
+            PreconditionFailedException: If ``etag`` no longer matches
         """
         deal_dict = deal.model_dump()
         deal_dict["id"] = deal.deal_id
-        updated = await self.upsert(deal_dict)
-        return Deal(**updated)
+        previous = await self._read_previous(deal.deal_id)
+        if etag is None:
+            updated = await self.upsert(deal_dict)
+        else:
+            updated = await self.replace(deal_dict, etag=etag)
+        await self._sync_views(updated, previous)
+        await self._sync_summary(updated, previous)
+        return hydrate(Deal, updated)
 
     async def delete_deal(self, deal_id: str) -> None:
         """Delete a deal.
@@ -126,4 +335,118 @@ class DealRepository(BaseRepository[Deal]):
         Args:
             deal_id: Deal ID to delete
         """
+        previous = await self._read_previous(deal_id)
         await self.delete(item_id=deal_id, partition_key=deal_id)
+        if previous:
+            for view in self.views.values():
+                if previous.get(view.key_field) is not None:
+                    await view.remove(deal_id, previous[view.key_field])
+            await self._sync_summary(None, previous)
+
+    async def find(self, spec: DealSpec, fields: list[str] | None = None) -> list[dict]:
+        """Get deals matching a specification, from a view partition when possible.
+
+        Args:
+            spec: Deal filters, ordering and result cap
+            fields: Optional fields to project
+
+        Returns:
+            List of matching deal items
+        """
+        view = self._view_for(spec)
+        if view is not None:
+            return await view.find_in_partition(spec, fields)
+        return await super().find(spec, fields)
+
+    async def find_page(
+        self,
+        spec: DealSpec,
+        page_size: int = 100,
+        continuation_token: str | None = None,
+        fields: list[str] | None = None,
+    ) -> tuple[list[dict], str | None]:
+        """Get one page of deals matching a specification, from a view partition when possible.
+
+        Args:
+            spec: Deal filters, ordering and result cap
+            page_size: Maximum number of deals in the page
+            continuation_token: Token returned by the previous page
+            fields: Optional fields to project
+
+        Returns:
+            Tuple of (deal items, next continuation token or None when exhausted)
+        """
+        view = self._view_for(spec)
+        if view is not None:
+            return await view.find_page_in_partition(spec, page_size, continuation_token, fields)
+        return await super().find_page(spec, page_size, continuation_token, fields)
+
+    def iter_find_pages(
+        self, spec: DealSpec, page_size: int = 100, fields: list[str] | None = None
+    ) -> AsyncIterator[list[dict]]:
+        """Stream deals matching a specification, from a view partition when possible.
+
+        Args:
+            spec: Deal filters, ordering and result cap
+            page_size: Maximum number of deals per page
+            fields: Optional fields to project
+
+        Returns:
+            Async iterator of deal item lists, one per page
+        """
+        view = self._view_for(spec)
+        if view is None:
+            return super().iter_find_pages(spec, page_size, fields)
+        query, parameters = spec.build_query(fields)
+        return view.iter_pages(
+            query, parameters, page_size, partition_key=getattr(spec, view.key_field)
+        )
+
+    def _view_for(self, spec: DealSpec) -> "DealViewRepository | None":
+        """Pick the view whose partition key is fixed by ``spec`` (replica reads win)."""
+        if self.replica_ready:
+            return None
+        for key_field, view in self.views.items():
+            if getattr(spec, key_field) is not None:
+                return view
+        return None
+
+    async def _read_previous(self, deal_id: str) -> dict | None:
+        """Read the stored deal (bypassing the cache) when views or the summary need it."""
+        if not self.views and self.summary is None:
+            return None
+        try:
+            with self._track("read_previous") as tracker:
+                return await self.guard.run(
+                    lambda: self.container.read_item(
+                        item=deal_id, partition_key=deal_id, response_hook=tracker.on_response
+                    )
+                )
+        except CosmosResourceNotFoundError:
+            return None
+
+    async def _sync_views(self, deal: dict, previous: dict | None = None) -> None:
+        """Propagate a written deal to every view.
+
+        View failures are logged rather than raised: the deal itself has been
+        written, and the change feed job or a rebuild repairs the view.
+        """
+        for view in self.views.values():
+            try:
+                await view.sync(deal, previous)
+            except Exception as e:
+                logger.error(f"Error syncing deal {deal.get('id')} to {view.container_name}: {e}")
+
+    async def _sync_summary(self, deal: dict | None, previous: dict | None = None) -> None:
+        """Move a deal write into the pipeline summary.
+
+        Failures are logged rather than raised, like view updates; run
+        ``rebuild_deal_summary`` to repair the totals.
+        """
+        if self.summary is None:
+            return
+        try:
+            await self.summary.apply(deal, previous)
+        except Exception as e:
+            deal_id = (deal or previous or {}).get("id")
+            logger.error(f"Error applying deal {deal_id} to {self.summary.container_name}: {e}")
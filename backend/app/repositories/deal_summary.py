@@ -0,0 +1,230 @@
+"""Incrementally maintained pipeline summary of deals.
+
+Dashboards and the agent need deal counts and ``deal_amount`` totals per
+stage, service type and sales user. The Python Cosmos SDK does not run
+``GROUP BY`` queries, and summing every deal on each request costs a full
+scan, so the totals are kept in a single document (``DealSummaries``,
+partition key ``/id``, item ``pipeline``) that ``DealRepository`` adjusts
+by the delta of every deal write. Reading the summary is one point read,
+whatever the number of deals. Amounts are rounded to whole yen and summed
+as integers, so applying deltas never accumulates floating-point error.
+
+Writes made outside the application are not seen (same as the deal
+views); ``rebuild_deal_summary`` recomputes the document from ``Deals``.
+Until the document exists, ``aggregate_deal_summary`` computes the totals
+with server-side ``COUNT`` / ``SUM`` queries instead of reading every deal.
+"""
+
+import asyncio
+import logging
+from collections.abc import Iterable
+from datetime import datetime
+
+from app.core.exceptions import PreconditionFailedException
+from app.core.storage import StorageBackend
+from app.models.schemas import DealAggregate, DealSummary
+from app.repositories.base import BaseRepository
+from app.repositories.hydration import hydrate
+
+logger = logging.getLogger(__name__)
+
+SUMMARY_CONTAINER = "DealSummaries"
+SUMMARY_ID = "pipeline"
+
+# Deal fields the summary is grouped by (``DealSummary.by_<field>``)
+GROUP_FIELDS = ("deal_stage", "service_type", "sales_user_id")
+
+# Fields read when the summary is computed from deals
+SUMMARY_FIELDS = [*GROUP_FIELDS, "deal_amount"]
+
+# Read-modify-write attempts before giving up on a summary that keeps changing
+MAX_WRITE_ATTEMPTS = 5
+
+
+def add_deal(summary: DealSummary, deal: dict, sign: int = 1) -> None:
+    """Add (``sign=1``) or remove (``sign=-1``) one deal from the totals.
+
+    Deals without a value for a group field count in ``total`` only;
+    groups left empty by a removal are dropped.
+
+    Args:
+        summary: Summary to update in place
+        deal: Deal item (at least ``SUMMARY_FIELDS``)
+        sign: 1 to add the deal, -1 to remove it
+    """
+    amount = round(deal.get("deal_amount") or 0) * sign
+    summary.total.count += sign
+    summary.total.total_amount += amount
+    for field in GROUP_FIELDS:
+        key = deal.get(field)
+        if key is None:
+            continue
+        groups: dict[str, DealAggregate] = getattr(summary, f"by_{field}")
+        group = groups.setdefault(key, DealAggregate())
+        group.count += sign
+        group.total_amount += amount
+        if group.count <= 0:
+            del groups[key]
+
+
+def summarize(deals: Iterable[dict]) -> DealSummary:
+    """Compute the summary of deals.
+
+    Args:
+        deals: Deal items (at least ``SUMMARY_FIELDS``)
+
+    Returns:
+        Summary of the given deals
+    """
+    summary = DealSummary()
+    for deal in deals:
+        add_deal(summary, deal)
+    summary.updated_at = datetime.utcnow().isoformat()
+    return summary
+
+
+class DealSummaryRepository(BaseRepository[DealSummary]):
+    """Repository of the pipeline summary document."""
+
+    model = DealSummary
+
+    def __init__(self, client: StorageBackend):
+        """Initialize DealSummaryRepository.
+
+        Args:
+            client: Shared storage backend
+        """
+        super().__init__(SUMMARY_CONTAINER, client)
+        # Every deal write updates the same document: queue this worker's
+        # updates instead of letting them race on the ETag
+        self._write_lock = asyncio.Lock()
+
+    async def get_summary(self) -> DealSummary | None:
+        """Get the stored summary.
+
+        Returns:
+            DealSummary or None if it has not been built yet
+        """
+        item = await self.get_by_id(SUMMARY_ID, SUMMARY_ID)
+        return hydrate(DealSummary, item) if item else None
+
+    async def save(self, summary: DealSummary) -> None:
+        """Store a summary, replacing the current one.
+
+        Args:
+            summary: Summary to store
+        """
+        await self.upsert({**summary.model_dump(), "id": SUMMARY_ID})
+
+    async def apply(self, deal: dict | None, previous: dict | None) -> None:
+        """Move one deal write into the stored totals.
+
+        Updates from this worker run one at a time; other workers are
+        serialized with the document's ETag (the delta is re-applied to a
+        fresh read when another writer won). A summary that has not been
+        built yet is left alone.
+
+        Args:
+            deal: Deal item as written (None for a delete)
+            previous: Deal item before the write (None for a create)
+
+        Raises:
+            PreconditionFailedException: If concurrent writers kept winning
+        """
+        if deal is None and previous is None:
+            return
+        async with self._write_lock:
+            for attempt in range(1, MAX_WRITE_ATTEMPTS + 1):
+                versioned = await self.get_versioned(SUMMARY_ID)
+                if not versioned:
+                    logger.warning(f"{SUMMARY_CONTAINER} has not been built; skipping update")
+                    return
+                summary, etag = versioned
+                if previous is not None:
+                    add_deal(summary, previous, -1)
+                if deal is not None:
+                    add_deal(summary, deal)
+                summary.updated_at = datetime.utcnow().isoformat()
+                try:
+                    await self.replace({**summary.model_dump(), "id": SUMMARY_ID}, etag=etag)
+                    return
+                except PreconditionFailedException:
+                    logger.info(
+                        f"Deal summary changed concurrently (attempt {attempt}/{MAX_WRITE_ATTEMPTS})"
+                    )
+            raise PreconditionFailedException("Deal summary kept changing")
+
+
+async def aggregate_deal_summary(source: BaseRepository) -> DealSummary:
+    """Compute the summary with server-side aggregate queries.
+
+    One ``SELECT DISTINCT VALUE`` query per group field, then a ``COUNT``
+    and a ``SUM`` query per group; only the totals leave the database.
+
+    Args:
+        source: Repository of the ``Deals`` container
+
+    Returns:
+        Summary of every deal
+    """
+    keys = await asyncio.gather(
+        *(source.query(f"SELECT DISTINCT VALUE c.{field} FROM c") for field in GROUP_FIELDS)
+    )
+    groups = [
+        (field, key)
+        for field, values in zip(GROUP_FIELDS, keys, strict=True)
+        for key in values
+        if key is not None
+    ]
+    aggregates = await asyncio.gather(
+        _aggregate(source), *(_aggregate(source, field, key) for field, key in groups)
+    )
+    summary = DealSummary(total=aggregates[0])
+    for (field, key), aggregate in zip(groups, aggregates[1:], strict=True):
+        if aggregate.count:
+            getattr(summary, f"by_{field}")[key] = aggregate
+    summary.updated_at = datetime.utcnow().isoformat()
+    return summary
+
+
+async def _aggregate(
+    source: BaseRepository, field: str | None = None, key: object = None
+) -> DealAggregate:
+    """Count the deals of one group (or all deals) and sum their amounts."""
+    conditions = [f"c.{field} = @key"] if field else []
+    parameters = [{"name": "@key", "value": key}] if field else None
+    count_where = f" WHERE {conditions[0]}" if conditions else ""
+    sum_where = " AND ".join([*conditions, "IS_NUMBER(c.deal_amount)"])
+    count, total = await asyncio.gather(
+        source.query(f"SELECT VALUE COUNT(1) FROM c{count_where}", parameters),
+        source.query(f"SELECT VALUE SUM(c.deal_amount) FROM c WHERE {sum_where}", parameters),
+    )
+    # SUM is undefined (no row) when the group has no numeric amount
+    return DealAggregate(
+        count=count[0] if count else 0, total_amount=round(total[0]) if total else 0
+    )
+
+
+async def rebuild_deal_summary(
+    source: BaseRepository, summary_repo: DealSummaryRepository, page_size: int = 1000
+) -> DealSummary:
+    """Recompute the summary from ``Deals`` and store it.
+
+    Args:
+        source: Repository of the ``Deals`` container
+        summary_repo: Summary repository to write to
+        page_size: Deals read per page
+
+    Returns:
+        Stored summary
+    """
+    summary = DealSummary()
+    async for deals in source.iter_pages(
+        "SELECT * FROM c", page_size=page_size, fields=SUMMARY_FIELDS
+    ):
+        for deal in deals:
+            add_deal(summary, deal)
+    summary.updated_at = datetime.utcnow().isoformat()
+    await summary_repo.save(summary)
+    logger.info(f"Rebuilt deal summary from {summary.total.count} deals")
+    return summary
@@ -0,0 +1,303 @@
+"""Vector similarity index over deal notes ("similar deals").
+
+Deals are embedded locally, without any network call: the normalized notes
+(see ``search_index.normalize``) are split into character 2/3-grams that
+are hashed into ``dim`` buckets with sublinear term frequency, and the
+deal's ``service_type`` is added as one more weighted feature. Rows live in
+one float32 NumPy matrix.
+
+IDF weights come from document frequencies that are updated on every
+add/remove, and are applied at query time (``q * idf²`` against the raw
+rows, divided by the IDF-weighted row norms), so rows never have to be
+rewritten when the corpus changes. A written row gets its norm right away;
+the IDF and all norms are recomputed in one pass once 1% of the deals have
+changed (``IDF_REFRESH_RATIO``). A batch of queries is scored with one matrix
+product and the top ``k`` of each is taken with ``argpartition``.
+
+``DealVectorIndex`` subscribes to the ``Deals`` change-feed replica
+(``ContainerReplica.subscribe``) so deal writes update it incrementally.
+"""
+
+import numpy as np
+
+from app.repositories.replica import ContainerReplica
+from app.repositories.search_index import normalize
+
+# Character n-gram sizes hashed into the vector
+NGRAM_SIZES = (2, 3)
+
+# Term frequency given to the service type feature (a few shared n-grams' worth)
+SERVICE_TYPE_WEIGHT = 3.0
+
+# Initial number of rows allocated (the matrix doubles when full)
+INITIAL_CAPACITY = 1024
+
+# Share of deals that may change before the IDF weights are recomputed
+IDF_REFRESH_RATIO = 0.01
+
+
+class HashedNgramVectorizer:
+    """Hashed character n-gram term frequencies (feature hashing, no vocabulary)."""
+
+    def __init__(self, dim: int = 1024, ngram_sizes: tuple[int, ...] = NGRAM_SIZES):
+        """Initialize vectorizer.
+
+        Args:
+            dim: Number of hash buckets (vector dimension)
+            ngram_sizes: Character n-gram sizes
+        """
+        self.dim = dim
+        self.ngram_sizes = ngram_sizes
+
+    def _bucket(self, feature: str) -> int:
+        """Hash a feature to a bucket.
+
+        The builtin string hash differs between processes, which is fine:
+        the index is built and queried in the same process.
+        """
+        return hash(feature) % self.dim
+
+    def vector(self, text: str | None, service_type: str | None = None) -> np.ndarray:
+        """Get the term-frequency vector of a deal.
+
+        Args:
+            text: Notes (any width, case or kana)
+            service_type: Optional service type feature
+
+        Returns:
+            Dense float32 vector (``1 + log(count)`` per bucket)
+        """
+        text = normalize(text or "")
+        dim = self.dim
+        buckets = [
+            hash(text[i : i + size]) % dim
+            for size in self.ngram_sizes
+            for i in range(len(text) - size + 1)
+        ]
+        vector = np.zeros(dim, dtype=np.float32)
+        if buckets:
+            counts = np.bincount(buckets, minlength=dim)
+            present = counts > 0
+            vector[present] = 1 + np.log(counts[present])
+        if service_type:
+            vector[self._bucket(f"service_type={service_type}")] += SERVICE_TYPE_WEIGHT
+        return vector
+
+
+class DealVectorIndex:
+    """TF-IDF cosine similarity index of deals."""
+
+    def __init__(self, dim: int = 1024):
+        """Initialize an empty index.
+
+        Args:
+            dim: Vector dimension (hash buckets)
+        """
+        self.vectorizer = HashedNgramVectorizer(dim)
+        self._matrix = np.zeros((INITIAL_CAPACITY, dim), dtype=np.float32)
+        self._ids: list[str] = []
+        self._rows: dict[str, int] = {}
+        self._df = np.zeros(dim, dtype=np.int64)
+        # IDF and IDF-weighted norm per row; written rows get their norm right
+        # away, the IDF itself is refreshed once enough deals have changed
+        self._idf: np.ndarray | None = None
+        self._norms = np.zeros(INITIAL_CAPACITY, dtype=np.float32)
+        self._changes_since_idf = 0
+        self._replica: ContainerReplica | None = None
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def attach(self, replica: ContainerReplica) -> None:
+        """Load deals from the ``Deals`` replica and follow its changes.
+
+        Args:
+            replica: Replica of ``Deals``
+        """
+        self._replica = replica
+        replica.subscribe(self)
+
+    @property
+    def ready(self) -> bool:
+        """Whether the index is loaded (its replica is ready)."""
+        return self._replica is not None and self._replica.ready
+
+    # ------------------------------------------------------------------
+    # Mutations (ReplicaListener)
+    # ------------------------------------------------------------------
+
+    def apply(self, item: dict) -> None:
+        """Add or replace the vector of a deal.
+
+        Args:
+            item: Deal item
+        """
+        deal_id = item.get("id")
+        if deal_id is None:
+            return
+        vector = self.vectorizer.vector(item.get("notes"), item.get("service_type"))
+        buckets = np.flatnonzero(vector)
+        if not len(buckets):
+            self.remove(deal_id)
+            return
+        row = self._rows.get(deal_id)
+        if row is None:
+            row = len(self._ids)
+            if row == len(self._matrix):
+                self._grow()
+            self._ids.append(deal_id)
+            self._rows[deal_id] = row
+        else:
+            self._df[np.flatnonzero(self._matrix[row])] -= 1
+        self._matrix[row] = vector
+        self._df[buckets] += 1
+        self._changed(row)
+
+    def remove(self, item_id: str) -> None:
+        """Remove the vector of a deal (the last row moves into its place).
+
+        Args:
+            item_id: Deal ID
+        """
+        row = self._rows.pop(item_id, None)
+        if row is None:
+            return
+        self._df[np.flatnonzero(self._matrix[row])] -= 1
+        last = len(self._ids) - 1
+        if row != last:
+            moved = self._ids[last]
+            self._matrix[row] = self._matrix[last]
+            self._norms[row] = self._norms[last]
+            self._ids[row] = moved
+            self._rows[moved] = row
+        self._matrix[last] = 0
+        self._ids.pop()
+        self._changed(None)
+
+    def clear(self) -> None:
+        """Drop every vector."""
+        self._matrix[: len(self._ids)] = 0
+        self._ids.clear()
+        self._rows.clear()
+        self._df[:] = 0
+        self._idf = None
+
+    def _changed(self, row: int | None) -> None:
+        """Keep the norm of a written row current and count the change against the IDF."""
+        if self._idf is None:
+            return
+        if row is not None:
+            self._norms[row] = np.linalg.norm(self._matrix[row] * self._idf)
+        self._changes_since_idf += 1
+
+    def _grow(self) -> None:
+        """Double the row capacity."""
+        capacity = len(self._matrix) * 2
+        grown = np.zeros((capacity, self._matrix.shape[1]), dtype=np.float32)
+        grown[: len(self._matrix)] = self._matrix
+        self._matrix = grown
+        norms = np.zeros(capacity, dtype=np.float32)
+        norms[: len(self._norms)] = self._norms
+        self._norms = norms
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+
+    def search(
+        self, texts: list[str], top_k: int = 5, service_type: str | None = None
+    ) -> list[list[tuple[str, float]]]:
+        """Find the deals most similar to each of several texts.
+
+        Args:
+            texts: Query texts (e.g. a new deal's notes)
+            top_k: Results per query
+            service_type: Optional service type feature added to every query
+
+        Returns:
+            One list of (deal ID, cosine similarity) per text, most similar first
+        """
+        queries = np.stack([self.vectorizer.vector(text, service_type) for text in texts])
+        return self._top_k(queries, top_k, [None] * len(texts))
+
+    def similar_to(self, deal_ids: list[str], top_k: int = 5) -> list[list[tuple[str, float]]]:
+        """Find the deals most similar to each of several indexed deals.
+
+        Args:
+            deal_ids: Deal IDs (deals without notes get no results)
+            top_k: Results per deal (the deal itself is excluded)
+
+        Returns:
+            One list of (deal ID, cosine similarity) per deal, most similar first
+        """
+        rows = [self._rows.get(deal_id) for deal_id in deal_ids]
+        queries = np.stack(
+            [
+                self._matrix[row] if row is not None else np.zeros(self.vectorizer.dim, np.float32)
+                for row in rows
+            ]
+        )
+        return self._top_k(queries, top_k, rows)
+
+    def _top_k(
+        self, queries: np.ndarray, top_k: int, exclude_rows: list[int | None]
+    ) -> list[list[tuple[str, float]]]:
+        """Score a batch of raw term-frequency vectors against every row."""
+        count = len(self._ids)
+        if count == 0 or top_k <= 0:
+            return [[] for _ in exclude_rows]
+        idf, row_norms = self._idf_weights()
+        weighted = queries * idf
+        query_norms = np.linalg.norm(weighted, axis=1)
+        # (queries x rows) cosine similarities of the IDF-weighted vectors
+        scores = (weighted * idf) @ self._matrix[:count].T
+        with np.errstate(divide="ignore", invalid="ignore"):
+            scores /= np.outer(query_norms, row_norms)
+        scores[~np.isfinite(scores)] = 0.0
+        for query, row in enumerate(exclude_rows):
+            if row is not None:
+                scores[query, row] = -1.0
+        k = min(top_k, count)
+        if k < count:
+            top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+        else:
+            top = np.tile(np.arange(count), (len(scores), 1))
+        results = []
+        for query, rows in enumerate(top):
+            rows = rows[np.argsort(-scores[query, rows], kind="stable")]
+            results.append(
+                [
+                    (self._ids[row], float(scores[query, row]))
+                    for row in rows
+                    if scores[query, row] > 0
+                ]
+            )
+        return results
+
+    def _idf_weights(self) -> tuple[np.ndarray, np.ndarray]:
+        """Get the IDF vector and the IDF-weighted norm of every row.
+
+        The IDF is recomputed (with every norm, one pass over the matrix)
+        when more than ``IDF_REFRESH_RATIO`` of the deals changed since the
+        last computation; until then a few document frequencies may lag.
+        """
+        count = len(self._ids)
+        if self._idf is None or self._changes_since_idf > count * IDF_REFRESH_RATIO:
+            self._idf = (np.log((count + 1) / (self._df + 1)) + 1).astype(np.float32)
+            # Row-wise sum of (tf * idf)², without materializing the squared matrix
+            matrix = self._matrix[:count]
+            self._norms[:count] = np.sqrt(
+                np.einsum("ij,ij,j->i", matrix, matrix, np.square(self._idf))
+            )
+            self._changes_since_idf = 0
+        return self._idf, self._norms[:count]
+
+    def stats(self) -> dict:
+        """Get index status."""
+        return {
+            "ready": self.ready,
+            "deals": len(self._ids),
+            "dim": self.vectorizer.dim,
+            "capacity": len(self._matrix),
+            "matrix_mib": round(self._matrix.nbytes / 2**20, 1),
+        }
@@ -0,0 +1,247 @@
+"""Materialized views of deals partitioned by secondary keys.
+
+``Deals`` is partitioned by ``/id``, so looking up the deals of a sales
+user or a customer fans out to every partition. The view containers hold
+a copy of each deal partitioned by that key instead:
+
+- ``DealsBySalesUser`` (partition key ``/sales_user_id``)
+- ``DealsByCustomer`` (partition key ``/customer_id``)
+
+so those lookups become single-partition queries whose cost does not grow
+with the container. Views are updated by ``DealRepository`` on every write
+and, optionally, by ``DealViewSyncJob`` tailing the ``Deals`` change feed
+(for writes made outside the application). ``rebuild_deal_views``
+backfills them and removes stale copies.
+"""
+
+import asyncio
+import contextlib
+import logging
+from typing import Any
+
+from azure.cosmos.aio import ContainerProxy
+from azure.cosmos.exceptions import CosmosResourceNotFoundError
+
+from app.core.storage import StorageBackend
+from app.models.schemas import Deal
+from app.repositories.base import BaseRepository
+from app.repositories.filters import DealSpec
+
+logger = logging.getLogger(__name__)
+
+# View container name -> deal field used as its partition key
+DEAL_VIEWS = {
+    "DealsBySalesUser": "sales_user_id",
+    "DealsByCustomer": "customer_id",
+}
+
+
+class DealViewRepository(BaseRepository[Deal]):
+    """Copy of the deals in a container partitioned by one deal field."""
+
+    model = Deal
+
+    def __init__(self, container_name: str, key_field: str, client: StorageBackend):
+        """Initialize view repository.
+
+        Args:
+            container_name: View container name
+            key_field: Deal field the view is partitioned by
+            client: Shared storage backend
+        """
+        super().__init__(container_name, client)
+        self.key_field = key_field
+
+    async def find_in_partition(
+        self, spec: DealSpec, fields: list[str] | None = None
+    ) -> list[dict]:
+        """Get deals matching a specification from the partition of its key.
+
+        Args:
+            spec: Deal filters; must set ``key_field``
+            fields: Optional fields to project
+
+        Returns:
+            List of matching deal items
+        """
+        query, parameters = spec.build_query(fields)
+        return await self.query(query, parameters, partition_key=getattr(spec, self.key_field))
+
+    async def find_page_in_partition(
+        self,
+        spec: DealSpec,
+        page_size: int = 100,
+        continuation_token: str | None = None,
+        fields: list[str] | None = None,
+    ) -> tuple[list[dict], str | None]:
+        """Get one page of deals matching a specification from one partition.
+
+        Args:
+            spec: Deal filters; must set ``key_field``
+            page_size: Maximum number of items in the page
+            continuation_token: Token returned by the previous page
+            fields: Optional fields to project
+
+        Returns:
+            Tuple of (items, next continuation token or None when exhausted)
+        """
+        query, parameters = spec.build_query(fields)
+        return await self.query_page(
+            query,
+            parameters,
+            page_size,
+            continuation_token,
+            partition_key=getattr(spec, self.key_field),
+        )
+
+    async def sync(self, deal: dict, previous: dict | None = None) -> None:
+        """Write the view copy of a deal and drop the copy under a former key.
+
+        Args:
+            deal: Deal item as written to ``Deals``
+            previous: Deal item before the write (None if unknown or new)
+        """
+        key = deal.get(self.key_field)
+        if previous is not None and previous.get(self.key_field) not in (None, key):
+            await self.remove(deal["deal_id"], previous[self.key_field])
+        if key is not None:
+            await self.upsert(view_item(deal))
+
+    async def remove(self, deal_id: str, key: str) -> None:
+        """Delete the view copy of a deal (missing copies are ignored).
+
+        Args:
+            deal_id: Deal ID
+            key: Value of ``key_field`` the copy is stored under
+        """
+        with contextlib.suppress(CosmosResourceNotFoundError):
+            await self.delete(item_id=deal_id, partition_key=key)
+
+
+def view_item(deal: dict) -> dict:
+    """Build the view copy of a deal (model fields only, without system fields)."""
+    item = {field: deal.get(field) for field in Deal.model_fields}
+    item["id"] = deal["deal_id"]
+    return item
+
+
+class DealViewSyncJob:
+    """Keep deal views in sync by tailing the ``Deals`` change feed.
+
+    Starts from the current end of the feed (use ``rebuild_deal_views`` to
+    backfill). The change feed reports the latest version of each deal only,
+    so deletes and key changes made outside the application leave stale
+    copies until the next rebuild.
+    """
+
+    def __init__(
+        self,
+        source: ContainerProxy,
+        views: list[DealViewRepository],
+        poll_interval_seconds: float = 5.0,
+    ):
+        """Initialize job.
+
+        Args:
+            source: ``Deals`` container
+            views: Views to update
+            poll_interval_seconds: Delay between change feed polls
+        """
+        self.source = source
+        self.views = views
+        self.poll_interval_seconds = poll_interval_seconds
+        self._continuation: str | None = None
+        self._task: asyncio.Task | None = None
+        self.changes_applied = 0
+        self.poll_errors = 0
+
+    async def start(self) -> None:
+        """Start tailing the change feed."""
+        self._task = asyncio.create_task(self._run(), name="deal-view-sync")
+
+    async def stop(self) -> None:
+        """Stop tailing the change feed."""
+        if self._task:
+            self._task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._task
+            self._task = None
+
+    async def _run(self) -> None:
+        """Poll the change feed until cancelled."""
+        while True:
+            try:
+                await self._poll()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.poll_errors += 1
+                logger.warning(f"Deal view sync poll failed: {e}")
+            await asyncio.sleep(self.poll_interval_seconds)
+
+    async def _poll(self) -> None:
+        """Apply changes since the last continuation token to every view."""
+        headers: dict[str, str] = {}
+
+        def capture_headers(response_headers, _result) -> None:
+            headers.update(response_headers)
+
+        kwargs: dict[str, Any] = (
+            {"continuation": self._continuation} if self._continuation else {"start_time": "Now"}
+        )
+        async for deal in self.source.query_items_change_feed(
+            response_hook=capture_headers, **kwargs
+        ):
+            for view in self.views:
+                await view.sync(deal)
+            self.changes_applied += 1
+        self._continuation = headers.get("etag") or self._continuation
+
+    def stats(self) -> dict:
+        """Get job counters."""
+        return {
+            "running": self._task is not None and not self._task.done(),
+            "changes_applied": self.changes_applied,
+            "poll_errors": self.poll_errors,
+        }
+
+
+async def rebuild_deal_views(
+    source: BaseRepository, views: list[DealViewRepository], page_size: int = 1000
+) -> dict[str, int]:
+    """Backfill every view from ``Deals`` and delete stale copies.
+
+    Args:
+        source: Repository of the ``Deals`` container
+        views: Views to rebuild
+        page_size: Deals read per page
+
+    Returns:
+        Dict with the number of synced deals and removed stale copies
+    """
+    keys: dict[str, dict[str, Any]] = {view.container_name: {} for view in views}
+    synced = 0
+    async for deals in source.iter_pages("SELECT * FROM c", page_size=page_size):
+        for deal in deals:
+            for view in views:
+                keys[view.container_name][deal["deal_id"]] = deal.get(view.key_field)
+        await asyncio.gather(*(view.sync(deal) for deal in deals for view in views))
+        synced += len(deals)
+
+    removed = 0
+    for view in views:
+        current = keys[view.container_name]
+        fields = ["deal_id", view.key_field]
+        async for copies in view.iter_pages("SELECT * FROM c", page_size=page_size, fields=fields):
+            stale = [
+                copy
+                for copy in copies
+                if copy["deal_id"] not in current
+                or current[copy["deal_id"]] != copy.get(view.key_field)
+            ]
+            await asyncio.gather(
+                *(view.remove(copy["deal_id"], copy.get(view.key_field)) for copy in stale)
+            )
+            removed += len(stale)
+    logger.info(f"Rebuilt deal views: {synced} deals synced, {removed} stale copies removed")
+    return {"synced": synced, "removed": removed}
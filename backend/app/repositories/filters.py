@@ -0,0 +1,160 @@
+"""Query specifications for repositories.
+
+A specification describes *what* to fetch (filters, ordering and a result
+cap) independently of *where* it is served from: the same object builds a
+single parameterized Cosmos DB query and evaluates against replica items.
+"""
+
+from typing import Any, ClassVar
+
+from pydantic import BaseModel, Field, model_validator
+
+from app.repositories.query_builder import QueryBuilder
+
+
+class QuerySpec(BaseModel):
+    """Base specification with ordering and a result cap."""
+
+    # Fields accepted by ``order_by`` (set by subclasses)
+    sortable_fields: ClassVar[tuple[str, ...]] = ()
+
+    order_by: str | None = None
+    descending: bool = False
+    top: int | None = Field(default=None, ge=1)
+
+    @model_validator(mode="after")
+    def _check_order_by(self) -> "QuerySpec":
+        if self.order_by and self.order_by not in self.sortable_fields:
+            raise ValueError(f"order_by must be one of: {', '.join(self.sortable_fields)}")
+        return self
+
+    def build_query(self, fields: list[str] | None = None) -> tuple[str, list[dict]]:
+        """Build the Cosmos DB query for this specification.
+
+        Args:
+            fields: Optional fields to project
+
+        Returns:
+            Tuple of (query, parameters)
+        """
+        builder = QueryBuilder(fields)
+        self._apply(builder)
+        return builder.order_by(self.order_by, self.descending).top(self.top).build()
+
+    def select(self, items: list[dict]) -> list[dict]:
+        """Evaluate this specification against in-memory items.
+
+        Args:
+            items: Candidate items (e.g. from a replica)
+
+        Returns:
+            Matching items, ordered and capped like the Cosmos DB query
+        """
+        matched = [item for item in items if self.matches(item)]
+        if self.order_by:
+            # Cosmos DB sorts undefined/null values before any other value
+            matched.sort(key=self._sort_key, reverse=self.descending)
+        return matched[: self.top] if self.top is not None else matched
+
+    def _sort_key(self, item: dict) -> tuple[bool, Any]:
+        """Sort key that keeps falsy values (``0``, ``""``) as they are."""
+        value = item.get(self.order_by)
+        return value is not None, value
+
+    def matches(self, item: dict) -> bool:
+        """Whether an item satisfies all filters (overridden by subclasses)."""
+        return True
+
+    def _apply(self, builder: QueryBuilder) -> None:
+        """Add this specification's filters to ``builder`` (overridden by subclasses)."""
+
+    @staticmethod
+    def _in_range(value: Any, minimum: Any, maximum: Any) -> bool:
+        if minimum is None and maximum is None:
+            return True
+        if value is None:
+            return False
+        return (minimum is None or value >= minimum) and (maximum is None or value <= maximum)
+
+
+class UserSpec(QuerySpec):
+    """User filters (all conditions are ANDed)."""
+
+    sortable_fields: ClassVar[tuple[str, ...]] = ("user_id", "name", "department", "role")
+
+    department: str | None = None
+    role: str | None = None
+
+    def matches(self, item: dict) -> bool:
+        """Whether a user item satisfies all filters."""
+        return all(
+            value is None or item.get(field) == value
+            for field, value in (("department", self.department), ("role", self.role))
+        )
+
+    def _apply(self, builder: QueryBuilder) -> None:
+        builder.where_eq("department", self.department).where_eq("role", self.role)
+
+
+class CustomerSpec(QuerySpec):
+    """Customer filters (all conditions are ANDed)."""
+
+    sortable_fields: ClassVar[tuple[str, ...]] = ("customer_id", "name", "industry")
+
+    industries: list[str] | None = None  # 業種（いずれかに一致）
+    keyword: str | None = None  # 顧客名の部分一致
+
+    def matches(self, item: dict) -> bool:
+        """Whether a customer item satisfies all filters."""
+        if self.industries and item.get("industry") not in self.industries:
+            return False
+        return not self.keyword or self.keyword in (item.get("name") or "")
+
+    def _apply(self, builder: QueryBuilder) -> None:
+        builder.where_in("industry", self.industries).where_contains("name", self.keyword)
+
+
+class DealSpec(QuerySpec):
+    """Deal filters (all conditions are ANDed)."""
+
+    sortable_fields: ClassVar[tuple[str, ...]] = (
+        "deal_id",
+        "customer_name",
+        "deal_stage",
+        "deal_amount",
+        "last_contact_date",
+    )
+
+    sales_user_id: str | None = None
+    customer_id: str | None = None
+    deal_stage: str | None = None
+    service_type: str | None = None
+    min_amount: float | None = None  # 案件金額の下限（含む）
+    max_amount: float | None = None  # 案件金額の上限（含む）
+    contact_date_from: str | None = None  # 最終接触日の開始（YYYY-MM-DD、含む）
+    contact_date_to: str | None = None  # 最終接触日の終了（YYYY-MM-DD、含む）
+
+    def matches(self, item: dict) -> bool:
+        """Whether a deal item satisfies all filters."""
+        for field, value in self._equality_filters().items():
+            if value is not None and item.get(field) != value:
+                return False
+        return self._in_range(
+            item.get("deal_amount"), self.min_amount, self.max_amount
+        ) and self._in_range(
+            item.get("last_contact_date"), self.contact_date_from, self.contact_date_to
+        )
+
+    def _apply(self, builder: QueryBuilder) -> None:
+        for field, value in self._equality_filters().items():
+            builder.where_eq(field, value)
+        builder.where_range("deal_amount", self.min_amount, self.max_amount)
+        builder.where_range("last_contact_date", self.contact_date_from, self.contact_date_to)
+
+    def _equality_filters(self) -> dict[str, str | None]:
+        return {
+            "sales_user_id": self.sales_user_id,
+            "customer_id": self.customer_id,
+            "deal_stage": self.deal_stage,
+            "service_type": self.service_type,
+        }
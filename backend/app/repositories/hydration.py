@@ -0,0 +1,52 @@
+"""Lean model construction for items read from our own database.
+
+``Deal(**item)`` packs the item into keyword arguments and goes through
+``BaseModel.__init__`` before reaching pydantic-core, and every Cosmos
+system field (``_rid`` / ``_etag`` / ``_ts`` ...) rides along. For items we
+wrote ourselves, ``hydrate`` hands the dict straight to the model's
+compiled validator (a list goes through one call), which drops system
+fields and undeclared keys such as ``id`` while building the model.
+
+``model_construct`` looks like the obvious "no validation" path, but it is
+implemented in Python and measured slower than the compiled validator for
+these models (see ``benchmarks/bench_hydration.py``).
+"""
+
+from functools import lru_cache
+from typing import TypeVar
+
+from pydantic import BaseModel, TypeAdapter
+
+M = TypeVar("M", bound=BaseModel)
+
+
+@lru_cache(maxsize=256)
+def list_adapter(model: type[BaseModel]) -> TypeAdapter:
+    """Get the cached ``TypeAdapter`` for ``list[model]``."""
+    return TypeAdapter(list[model])
+
+
+def hydrate(model: type[M], item: dict) -> M:
+    """Build a model from an item read from the database.
+
+    Args:
+        model: Model class
+        item: Item returned by the storage backend
+
+    Returns:
+        Model instance
+    """
+    return model.__pydantic_validator__.validate_python(item)
+
+
+def hydrate_many(model: type[M], items: list[dict]) -> list[M]:
+    """Build models from items read from the database in a single validator call.
+
+    Args:
+        model: Model class
+        items: Items returned by the storage backend
+
+    Returns:
+        List of model instances
+    """
+    return list_adapter(model).validate_python(items)
@@ -0,0 +1,89 @@
+"""Field projection helpers (``SELECT c.a, c.b`` queries and partial models)."""
+
+import re
+from collections.abc import Sequence
+from functools import lru_cache
+
+from pydantic import BaseModel, create_model
+
+from app.core.exceptions import ValidationException
+
+_FIELD_NAME = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*$")
+_SELECT_ALL = re.compile(r"^\s*SELECT\s+\*\s+FROM\s+c\b", re.IGNORECASE)
+
+
+def validate_fields(model: type[BaseModel], fields: Sequence[str]) -> list[str]:
+    """Validate projected field names against a model.
+
+    Args:
+        model: Model whose fields may be projected
+        fields: Requested field names
+
+    Returns:
+        De-duplicated list of field names in request order
+
+    Raises:
+        ValidationException: If a field is unknown
+    """
+    unknown = [field for field in fields if field not in model.model_fields]
+    if unknown:
+        raise ValidationException(f"Unknown fields for {model.__name__}: {', '.join(unknown)}")
+    return list(dict.fromkeys(fields))
+
+
+def select_clause(fields: Sequence[str] | None) -> str:
+    """Build the SELECT clause for a projection.
+
+    Args:
+        fields: Field names, or None for all fields
+
+    Returns:
+        ``SELECT *`` or ``SELECT c.a, c.b``
+    """
+    if not fields:
+        return "SELECT *"
+    for field in fields:
+        if not _FIELD_NAME.match(field):
+            raise ValidationException(f"Invalid field name: {field}")
+    return "SELECT " + ", ".join(f"c.{field}" for field in fields)
+
+
+def project_query(query: str, fields: Sequence[str] | None) -> str:
+    """Rewrite a ``SELECT * FROM c`` query to select only ``fields``.
+
+    Args:
+        query: Query starting with ``SELECT * FROM c``
+        fields: Field names, or None to leave the query unchanged
+
+    Returns:
+        Projected query
+    """
+    if not fields:
+        return query
+    if not _SELECT_ALL.match(query):
+        raise ValueError("Projection requires a query starting with 'SELECT * FROM c'")
+    return _SELECT_ALL.sub(f"{select_clause(fields)} FROM c", query, count=1)
+
+
+def project_item(item: dict, fields: Sequence[str]) -> dict:
+    """Project an in-memory item to ``fields`` (mirrors Cosmos, which omits missing fields)."""
+    return {field: item[field] for field in fields if field in item}
+
+
+@lru_cache(maxsize=256)
+def _partial_model(model: type[BaseModel], fields: tuple[str, ...]) -> type[BaseModel]:
+    definitions = {field: (model.model_fields[field].annotation | None, None) for field in fields}
+    return create_model(f"{model.__name__}Partial", **definitions)
+
+
+def partial_model(model: type[BaseModel], fields: Sequence[str]) -> type[BaseModel]:
+    """Get a lightweight model containing only ``fields`` (all optional).
+
+    Args:
+        model: Full model
+        fields: Projected field names
+
+    Returns:
+        Cached partial model class
+    """
+    return _partial_model(model, tuple(fields))
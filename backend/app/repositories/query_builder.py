@@ -0,0 +1,108 @@
+"""Composable builder for parameterized Cosmos DB SQL queries."""
+
+from typing import Any
+
+from app.repositories.projection import select_clause
+
+
+class QueryBuilder:
+    """Build one parameterized ``SELECT ... FROM c`` query from composable parts.
+
+    ``None`` filter values are ignored, so optional arguments can be passed
+    straight through::
+
+        query, parameters = (
+            QueryBuilder()
+            .where_eq("sales_user_id", sales_user_id)
+            .where_range("deal_amount", min_amount, max_amount)
+            .order_by("deal_amount", descending=True)
+            .top(10)
+            .build()
+        )
+    """
+
+    def __init__(self, fields: list[str] | None = None):
+        """Initialize builder.
+
+        Args:
+            fields: Optional fields to project (None selects whole documents)
+        """
+        self._fields = fields
+        self._conditions: list[str] = []
+        self._parameters: list[dict] = []
+        self._order_by: list[str] = []
+        self._top: int | None = None
+
+    def where_eq(self, field: str, value: Any) -> "QueryBuilder":
+        """Add ``c.field = value``."""
+        if value is not None:
+            self._conditions.append(f"{self._ref(field)} = {self._param(field, value)}")
+        return self
+
+    def where_in(self, field: str, values: list | None) -> "QueryBuilder":
+        """Add ``c.field IN (values)`` (as ``ARRAY_CONTAINS`` with one parameter)."""
+        if values:
+            if len(values) == 1:
+                return self.where_eq(field, values[0])
+            self._conditions.append(
+                f"ARRAY_CONTAINS({self._param(field, list(values))}, {self._ref(field)})"
+            )
+        return self
+
+    def where_range(self, field: str, minimum: Any = None, maximum: Any = None) -> "QueryBuilder":
+        """Add an inclusive range ``minimum <= c.field <= maximum`` (either bound optional)."""
+        if minimum is not None:
+            self._conditions.append(f"{self._ref(field)} >= {self._param(field + '_min', minimum)}")
+        if maximum is not None:
+            self._conditions.append(f"{self._ref(field)} <= {self._param(field + '_max', maximum)}")
+        return self
+
+    def where_contains(self, field: str, value: str | None) -> "QueryBuilder":
+        """Add ``CONTAINS(c.field, value)``."""
+        if value:
+            self._conditions.append(f"CONTAINS({self._ref(field)}, {self._param(field, value)})")
+        return self
+
+    def order_by(self, field: str | None, descending: bool = False) -> "QueryBuilder":
+        """Add a server-side ORDER BY term."""
+        if field:
+            self._order_by.append(f"{self._ref(field)} {'DESC' if descending else 'ASC'}")
+        return self
+
+    def top(self, count: int | None) -> "QueryBuilder":
+        """Limit the number of results with ``TOP``."""
+        self._top = count
+        return self
+
+    def build(self) -> tuple[str, list[dict]]:
+        """Build the query.
+
+        Returns:
+            Tuple of (query, parameters)
+        """
+        select = select_clause(self._fields)
+        if self._top is not None:
+            select = select.replace("SELECT", f"SELECT TOP {int(self._top)}", 1)
+        query = f"{select} FROM c"
+        if self._conditions:
+            query += " WHERE " + " AND ".join(self._conditions)
+        if self._order_by:
+            query += " ORDER BY " + ", ".join(self._order_by)
+        return query, list(self._parameters)
+
+    @staticmethod
+    def _ref(field: str) -> str:
+        """Reference a document field (validated like projected fields)."""
+        select_clause([field])
+        return f"c.{field}"
+
+    def _param(self, name: str, value: Any) -> str:
+        """Register a parameter with a unique name."""
+        param = f"@{name}"
+        existing = {p["name"] for p in self._parameters}
+        suffix = 1
+        while param in existing:
+            suffix += 1
+            param = f"@{name}_{suffix}"
+        self._parameters.append({"name": param, "value": value})
+        return param
@@ -0,0 +1,283 @@
+"""Change-feed synchronized in-memory replica of a Cosmos DB container.
+
+A replica bootstraps from the beginning of the container's change feed and
+then polls the feed with the saved continuation token, so steady-state RU
+cost is limited to change feed polling. Reads are served from dictionaries
+keyed by item ID and by a set of secondary fields.
+
+The change feed (latest version mode) does not report deletes. Deletes made
+through this worker's repositories are applied directly; deletes made
+elsewhere are reconciled by the periodic full resync (every 10 minutes by
+default), which bounds how long a deleted item can still be served.
+"""
+
+import asyncio
+import contextlib
+import logging
+import time
+from collections import defaultdict
+from collections.abc import Iterable
+from typing import Any, Protocol
+
+from azure.cosmos.aio import ContainerProxy
+
+from app.core.resilience import ThrottleGuard
+
+logger = logging.getLogger(__name__)
+
+
+class ReplicaListener(Protocol):
+    """Derived in-memory structure kept in step with a replica (e.g. a search index)."""
+
+    def apply(self, item: dict) -> None:
+        """Insert or replace an item."""
+
+    def remove(self, item_id: str) -> None:
+        """Remove an item."""
+
+    def clear(self) -> None:
+        """Drop every item (the replica is about to be reloaded)."""
+
+
+class ContainerReplica:
+    """In-memory copy of a container with secondary-key indexes."""
+
+    def __init__(
+        self,
+        container: ContainerProxy,
+        name: str,
+        index_fields: Iterable[str],
+        poll_interval_seconds: float = 5.0,
+        resync_interval_seconds: float = 600,
+        guard: ThrottleGuard | None = None,
+    ):
+        """Initialize replica.
+
+        Args:
+            container: Container to replicate
+            name: Container name used in logs and stats
+            index_fields: Fields that get a secondary-key index
+            poll_interval_seconds: Delay between change feed polls
+            resync_interval_seconds: Interval of full resyncs to pick up deletes (0 disables)
+            guard: Throttling guard of the container (reads are retried on 429)
+        """
+        self.container = container
+        self.name = name
+        self.index_fields = tuple(index_fields)
+        self.poll_interval_seconds = poll_interval_seconds
+        self.resync_interval_seconds = resync_interval_seconds
+        self.guard = guard
+        self.ready = False
+        self._items: dict[str, dict] = {}
+        self._indexes: dict[str, dict[Any, dict[str, dict]]] = {
+            field: defaultdict(dict) for field in self.index_fields
+        }
+        self._listeners: list[ReplicaListener] = []
+        self._continuation: str | None = None
+        self._task: asyncio.Task | None = None
+        self._last_sync: float | None = None
+        self._last_resync: float = 0.0
+        self.changes_applied = 0
+        self.polls = 0
+        self.poll_errors = 0
+
+    def subscribe(self, listener: ReplicaListener) -> None:
+        """Forward every change of the replica to ``listener``.
+
+        Items already loaded are applied to the listener right away.
+
+        Args:
+            listener: Structure to keep in sync
+        """
+        self._listeners.append(listener)
+        for item in self._items.values():
+            listener.apply(item)
+
+    # ------------------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------------------
+
+    async def start(self) -> None:
+        """Bootstrap the replica and start tailing the change feed.
+
+        Bootstrap failures are logged; the polling task keeps retrying and
+        repositories fall back to Cosmos DB until the replica is ready.
+        """
+        try:
+            await self._bootstrap()
+        except Exception as e:
+            logger.error(f"Replica bootstrap failed for {self.name}: {e}")
+        self._task = asyncio.create_task(self._run(), name=f"replica-{self.name}")
+
+    async def stop(self) -> None:
+        """Stop tailing the change feed."""
+        if self._task:
+            self._task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._task
+            self._task = None
+        self.ready = False
+
+    async def _run(self) -> None:
+        """Poll the change feed until cancelled."""
+        while True:
+            await asyncio.sleep(self.poll_interval_seconds)
+            try:
+                if not self.ready or self._resync_due():
+                    await self._bootstrap()
+                else:
+                    await self._poll()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.poll_errors += 1
+                logger.warning(f"Change feed poll failed for {self.name}: {e}")
+
+    def _resync_due(self) -> bool:
+        """Check whether a periodic full resync is due."""
+        return (
+            self.resync_interval_seconds > 0
+            and time.monotonic() - self._last_resync >= self.resync_interval_seconds
+        )
+
+    async def _bootstrap(self) -> None:
+        """Load every item from the beginning of the change feed."""
+        items, continuation = await self._read_changes(start_time="Beginning")
+        self._items.clear()
+        for index in self._indexes.values():
+            index.clear()
+        for listener in self._listeners:
+            listener.clear()
+        for item in items:
+            self.apply(item)
+        self._continuation = continuation
+        self._last_sync = self._last_resync = time.monotonic()
+        self.ready = True
+        logger.info(f"Replica of {self.name} bootstrapped with {len(self._items)} items")
+
+    async def _poll(self) -> None:
+        """Apply changes since the last continuation token."""
+        items, continuation = await self._read_changes(continuation=self._continuation)
+        for item in items:
+            self.apply(item)
+        if continuation:
+            self._continuation = continuation
+        self._last_sync = time.monotonic()
+        self.polls += 1
+        self.changes_applied += len(items)
+        if items:
+            logger.debug(f"Applied {len(items)} changes to replica of {self.name}")
+
+    async def _read_changes(self, **kwargs: Any) -> tuple[list[dict], str | None]:
+        """Read the change feed until exhausted.
+
+        Returns:
+            Tuple of (changed items, continuation token for the next read)
+        """
+        headers: dict[str, str] = {}
+
+        def capture_headers(response_headers, _result) -> None:
+            headers.update(response_headers)
+
+        async def read() -> list[dict]:
+            return [
+                item
+                async for item in self.container.query_items_change_feed(
+                    response_hook=capture_headers, **kwargs
+                )
+            ]
+
+        items = await (self.guard.run(read) if self.guard else read())
+        return items, headers.get("etag")
+
+    # ------------------------------------------------------------------
+    # Mutations (change feed and local write paths)
+    # ------------------------------------------------------------------
+
+    def apply(self, item: dict) -> None:
+        """Insert or replace an item.
+
+        Args:
+            item: Item dict as stored in Cosmos DB
+        """
+        item_id = item.get("id")
+        if item_id is None:
+            return
+        previous = self._items.get(item_id)
+        if previous is not None:
+            # A change feed page read before a local write must not roll it back
+            if item.get("_ts", 0) < previous.get("_ts", 0):
+                return
+            self._unindex(previous)
+        self._items[item_id] = item
+        for field, index in self._indexes.items():
+            index[item.get(field)][item_id] = item
+        for listener in self._listeners:
+            listener.apply(item)
+
+    def remove(self, item_id: str) -> None:
+        """Remove an item.
+
+        Args:
+            item_id: Item ID
+        """
+        previous = self._items.pop(item_id, None)
+        if previous is not None:
+            self._unindex(previous)
+            for listener in self._listeners:
+                listener.remove(item_id)
+
+    def _unindex(self, item: dict) -> None:
+        """Remove an item from the secondary indexes."""
+        item_id = item["id"]
+        for field, index in self._indexes.items():
+            bucket = index.get(item.get(field))
+            if bucket is not None:
+                bucket.pop(item_id, None)
+                if not bucket:
+                    del index[item.get(field)]
+
+    # ------------------------------------------------------------------
+    # Reads
+    # ------------------------------------------------------------------
+
+    def get(self, item_id: str) -> dict | None:
+        """Get item by ID."""
+        return self._items.get(item_id)
+
+    def all(self) -> list[dict]:
+        """Get all items."""
+        return list(self._items.values())
+
+    def find(self, field: str, value: Any) -> list[dict]:
+        """Get items whose ``field`` equals ``value``.
+
+        Args:
+            field: Field name (indexed fields are served from the index)
+            value: Value to match
+
+        Returns:
+            Matching items
+        """
+        index = self._indexes.get(field)
+        if index is not None:
+            return list(index.get(value, {}).values())
+        return [item for item in self._items.values() if item.get(field) == value]
+
+    def stats(self) -> dict:
+        """Get replica status.
+
+        Returns:
+            Dict of status counters
+        """
+        return {
+            "ready": self.ready,
+            "items": len(self._items),
+            "index_fields": list(self.index_fields),
+            "seconds_since_sync": (
+                round(time.monotonic() - self._last_sync, 3) if self._last_sync else None
+            ),
+            "polls": self.polls,
+            "changes_applied": self.changes_applied,
+            "poll_errors": self.poll_errors,
+        }
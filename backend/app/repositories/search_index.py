@@ -0,0 +1,248 @@
+"""In-process bigram inverted index for Japanese customer search.
+
+``CONTAINS(c.name, @keyword)`` scans every customer and only matches the
+exact spelling, so 「ｿﾌﾄﾊﾞﾝｸ」 misses 「ソフトバンク」 and 「ｋｄｄｉ」
+misses 「KDDI株式会社」. This index normalizes text (NFKC, case folding,
+hiragana to katakana, no whitespace) and maps every character bigram to the
+documents containing it. A search intersects the posting sets of the query
+bigrams (smallest first), confirms the normalized substring on the
+candidates and ranks them, so its cost follows the number of matches rather
+than the number of customers (see ``benchmarks/bench_search_index.py``).
+
+``CustomerSearchIndex`` covers customer names and contact persons plus the
+notes of each customer's deals. It subscribes to the change-feed replicas
+of ``Customers`` and ``Deals`` (``ContainerReplica.subscribe``), so writes
+made through the repositories and changes picked up from the feed update it
+incrementally.
+"""
+
+import unicodedata
+from collections import defaultdict
+
+from app.repositories.replica import ContainerReplica
+
+# Field weights: a name match outranks a contact person match, which
+# outranks a match in deal notes
+CUSTOMER_FIELD_WEIGHTS = {"name": 3.0, "contact_person": 2.0}
+DEAL_NOTES_WEIGHT = 1.0
+
+# Katakana is the canonical kana (company names are mostly written in it)
+_HIRAGANA_TO_KATAKANA = {code: code + 0x60 for code in range(ord("ぁ"), ord("ゖ") + 1)}
+
+
+def normalize(text: str) -> str:
+    """Normalize text for matching.
+
+    NFKC folds half-width kana and full-width alphanumerics, case folding
+    makes ASCII case-insensitive, hiragana is mapped to katakana and
+    whitespace is removed.
+
+    Args:
+        text: Raw text
+
+    Returns:
+        Normalized text
+    """
+    text = unicodedata.normalize("NFKC", text).casefold().translate(_HIRAGANA_TO_KATAKANA)
+    return "".join(text.split())
+
+
+def bigrams(text: str) -> set[str]:
+    """Get the character bigrams of normalized text."""
+    return {text[i : i + 2] for i in range(len(text) - 1)}
+
+
+class TextIndex:
+    """Bigram inverted index over some text fields of a container's items.
+
+    Items are numbered internally so posting sets hold small ints and the
+    normalized texts live in plain lists (cheaper to scan than nested dicts
+    when a query matches many items).
+    """
+
+    def __init__(self, field_weights: dict[str, float], group_field: str | None = None):
+        """Initialize index.
+
+        Args:
+            field_weights: Indexed fields and their ranking weight
+            group_field: Optional field results are reported by instead of
+                the item ID (e.g. ``customer_id`` for deals)
+        """
+        self.field_weights = field_weights
+        self.group_field = group_field
+        self._numbers: dict[str, int] = {}
+        # Per item number: result key (item ID or group value), None when free
+        self._keys: list[str | None] = []
+        self._free: list[int] = []
+        # field -> normalized text per item number ("" when absent)
+        self._texts: dict[str, list[str]] = {field: [] for field in field_weights}
+        # field -> bigram -> item numbers
+        self._postings: dict[str, dict[str, set[int]]] = {
+            field: defaultdict(set) for field in field_weights
+        }
+
+    def __len__(self) -> int:
+        return len(self._numbers)
+
+    def apply(self, item: dict) -> None:
+        """Index an item, replacing its previous version.
+
+        Args:
+            item: Item as stored in the container
+        """
+        item_id = item.get("id")
+        if item_id is None:
+            return
+        self.remove(item_id)
+        if self._free:
+            number = self._free.pop()
+        else:
+            number = len(self._keys)
+            self._keys.append(None)
+            for texts in self._texts.values():
+                texts.append("")
+        self._numbers[item_id] = number
+        key = item.get(self.group_field) if self.group_field else item_id
+        self._keys[number] = key if key is not None else item_id
+        for field in self.field_weights:
+            text = normalize(item.get(field) or "")
+            self._texts[field][number] = text
+            postings = self._postings[field]
+            for gram in bigrams(text):
+                postings[gram].add(number)
+
+    def remove(self, item_id: str) -> None:
+        """Remove an item from the index.
+
+        Args:
+            item_id: Item ID
+        """
+        number = self._numbers.pop(item_id, None)
+        if number is None:
+            return
+        for field, texts in self._texts.items():
+            postings = self._postings[field]
+            for gram in bigrams(texts[number]):
+                numbers = postings.get(gram)
+                if numbers is not None:
+                    numbers.discard(number)
+                    if not numbers:
+                        del postings[gram]
+            texts[number] = ""
+        self._keys[number] = None
+        self._free.append(number)
+
+    def clear(self) -> None:
+        """Drop every item."""
+        self._numbers.clear()
+        self._keys.clear()
+        self._free.clear()
+        for texts in self._texts.values():
+            texts.clear()
+        for postings in self._postings.values():
+            postings.clear()
+
+    def search(self, query: str) -> dict[str, float]:
+        """Score the items (or groups) whose fields contain a normalized query.
+
+        A field scores its weight times how much of the field the query
+        covers, doubled for a prefix match; an item keeps its best field.
+
+        Args:
+            query: Normalized query (see ``normalize``)
+
+        Returns:
+            Mapping of item ID (or group value) to score
+        """
+        scores: dict[str, float] = {}
+        if not query:
+            return scores
+        grams = bigrams(query)
+        keys = self._keys
+        for field, weight in self.field_weights.items():
+            texts = self._texts[field]
+            coverage = weight * len(query)
+            for number in self._candidates(field, grams, query):
+                text = texts[number]
+                score = coverage / len(text)
+                if text.startswith(query):
+                    score *= 2
+                key = keys[number]
+                if score > scores.get(key, 0.0):
+                    scores[key] = score
+        return scores
+
+    def _candidates(self, field: str, grams: set[str], query: str) -> list[int]:
+        """Get the numbers of the items whose ``field`` contains ``query``."""
+        texts = self._texts[field]
+        if not grams:
+            # Single character: no bigram to look up, check every text
+            return [number for number, text in enumerate(texts) if query in text]
+        postings = self._postings[field]
+        sets = sorted(
+            (postings.get(gram) for gram in grams), key=lambda numbers: len(numbers or ())
+        )
+        if not sets[0]:
+            return []
+        candidates = sets[0].intersection(*sets[1:]) if len(sets) > 1 else sets[0]
+        if len(grams) == 1 and len(query) == 2:
+            return list(candidates)
+        # Every bigram present does not mean they are adjacent
+        return [number for number in candidates if query in texts[number]]
+
+    def stats(self) -> dict:
+        """Get index size counters."""
+        return {
+            "items": len(self._numbers),
+            "bigrams": {field: len(postings) for field, postings in self._postings.items()},
+            "postings": sum(
+                len(numbers)
+                for postings in self._postings.values()
+                for numbers in postings.values()
+            ),
+        }
+
+
+class CustomerSearchIndex:
+    """Ranked customer search over names, contact persons and deal notes."""
+
+    def __init__(self, customers: ContainerReplica, deals: ContainerReplica):
+        """Build the index from replicas and keep it in sync with them.
+
+        Args:
+            customers: Replica of ``Customers``
+            deals: Replica of ``Deals``
+        """
+        self.customers = TextIndex(CUSTOMER_FIELD_WEIGHTS)
+        self.deal_notes = TextIndex({"notes": DEAL_NOTES_WEIGHT}, group_field="customer_id")
+        self._replicas = (customers, deals)
+        customers.subscribe(self.customers)
+        deals.subscribe(self.deal_notes)
+
+    @property
+    def ready(self) -> bool:
+        """Whether both replicas (and so the index) are loaded."""
+        return all(replica.ready for replica in self._replicas)
+
+    def search(self, keyword: str) -> list[str]:
+        """Find customers whose name, contact person or deal notes contain a keyword.
+
+        Args:
+            keyword: Search keyword (any width, case or kana)
+
+        Returns:
+            Customer IDs, best match first
+        """
+        query = normalize(keyword)
+        scores = self.customers.search(query)
+        for customer_id, score in self.deal_notes.search(query).items():
+            scores[customer_id] = scores.get(customer_id, 0.0) + score
+        return sorted(scores, key=lambda customer_id: (-scores[customer_id], customer_id))
+
+    def stats(self) -> dict:
+        """Get index status."""
+        return {
+            "ready": self.ready,
+            "customers": self.customers.stats(),
+            "deal_notes": self.deal_notes.stats(),
+        }
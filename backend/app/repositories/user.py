@@ -2,8 +2,12 @@
 
 import logging
 
+from app.core.storage import StorageBackend
 from app.models.schemas import User
 from app.repositories.base import BaseRepository
+from app.repositories.cache import EntityCache
+from app.repositories.filters import UserSpec
+from app.repositories.hydration import hydrate
 
 logger = logging.getLogger(__name__)
 
@@ -11,18 +15,28 @@ logger = logging.getLogger(__name__)
 class UserRepository(BaseRepository[User]):
     """Repository for User data access."""
 
-    def __init__(self):
-        """Initialize UserRepository."""
-        super().__init__("Users")
+    model = User
 
-    async def get_all_users(self) -> list[User]:
+    def __init__(self, client: StorageBackend, cache: EntityCache | None = None):
+        """Initialize UserRepository.
+
+        Args:
+            client: Shared storage backend
+            cache: Optional read-through cache for user lookups
+        """
+        super().__init__("Users", client, cache)
+
+    async def get_all_users(self, fields: list[str] | None = None) -> list[User]:
         """Get all users.
 
+        Args:
+            fields: Optional fields to project (returns partial models)
+
         Returns:
             List of User objects
         """
-        items = await self.get_all()
-        return [User(**item) for item in items]
+        items = await self.get_all(fields)
+        return self._to_models(items, fields)
 
     async def get_user_by_id(self, user_id: str) -> User | None:
         """Get user by ID.
@@ -34,35 +48,73 @@ class UserRepository(BaseRepository[User]):
             User object or None if not found
         """
         item = await self.get_by_id(item_id=user_id, partition_key=user_id)
-        return User(**item) if item else None
+        return hydrate(User, item) if item else None
 
-    async def get_users_by_department(self, department: str) -> list[User]:
+    async def get_users_by_department(
+        self, department: str, fields: list[str] | None = None
+    ) -> list[User]:
         """Get users by department.
 
         Args:
             department: Department name
+            fields: Optional fields to project (returns partial models)
 
         Returns:
             List of User objects
         """
-        query = "SELECT * FROM c WHERE c.department = @department"
-        parameters = [{"name": "@department", "value": department}]
-        items = await self.query(query=query, parameters=parameters)
-        return [User(**item) for item in items]
+        items = await self.find_by_field("department", department, fields)
+        return self._to_models(items, fields)
 
-    async def get_users_by_role(self, role: str) -> list[User]:
+    async def get_users_by_role(self, role: str, fields: list[str] | None = None) -> list[User]:
         """Get users by role.
 
         Args:
             role: Role name
+            fields: Optional fields to project (returns partial models)
 
         Returns:
             List of User objects
         """
-        query = "SELECT * FROM c WHERE c.role = @role"
-        parameters = [{"name": "@role", "value": role}]
-        items = await self.query(query=query, parameters=parameters)
-        return [User(**item) for item in items]
+        items = await self.find_by_field("role", role, fields)
+        return self._to_models(items, fields)
+
+    async def find_users(self, spec: UserSpec, fields: list[str] | None = None) -> list[User]:
+        """Get users matching all filters of a specification in a single query.
+
+        Args:
+            spec: User filters, ordering and result cap
+            fields: Optional fields to project (returns partial models)
+
+        Returns:
+            List of User objects
+        """
+        items = await self.find(spec, fields)
+        return self._to_models(items, fields)
+
+    async def get_users_page(
+        self,
+        department: str | None = None,
+        role: str | None = None,
+        page_size: int = 100,
+        continuation_token: str | None = None,
+        fields: list[str] | None = None,
+    ) -> tuple[list[User], str | None]:
+        """Get one page of users, optionally filtered by department and role.
+
+        Args:
+            department: Optional department filter
+            role: Optional role filter
+            page_size: Maximum number of users in the page
+            continuation_token: Token returned by the previous page
+            fields: Optional fields to project (returns partial models)
+
+        Returns:
+            Tuple of (users, next continuation token or None when exhausted)
+        """
+        items, next_token = await self.find_page(
+            UserSpec(department=department, role=role), page_size, continuation_token, fields
+        )
+        return self._to_models(items, fields), next_token
 
     async def create_user(self, user: User) -> User:
         """Create a new user.
@@ -76,21 +128,29 @@ class UserRepository(BaseRepository[User]):
         user_dict = user.model_dump()
         user_dict["id"] = user.user_id  # Cosmos DB requires 'id' field
         created = await self.create(user_dict)
-        return User(**created)
+        return hydrate(User, created)
 
-    async def update_user(self, user: User) -> User:
+    async def update_user(self, user: User, etag: str | None = None) -> User:
         """Update a user.
 
         Args:
             user: User object to update
+            etag: Optional ETag of the version the update is based on; when
+                given, the update fails if the user changed in the meantime
 
         Returns:
             Updated User object
+
+        Raises:
+            PreconditionFailedException: If ``etag`` no longer matches
         """
         user_dict = user.model_dump()
         user_dict["id"] = user.user_id
-        updated = await self.upsert(user_dict)
-        return User(**updated)
+        if etag is None:
+            updated = await self.upsert(user_dict)
+        else:
+            updated = await self.replace(user_dict, etag=etag)
+        return hydrate(User, updated)
 
     async def delete_user(self, user_id: str) -> None:
         """Delete a user.
@@ -50,6 +50,7 @@ class ConversationResponse(BaseModel):
     user_id: str
     title: str
     messages: list[dict]
+    message_count: int = 0
     created_at: str
     updated_at: str
     is_active: bool = True
@@ -5,6 +5,7 @@ import os
 
 from google import genai
 
+from app.core.resources import get_resources
 from app.repositories.customer import CustomerRepository
 from app.repositories.deal import DealRepository
 from app.prompts.copilot_prompts import build_chat_prompt
@@ -28,9 +29,9 @@ class CopilotService:
         self.client = genai.Client(api_key=api_key)
         self.model_id = "gemini-2.0-flash"
 
-        # Initialize repositories
-        self.deal_repo = deal_repo or DealRepository()
-        self.customer_repo = customer_repo or CustomerRepository()
+        # Use the shared repositories unless explicitly injected
+        self.deal_repo = deal_repo or get_resources().deal_repo
+        self.customer_repo = customer_repo or get_resources().customer_repo
 
         logger.info(f"Gemini API initialized with model: {self.model_id}")
 
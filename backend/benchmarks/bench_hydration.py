@@ -0,0 +1,151 @@
+"""Microbenchmark of model construction and response serialization.
+
+Compares, in objects per second:
+
+- read path: ``Deal(**item)`` / ``Conversation(**item)`` and
+  ``model_construct`` against ``hydrate_many`` (one compiled validator call).
+  ``model_construct`` leaves nested messages as plain dicts, so its
+  Conversation figure is a lower bound, not a usable path.
+- response path: the previous route behaviour (models dumped, validated
+  against ``response_model`` and serialized) against ``model_response``
+
+Items carry Cosmos DB system fields like real query results. No database
+or network is needed.
+
+Usage (from ``backend/``)::
+
+    python -m benchmarks.bench_hydration --deals 10000 --messages 40
+"""
+
+import argparse
+import gc
+import time
+from collections.abc import Callable
+
+from pydantic import TypeAdapter
+
+from app.api.responses import dump_models
+from app.initializers.generate_data import SyntheticDataGenerator
+from app.models.conversation import Conversation
+from app.models.schemas import Deal
+from app.repositories.hydration import hydrate_many
+
+
+def with_system_fields(item: dict, number: int) -> dict:
+    """Add the metadata Cosmos DB returns with every item."""
+    return {
+        **item,
+        "_rid": f"rid{number}==",
+        "_self": f"dbs/db==/colls/c==/docs/rid{number}==/",
+        "_etag": f'"0000{number:04x}-0000-0000-0000-000000000000"',
+        "_attachments": "attachments/",
+        "_ts": 1767225600 + number,
+    }
+
+
+def conversation_items(count: int, messages: int) -> list[dict]:
+    """Build conversation documents with alternating user / assistant messages."""
+    items = []
+    for number in range(count):
+        items.append(
+            with_system_fields(
+                {
+                    "id": f"conv-{number}",
+                    "user_id": str(number % 50 + 1),
+                    "title": "KDDI案件について",
+                    "messages": [
+                        {
+                            "message_id": f"msg-{number}-{index}",
+                            "role": "user" if index % 2 == 0 else "assistant",
+                            "content": "案件の進捗と次のアクションを整理してください。" * 20,
+                            "timestamp": "2026-03-01T10:00:00",
+                            "search_history": [{"tool": "search_deals"}] if index % 2 else None,
+                        }
+                        for index in range(messages)
+                    ],
+                    "created_at": "2026-03-01T10:00:00",
+                    "updated_at": "2026-03-01T10:30:00",
+                    "is_active": True,
+                },
+                number,
+            )
+        )
+    return items
+
+
+def measure(name: str, count: int, operation: Callable[[], object], repeat: int) -> float:
+    """Run ``operation`` ``repeat`` times and print the best objects/s (GC paused like timeit)."""
+    best = float("inf")
+    gc.disable()
+    try:
+        for _ in range(repeat):
+            started = time.perf_counter()
+            operation()
+            best = min(best, time.perf_counter() - started)
+    finally:
+        gc.enable()
+    rate = count / best
+    print(f"{name:<44} {rate:12,.0f} obj/s  ({best * 1000:8.1f}ms)")
+    return rate
+
+
+def main() -> None:
+    """Compare validated and trusted construction / serialization."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--deals", type=int, default=10_000, help="Deals per run")
+    parser.add_argument("--conversations", type=int, default=200, help="Conversations per run")
+    parser.add_argument("--messages", type=int, default=40, help="Messages per conversation")
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per case (best is reported)")
+    args = parser.parse_args()
+
+    generator = SyntheticDataGenerator(num_deals=args.deals)
+    deal_items = [with_system_fields(item, n) for n, item in enumerate(generator.iter_deals())]
+    conv_items = conversation_items(args.conversations, args.messages)
+    print(
+        f"deals={len(deal_items)} conversations={len(conv_items)} "
+        f"messages/conversation={args.messages}\n"
+    )
+
+    for model, items in ((Deal, deal_items), (Conversation, conv_items)):
+        adapter = TypeAdapter(list[model])
+        validated = measure(
+            f"{model.__name__}(**item)",
+            len(items),
+            lambda model=model, items=items: [model(**item) for item in items],
+            args.repeat,
+        )
+        measure(
+            f"{model.__name__}.model_construct(**item)",
+            len(items),
+            lambda model=model, items=items: [model.model_construct(**item) for item in items],
+            args.repeat,
+        )
+        trusted = measure(
+            f"hydrate_many({model.__name__}, items)",
+            len(items),
+            lambda model=model, items=items: hydrate_many(model, items),
+            args.repeat,
+        )
+        models = hydrate_many(model, items)
+        previous = measure(
+            f"{model.__name__} response: dump+validate+json",
+            len(items),
+            lambda adapter=adapter, models=models: adapter.dump_json(
+                adapter.validate_python([m.model_dump() for m in models])
+            ),
+            args.repeat,
+        )
+        direct = measure(
+            f"{model.__name__} response: model_response",
+            len(items),
+            lambda models=models: dump_models(models),
+            args.repeat,
+        )
+        print(
+            f"  -> read x{trusted / validated:.1f}, response x{direct / previous:.1f}, "
+            f"read+response x{(1 / validated + 1 / previous) / (1 / trusted + 1 / direct):.1f}\n"
+        )
+
+
+if __name__ == "__main__":
+    main()
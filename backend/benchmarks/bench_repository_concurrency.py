@@ -0,0 +1,145 @@
+"""Concurrent throughput benchmark for the repository layer.
+
+Compares the previous data access pattern (``async def`` wrappers around the
+synchronous ``azure.cosmos`` client, which block the event loop) with the
+``azure.cosmos.aio`` based repositories.
+
+Usage (from ``backend/``, requires COSMOS_* settings in ``.env``)::
+
+    python -m benchmarks.bench_repository_concurrency --requests 500 --concurrency 50
+"""
+
+import argparse
+import asyncio
+import contextlib
+import statistics
+import time
+from collections.abc import Awaitable, Callable
+
+from azure.cosmos import CosmosClient as SyncCosmosClient
+
+from app.core.config import settings
+from app.core.resources import close_resources, init_resources
+
+
+class LoopLagProbe:
+    """Measure how long the event loop is blocked while a benchmark runs."""
+
+    def __init__(self, interval: float = 0.01):
+        """Initialize probe.
+
+        Args:
+            interval: Sleep interval between samples in seconds
+        """
+        self.interval = interval
+        self.max_lag = 0.0
+        self._task: asyncio.Task | None = None
+
+    async def _run(self) -> None:
+        while True:
+            started = time.perf_counter()
+            await asyncio.sleep(self.interval)
+            lag = time.perf_counter() - started - self.interval
+            self.max_lag = max(self.max_lag, lag)
+
+    def start(self) -> None:
+        """Start sampling."""
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop sampling."""
+        if self._task:
+            self._task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._task
+
+
+async def run_benchmark(
+    name: str,
+    operation: Callable[[], Awaitable[object]],
+    total_requests: int,
+    concurrency: int,
+) -> None:
+    """Run ``operation`` concurrently and print throughput/latency statistics.
+
+    Args:
+        name: Label printed in the report
+        operation: Coroutine factory performing one request
+        total_requests: Number of requests to issue
+        concurrency: Maximum number of in-flight requests
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies: list[float] = []
+
+    async def worker() -> None:
+        async with semaphore:
+            started = time.perf_counter()
+            await operation()
+            latencies.append(time.perf_counter() - started)
+
+    probe = LoopLagProbe()
+    probe.start()
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(total_requests)))
+    elapsed = time.perf_counter() - started
+    await probe.stop()
+
+    latencies.sort()
+    p95 = latencies[int(len(latencies) * 0.95) - 1]
+    print(
+        f"{name:<12} {total_requests / elapsed:8.1f} req/s  "
+        f"p50={statistics.median(latencies) * 1000:7.1f}ms  "
+        f"p95={p95 * 1000:7.1f}ms  "
+        f"max loop lag={probe.max_lag * 1000:7.1f}ms"
+    )
+
+
+async def main() -> None:
+    """Run sync vs async benchmarks."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=200, help="Total requests per run")
+    parser.add_argument("--concurrency", type=int, default=20, help="In-flight requests")
+    parser.add_argument("--deal-id", default="1", help="Deal ID used for point reads")
+    parser.add_argument("--sales-user-id", default="1", help="Sales user ID used for queries")
+    args = parser.parse_args()
+
+    sync_client = SyncCosmosClient(settings.COSMOS_ENDPOINT, settings.COSMOS_KEY)
+    sync_container = sync_client.get_database_client(
+        settings.COSMOS_DATABASE_NAME
+    ).get_container_client("Deals")
+    repo = (await init_resources()).deal_repo
+
+    # Previous implementation: async signature, blocking client
+    async def sync_point_read():
+        return sync_container.read_item(item=args.deal_id, partition_key=args.deal_id)
+
+    async def sync_query():
+        return list(
+            sync_container.query_items(
+                query="SELECT * FROM c WHERE c.sales_user_id = @sales_user_id",
+                parameters=[{"name": "@sales_user_id", "value": args.sales_user_id}],
+                enable_cross_partition_query=True,
+            )
+        )
+
+    print(f"requests={args.requests} concurrency={args.concurrency}\n")
+    try:
+        print("[point read]")
+        await run_benchmark("sync", sync_point_read, args.requests, args.concurrency)
+        await run_benchmark(
+            "aio", lambda: repo.get_deal_by_id(args.deal_id), args.requests, args.concurrency
+        )
+        print("\n[query by sales user]")
+        await run_benchmark("sync", sync_query, args.requests, args.concurrency)
+        await run_benchmark(
+            "aio",
+            lambda: repo.get_deals_by_user(args.sales_user_id),
+            args.requests,
+            args.concurrency,
+        )
+    finally:
+        await close_resources()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
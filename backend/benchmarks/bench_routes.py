@@ -0,0 +1,123 @@
+"""Route and agent tool benchmark against the in-memory storage backend.
+
+Runs the API in process (no server, no network) on top of
+``MemoryStorage`` loaded with synthetic data, so results are reproducible
+on a laptop or CI box without an Azure account. Simulated latency stands
+in for the Cosmos DB round trip.
+
+Usage (from ``backend/``)::
+
+    python -m benchmarks.bench_routes --deals 10000 --latency-ms 5 --requests 500
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import time
+from collections.abc import Awaitable, Callable
+
+
+async def run_benchmark(
+    name: str,
+    operation: Callable[[], Awaitable[object]],
+    total_requests: int,
+    concurrency: int,
+) -> None:
+    """Run ``operation`` concurrently and print throughput/latency statistics.
+
+    Args:
+        name: Label printed in the report
+        operation: Coroutine factory performing one request
+        total_requests: Number of requests to issue
+        concurrency: Maximum number of in-flight requests
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies: list[float] = []
+
+    async def worker() -> None:
+        async with semaphore:
+            started = time.perf_counter()
+            await operation()
+            latencies.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(total_requests)))
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    p95 = latencies[max(0, int(len(latencies) * 0.95) - 1)]
+    print(
+        f"{name:<36} {total_requests / elapsed:8.1f} req/s  "
+        f"p50={statistics.median(latencies) * 1000:7.1f}ms  "
+        f"p95={p95 * 1000:7.1f}ms"
+    )
+
+
+async def main() -> None:
+    """Load synthetic data into memory and benchmark routes and tools."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--deals", type=int, default=10_000, help="Synthetic deals to load")
+    parser.add_argument("--latency-ms", type=float, default=5, help="Simulated request latency")
+    parser.add_argument("--jitter-ms", type=float, default=2, help="Simulated latency jitter")
+    parser.add_argument("--requests", type=int, default=300, help="Total requests per run")
+    parser.add_argument("--concurrency", type=int, default=20, help="In-flight requests")
+    args = parser.parse_args()
+
+    # Settings are read at import time, so select the backend before importing the app
+    os.environ.update(
+        STORAGE_BACKEND="memory",
+        MEMORY_STORE_SEED_DATA="synthetic",
+        MEMORY_STORE_SYNTHETIC_DEALS=str(args.deals),
+        MEMORY_STORE_LATENCY_MS=str(args.latency_ms),
+        MEMORY_STORE_LATENCY_JITTER_MS=str(args.jitter_ms),
+    )
+    import httpx
+
+    from app.agent.tools.customer_tools import search_customers
+    from app.agent.tools.deal_tools import get_deal_details, search_deals
+    from app.core.resources import close_resources, init_resources
+    from main import app
+
+    await init_resources()
+    transport = httpx.ASGITransport(app=app)
+    print(
+        f"deals={args.deals} latency={args.latency_ms}ms(+{args.jitter_ms}) "
+        f"requests={args.requests} concurrency={args.concurrency}\n"
+    )
+
+    async def get(client: httpx.AsyncClient, path: str) -> None:
+        response = await client.get(path)
+        response.raise_for_status()
+
+    try:
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            routes = {
+                "GET /deals/{id}": "/api/v1/deals/1",
+                "GET /deals?sales_user_id": "/api/v1/deals?sales_user_id=1",
+                "GET /deals?deal_stage&order_by": (
+                    "/api/v1/deals?deal_stage=提案&order_by=deal_amount&order=desc&top=20"
+                ),
+                "GET /deals?limit (page)": "/api/v1/deals?limit=100",
+                "GET /customers?industry": "/api/v1/customers?industry=製造業",
+                "GET /users": "/api/v1/users",
+            }
+            for name, path in routes.items():
+                await run_benchmark(
+                    name, lambda path=path: get(client, path), args.requests, args.concurrency
+                )
+
+        print()
+        tools = {
+            "tool search_deals": lambda: search_deals(sales_user_id="1"),
+            "tool get_deal_details": lambda: get_deal_details("1"),
+            "tool search_customers": lambda: search_customers(industries=["製造業"]),
+        }
+        for name, operation in tools.items():
+            await run_benchmark(name, operation, args.requests, args.concurrency)
+    finally:
+        await close_resources()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,97 @@
+"""Customer search benchmark: bigram index against an in-memory substring scan.
+
+Builds ``TextIndex`` / ``CustomerSearchIndex``-style indexes over synthetic
+customers and deals, then times keyword searches with the index and with
+the scan a replica read does today (``keyword in name`` over every
+customer). No database or network is needed.
+
+Usage (from ``backend/``)::
+
+    python -m benchmarks.bench_search_index --customers 100000 --deals 100000
+"""
+
+import argparse
+import gc
+import time
+import tracemalloc
+
+from app.initializers.generate_data import SyntheticDataGenerator
+from app.repositories.search_index import (
+    CUSTOMER_FIELD_WEIGHTS,
+    DEAL_NOTES_WEIGHT,
+    TextIndex,
+    normalize,
+)
+
+QUERIES = ["ソフトバンク", "ｿﾌﾄﾊﾞﾝｸ", "ｋｄｄｉ", "株式会社", "山田", "物流", "5G"]
+
+
+def measure(operation, repeat: int) -> float:
+    """Return the best time of ``operation`` in milliseconds."""
+    best = float("inf")
+    gc.disable()
+    try:
+        for _ in range(repeat):
+            started = time.perf_counter()
+            operation()
+            best = min(best, time.perf_counter() - started)
+    finally:
+        gc.enable()
+    return best * 1000
+
+
+def build(items: list[dict], index: TextIndex) -> tuple[float, float]:
+    """Index items; return build time in seconds and traced memory in MiB."""
+    tracemalloc.start()
+    started = time.perf_counter()
+    for item in items:
+        index.apply(item)
+    elapsed = time.perf_counter() - started
+    memory = tracemalloc.get_traced_memory()[0] / 2**20
+    tracemalloc.stop()
+    return elapsed, memory
+
+
+def main() -> None:
+    """Time index builds and searches."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--customers", type=int, default=100_000, help="Customers to index")
+    parser.add_argument("--deals", type=int, default=100_000, help="Deals whose notes are indexed")
+    parser.add_argument("--repeat", type=int, default=20, help="Runs per query (best is reported)")
+    args = parser.parse_args()
+
+    generator = SyntheticDataGenerator(num_deals=args.deals, num_customers=args.customers)
+    customers = generator.customers()
+    deals = list(generator.iter_deals())
+    customer_index = TextIndex(CUSTOMER_FIELD_WEIGHTS)
+    notes_index = TextIndex({"notes": DEAL_NOTES_WEIGHT}, group_field="customer_id")
+    for label, items, index in (
+        ("customers", customers, customer_index),
+        ("deal notes", deals, notes_index),
+    ):
+        elapsed, memory = build(items, index)
+        stats = index.stats()
+        print(
+            f"{label:<10} {len(items):>8,} items  build {elapsed:6.2f}s  "
+            f"{stats['postings']:>10,} postings  ~{memory:,.0f} MiB"
+        )
+    print()
+
+    print(f"{'query':<14} {'hits':>7} {'index':>10} {'+notes':>10} {'scan':>10}")
+    for keyword in QUERIES:
+        query = normalize(keyword)
+        hits = len(customer_index.search(query))
+        indexed = measure(lambda query=query: customer_index.search(query), args.repeat)
+        with_notes = measure(
+            lambda query=query: (customer_index.search(query), notes_index.search(query)),
+            args.repeat,
+        )
+        scan = measure(
+            lambda keyword=keyword: [c for c in customers if keyword in (c.get("name") or "")],
+            max(1, args.repeat // 4),
+        )
+        print(f"{keyword:<14} {hits:>7,} {indexed:>8.3f}ms {with_notes:>8.3f}ms {scan:>8.3f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,153 @@
+"""Serialization and compression benchmark on real response shapes.
+
+Encodes a ``ConversationResponse`` with long Markdown reports and a deal
+list with each available encoder, then compresses the JSON body with gzip
+and brotli (when installed), reporting encode time and payload size. No
+database or network is needed.
+
+Usage (from ``backend/``)::
+
+    python -m benchmarks.bench_serialization --deals 10000 --messages 20
+"""
+
+import argparse
+import gc
+import gzip
+import json
+import time
+from collections.abc import Callable
+
+from fastapi.encoders import jsonable_encoder
+
+from app.api.responses import FastJSONResponse, dump_models, encode_models, msgpack
+from app.initializers.generate_data import SyntheticDataGenerator
+from app.models.schemas import Deal
+from app.repositories.hydration import hydrate_many
+from app.schemas.agent import ConversationResponse
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+REPORT_SECTION = """## {n}. {deal.customer_name} 案件分析
+
+| 項目 | 内容 |
+|------|------|
+| 案件金額 | {deal.deal_amount:,.0f}円 |
+| ステージ | {deal.deal_stage} |
+| サービス | {deal.service_type} |
+| 担当 | {deal.sales_user_name} |
+| 最終接触日 | {deal.last_contact_date} |
+
+- {deal.notes}
+- 次回アクション: {deal.last_contact_date} 以降のフォローアップを担当者と調整。
+
+"""
+
+
+def conversation(deals: list[Deal], messages: int, report_sections: int) -> ConversationResponse:
+    """Build a conversation whose assistant messages are long Markdown reports on deals."""
+
+    def answer(index: int) -> str:
+        start = index * report_sections
+        return "".join(
+            REPORT_SECTION.format(n=n, deal=deals[(start + n) % len(deals)])
+            for n in range(1, report_sections + 1)
+        )
+
+    return ConversationResponse(
+        id="0ae39b5e-22b9-473f-aadb-0e95a67c4d91",
+        user_id="1",
+        title="KDDI案件について",
+        messages=[
+            {
+                "message_id": f"msg-{index}",
+                "role": "user" if index % 2 == 0 else "assistant",
+                "content": "KDDIの案件状況をまとめて" if index % 2 == 0 else answer(index),
+                "timestamp": "2026-03-01T10:00:00",
+                "search_history": [{"tool": "search_deals", "args": {"customer_id": "1"}}]
+                if index % 2
+                else None,
+            }
+            for index in range(messages)
+        ],
+        created_at="2026-03-01T10:00:00",
+        updated_at="2026-03-01T10:30:00",
+    )
+
+
+def measure(operation: Callable[[], bytes], repeat: int) -> tuple[float, bytes]:
+    """Return the best time in seconds and the output of ``operation``."""
+    best = float("inf")
+    gc.disable()
+    try:
+        for _ in range(repeat):
+            started = time.perf_counter()
+            output = operation()
+            best = min(best, time.perf_counter() - started)
+    finally:
+        gc.enable()
+    return best, output
+
+
+def report(name: str, elapsed: float, size: int, baseline: int) -> None:
+    """Print one result line."""
+    print(f"  {name:<34} {elapsed * 1000:8.2f}ms  {size:>10,} B  ({size / baseline:6.1%})")
+
+
+def bench_shape(label: str, content, repeat: int) -> None:
+    """Benchmark encoders and compressors for one response body."""
+    print(label)
+    encoders: dict[str, Callable[[], bytes]] = {
+        "json (jsonable_encoder + stdlib)": lambda: json.dumps(
+            jsonable_encoder(content), ensure_ascii=False, separators=(",", ":")
+        ).encode("utf-8"),
+        "FastJSONResponse (orjson)": lambda: FastJSONResponse(jsonable_encoder(content)).body,
+        "dump_models (pydantic-core)": lambda: dump_models(content),
+    }
+    if msgpack is not None:
+        encoders["msgpack"] = lambda: encode_models(content, "application/msgpack")
+
+    baseline = len(dump_models(content))
+    for name, encoder in encoders.items():
+        elapsed, body = measure(encoder, repeat)
+        report(name, elapsed, len(body), baseline)
+
+    body = dump_models(content)
+    compressors: dict[str, Callable[[], bytes]] = {
+        "gzip -1": lambda: gzip.compress(body, compresslevel=1, mtime=0),
+        "gzip -6": lambda: gzip.compress(body, compresslevel=6, mtime=0),
+    }
+    if brotli is not None:
+        for quality in (4, 5, 11):
+            compressors[f"brotli q{quality}"] = lambda quality=quality: brotli.compress(
+                body, quality=quality
+            )
+    for name, compressor in compressors.items():
+        elapsed, compressed = measure(compressor, repeat)
+        report(f"json + {name}", elapsed, len(compressed), baseline)
+    print()
+
+
+def main() -> None:
+    """Benchmark serialization of conversation and deal list responses."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--deals", type=int, default=10_000, help="Deals in the list response")
+    parser.add_argument("--messages", type=int, default=20, help="Messages in the conversation")
+    parser.add_argument("--sections", type=int, default=30, help="Report sections per answer")
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per case (best is reported)")
+    args = parser.parse_args()
+
+    deals = hydrate_many(Deal, list(SyntheticDataGenerator(num_deals=args.deals).iter_deals()))
+    print(f"brotli={'yes' if brotli else 'no'} msgpack={'yes' if msgpack else 'no'}\n")
+    bench_shape(
+        f"ConversationResponse ({args.messages} messages, {args.sections} sections per report)",
+        conversation(deals, args.messages, args.sections),
+        args.repeat,
+    )
+    bench_shape(f"list[Deal] ({len(deals)} deals)", deals, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
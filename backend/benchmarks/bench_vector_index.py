@@ -0,0 +1,83 @@
+"""Similar deal search benchmark on the in-process vector index.
+
+Indexes synthetic deals with ``DealVectorIndex`` and times single and
+batched top-k cosine queries, plus incremental add/remove. No database or
+network is needed.
+
+Usage (from ``backend/``)::
+
+    python -m benchmarks.bench_vector_index --deals 100000 --dim 1024
+"""
+
+import argparse
+import gc
+import time
+
+from app.initializers.generate_data import SyntheticDataGenerator
+from app.repositories.deal_vectors import DealVectorIndex
+
+
+def measure(operation, repeat: int) -> float:
+    """Return the best time of ``operation`` in milliseconds."""
+    best = float("inf")
+    gc.disable()
+    try:
+        for _ in range(repeat):
+            started = time.perf_counter()
+            operation()
+            best = min(best, time.perf_counter() - started)
+    finally:
+        gc.enable()
+    return best * 1000
+
+
+def main() -> None:
+    """Time index build, queries and incremental updates."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--deals", type=int, default=100_000, help="Deals to index")
+    parser.add_argument("--dim", type=int, default=1024, help="Vector dimension")
+    parser.add_argument("--top-k", type=int, default=5, help="Results per query")
+    parser.add_argument("--batch", type=int, default=32, help="Queries per batched call")
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per case (best is reported)")
+    args = parser.parse_args()
+
+    deals = [
+        {**deal, "id": deal["deal_id"]}
+        for deal in SyntheticDataGenerator(num_deals=args.deals).iter_deals()
+    ]
+    index = DealVectorIndex(dim=args.dim)
+    started = time.perf_counter()
+    for deal in deals:
+        index.apply(deal)
+    build = time.perf_counter() - started
+    stats = index.stats()
+    print(
+        f"deals={len(index):,} dim={args.dim} build={build:.2f}s "
+        f"matrix={stats['matrix_mib']:,} MiB\n"
+    )
+
+    ids = [deal["deal_id"] for deal in deals[: args.batch]]
+    texts = [deal["notes"] for deal in deals[: args.batch]]
+    index.similar_to(ids[:1], args.top_k)  # compute IDF weights once
+
+    single = measure(lambda: index.similar_to(ids[:1], args.top_k), args.repeat)
+    batched = measure(lambda: index.similar_to(ids, args.top_k), args.repeat)
+    text = measure(lambda: index.search(texts[:1], args.top_k), args.repeat)
+    print(f"  similar_to 1 deal            {single:8.2f}ms")
+    print(
+        f"  similar_to {args.batch} deals (batched)  {batched:8.2f}ms "
+        f"({batched / args.batch:.2f}ms per query)"
+    )
+    print(f"  search 1 text                {text:8.2f}ms")
+
+    def update() -> None:
+        index.remove(deals[0]["deal_id"])
+        index.apply(deals[0])
+
+    print(f"  remove + add 1 deal          {measure(update, args.repeat):8.3f}ms")
+    refresh = measure(lambda: (update(), index.similar_to(ids[:1], args.top_k)), args.repeat)
+    print(f"  first query after a write    {refresh:8.2f}ms")
+
+
+if __name__ == "__main__":
+    main()
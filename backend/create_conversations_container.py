@@ -1,32 +1,44 @@
-"""Create Conversations container in Cosmos DB."""
+"""Create Conversations, ConversationMessages and ConversationSummaries containers in Cosmos DB."""
 import asyncio
 import os
 from azure.cosmos.aio import CosmosClient
 from dotenv import load_dotenv
 
+from app.repositories.conversation import MESSAGES_CONTAINER, SUMMARIES_CONTAINER
+
 load_dotenv()
 
 async def create_container():
     endpoint = os.getenv("COSMOS_ENDPOINT")
     key = os.getenv("COSMOS_KEY")
     database_name = os.getenv("COSMOS_DATABASE_NAME", "SangikyoDB")
-    
+
     async with CosmosClient(endpoint, key) as client:
         database = client.get_database_client(database_name)
-        
-        try:
-            # Create Conversations container with partition key /id (serverless mode)
-            container = await database.create_container(
-                id="Conversations",
-                partition_key={"paths": ["/id"], "kind": "Hash"}
-            )
-            print(f"✅ Created container: Conversations (partition key: /id)")
-        except Exception as e:
-            if "Conflict" in str(e):
-                print("ℹ️  Container 'Conversations' already exists")
-            else:
-                print(f"❌ Error: {e}")
-                raise
+
+        # Conversation headers by /id, messages by /conversation_id and the
+        # history list by /user_id (serverless mode)
+        containers = {
+            "Conversations": "id",
+            MESSAGES_CONTAINER: "conversation_id",
+            SUMMARIES_CONTAINER: "user_id",
+        }
+        for container_name, key_field in containers.items():
+            try:
+                await database.create_container(
+                    id=container_name,
+                    partition_key={"paths": [f"/{key_field}"], "kind": "Hash"}
+                )
+                print(f"✅ Created container: {container_name} (partition key: /{key_field})")
+            except Exception as e:
+                if "Conflict" in str(e):
+                    print(f"ℹ️  Container '{container_name}' already exists")
+                else:
+                    print(f"❌ Error: {e}")
+                    raise
+
+    print("Existing conversations: python -m app.initializers.migrate_conversation_messages")
+    print("                        python -m app.initializers.rebuild_conversation_summaries")
 
 if __name__ == "__main__":
     asyncio.run(create_container())
@@ -0,0 +1,44 @@
+"""Create materialized deal view and pipeline summary containers in Cosmos DB."""
+
+import asyncio
+import os
+
+from azure.cosmos.aio import CosmosClient
+from dotenv import load_dotenv
+
+from app.repositories.deal_summary import SUMMARY_CONTAINER
+from app.repositories.deal_views import DEAL_VIEWS
+
+load_dotenv()
+
+
+async def create_containers():
+    endpoint = os.getenv("COSMOS_ENDPOINT")
+    key = os.getenv("COSMOS_KEY")
+    database_name = os.getenv("COSMOS_DATABASE_NAME", "SangikyoDB")
+
+    async with CosmosClient(endpoint, key) as client:
+        database = client.get_database_client(database_name)
+
+        # The summary is a single document, partitioned by its id like the entity containers
+        containers = {**DEAL_VIEWS, SUMMARY_CONTAINER: "id"}
+        for container_name, key_field in containers.items():
+            try:
+                # Partitioned by the lookup key so "deals of X" is a single-partition query
+                await database.create_container(
+                    id=container_name, partition_key={"paths": [f"/{key_field}"], "kind": "Hash"}
+                )
+                print(f"✅ Created container: {container_name} (partition key: /{key_field})")
+            except Exception as e:
+                if "Conflict" in str(e):
+                    print(f"ℹ️  Container '{container_name}' already exists")
+                else:
+                    print(f"❌ Error: {e}")
+                    raise
+
+    print("Next: python -m app.initializers.rebuild_deal_views, then set DEAL_VIEWS_ENABLED=true")
+    print("      python -m app.initializers.rebuild_deal_summary (or let the app build it)")
+
+
+if __name__ == "__main__":
+    asyncio.run(create_containers())
@@ -1,18 +1,38 @@
 """FastAPI Hello World - Azure App Service B1"""
 
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
+from app.api.compression import CompressionMiddleware
+from app.api.pagination import NEXT_CURSOR_HEADER
+from app.api.responses import FastJSONResponse
 from app.api.routes import router as api_router
+from app.core.config import settings
 from app.core.logging_config import setup_logging
+from app.core.resources import close_resources, init_resources
 
 # Setup logging
 setup_logging(level="INFO")
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Open shared resources on startup and close them on shutdown."""
+    await init_resources()
+    try:
+        yield
+    finally:
+        await close_resources()
+
+
 app = FastAPI(
     title="Sangikyo V2 API",
     version="1.0.0",
     description="営業支援AIエージェント - バックエンドAPI",
+    lifespan=lifespan,
+    default_response_class=FastJSONResponse,
 )
 
 # CORS設定（Next.jsからのアクセスを許可）
@@ -22,8 +42,18 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER, "ETag"],
 )
 
+# レスポンス圧縮（gzip / brotli。SSE・NDJSONのストリームは対象外）
+if settings.RESPONSE_COMPRESSION_ENABLED:
+    app.add_middleware(
+        CompressionMiddleware,
+        minimum_size=settings.RESPONSE_COMPRESSION_MIN_BYTES,
+        gzip_level=settings.GZIP_LEVEL,
+        brotli_quality=settings.BROTLI_QUALITY,
+    )
+
 # API routes (router already has prefix="/api/v1")
 app.include_router(api_router)
 
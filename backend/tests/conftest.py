@@ -0,0 +1,29 @@
+"""Shared pytest configuration."""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+# Make ``app`` importable when pytest is run from any directory
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from app.core.memory_store import MemoryStorage  # noqa: E402
+from app.core.sqlite_store import SQLiteStorage  # noqa: E402
+
+
+@pytest.fixture
+def anyio_backend():
+    """Run ``@pytest.mark.anyio`` tests on asyncio only."""
+    return "asyncio"
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def storage(request, tmp_path):
+    """Each storage backend that evaluates the Cosmos SQL subset itself."""
+    if request.param == "memory":
+        yield MemoryStorage()
+        return
+    storage = SQLiteStorage(str(tmp_path / "test.db"), pool_size=1)
+    yield storage
+    storage.pool.close()
@@ -0,0 +1,118 @@
+"""Tests for ETag validators, 304 responses and conditional conversation deletes."""
+
+import asyncio
+import uuid
+
+import msgpack
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.api.compression import CompressionMiddleware
+from app.api.responses import etag_matches, etag_value
+from app.api.routes import router
+from app.core.dependencies import get_conversation_repository
+from app.core.memory_store import MemoryStorage
+from app.models.conversation import Message
+from app.repositories.conversation import ConversationRepository
+
+
+def message(content: str) -> Message:
+    return Message(
+        message_id=str(uuid.uuid4()),
+        role="user",
+        content=content,
+        timestamp="2026-01-01T00:00:00",
+    )
+
+
+@pytest.mark.parametrize(
+    ("header", "etag", "expected"),
+    [
+        (None, '"a"', False),
+        ('"a"', '"a"', True),
+        ('W/"a"', '"a"', True),
+        ('"a"', 'W/"a"', True),
+        ('"b", W/"a"', '"a"', True),
+        ('"b"', '"a"', False),
+        ("*", '"a"', True),
+    ],
+)
+def test_etag_matches_is_weak(header, etag, expected):
+    assert etag_matches(header, etag) is expected
+
+
+def test_etag_value_strips_the_weak_prefix():
+    assert etag_value(' W/"abc" ') == '"abc"'
+
+
+@pytest.fixture
+def repo():
+    return ConversationRepository(MemoryStorage())
+
+
+@pytest.fixture
+def client(repo):
+    # Only the routes under test: the app's lifespan would open the shared resources
+    app = FastAPI()
+    app.add_middleware(CompressionMiddleware, minimum_size=1)
+    app.include_router(router)
+    app.dependency_overrides[get_conversation_repository] = lambda: repo
+    return TestClient(app)
+
+
+@pytest.fixture
+def conversation_id(client, repo):
+    response = client.post(
+        "/api/v1/conversations", params={"user_id": "u1", "first_message_content": "q0"}
+    )
+    assert response.status_code == 200
+    return response.json()["id"]
+
+
+def test_conversation_is_revalidated_with_its_etag(client, repo, conversation_id):
+    url = f"/api/v1/conversations/{conversation_id}"
+    response = client.get(url)
+    assert response.status_code == 200
+    etag = response.headers["etag"]
+    assert etag.startswith('W/"')
+    assert response.headers["cache-control"] == "no-cache"
+    assert "Accept" in response.headers["vary"]
+
+    response = client.get(url, headers={"If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.content == b""
+    assert response.headers["etag"] == etag
+
+    asyncio.run(repo.append_messages(conversation_id, [message("q1")]))
+    response = client.get(url, headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["etag"] != etag
+    assert [m["content"] for m in response.json()["messages"]] == ["q0", "q1"]
+
+
+def test_list_etag_is_shared_by_every_encoding(client, conversation_id):
+    url = "/api/v1/users/u1/conversations"
+    plain = client.get(url, headers={"Accept-Encoding": "identity"})
+    compressed = client.get(url, headers={"Accept-Encoding": "gzip"})
+    packed = client.get(
+        url, headers={"Accept": "application/msgpack", "Accept-Encoding": "identity"}
+    )
+    assert compressed.headers["content-encoding"] == "gzip"
+    assert {"Accept", "Accept-Encoding"} <= {
+        value.strip() for value in compressed.headers["vary"].split(",")
+    }
+    assert plain.headers["etag"] == compressed.headers["etag"] == packed.headers["etag"]
+    assert msgpack.unpackb(packed.content) == plain.json()
+    assert [item["id"] for item in plain.json()] == [conversation_id]
+
+    response = client.get(url, headers={"If-None-Match": plain.headers["etag"]})
+    assert response.status_code == 304
+
+
+def test_delete_requires_the_current_etag(client, conversation_id):
+    url = f"/api/v1/conversations/{conversation_id}"
+    etag = client.get(url).headers["etag"]
+    assert client.delete(url, headers={"If-Match": 'W/"stale"'}).status_code == 412
+    assert client.delete(url, headers={"If-Match": etag}).status_code == 200
+    assert client.delete("/api/v1/conversations/missing").status_code == 404
@@ -0,0 +1,178 @@
+"""Tests for conversation headers, message documents and message windows."""
+
+import asyncio
+import uuid
+
+import pytest
+
+from app.core.memory_store import MemoryStorage
+from app.models.conversation import Message
+from app.repositories.conversation import ConversationNotFoundError, ConversationRepository
+
+
+def message(content: str, role: str = "user") -> Message:
+    return Message(
+        message_id=str(uuid.uuid4()),
+        role=role,
+        content=content,
+        timestamp="2026-01-01T00:00:00",
+    )
+
+
+@pytest.fixture
+def repo():
+    return ConversationRepository(MemoryStorage())
+
+
+async def contents(repo: ConversationRepository, conversation_id: str) -> list[str]:
+    conversation, etag = await repo.get_versioned(conversation_id)
+    assert etag is not None
+    assert len(conversation.messages) == conversation.message_count
+    return [m.content for m in conversation.messages]
+
+
+@pytest.mark.anyio
+async def test_append_stores_messages_then_counts_them(repo):
+    conv = await repo.create_conversation("u1", message("q0"))
+    header = await repo.append_messages(conv.id, [message("a0", "assistant"), message("q1")])
+    assert header.message_count == 3
+    assert await contents(repo, conv.id) == ["q0", "a0", "q1"]
+    summaries = await repo.list_user_conversations("u1")
+    assert [(s.message_count, s.last_message) for s in summaries] == [(3, "q1")]
+
+
+@pytest.mark.anyio
+async def test_uncommitted_documents_are_not_served(repo):
+    conv = await repo.create_conversation("u1", message("q0"))
+    # Written by an append whose header update has not happened (yet)
+    await repo.messages.save(conv.id, 1, message("pending"))
+    assert await contents(repo, conv.id) == ["q0"]
+    window, _ = await repo.get_message_page(conv.id, limit=10)
+    assert [m.content for m in window] == ["q0"]
+    window, _ = await repo.get_message_page(conv.id, limit=10, newer=True)
+    assert [m.content for m in window] == ["q0"]
+
+
+@pytest.mark.anyio
+async def test_failed_header_write_counts_nothing(repo, monkeypatch):
+    conv = await repo.create_conversation("u1", message("q0"))
+    turn = [message("q1"), message("a1", "assistant")]
+
+    async def unavailable(*args, **kwargs):
+        raise RuntimeError("service unavailable")
+
+    with monkeypatch.context() as patch:
+        patch.setattr(repo, "replace", unavailable)
+        with pytest.raises(RuntimeError):
+            await repo.append_messages(conv.id, turn)
+    assert await contents(repo, conv.id) == ["q0"]
+    assert not await repo.is_appended(conv.id, turn)
+
+    await repo.append_messages(conv.id, turn)
+    assert await contents(repo, conv.id) == ["q0", "q1", "a1"]
+
+
+@pytest.mark.anyio
+async def test_is_appended_detects_a_lost_response(repo, monkeypatch):
+    conv = await repo.create_conversation("u1", message("q0"))
+    turn = [message("q1")]
+    replace = repo.replace
+
+    async def timed_out(*args, **kwargs):
+        await replace(*args, **kwargs)
+        raise TimeoutError
+
+    with monkeypatch.context() as patch:
+        patch.setattr(repo, "replace", timed_out)
+        with pytest.raises(TimeoutError):
+            await repo.append_messages(conv.id, turn)
+    assert await repo.is_appended(conv.id, turn)
+    assert await contents(repo, conv.id) == ["q0", "q1"]
+
+
+@pytest.mark.anyio
+async def test_discard_deletes_only_uncommitted_documents(repo):
+    conv = await repo.create_conversation("u1", message("q0"))
+    committed = [message("q1")]
+    await repo.append_messages(conv.id, committed)
+    abandoned = [message("lost1"), message("lost2")]
+    await repo.messages.save(conv.id, 2, abandoned[0])
+    await repo.messages.save(conv.id, 3, abandoned[1])
+
+    assert await repo.discard_messages(conv.id, [*committed, *abandoned]) == 2
+    await repo.append_messages(conv.id, [message("q2"), message("q3")])
+    assert await contents(repo, conv.id) == ["q0", "q1", "q2", "q3"]
+
+
+@pytest.mark.anyio
+async def test_concurrent_appends_get_distinct_positions(repo):
+    conv = await repo.create_conversation("u1", message("q0"))
+    await asyncio.gather(*(repo.append_messages(conv.id, [message(f"m{i}")]) for i in range(4)))
+    stored = await contents(repo, conv.id)
+    assert stored[0] == "q0"
+    assert sorted(stored[1:]) == ["m0", "m1", "m2", "m3"]
+    documents = await repo.messages.query(
+        "SELECT * FROM c WHERE c.conversation_id = @id", [{"name": "@id", "value": conv.id}]
+    )
+    assert sorted(d["seq"] for d in documents) == [0, 1, 2, 3, 4]
+
+
+async def walk(repo: ConversationRepository, conversation_id: str, limit: int, newer: bool):
+    """Read every window in one direction; returns the contents in chronological order."""
+    windows = []
+    cursor = None
+    while True:
+        window, cursor = await repo.get_message_page(
+            conversation_id, limit=limit, cursor=cursor, newer=newer
+        )
+        assert 0 < len(window) <= limit
+        windows.append([m.content for m in window])
+        if cursor is None:
+            break
+    if not newer:
+        windows.reverse()
+    return [content for window in windows for content in window]
+
+
+async def legacy_conversation(repo: ConversationRepository, inline: int, stored: int) -> str:
+    """Create a header that keeps its first messages inline, then append the rest."""
+    conversation_id = str(uuid.uuid4())
+    messages = [message(f"m{i}") for i in range(inline)]
+    await repo.container.upsert_item(
+        {
+            "id": conversation_id,
+            "user_id": "u1",
+            "title": "legacy",
+            "messages": [m.model_dump() for m in messages],
+            "created_at": "2026-01-01T00:00:00",
+            "updated_at": "2026-01-01T00:00:00",
+            "is_active": True,
+        }
+    )
+    for i in range(inline, inline + stored):
+        await repo.append_messages(conversation_id, [message(f"m{i}")])
+    return conversation_id
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize("limit", [1, 2, 3, 7, 20])
+@pytest.mark.parametrize("newer", [False, True])
+async def test_windows_cover_every_message_once(repo, limit, newer):
+    first, *rest = [message(f"m{i}") for i in range(7)]
+    conv = await repo.create_conversation("u1", first, replies=rest)
+    expected = [f"m{i}" for i in range(7)]
+    assert await walk(repo, conv.id, limit, newer) == expected
+
+    legacy_id = await legacy_conversation(repo, inline=3, stored=4)
+    assert await walk(repo, legacy_id, limit, newer) == expected
+    assert await repo.move_inline_messages(legacy_id) == 3
+    assert await walk(repo, legacy_id, limit, newer) == expected
+
+
+@pytest.mark.anyio
+async def test_latest_window_and_missing_conversation(repo):
+    legacy_id = await legacy_conversation(repo, inline=2, stored=0)
+    window, cursor = await repo.get_message_page(legacy_id, limit=5)
+    assert ([m.content for m in window], cursor) == (["m0", "m1"], None)
+    with pytest.raises(ConversationNotFoundError):
+        await repo.get_message_page("missing")
@@ -0,0 +1,148 @@
+"""Tests for the write-behind conversation writer."""
+
+import asyncio
+import uuid
+
+import pytest
+from azure.cosmos.exceptions import CosmosHttpResponseError
+from pydantic import BaseModel, ValidationError
+
+from app.core.memory_store import MemoryStorage
+from app.models.conversation import Message
+from app.repositories.conversation import ConversationNotFoundError, ConversationRepository
+from app.repositories.conversation_writer import ConversationWriter
+
+
+def message(content: str, role: str = "user") -> Message:
+    return Message(
+        message_id=str(uuid.uuid4()),
+        role=role,
+        content=content,
+        timestamp="2026-01-01T00:00:00",
+    )
+
+
+@pytest.fixture
+def repo():
+    return ConversationRepository(MemoryStorage())
+
+
+@pytest.fixture
+def writer(repo):
+    return ConversationWriter(repo, max_attempts=3, retry_base_delay_ms=1, retry_max_delay_ms=1)
+
+
+async def contents(repo: ConversationRepository, conversation_id: str) -> list[str]:
+    conversation = await repo.get_conversation(conversation_id)
+    return [m.content for m in conversation.messages]
+
+
+def validation_error() -> ValidationError:
+    class Model(BaseModel):
+        count: int
+
+    try:
+        Model(count="many")
+    except ValidationError as e:
+        return e
+    raise AssertionError("expected a validation error")
+
+
+@pytest.mark.anyio
+async def test_started_conversation_is_listed_before_its_first_turn(repo, writer):
+    first = message("q0")
+    conv = await repo.start_conversation("u1", first)
+    header = await repo.get_conversation(conv.id)
+    assert header.message_count == 0
+    assert [s.id for s in await repo.list_user_conversations("u1")] == [conv.id]
+
+    writer.submit(conv.id, [first, message("a0", "assistant")])
+    await writer.close()
+    assert await contents(repo, conv.id) == ["q0", "a0"]
+    summaries = await repo.list_user_conversations("u1")
+    assert [(s.message_count, s.last_message) for s in summaries] == [(2, "a0")]
+
+
+@pytest.mark.anyio
+async def test_turns_are_written_in_order_and_coalesced(repo, writer):
+    conv = await repo.create_conversation("u1", message("q0"))
+    for i in range(1, 4):
+        writer.submit(conv.id, [message(f"q{i}"), message(f"a{i}", "assistant")])
+    assert [m.content for m in await writer.recent_messages(conv.id, 3)] == ["a2", "q3", "a3"]
+
+    await writer.close()
+    assert await contents(repo, conv.id) == ["q0", "q1", "a1", "q2", "a2", "q3", "a3"]
+    stats = writer.stats()
+    assert stats["turns_coalesced"] == 2
+    assert stats["writes"] == 1  # all queued before the flush task ran
+    assert stats["pending_messages"] == 0
+    with pytest.raises(RuntimeError):
+        writer.submit(conv.id, [message("late")])
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize(
+    "error",
+    [
+        CosmosHttpResponseError(status_code=503, message="service unavailable"),
+        validation_error(),  # a ValueError, but not a missing conversation
+    ],
+)
+async def test_transient_failures_are_retried(repo, writer, monkeypatch, error):
+    conv = await repo.create_conversation("u1", message("q0"))
+    append = repo.append_messages
+    failures = [error]
+
+    async def flaky(*args, **kwargs):
+        if failures:
+            raise failures.pop()
+        return await append(*args, **kwargs)
+
+    monkeypatch.setattr(repo, "append_messages", flaky)
+    writer.submit(conv.id, [message("q1")])
+    await writer.close()
+    assert await contents(repo, conv.id) == ["q0", "q1"]
+    assert writer.stats()["retries"] == 1
+    assert writer.stats()["failed_writes"] == 0
+
+
+@pytest.mark.anyio
+async def test_missing_conversation_is_not_retried(repo, writer):
+    writer.submit("missing", [message("q0")])
+    await writer.close()
+    stats = writer.stats()
+    assert stats["retries"] == 0
+    assert stats["failed_writes"] == 1
+    assert stats["messages_dropped"] == 1
+    with pytest.raises(ConversationNotFoundError):
+        await writer.recent_messages("missing", 10)
+
+
+@pytest.mark.anyio
+async def test_close_drains_queued_writes(repo, writer, monkeypatch):
+    conv = await repo.create_conversation("u1", message("q0"))
+    append = repo.append_messages
+
+    async def slow(*args, **kwargs):
+        await asyncio.sleep(0.01)
+        return await append(*args, **kwargs)
+
+    monkeypatch.setattr(repo, "append_messages", slow)
+    writer.submit(conv.id, [message("q1")])
+    await asyncio.sleep(0)
+    # Queued while q1 is being written: coalesced into the next write
+    writer.submit(conv.id, [message("q2")])
+    writer.submit(conv.id, [message("q3")])
+    await writer.close(timeout_seconds=5)
+    assert await contents(repo, conv.id) == ["q0", "q1", "q2", "q3"]
+    assert writer.stats()["writes"] == 2
+
+
+@pytest.mark.anyio
+async def test_get_by_id_raises_failures_other_than_not_found(repo, monkeypatch):
+    async def failing(**kwargs):
+        raise CosmosHttpResponseError(status_code=500, message="internal error")
+
+    monkeypatch.setattr(repo.container, "read_item", failing)
+    with pytest.raises(CosmosHttpResponseError):
+        await repo.get_by_id("c1", "c1")
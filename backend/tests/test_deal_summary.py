@@ -0,0 +1,104 @@
+"""Tests for the pipeline summary and its aggregate-query fallback."""
+
+import pytest
+
+from app.core.memory_store import MemoryStorage
+from app.models.schemas import DealSummary
+from app.repositories.deal import DealRepository
+from app.repositories.deal_summary import (
+    DealSummaryRepository,
+    add_deal,
+    aggregate_deal_summary,
+    summarize,
+)
+
+DEALS = [
+    {
+        "id": "d1",
+        "deal_stage": "受注",
+        "service_type": "通信インフラ構築",
+        "sales_user_id": "u1",
+        "deal_amount": 1_000_000,
+    },
+    {
+        "id": "d2",
+        "deal_stage": "受注",
+        "service_type": "技術人材派遣",
+        "sales_user_id": "u2",
+        "deal_amount": 250_000.4,
+    },
+    {
+        "id": "d3",
+        "deal_stage": "提案",
+        "service_type": "通信インフラ構築",
+        "sales_user_id": "u1",
+        "deal_amount": None,
+    },
+    {"id": "d4", "deal_stage": "見込み", "sales_user_id": "u2"},
+]
+
+
+def _without_timestamp(summary: DealSummary) -> dict:
+    return summary.model_dump(exclude={"updated_at"})
+
+
+def test_add_and_remove_deal_round_to_whole_yen():
+    summary = DealSummary()
+    for _ in range(1000):
+        add_deal(summary, {"deal_stage": "受注", "deal_amount": 0.1 + 0.2})
+        add_deal(summary, {"deal_stage": "受注", "deal_amount": 0.1 + 0.2}, -1)
+    add_deal(summary, {"deal_stage": "受注", "deal_amount": 1234.6})
+    assert summary.total.count == 1
+    assert summary.total.total_amount == 1235
+    assert isinstance(summary.total.total_amount, int)
+    assert summary.by_deal_stage["受注"].total_amount == 1235
+
+
+def test_remove_drops_empty_groups():
+    summary = summarize(DEALS[:1])
+    add_deal(summary, DEALS[0], -1)
+    assert summary.by_deal_stage == {}
+    assert summary.total.count == 0
+
+
+@pytest.mark.anyio
+async def test_aggregate_queries_match_summarize(storage):
+    container = storage.get_container("Deals")
+    for deal in DEALS:
+        await container.upsert_item(deal)
+    summary = await aggregate_deal_summary(DealRepository(storage))
+    assert _without_timestamp(summary) == _without_timestamp(summarize(DEALS))
+    assert summary.by_deal_stage["受注"].count == 2
+    assert summary.by_deal_stage["提案"].total_amount == 0
+    assert "見込み" in summary.by_deal_stage
+    assert set(summary.by_service_type) == {"通信インフラ構築", "技術人材派遣"}
+
+
+@pytest.mark.anyio
+async def test_get_deal_summary_prefers_the_stored_document():
+    storage = MemoryStorage()
+    storage.load("Deals", DEALS)
+    repo = DealRepository(storage)
+    summary_repo = DealSummaryRepository(storage)
+    repo.attach_summary(summary_repo)
+
+    # Not built yet: computed with aggregate queries
+    assert (await repo.get_deal_summary()).total.count == len(DEALS)
+
+    stored = summarize(DEALS[:1])
+    await summary_repo.save(stored)
+    assert (await repo.get_deal_summary()).total.count == 1
+
+
+@pytest.mark.anyio
+async def test_apply_moves_a_deal_between_groups():
+    storage = MemoryStorage()
+    summary_repo = DealSummaryRepository(storage)
+    await summary_repo.save(summarize(DEALS))
+    previous = DEALS[2]
+    updated = {**previous, "deal_stage": "受注", "deal_amount": 300_000}
+    await summary_repo.apply(updated, previous)
+    summary = await summary_repo.get_summary()
+    assert summary.by_deal_stage["受注"].count == 3
+    assert summary.by_deal_stage["受注"].total_amount == 1_550_000
+    assert "提案" not in summary.by_deal_stage
@@ -0,0 +1,94 @@
+"""Tests for the similar deal vector index."""
+
+import numpy as np
+import pytest
+
+from app.repositories import deal_vectors
+from app.repositories.deal_vectors import DealVectorIndex
+
+NOTES = [
+    "基地局の光回線工事、来期の増設も検討中",
+    "光回線の敷設工事と保守契約の更新",
+    "技術者派遣の延長、ネットワーク設計の要員を追加",
+    "データセンターの電源設備更新",
+    "基地局アンテナの保守点検",
+    "ネットワーク設計支援の技術者派遣",
+    "",
+]
+
+
+def _deals() -> list[dict]:
+    return [
+        {"id": f"d{i}", "notes": notes, "service_type": "通信インフラ構築" if i % 2 else None}
+        for i, notes in enumerate(NOTES)
+    ]
+
+
+def _brute_force(index: DealVectorIndex, deals: list[dict], query: np.ndarray) -> list[str]:
+    """Rank deals by cosine similarity of freshly computed TF-IDF vectors."""
+    rows = {
+        deal["id"]: index.vectorizer.vector(deal["notes"], deal["service_type"]) for deal in deals
+    }
+    rows = {deal_id: row for deal_id, row in rows.items() if row.any()}
+    df = np.sum([row > 0 for row in rows.values()], axis=0)
+    idf = np.log((len(rows) + 1) / (df + 1)) + 1
+    scores = {}
+    for deal_id, row in rows.items():
+        a, b = query * idf, row * idf
+        score = float(a @ b / (np.linalg.norm(a) * np.linalg.norm(b)))
+        if score > 0:
+            scores[deal_id] = score
+    return sorted(scores, key=lambda deal_id: -scores[deal_id])
+
+
+@pytest.fixture
+def index(monkeypatch):
+    # Small initial matrix so that loading the deals grows it
+    monkeypatch.setattr(deal_vectors, "INITIAL_CAPACITY", 2)
+    # Buckets come from the per-process string hash: use enough of them
+    # that unrelated notes do not share one
+    index = DealVectorIndex(dim=1 << 16)
+    for deal in _deals():
+        index.apply(deal)
+    return index
+
+
+def test_deals_without_features_are_not_indexed(index):
+    assert len(index) == len(NOTES) - 1
+    assert index.similar_to(["d6"]) == [[]]
+
+
+def test_search_matches_brute_force(index):
+    text = "光回線の保守"
+    results = index.search([text, "派遣"], top_k=3)
+    assert [deal_id for deal_id, _ in results[0]] == _brute_force(
+        index, _deals(), index.vectorizer.vector(text)
+    )[:3]
+    assert {deal_id for deal_id, _ in results[1]} == {"d2", "d5"}
+    scores = [score for _, score in results[0]]
+    assert scores == sorted(scores, reverse=True)
+    assert all(0 < score <= 1.0 + 1e-6 for score in scores)
+
+
+def test_similar_to_excludes_the_deal_itself(index):
+    [results] = index.similar_to(["d5"], top_k=10)
+    assert results[0][0] == "d2"
+    assert "d5" not in {deal_id for deal_id, _ in results}
+
+
+def test_updates_and_removals_are_reflected(index):
+    index.search(["基地局"])  # computes the IDF before the changes
+    index.remove("d0")
+    index.apply({"id": "d1", "notes": "データセンターの電源工事"})
+    deals = [deal for deal in _deals() if deal["id"] not in ("d0", "d1")]
+    deals.append({"id": "d1", "notes": "データセンターの電源工事", "service_type": None})
+    # More than IDF_REFRESH_RATIO of the deals changed: the IDF is recomputed
+    text = "電源設備"
+    ranked = [deal_id for deal_id, _ in index.search([text], top_k=10)[0]]
+    assert ranked == _brute_force(index, deals, index.vectorizer.vector(text))
+    assert "d0" not in ranked
+
+
+def test_top_k_bounds(index):
+    assert index.search(["基地局"], top_k=0) == [[]]
+    assert DealVectorIndex(dim=64).search(["基地局"]) == [[]]
@@ -0,0 +1,93 @@
+"""Tests for the read-through entity cache."""
+
+import pytest
+
+from app.repositories import cache as cache_module
+from app.repositories.cache import EntityCache
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Controllable ``time.monotonic`` for the cache module."""
+    now = [1000.0]
+    monkeypatch.setattr(cache_module.time, "monotonic", lambda: now[0])
+    return now
+
+
+def test_hit_and_miss(clock):
+    cache = EntityCache("Users", max_items=10, ttl_seconds=60)
+    assert cache.get("1") == (False, None)
+    cache.set("1", {"id": "1"})
+    assert cache.get("1") == (True, {"id": "1"})
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+
+
+def test_entries_expire_after_ttl(clock):
+    cache = EntityCache("Users", max_items=10, ttl_seconds=60)
+    cache.set("1", {"id": "1"})
+    clock[0] += 59
+    assert cache.get("1")[0] is True
+    clock[0] += 1
+    assert cache.get("1") == (False, None)
+    assert cache.stats()["expirations"] == 1
+
+
+def test_least_recently_used_entry_is_evicted(clock):
+    cache = EntityCache("Users", max_items=2, ttl_seconds=60)
+    cache.set("1", {"id": "1"})
+    cache.set("2", {"id": "2"})
+    cache.get("1")  # "2" becomes the least recently used
+    cache.set("3", {"id": "3"})
+    assert cache.get("2") == (False, None)
+    assert cache.get("1")[0] is True
+    assert cache.get("3")[0] is True
+    assert cache.stats()["evictions"] == 1
+
+
+def test_negative_entries_use_their_own_ttl(clock):
+    cache = EntityCache("Users", max_items=10, ttl_seconds=60, negative_ttl_seconds=5)
+    cache.set_missing("404")
+    assert cache.get("404") == (True, None)
+    clock[0] += 5
+    assert cache.get("404") == (False, None)
+
+
+def test_negative_caching_disabled_by_default(clock):
+    cache = EntityCache("Users", max_items=10, ttl_seconds=60)
+    cache.set_missing("404")
+    assert cache.get("404") == (False, None)
+
+
+def test_invalidate_drops_entry(clock):
+    cache = EntityCache("Users", max_items=10, ttl_seconds=60)
+    cache.set("1", {"id": "1"})
+    cache.invalidate("1")
+    assert cache.get("1") == (False, None)
+    assert cache.stats()["invalidations"] == 1
+
+
+def test_read_in_flight_during_write_is_not_cached(clock):
+    cache = EntityCache("Users", max_items=10, ttl_seconds=60, negative_ttl_seconds=60)
+    generation = cache.generation()  # read starts
+    cache.invalidate("1")  # write lands while the read is in flight
+    cache.set("1", {"id": "1", "name": "old"}, generation)
+    cache.set_missing("1", generation)
+    assert cache.get("1") == (False, None)
+    assert cache.stats()["stale_sets"] == 2
+
+
+def test_read_started_after_write_is_cached(clock):
+    cache = EntityCache("Users", max_items=10, ttl_seconds=60)
+    cache.invalidate("1")
+    generation = cache.generation()
+    cache.set("1", {"id": "1"}, generation)
+    assert cache.get("1") == (True, {"id": "1"})
+
+
+def test_write_to_other_key_does_not_block_caching(clock):
+    cache = EntityCache("Users", max_items=10, ttl_seconds=60)
+    generation = cache.generation()
+    cache.invalidate("2")
+    cache.set("1", {"id": "1"}, generation)
+    assert cache.get("1")[0] is True
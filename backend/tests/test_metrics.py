@@ -0,0 +1,60 @@
+"""Tests for attributing Cosmos calls to repository operations."""
+
+from collections.abc import AsyncIterator
+
+import pytest
+
+from app.core import metrics
+from app.core.metrics import label_operations
+
+
+class FakeRepository:
+    async def get(self):
+        return metrics._current_operation.get()
+
+    async def stream(self):
+        yield metrics._current_operation.get()
+
+    def iter_pages(self) -> AsyncIterator[str | None]:
+        return self._pages()
+
+    async def _pages(self):
+        for _ in range(2):
+            yield metrics._current_operation.get()
+
+    def plain(self):
+        return metrics._current_operation.get()
+
+
+label_operations(FakeRepository, "FakeRepository")
+
+
+@pytest.mark.anyio
+async def test_coroutine_is_labelled():
+    assert await FakeRepository().get() == "FakeRepository.get"
+    assert metrics._current_operation.get() is None
+
+
+@pytest.mark.anyio
+async def test_async_generator_is_labelled_per_step():
+    assert [label async for label in FakeRepository().stream()] == ["FakeRepository.stream"]
+
+
+@pytest.mark.anyio
+async def test_returned_async_iterator_is_labelled():
+    labels = [label async for label in FakeRepository().iter_pages()]
+    assert labels == ["FakeRepository.iter_pages"] * 2
+    assert metrics._current_operation.get() is None
+
+
+@pytest.mark.anyio
+async def test_outermost_operation_wins():
+    token = metrics._current_operation.set("Outer.op")
+    try:
+        assert [label async for label in FakeRepository().iter_pages()] == ["Outer.op"] * 2
+    finally:
+        metrics._current_operation.reset(token)
+
+
+def test_plain_method_result_is_unchanged():
+    assert FakeRepository().plain() is None
@@ -0,0 +1,82 @@
+"""Tests for query specifications and the query builder."""
+
+import pytest
+from pydantic import ValidationError
+
+from app.core.exceptions import ValidationException
+from app.repositories.filters import CustomerSpec, DealSpec
+from app.repositories.query_builder import QueryBuilder
+
+DEALS = [
+    {"id": "d1", "deal_id": "d1", "sales_user_id": "u1", "deal_amount": 0, "deal_stage": "提案"},
+    {"id": "d2", "deal_id": "d2", "sales_user_id": "u1", "deal_amount": 500, "deal_stage": "受注"},
+    {"id": "d3", "deal_id": "d3", "sales_user_id": "u2", "deal_amount": 300, "deal_stage": "受注"},
+    {"id": "d4", "deal_id": "d4", "sales_user_id": "u1", "deal_stage": "見込み"},
+    {"id": "d5", "deal_id": "d5", "sales_user_id": "u1", "deal_amount": 900, "deal_stage": "受注"},
+]
+
+
+def test_builder_skips_none_and_names_parameters_uniquely():
+    query, parameters = (
+        QueryBuilder(["id", "deal_amount"])
+        .where_eq("deal_stage", "受注")
+        .where_eq("sales_user_id", None)
+        .where_eq("deal_stage", "提案")
+        .where_range("deal_amount", 100, None)
+        .where_in("industry", ["a", "b"])
+        .order_by("deal_amount", descending=True)
+        .top(5)
+        .build()
+    )
+    assert query == (
+        "SELECT TOP 5 c.id, c.deal_amount FROM c "
+        "WHERE c.deal_stage = @deal_stage AND c.deal_stage = @deal_stage_2 "
+        "AND c.deal_amount >= @deal_amount_min AND ARRAY_CONTAINS(@industry, c.industry) "
+        "ORDER BY c.deal_amount DESC"
+    )
+    assert [p["name"] for p in parameters] == [
+        "@deal_stage",
+        "@deal_stage_2",
+        "@deal_amount_min",
+        "@industry",
+    ]
+
+
+def test_builder_without_filters():
+    assert QueryBuilder().where_in("industry", []).build() == ("SELECT * FROM c", [])
+
+
+def test_builder_rejects_invalid_field_names():
+    with pytest.raises(ValidationException):
+        QueryBuilder().where_eq("name = 1 OR 1", "x")
+
+
+def test_spec_rejects_unknown_order_by():
+    with pytest.raises(ValidationError):
+        DealSpec(order_by="notes")
+    with pytest.raises(ValidationError):
+        CustomerSpec(top=0)
+
+
+def test_select_keeps_falsy_sort_values_and_puts_missing_first():
+    spec = DealSpec(sales_user_id="u1", order_by="deal_amount")
+    assert [item["id"] for item in spec.select(DEALS)] == ["d4", "d1", "d2", "d5"]
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize(
+    "spec",
+    [
+        DealSpec(sales_user_id="u1", order_by="deal_amount"),
+        DealSpec(deal_stage="受注", min_amount=300, order_by="deal_amount", descending=True, top=2),
+        DealSpec(max_amount=500, order_by="deal_id"),
+        DealSpec(order_by="deal_amount", descending=True),
+    ],
+)
+async def test_query_and_select_agree(storage, spec):
+    container = storage.get_container("Deals")
+    for deal in DEALS:
+        await container.upsert_item(deal)
+    query, parameters = spec.build_query(["id"])
+    served = [item["id"] async for item in container.query_items(query, parameters=parameters)]
+    assert served == [item["id"] for item in spec.select(DEALS)]
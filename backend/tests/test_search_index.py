@@ -0,0 +1,108 @@
+"""Tests for the customer search index and keyword search through the repository."""
+
+import pytest
+
+from app.core.memory_store import MemoryStorage
+from app.repositories.customer import CustomerRepository
+from app.repositories.filters import CustomerSpec
+from app.repositories.replica import ContainerReplica
+from app.repositories.search_index import CustomerSearchIndex, TextIndex, normalize
+
+
+@pytest.mark.parametrize(
+    ("raw", "expected"),
+    [
+        ("ｿﾌﾄﾊﾞﾝｸ", "ソフトバンク"),  # half-width kana
+        ("ｋｄｄｉ", "kddi"),  # full-width alphanumerics, case folding
+        ("KDDI株式会社", "kddi株式会社"),
+        ("そふとばんく", "ソフトバンク"),  # hiragana to katakana
+        (" 東京 　電力 ", "東京電力"),  # ASCII and ideographic spaces
+    ],
+)
+def test_normalize(raw, expected):
+    assert normalize(raw) == expected
+
+
+def test_text_index_ranks_by_weight_coverage_and_prefix():
+    index = TextIndex({"name": 3.0, "contact_person": 2.0})
+    index.apply({"id": "1", "name": "ソフトバンク株式会社", "contact_person": "山田"})
+    index.apply({"id": "2", "name": "ソフトバンク", "contact_person": "佐藤"})
+    index.apply({"id": "3", "name": "日本電気", "contact_person": "ソフトバンク担当"})
+    scores = index.search(normalize("ｿﾌﾄﾊﾞﾝｸ"))
+    assert set(scores) == {"1", "2", "3"}
+    assert scores["2"] > scores["1"] > scores["3"]
+
+
+def test_text_index_confirms_adjacent_bigrams():
+    index = TextIndex({"name": 1.0})
+    # Contains the bigrams of "ABC" ("AB", "BC") but not the substring
+    index.apply({"id": "1", "name": "abxbc"})
+    index.apply({"id": "2", "name": "xabc"})
+    assert set(index.search("abc")) == {"2"}
+
+
+def test_text_index_single_character_query():
+    index = TextIndex({"name": 1.0})
+    index.apply({"id": "1", "name": "東京"})
+    index.apply({"id": "2", "name": "大阪"})
+    assert set(index.search("京")) == {"1"}
+
+
+def test_text_index_replaces_and_removes_items():
+    index = TextIndex({"name": 1.0})
+    index.apply({"id": "1", "name": "東京電力"})
+    index.apply({"id": "1", "name": "関西電力"})
+    assert index.search("東京") == {}
+    assert set(index.search("関西")) == {"1"}
+    index.remove("1")
+    assert index.search("関西") == {}
+    assert len(index) == 0
+    assert index.stats()["postings"] == 0
+
+
+def _replica(storage: MemoryStorage, name: str, items: list[dict]) -> ContainerReplica:
+    replica = ContainerReplica(storage.get_container(name), name, index_fields=())
+    for item in items:
+        replica.apply(item)
+    replica.ready = True
+    return replica
+
+
+def test_customer_search_adds_deal_note_matches():
+    storage = MemoryStorage()
+    customers = _replica(
+        storage,
+        "Customers",
+        [
+            {"id": "c1", "name": "東京電力"},
+            {"id": "c2", "name": "関西商事"},
+        ],
+    )
+    deals = _replica(storage, "Deals", [{"id": "d1", "customer_id": "c2", "notes": "東京支店"}])
+    index = CustomerSearchIndex(customers, deals)
+    assert index.search("とうきょう") == []
+    assert index.search("東京") == ["c1", "c2"]
+    customers.ready = False
+    assert not index.ready
+
+
+@pytest.mark.anyio
+async def test_repository_search_reads_customers_missing_from_replica():
+    storage = MemoryStorage()
+    stored = [
+        {"id": "c1", "customer_id": "c1", "name": "東京電力", "industry": "電力"},
+        {"id": "c2", "customer_id": "c2", "name": "関西商事", "industry": "商社"},
+    ]
+    storage.load("Customers", stored)
+    # The deal notes were indexed before the Customers replica picked up c2
+    customers = _replica(storage, "Customers", stored[:1])
+    deals = _replica(storage, "Deals", [{"id": "d1", "customer_id": "c2", "notes": "東京支店"}])
+    repo = CustomerRepository(storage)
+    repo.attach_replica(customers)
+    repo.attach_search_index(CustomerSearchIndex(customers, deals))
+
+    items = await repo.find(CustomerSpec(keyword="東京"))
+    assert [item["id"] for item in items] == ["c1", "c2"]
+
+    items = await repo.find(CustomerSpec(keyword="東京", industries=["商社"]))
+    assert [item["id"] for item in items] == ["c2"]
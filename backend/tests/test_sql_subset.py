@@ -0,0 +1,120 @@
+"""Tests for the Cosmos SQL subset and its evaluation by the local storage backends."""
+
+import pytest
+from azure.cosmos.exceptions import CosmosHttpResponseError
+
+from app.core.sql_subset import UNDEFINED, parse_query, resolve
+
+ITEMS = [
+    {"id": "1", "name": "Alpha", "stage": "受注", "amount": 300, "tags": ["a"], "meta": {"n": 1}},
+    {"id": "2", "name": "beta", "stage": "提案", "amount": 100.5, "tags": ["b"]},
+    {"id": "3", "name": "Gamma", "stage": "受注", "amount": None, "tags": []},
+    {"id": "4", "name": "delta", "stage": "見込み", "amount": "n/a"},
+    {"id": "5", "name": "Alpine", "stage": "提案", "amount": 50, "tags": ["a", "b"]},
+]
+
+
+def test_parse_query():
+    parsed = parse_query(
+        "SELECT TOP 3 c.id, c.meta.n FROM c "
+        "WHERE c.stage = @stage AND NOT (c.amount < 10 OR IS_DEFINED(c.x)) "
+        "ORDER BY c.amount DESC, c.id OFFSET 1 LIMIT 5"
+    )
+    assert parsed.fields == ["id", "meta.n"]
+    assert parsed.top == 3
+    assert parsed.where[0] == "and"
+    assert parsed.order_by == [("amount", True), ("id", False)]
+    assert (parsed.offset, parsed.limit) == (1, 5)
+
+
+def test_parse_select_value():
+    count = parse_query("SELECT VALUE COUNT(1) FROM c")
+    assert count.value == ("aggregate", "COUNT", ("literal", 1))
+    parsed = parse_query("SELECT DISTINCT VALUE c.stage FROM c")
+    assert parsed.distinct
+    assert parsed.value == ("path", "stage")
+
+
+@pytest.mark.parametrize(
+    "query",
+    [
+        "SELECT * FROM items",
+        "SELECT DISTINCT c.id FROM c",
+        "SELECT VALUE COUNT(1) FROM c ORDER BY c.id",
+        "SELECT * FROM c WHERE REVERSE(c.name) = 'a'",
+        "SELECT * FROM c WHERE c.id = ;",
+    ],
+)
+def test_unsupported_queries_are_rejected_with_400(query):
+    with pytest.raises(CosmosHttpResponseError) as error:
+        parse_query(query)
+    assert error.value.status_code == 400
+
+
+def test_resolve():
+    assert resolve({"a": {"b": 0}}, "a.b") == 0
+    assert resolve({"a": {"b": 0}}, "a.c") is UNDEFINED
+    assert resolve({"a": 1}, "a.b") is UNDEFINED
+
+
+def test_execute_in_memory():
+    parsed = parse_query("SELECT c.id FROM c WHERE c.amount > @min ORDER BY c.amount DESC")
+    assert parsed.execute(ITEMS, {"@min": 60}) == [{"id": "1"}, {"id": "2"}]
+
+
+async def _query(storage, query: str, parameters: list[dict] | None = None) -> list:
+    container = storage.get_container("Deals")
+    for item in ITEMS:
+        await container.upsert_item(item)
+    results = [
+        item async for item in container.query_items(query=query, parameters=parameters or [])
+    ]
+    return [
+        {k: v for k, v in item.items() if not k.startswith("_")} if isinstance(item, dict) else item
+        for item in results
+    ]
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize(
+    ("query", "parameters", "expected"),
+    [
+        (
+            "SELECT c.id FROM c WHERE c.stage = @stage ORDER BY c.id DESC",
+            [{"name": "@stage", "value": "受注"}],
+            [{"id": "3"}, {"id": "1"}],
+        ),
+        (
+            "SELECT c.id FROM c WHERE CONTAINS(LOWER(c.name), 'alp') ORDER BY c.id",
+            None,
+            [{"id": "1"}, {"id": "5"}],
+        ),
+        (
+            "SELECT c.id FROM c WHERE STARTSWITH(c.name, 'A') AND ARRAY_CONTAINS(c.tags, 'b')",
+            None,
+            [{"id": "5"}],
+        ),
+        (
+            "SELECT c.id FROM c WHERE NOT IS_DEFINED(c.tags) OR c.amount = null ORDER BY c.id",
+            None,
+            [{"id": "3"}, {"id": "4"}],
+        ),
+        ("SELECT c.id, c.meta.n FROM c WHERE c.id = '1'", None, [{"id": "1", "n": 1}]),
+        ("SELECT c.id FROM c ORDER BY c.id OFFSET 1 LIMIT 2", None, [{"id": "2"}, {"id": "3"}]),
+        ("SELECT TOP 1 c.id FROM c ORDER BY c.name DESC", None, [{"id": "4"}]),
+        ("SELECT VALUE COUNT(1) FROM c WHERE c.stage != '見込み'", None, [4]),
+        ("SELECT VALUE SUM(c.amount) FROM c WHERE IS_NUMBER(c.amount)", None, [450.5]),
+        ("SELECT VALUE SUM(c.amount) FROM c WHERE c.id = 'none'", None, [0]),
+        (
+            "SELECT DISTINCT VALUE c.stage FROM c WHERE c.id != '3'",
+            None,
+            ["受注", "提案", "見込み"],
+        ),
+    ],
+)
+async def test_backends_agree(storage, query, parameters, expected):
+    results = await _query(storage, query, parameters)
+    if query.startswith("SELECT DISTINCT"):
+        results = sorted(results)
+        expected = sorted(expected)
+    assert results == expected
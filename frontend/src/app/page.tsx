@@ -7,7 +7,7 @@ import { ChatMessages } from '@/components/chat/ChatMessages'
 import { useUserStore } from '@/store/userStore'
 import { useConversationStore } from '@/store/conversationStore'
 import { useAgentStream } from '@/hooks/useAgentStream'
-import { getConversation } from '@/lib/api'
+import { Message as ConversationMessage, getConversationMessages } from '@/lib/api'
 import { SearchHistoryItem } from '@/types/agent'
 
 interface Message {
@@ -20,6 +20,10 @@ export default function Home() {
   const selectedUserId = useUserStore((state) => state.selectedUserId)
   const { fetchConversations, startNewConversation } = useConversationStore()
   const [messages, setMessages] = useState<Message[]>([])
+  // 表示中の会話と、さらに古いメッセージを読み込むためのカーソル
+  const [loadedConversationId, setLoadedConversationId] = useState<string | null>(null)
+  const [olderCursor, setOlderCursor] = useState<string | null>(null)
+  const [isLoadingOlder, setIsLoadingOlder] = useState(false)
 
   // エージェントストリームフック
   const {
@@ -62,25 +66,40 @@ export default function Home() {
   // 新規会話を開始
   const handleNewConversation = useCallback(() => {
     setMessages([])
+    setLoadedConversationId(null)
+    setOlderCursor(null)
     startNewConversation()
   }, [startNewConversation])
 
-  // 会話を選択して復元
+  // 会話を選択して復元（最新のメッセージから1ウィンドウ分）
   const handleSelectConversation = useCallback(async (convId: string) => {
     try {
-      const conversation = await getConversation(convId)
-      // メッセージを復元
-      const restoredMessages: Message[] = conversation.messages.map((msg) => ({
-        role: msg.role,
-        content: msg.content,
-        searchHistory: msg.search_history || undefined,
-      }))
-      setMessages(restoredMessages)
+      const page = await getConversationMessages(convId)
+      setMessages(page.messages.map(toChatMessage))
+      setLoadedConversationId(convId)
+      setOlderCursor(page.nextCursor)
     } catch (error) {
       console.error('Failed to load conversation:', error)
     }
   }, [])
 
+  // 上端までスクロールしたら古いメッセージを読み込む
+  const handleLoadOlder = useCallback(async () => {
+    if (!loadedConversationId || !olderCursor || isLoadingOlder) {
+      return
+    }
+    setIsLoadingOlder(true)
+    try {
+      const page = await getConversationMessages(loadedConversationId, olderCursor)
+      setMessages((prev) => [...page.messages.map(toChatMessage), ...prev])
+      setOlderCursor(page.nextCursor)
+    } catch (error) {
+      console.error('Failed to load older messages:', error)
+    } finally {
+      setIsLoadingOlder(false)
+    }
+  }, [loadedConversationId, olderCursor, isLoadingOlder])
+
   return (
     <MainLayout
       onNewConversation={handleNewConversation}
@@ -99,6 +118,9 @@ export default function Home() {
           error={error}
           agentEvents={agentEvents}
           agentCurrentMessage={agentCurrentMessage}
+          hasOlder={olderCursor !== null}
+          isLoadingOlder={isLoadingOlder}
+          onLoadOlder={handleLoadOlder}
         />
 
         {/* 入力フォーム */}
@@ -111,3 +133,11 @@ export default function Home() {
     </MainLayout>
   )
 }
+
+function toChatMessage(msg: ConversationMessage): Message {
+  return {
+    role: msg.role,
+    content: msg.content,
+    searchHistory: msg.search_history || undefined,
+  }
+}
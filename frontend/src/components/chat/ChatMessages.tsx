@@ -1,11 +1,14 @@
 'use client'
 
-import { useEffect, useRef } from 'react'
+import { UIEvent, useEffect, useLayoutEffect, useRef } from 'react'
 import { ChatMessage } from './ChatMessage'
 import { AgentProgress } from '../agent/AgentProgress'
 import { AlertCircle } from 'lucide-react'
 import { ProgressEvent, SearchHistoryItem } from '@/types/agent'
 
+// 上端からこの距離までスクロールしたら古いメッセージを読み込む
+const LOAD_OLDER_THRESHOLD_PX = 80
+
 interface Message {
   role: 'user' | 'assistant'
   content: string
@@ -18,6 +21,9 @@ interface ChatMessagesProps {
   error: string | null
   agentEvents?: ProgressEvent[]
   agentCurrentMessage?: string
+  hasOlder?: boolean
+  isLoadingOlder?: boolean
+  onLoadOlder?: () => void
 }
 
 export function ChatMessages({
@@ -26,17 +32,65 @@ export function ChatMessages({
   error,
   agentEvents = [],
   agentCurrentMessage = '',
+  hasOlder = false,
+  isLoadingOlder = false,
+  onLoadOlder,
 }: ChatMessagesProps) {
+  const containerRef = useRef<HTMLElement>(null)
   const messagesEndRef = useRef<HTMLDivElement>(null)
+  // 直前の描画時の先頭・末尾メッセージとスクロール領域の高さ
+  const edgesRef = useRef<{ first?: Message; last?: Message; scrollHeight: number }>({
+    scrollHeight: 0,
+  })
+  const keepPositionRef = useRef(false)
+
+  // 古いメッセージが先頭に追加されたときは表示位置を保つ
+  useLayoutEffect(() => {
+    const container = containerRef.current
+    const previous = edgesRef.current
+    const first = messages[0]
+    const last = messages[messages.length - 1]
+    keepPositionRef.current =
+      !!container && !!previous.last && last === previous.last && first !== previous.first
+    if (container && keepPositionRef.current) {
+      container.scrollTop += container.scrollHeight - previous.scrollHeight
+    }
+    edgesRef.current = { first, last, scrollHeight: container?.scrollHeight ?? 0 }
+  }, [messages])
 
   // 新しいメッセージが追加されたら自動スクロール
   useEffect(() => {
+    if (keepPositionRef.current) {
+      keepPositionRef.current = false
+      return
+    }
     messagesEndRef.current?.scrollIntoView({ behavior: 'smooth' })
   }, [messages, isLoading, agentEvents])
 
+  const handleScroll = (event: UIEvent<HTMLElement>) => {
+    const container = event.currentTarget
+    edgesRef.current.scrollHeight = container.scrollHeight
+    if (container.scrollTop < LOAD_OLDER_THRESHOLD_PX && hasOlder && !isLoadingOlder) {
+      onLoadOlder?.()
+    }
+  }
+
   return (
-    <main className="flex-1 overflow-y-auto px-6 py-8">
+    <main ref={containerRef} onScroll={handleScroll} className="flex-1 overflow-y-auto px-6 py-8">
       <div className="max-w-4xl mx-auto">
+        {/* 古いメッセージの読み込み */}
+        {hasOlder && (
+          <div className="text-center mb-6">
+            <button
+              onClick={onLoadOlder}
+              disabled={isLoadingOlder}
+              className="text-xs text-gray-500 hover:text-blue-600 disabled:text-gray-400"
+            >
+              {isLoadingOlder ? '読み込み中...' : '以前のメッセージを読み込む'}
+            </button>
+          </div>
+        )}
+
         {/* メッセージ履歴 */}
         {messages.map((message, idx) => (
           <ChatMessage
@@ -4,11 +4,11 @@ import { useState } from 'react'
 import { MessageSquare, Trash2 } from 'lucide-react'
 import { formatDistanceToNow } from 'date-fns'
 import { ja } from 'date-fns/locale'
-import { Conversation } from '@/lib/api'
+import { ConversationSummary } from '@/lib/api'
 import { DeleteConfirmDialog } from './DeleteConfirmDialog'
 
 interface ConversationCardProps {
-  conversation: Conversation
+  conversation: ConversationSummary
   onSelect: (conversationId: string) => void
   onDelete: (conversationId: string) => Promise<void>
 }
@@ -20,18 +20,11 @@ export function ConversationCard({ conversation, onSelect, onDelete }: Conversat
     if (conversation.title && conversation.title !== '新規会話') {
       return conversation.title
     }
-    const firstUserMessage = conversation.messages.find((m) => m.role === 'user')
-    if (firstUserMessage) {
-      return (
-        firstUserMessage.content.slice(0, 60) +
-        (firstUserMessage.content.length > 60 ? '...' : '')
-      )
-    }
     return '新規会話'
   }
 
   const getMessageCount = () => {
-    return conversation.messages.length
+    return conversation.message_count
   }
 
   const getRelativeTime = () => {
@@ -83,9 +76,9 @@ export function ConversationCard({ conversation, onSelect, onDelete }: Conversat
         </div>
 
         {/* Preview */}
-        {conversation.messages.length > 0 && (
+        {conversation.last_message && (
           <div className="text-xs text-gray-600 line-clamp-2 bg-gray-50 p-2 rounded border border-gray-100">
-            {conversation.messages[conversation.messages.length - 1].content}
+            {conversation.last_message}
           </div>
         )}
       </div>
@@ -1,11 +1,11 @@
 'use client'
 
-import { Conversation } from '@/lib/api'
+import { ConversationSummary } from '@/lib/api'
 import { formatRelativeTime } from '@/lib/dateUtils'
 import { MessageSquare } from 'lucide-react'
 
 interface ConversationListItemProps {
-  conversation: Conversation
+  conversation: ConversationSummary
   isSelected: boolean
   onClick: () => void
   isExpanded: boolean
@@ -17,15 +17,10 @@ export function ConversationListItem({
   onClick,
   isExpanded,
 }: ConversationListItemProps) {
-  // タイトル生成: 最初のユーザーメッセージから30文字
   const getTitle = () => {
     if (conversation.title && conversation.title !== '新規会話') {
       return conversation.title
     }
-    const firstUserMessage = conversation.messages.find((m) => m.role === 'user')
-    if (firstUserMessage) {
-      return firstUserMessage.content.slice(0, 30) + (firstUserMessage.content.length > 30 ? '...' : '')
-    }
     return '新規会話'
   }
 
@@ -2,12 +2,12 @@
 
 import { useState } from 'react'
 import { MessageSquare, Trash2 } from 'lucide-react'
-import { Conversation } from '@/lib/api'
+import { ConversationSummary } from '@/lib/api'
 import { DeleteConfirmDialog } from './DeleteConfirmDialog'
 import { formatRelativeTime } from '@/lib/dateUtils'
 
 interface ConversationRowProps {
-  conversation: Conversation
+  conversation: ConversationSummary
   onSelect: (conversationId: string) => void
   onDelete: (conversationId: string) => Promise<void>
 }
@@ -19,18 +19,11 @@ export function ConversationRow({ conversation, onSelect, onDelete }: Conversati
     if (conversation.title && conversation.title !== '新規会話') {
       return conversation.title
     }
-    const firstUserMessage = conversation.messages.find((m) => m.role === 'user')
-    if (firstUserMessage) {
-      return (
-        firstUserMessage.content.slice(0, 80) +
-        (firstUserMessage.content.length > 80 ? '...' : '')
-      )
-    }
     return '新規会話'
   }
 
   const getMessageCount = () => {
-    return conversation.messages.length
+    return conversation.message_count
   }
 
 
@@ -104,12 +104,23 @@ export interface Conversation {
   user_id: string
   title: string
   messages: Message[]
+  message_count: number
   created_at: string
   updated_at: string
   is_active: boolean
 }
 
-export async function getUserConversations(userId: string): Promise<Conversation[]> {
+// 会話履歴一覧の1件（メッセージ本文は含まない）
+export interface ConversationSummary {
+  id: string
+  user_id: string
+  title: string
+  message_count: number
+  last_message: string | null
+  updated_at: string
+}
+
+export async function getUserConversations(userId: string): Promise<ConversationSummary[]> {
   const response = await fetch(`${API_BASE_URL}/api/v1/users/${userId}/conversations`)
   if (!response.ok) {
     throw new Error('Failed to fetch conversations')
@@ -125,6 +136,34 @@ export async function getConversation(conversationId: string): Promise<Conversat
   return response.json()
 }
 
+// 会話メッセージの1ウィンドウ（ウィンドウ内は古い順）
+export interface MessagePage {
+  messages: Message[]
+  // さらに古いメッセージを取得するカーソル（最初まで読み込んだら null）
+  nextCursor: string | null
+}
+
+export async function getConversationMessages(
+  conversationId: string,
+  cursor?: string | null,
+  limit: number = 50
+): Promise<MessagePage> {
+  const params = new URLSearchParams({ limit: String(limit) })
+  if (cursor) {
+    params.set('cursor', cursor)
+  }
+  const response = await fetch(
+    `${API_BASE_URL}/api/v1/conversations/${conversationId}/messages?${params}`
+  )
+  if (!response.ok) {
+    throw new Error('Failed to fetch messages')
+  }
+  return {
+    messages: await response.json(),
+    nextCursor: response.headers.get('X-Next-Cursor'),
+  }
+}
+
 export async function deleteConversation(conversationId: string): Promise<void> {
   const response = await fetch(`${API_BASE_URL}/api/v1/conversations/${conversationId}`, {
     method: 'DELETE',
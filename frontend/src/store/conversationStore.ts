@@ -1,10 +1,14 @@
 'use client'
 
 import { create } from 'zustand'
-import { Conversation, getUserConversations, deleteConversation as apiDeleteConversation } from '@/lib/api'
+import {
+  ConversationSummary,
+  getUserConversations,
+  deleteConversation as apiDeleteConversation,
+} from '@/lib/api'
 
 interface ConversationStore {
-  conversations: Conversation[]
+  conversations: ConversationSummary[]
   selectedConversationId: string | null
   isLoading: boolean
   error: string | null